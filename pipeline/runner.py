@@ -60,6 +60,13 @@ def log_event(level: str, message: str, **meta):
                 j[k] = v
         # Print JSON on its own line for easy grepping/parsing
         print(json.dumps(j, separators=(",", ":"), sort_keys=True))
+        # Also append to the job's event stream when run under the orchestrator
+        try:
+            from shared.job_events import emit
+        except ImportError:
+            return
+        extra = {k: v for k, v in meta.items() if k not in ("event", "stage")}
+        emit(meta["event"], meta.get("stage"), level=level, message=message, **extra)
 
 def sha256_of_file(path: str) -> str:
     """Compute sha256 digest for a file. Returns empty string on error."""
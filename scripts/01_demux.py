@@ -15,6 +15,8 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from shared.stage_utils import StageIO, get_stage_logger
 from shared.config import load_config
+from shared.demux_analysis import analysis_path, demux_audio, manifest_summary
+from shared.job_events import emit as emit_event
 
 # Local
 from shared.logger import get_logger
@@ -110,45 +112,30 @@ def run_stage(job_dir: Path, stage_name: str = "01_demux") -> int:
         audio_file = io.stage_dir / "audio.wav"
         logger.info(f"Output audio: {audio_file}")
         
-        # Build ffmpeg command
-        cmd = ["ffmpeg"]
-        
-        # Add start time if specified (must come before -i)
-        if start_time:
-            cmd.extend(["-ss", start_time])
-        
-        # Input file
-        cmd.extend(["-i", str(input_file)])
-        
-        # Add end time if specified (more accurate when after -i)
-        if end_time:
-            cmd.extend(["-to", end_time])
-        
-        # Audio extraction parameters
-        cmd.extend([
-            "-vn",  # No video
-            "-acodec", "pcm_s16le",  # 16-bit PCM
-            "-ar", "16000",  # 16kHz sample rate (required by Whisper)
-            "-ac", "1",  # Mono
-            "-y",  # Overwrite
-            str(audio_file)
-        ])
-        
-        logger.debug(f"Running ffmpeg: {' '.join(cmd)}")
+        # Single decode: PCM plus duration, loudness envelope, feature
+        # vector and fingerprint (audio_analysis.json) in one ffmpeg pass
         logger.info("Extracting audio...")
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.error(f"ffmpeg failed with code {result.returncode}")
-            logger.error(f"stderr: {result.stderr}")
-            raise RuntimeError(f"ffmpeg extraction failed: {result.stderr}")
+        try:
+            analysis = demux_audio(
+                Path(input_file),
+                audio_file,
+                start_time=start_time,
+                end_time=end_time
+            )
+        except subprocess.CalledProcessError as e:
+            logger.error(f"ffmpeg failed with code {e.returncode}")
+            logger.error(f"stderr: {e.stderr}")
+            raise RuntimeError(f"ffmpeg extraction failed: {e.stderr}")
         
         # Track output
         io.track_output(audio_file, "audio", format="wav", sample_rate=16000, channels=1)
+        io.track_output(analysis_path(audio_file), "audio_analysis", format="json")
         
         logger.info(f"✓ Audio extracted successfully: {audio_file}")
         logger.debug(f"File size: {audio_file.stat().st_size / (1024*1024):.2f} MB")
+        logger.info(f"  Duration: {analysis['duration']:.1f}s, loudness: {analysis['loudness']['rms_dbfs']:.1f} dBFS")
+        # Media length for progress ETAs (tools/pipeline-status.py)
+        emit_event("media", media_seconds=round(analysis['duration'], 2))
         
         # ========================================
         # SIMILARITY OPTIMIZATION (Task #18)
@@ -235,7 +222,7 @@ def run_stage(job_dir: Path, stage_name: str = "01_demux") -> int:
         logger.info("DEMUX STAGE COMPLETED")
         logger.info("=" * 60)
         
-        io.finalize(status="success")
+        io.finalize(status="success", audio_analysis=manifest_summary(analysis))
         return 0
         
     except FileNotFoundError as e:
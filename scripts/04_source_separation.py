@@ -17,13 +17,20 @@ import shutil
 import json
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from shared.stage_utils import StageIO, get_stage_logger
+from shared.chunked_separation import (
+    QUALITY_MODELS,
+    ChunkedSeparator,
+    load_speech_regions,
+    plan_selective_segments,
+)
+from shared.music_score import DEFAULT_THRESHOLD, WINDOW_SECONDS, score_audio, select_windows
 
 # Local
 from shared.logger import get_logger
@@ -60,123 +67,143 @@ def install_demucs(logger: logging.Logger) -> bool:
         return False
 
 
-def separate_vocals(input_audio: Path, output_dir: Path, quality: str = "balanced", logger: Optional[logging.Logger] = None) -> None:
+def separate_vocals(
+    input_audio: Path,
+    output_dir: Path,
+    quality: str = "balanced",
+    logger: Optional[logging.Logger] = None,
+    segment_seconds: float = 120.0,
+    overlap_seconds: float = 2.0,
+    workers: int = 0,
+    speech_regions: Optional[List[Tuple[float, float]]] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    mode: str = "full",
+    music_threshold: float = DEFAULT_THRESHOLD
+) -> Optional[Path]:
     """
     Separate vocals from background music using Demucs
     
+    The audio is separated in overlapping segments across worker
+    processes; each finished segment is checkpointed under
+    output_dir/segments, so a rerun after a crash or interrupt resumes
+    where it stopped. Segments without speech are passed through.
+    
+    In adaptive mode a cheap per-window music score is computed first and
+    only windows with music under dialogue are separated; the rest of
+    vocals.wav is the original audio, cross-faded at the splice points.
+    
     Args:
         input_audio: Path to input audio file
         output_dir: Directory for output files
         quality: Quality preset (fast/balanced/quality)
         logger: Logger instance
+        segment_seconds: Segment length in seconds
+        overlap_seconds: Cross-faded overlap between segments
+        workers: Worker processes (0 = auto)
+        speech_regions: Speech (start, end) seconds; None separates everything
+        stats: Optional dict filled with separation statistics
+        mode: "full" (separate everything) or "adaptive" (music windows only)
+        music_threshold: Adaptive mode score threshold (0-1)
     
     Returns:
         Path to separated vocals file, or None if failed
     """
-    if logger:
-        logger.info("Starting source separation...")
-        logger.info(f"  Input: {input_audio}")
-        logger.info(f"  Quality: {quality}")
-    
-    # Create temp directory for Demucs output
-    temp_output = output_dir / "demucs_temp"
-    temp_output.mkdir(parents=True, exist_ok=True)
-    
-    # Build Demucs command
-    cmd = ["demucs"]
+    log = logger or get_logger(__name__)
+    model_name = QUALITY_MODELS.get(quality, QUALITY_MODELS['balanced'])
     
-    # Auto-detect best device (MPS on Apple Silicon, CUDA on NVIDIA, CPU fallback)
-    # Let demucs choose the best device automatically
+    log.info("Starting source separation...")
+    log.info(f"  Input: {input_audio}")
+    log.info(f"  Quality: {quality} (model: {model_name})")
+    log.info(f"  Segments: {segment_seconds:.0f}s with {overlap_seconds:.1f}s cross-fade")
     
-    # Model selection based on quality
-    if quality == "quality":
-        # Best quality: htdemucs (Hybrid Transformer model)
-        cmd.extend(["-n", "htdemucs"])
-    elif quality == "fast":
-        # Faster: mdx_extra_q model with MP3 output
-        cmd.extend(["-n", "mdx_extra_q", "--mp3"])
-    else:  # balanced
-        # Balanced: htdemucs (default, best quality)
-        cmd.extend(["-n", "htdemucs"])
+    final_vocals = output_dir / "vocals.wav"
+    final_accompaniment = output_dir / "accompaniment.wav"
     
-    # Two-stems mode (vocals + accompaniment only)
-    cmd.extend([
-        "--two-stems=vocals",
-        "-o", str(temp_output),
-        str(input_audio)
-    ])
-    
-    if logger:
-        logger.debug(f"Running: {' '.join(cmd)}")
-        logger.info("Processing audio with Demucs...")
-        logger.info("Note: Using hardware acceleration (MPS/CUDA) if available")
-    
-    # Run Demucs
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=3600  # 60 minutes max (for full-length movies)
+        segments, selected, music_stats = None, None, {}
+        if mode == "adaptive":
+            segments, selected, music_stats = _plan_adaptive(
+                input_audio, output_dir, music_threshold, segment_seconds, overlap_seconds, log
+            )
+        
+        separator = ChunkedSeparator(
+            input_audio,
+            output_dir / "segments",
+            model_name,
+            segment_seconds=segment_seconds,
+            overlap_seconds=overlap_seconds,
+            workers=workers,
+            speech_regions=speech_regions,
+            segments=segments,
+            selected=selected,
+            logger_instance=log
+        )
+        separator.run(final_vocals, final_accompaniment)
+        
+        if stats is not None:
+            stats.update(separator.stats)
+            stats['mode'] = mode
+            stats.update(music_stats)
+        
+        log.info(f"✓ Vocals extracted: {final_vocals}")
+        log.debug(f"  Accompaniment saved: {final_accompaniment}")
+        log.info(
+            f"  {separator.stats['separated']} separated, "
+            f"{separator.stats['passed_through']} passed through, "
+            f"{separator.stats['resumed']} resumed in {separator.stats['seconds']:.1f}s"
         )
-        
-        if result.returncode != 0:
-            if logger:
-                logger.error(f"Demucs failed with code {result.returncode}")
-                logger.error(f"stderr: {result.stderr}")
-            return None
-        
-        # Find the separated vocals file
-        # Demucs output structure varies by model
-        audio_name = input_audio.stem
-        
-        # Try both model output directories
-        model_dirs = ["htdemucs", "mdx_extra_q"]
-        vocals_file = None
-        
-        for model_dir in model_dirs:
-            potential_vocals = temp_output / model_dir / audio_name / "vocals.wav"
-            if potential_vocals.exists():
-                vocals_file = potential_vocals
-                break
-        
-        if not vocals_file:
-            if logger:
-                logger.error(f"Expected vocals file not found in {temp_output}")
-            return None
-        
-        # Copy vocals to final output location
-        final_vocals = output_dir / "vocals.wav"
-        shutil.copy2(vocals_file, final_vocals)
-        
-        # Also save the accompaniment (music) for reference
-        accompaniment_file = vocals_file.parent / "no_vocals.wav"
-        if accompaniment_file.exists():
-            final_accompaniment = output_dir / "accompaniment.wav"
-            shutil.copy2(accompaniment_file, final_accompaniment)
-            if logger:
-                logger.debug(f"  Accompaniment saved: {final_accompaniment}")
-        
-        # Clean up temp directory
-        shutil.rmtree(temp_output, ignore_errors=True)
-        
-        if logger:
-            logger.info(f"✓ Vocals extracted: {final_vocals}")
-            vocals_size = final_vocals.stat().st_size / (1024*1024)
-            logger.debug(f"  Vocals file size: {vocals_size:.2f} MB")
-        
         return final_vocals
         
-    except subprocess.TimeoutExpired:
-        if logger:
-            logger.error("Demucs timed out after 60 minutes", exc_info=True)
-        return None
+    except KeyboardInterrupt:
+        log.warning("Separation interrupted; finished segments are checkpointed for resume")
+        raise
     except Exception as e:
-        if logger:
-            logger.error(f"Source separation failed: {e}", exc_info=True)
+        log.error(f"Source separation failed: {e}", exc_info=True)
+        log.info("Finished segments are checkpointed; rerun the stage to resume")
         return None
 
 
+def _plan_adaptive(
+    input_audio: Path,
+    output_dir: Path,
+    threshold: float,
+    segment_seconds: float,
+    overlap_seconds: float,
+    log: logging.Logger
+) -> Tuple[List[Tuple[int, int]], List[bool], Dict[str, Any]]:
+    """Score music per window and plan separation for flagged windows only"""
+    from shared.audio_utils import PCMReader
+    
+    log.info(f"  Scoring music per {WINDOW_SECONDS:.0f}s window (threshold: {threshold})...")
+    scores = score_audio(input_audio, WINDOW_SECONDS)
+    flags = select_windows(scores, threshold)
+    
+    with PCMReader(input_audio) as reader:
+        num_samples = reader.num_samples
+    segments, selected = plan_selective_segments(
+        num_samples, flags, WINDOW_SECONDS,
+        segment_seconds=segment_seconds, overlap_seconds=overlap_seconds
+    )
+    
+    scores_file = output_dir / "music_scores.json"
+    with open(scores_file, 'w') as f:
+        json.dump({
+            "window_seconds": WINDOW_SECONDS,
+            "threshold": threshold,
+            "scores": [round(score, 3) for score in scores],
+            "selected": flags
+        }, f, indent=2)
+    
+    music_windows = sum(flags)
+    log.info(f"  Music under dialogue in {music_windows}/{len(flags)} windows "
+             f"({music_windows * WINDOW_SECONDS / 60:.1f} min to separate)")
+    return segments, selected, {
+        'music_windows': music_windows,
+        'total_windows': len(flags),
+        'music_threshold': threshold
+    }
+
+
 def main() -> int:
     """Extract vocals from audio using source separation."""
     stage_io = None
@@ -222,18 +249,33 @@ def main() -> int:
         sep_config = job_config.get("source_separation", {})
         enabled = sep_config.get("enabled", True)  # Default: enabled
         quality = sep_config.get("quality", "balanced")
+        segment_seconds = float(sep_config.get("segment_seconds", 120))
+        overlap_seconds = float(sep_config.get("overlap_seconds", 2))
+        workers = int(sep_config.get("workers", 0))
+        skip_non_speech = sep_config.get("skip_non_speech", True)
+        mode = sep_config.get("mode", "full")
+        music_threshold = float(sep_config.get("music_threshold", DEFAULT_THRESHOLD))
         
         # Track configuration
         stage_io.set_config({
             "enabled": enabled,
             "quality": quality,
-            "method": "demucs-htdemucs"
+            "method": f"demucs-{QUALITY_MODELS.get(quality, QUALITY_MODELS['balanced'])}",
+            "segment_seconds": segment_seconds,
+            "overlap_seconds": overlap_seconds,
+            "workers": workers,
+            "skip_non_speech": skip_non_speech,
+            "mode": mode,
+            "music_threshold": music_threshold
         })
         
         # Log configuration
         logger.info("Configuration:")
         logger.info(f"  Enabled: {enabled}")
         logger.info(f"  Quality: {quality}")
+        logger.info(f"  Segment: {segment_seconds:.0f}s, overlap: {overlap_seconds:.1f}s, workers: {workers or 'auto'}")
+        logger.info(f"  Skip non-speech: {skip_non_speech}")
+        logger.info(f"  Mode: {mode}" + (f" (music threshold: {music_threshold})" if mode == "adaptive" else ""))
         logger.info(f"  Config source: job.json")
         
         if not enabled:
@@ -244,6 +286,10 @@ def main() -> int:
             stage_io.finalize(status="skipped", reason="Disabled in config")
             return 0
         
+        if mode not in ('full', 'adaptive'):
+            logger.warning(f"Invalid mode '{mode}', using 'full'")
+            mode = 'full'
+        
         # Validate quality setting
         valid_qualities = ['fast', 'balanced', 'quality']
         if quality not in valid_qualities:
@@ -295,8 +341,27 @@ def main() -> int:
         # Create output directory
         output_dir = stage_io.stage_dir
         
+        # Speech map for passing non-speech segments through
+        speech_regions = None
+        if skip_non_speech:
+            speech_regions, speech_source = load_speech_regions(stage_io.output_base, input_audio)
+            if speech_regions is None:
+                logger.info("  No speech map available (separating all segments)")
+            else:
+                logger.info(f"  Speech map: {len(speech_regions)} regions (from {speech_source})")
+        
         # Separate vocals
-        vocals_file = separate_vocals(input_audio, output_dir, quality, logger)
+        separation_stats: Dict[str, Any] = {}
+        vocals_file = separate_vocals(
+            input_audio, output_dir, quality, logger,
+            segment_seconds=segment_seconds,
+            overlap_seconds=overlap_seconds,
+            workers=workers,
+            speech_regions=speech_regions,
+            stats=separation_stats,
+            mode=mode,
+            music_threshold=music_threshold
+        )
         
         if not vocals_file:
             logger.error("Source separation failed")
@@ -338,6 +403,10 @@ def main() -> int:
                              type="vocals",
                              size_mb=round(vocals_size_mb, 2))
         
+        music_scores = output_dir / "music_scores.json"
+        if mode == "adaptive" and music_scores.exists():
+            stage_io.track_output(music_scores, "music_scores", format="json")
+        
         # Track intermediate if separate vocals file kept
         if vocals_file != output_audio and vocals_file.exists():
             stage_io.track_intermediate(vocals_file, retained=True,
@@ -350,8 +419,9 @@ def main() -> int:
             'vocals_file': str(vocals_file),
             'output_audio': str(output_audio),
             'quality': quality,
-            'method': 'demucs-htdemucs',
-            'stems': 'two-stems (vocals + accompaniment)'
+            'method': f"demucs-{QUALITY_MODELS.get(quality, QUALITY_MODELS['balanced'])}",
+            'stems': 'two-stems (vocals + accompaniment)',
+            'separation': separation_stats
         }
         
         # Save original audio info for reference
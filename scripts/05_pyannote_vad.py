@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 PyAnnote VAD stage: Voice Activity Detection using PyAnnote
+
+Audio is processed in fixed overlapping windows (shared/streaming_vad.py),
+optionally across worker processes; on CPU-only hosts the Silero or
+energy detectors are a fast alternative to PyAnnote.
 """
 # Standard library
 import warnings
@@ -11,7 +15,6 @@ warnings.filterwarnings('ignore', category=UserWarning, module='torchaudio')
 
 import sys
 import os
-import json
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -19,7 +22,15 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from shared.stage_utils import StageIO, get_stage_logger
 from shared.config import load_config
+from shared.job_config import load_job_config
 from shared.user_profile import UserProfile
+from shared.chunked_separation import detect_device
+from shared.streaming_vad import (
+    DEFAULT_MERGE_GAP,
+    DEFAULT_OVERLAP_SECONDS,
+    DEFAULT_WINDOW_SECONDS,
+    StreamingVAD,
+)
 
 # Local
 from shared.logger import get_logger
@@ -34,9 +45,10 @@ if __name__ == "__main__":
     logger.info("PYANNOTE VAD STAGE: Voice Activity Detection")
     logger.info("=" * 60)
     
-    # Load configuration
+    # Load configuration (job config snapshot: settings and job.json, parsed once)
     try:
         config = load_config()
+        job_config = load_job_config(stage_io.output_base)
     except Exception as e:
         logger.error(f"Failed to load configuration: {e}", exc_info=True)
         stage_io.add_error(f"Config load failed: {e}", e)
@@ -46,35 +58,51 @@ if __name__ == "__main__":
     # Get VAD enabled flag from config (use dict access with defaults)
     vad_enabled = True  # Default: enabled
     vad_threshold = 0.5  # Default: 0.5
+    vad_backend = 'auto'
+    window_seconds = DEFAULT_WINDOW_SECONDS
+    overlap_seconds = DEFAULT_OVERLAP_SECONDS
+    vad_workers = 1
+    merge_gap = DEFAULT_MERGE_GAP
     
-    # Try to get from config if available
-    if hasattr(config, 'get'):
-        vad_enabled = config.get('PYANNOTE_VAD_ENABLED', 'true').lower() == 'true'
-        vad_threshold = float(config.get('PYANNOTE_VAD_THRESHOLD', '0.5'))
+    # System/job settings
+    vad_enabled = job_config.get_bool('PYANNOTE_VAD_ENABLED', vad_enabled)
+    vad_threshold = job_config.get_float('PYANNOTE_VAD_THRESHOLD', vad_threshold)
+    vad_backend = str(job_config.get('PYANNOTE_VAD_BACKEND', vad_backend)).lower()
+    window_seconds = job_config.get_float('PYANNOTE_VAD_WINDOW_SECONDS', window_seconds)
+    overlap_seconds = job_config.get_float('PYANNOTE_VAD_OVERLAP_SECONDS', overlap_seconds)
+    vad_workers = job_config.get_int('PYANNOTE_VAD_WORKERS', vad_workers)
+    merge_gap = job_config.get_float('PYANNOTE_MERGE_GAP', merge_gap)
     
     # Override with job.json parameters (AD-006)
-    job_json_path = stage_io.output_base / "job.json"
-    if job_json_path.exists():
+    job_data = job_config.job
+    if job_data:
         logger.info("Reading job-specific parameters from job.json...")
-        try:
-            with open(job_json_path) as f:
-                job_data = json.load(f)
-                
-                # Override VAD parameters
-                if 'vad' in job_data:
-                    vad_config = job_data['vad']
-                    if 'enabled' in vad_config and vad_config['enabled'] is not None:
-                        old_enabled = vad_enabled
-                        vad_enabled = vad_config['enabled']
-                        logger.info(f"  vad.enabled override: {old_enabled} → {vad_enabled} (from job.json)")
-                    if 'threshold' in vad_config and vad_config['threshold']:
-                        old_threshold = vad_threshold
-                        vad_threshold = float(vad_config['threshold'])
-                        logger.info(f"  vad.threshold override: {old_threshold} → {vad_threshold} (from job.json)")
-        except Exception as e:
-            logger.warning(f"Failed to read job.json parameters: {e}")
     else:
-        logger.warning(f"job.json not found at {job_json_path}, using system defaults")
+        logger.warning(f"job.json not found in {stage_io.output_base}, using system defaults")
+    
+    # Override VAD parameters
+    vad_config = job_data.get('vad') or {}
+    if vad_config.get('enabled') is not None:
+        old_enabled = vad_enabled
+        vad_enabled = vad_config['enabled']
+        logger.info(f"  vad.enabled override: {old_enabled} → {vad_enabled} (from job.json)")
+    if vad_config.get('threshold'):
+        old_threshold = vad_threshold
+        vad_threshold = float(vad_config['threshold'])
+        logger.info(f"  vad.threshold override: {old_threshold} → {vad_threshold} (from job.json)")
+    if vad_config.get('backend'):
+        vad_backend = str(vad_config['backend']).lower()
+        logger.info(f"  vad.backend override: {vad_backend} (from job.json)")
+    if vad_config.get('window_seconds'):
+        window_seconds = float(vad_config['window_seconds'])
+    if vad_config.get('overlap_seconds') is not None:
+        overlap_seconds = float(vad_config['overlap_seconds'])
+    if vad_config.get('workers') is not None:
+        vad_workers = int(vad_config['workers'])
+    if vad_config.get('merge_gap') is not None:
+        old_gap = merge_gap
+        merge_gap = float(vad_config['merge_gap'])
+        logger.info(f"  vad.merge_gap override: {old_gap} → {merge_gap} (from job.json)")
     
     logger.info(f"Using VAD enabled: {vad_enabled}")
     logger.info(f"Using VAD threshold: {vad_threshold}")
@@ -86,14 +114,7 @@ if __name__ == "__main__":
         sys.exit(0)
     
     # Load user profile for HuggingFace token
-    user_id = 1  # Default userId
-    if job_json_path.exists():
-        try:
-            with open(job_json_path) as f:
-                job_data = json.load(f)
-                user_id = job_data.get('userId', 1)
-        except Exception as e:
-            logger.warning(f"Could not read userId from job.json: {e}")
+    user_id = job_data.get('userId', 1)  # Default userId
     
     logger.info(f"Loading user profile for userId={user_id}...")
     try:
@@ -134,91 +155,56 @@ if __name__ == "__main__":
     # Get device from config
     device = getattr(config, 'pyannote_device', 
                     getattr(config, 'device', 'cpu')).lower()
+    if device == 'auto':
+        device = detect_device()
     logger.info(f"Device: {device}")
     
     # Track configuration
     stage_io.set_config({
         "device": device,
-        "merge_gap": 0.2,
+        "backend": vad_backend,
+        "threshold": vad_threshold,
+        "window_seconds": window_seconds,
+        "overlap_seconds": overlap_seconds,
+        "workers": vad_workers,
+        "merge_gap": merge_gap,
         "model": "pyannote/voice-activity-detection"
     })
     
-    logger.info("Running PyAnnote VAD...")
-    
-    # Run PyAnnote VAD directly
+    # Run VAD window by window (bounded memory, optional worker processes)
     exit_code = 1
+    vad_stats = {}
     try:
-        import json
-        import torch
-        from pyannote.audio import Pipeline
-        
-        # Load the VAD pipeline
-        logger.info("Loading PyAnnote VAD model...")
-        if hf_token:
-            pipeline = Pipeline.from_pretrained(
-                "pyannote/voice-activity-detection",
-                use_auth_token=hf_token
-            )
-        else:
-            # Try without token (may fail for gated models)
-            pipeline = Pipeline.from_pretrained("pyannote/voice-activity-detection")
-        
-        # Move to device
-        if device in ["cuda", "mps"]:
-            try:
-                pipeline.to(torch.device(device))
-                logger.info(f"Using device: {device}")
-            except Exception as e:
-                logger.warning(f"Could not use {device}, falling back to CPU: {e}")
-                device = "cpu"
+        vad = StreamingVAD(
+            backend=vad_backend,
+            device=device,
+            threshold=vad_threshold,
+            window_seconds=window_seconds,
+            overlap_seconds=overlap_seconds,
+            workers=vad_workers,
+            hf_token=hf_token,
+            logger_instance=logger
+        )
+        logger.info(
+            f"Running {vad.backend} VAD: {window_seconds:.0f}s windows, "
+            f"{overlap_seconds:.1f}s overlap, {vad.workers} worker(s)"
+        )
         
-        # Run VAD on audio
-        logger.info(f"Processing audio file: {audio_input}")
-        vad_result = pipeline(str(audio_input))
-        
-        # Convert to segments list
-        segments = []
-        for speech in vad_result.get_timeline().support():
-            segments.append({
-                "start": float(speech.start),
-                "end": float(speech.end),
-                "duration": float(speech.end - speech.start)
-            })
-        
-        logger.info(f"Detected {len(segments)} speech segments")
-        
-        # Merge close segments if merge_gap is set
-        merge_gap = 0.2
-        if merge_gap > 0 and len(segments) > 1:
-            merged_segments = []
-            current = segments[0]
-            
-            for next_seg in segments[1:]:
-                if next_seg["start"] - current["end"] <= merge_gap:
-                    # Merge segments
-                    current["end"] = next_seg["end"]
-                    current["duration"] = current["end"] - current["start"]
-                else:
-                    merged_segments.append(current)
-                    current = next_seg
-            
-            merged_segments.append(current)
-            logger.info(f"Merged to {len(merged_segments)} segments (gap threshold: {merge_gap}s)")
-            segments = merged_segments
-        
-        # Save to JSON with proper format expected by pipeline
-        # Pipeline expects {"segments": [...]} not just [...]
-        output_json.parent.mkdir(parents=True, exist_ok=True)
-        output_data = {"segments": segments}
-        with open(output_json, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        segments = vad.run(audio_input, output_json, merge_gap=merge_gap)
+        vad_stats = vad.stats
+        logger.info(f"Detected {vad_stats['raw_segments']} speech segments")
+        logger.info(f"Merged to {len(segments)} segments (gap threshold: {merge_gap}s)")
+        logger.info(
+            f"VAD processed {vad_stats['audio_seconds']:.0f}s of audio in "
+            f"{vad_stats['seconds']:.1f}s ({vad_stats['windows']} windows)"
+        )
         
         logger.info(f"✓ Saved speech segments to: {output_json}")
         exit_code = 0
         
     except ImportError as e:
-        logger.error(f"✗ Failed to import PyAnnote: {e}", exc_info=True)
-        logger.error("Make sure PyAnnote is installed in the correct environment")
+        logger.error(f"✗ Failed to import VAD backend: {e}", exc_info=True)
+        logger.error("Make sure PyAnnote/torch is installed in the correct environment, or use vad.backend=energy")
         stage_io.add_error(f"Import failed: {e}")
         stage_io.finalize(status="failed", error="Missing dependency")
         sys.exit(1)
@@ -234,7 +220,7 @@ if __name__ == "__main__":
         sys.exit(1)
     except RuntimeError as e:
         logger.error(f"✗ Model error: {e}", exc_info=True)
-        stage_io.add_error(f"PyAnnote model error: {e}")
+        stage_io.add_error(f"VAD model error: {e}")
         stage_io.finalize(status="failed", error=str(e))
         sys.exit(1)
     except KeyboardInterrupt:
@@ -253,23 +239,16 @@ if __name__ == "__main__":
         
         # Track output
         if output_json.exists():
-            import json
-            try:
-                with open(output_json, 'r') as f:
-                    segments_data = json.load(f)
-                segments_count = len(segments_data) if isinstance(segments_data, list) else 0
-                stage_io.track_output(output_json, "segments",
-                                     format="json",
-                                     segments_count=segments_count)
-                
-                # Finalize with success
-                stage_io.finalize(status="success",
-                                 segments_count=segments_count,
-                                 device=device)
-            except Exception as e:
-                logger.warning(f"Could not read output segments: {e}")
-                stage_io.track_output(output_json, "segments", format="json")
-                stage_io.finalize(status="success", device=device)
+            segments_count = vad_stats.get('segments', 0)
+            stage_io.track_output(output_json, "segments",
+                                 format="json",
+                                 segments_count=segments_count)
+            
+            # Finalize with success
+            stage_io.finalize(status="success",
+                             segments_count=segments_count,
+                             device=device,
+                             vad=vad_stats)
         else:
             logger.warning("Output file not found after successful completion")
             stage_io.add_warning("Output file not found")
@@ -16,15 +16,17 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
-
-# Local
-from shared.logger import get_logger
-logger = get_logger(__name__)
+from collections.abc import Mapping
 
 # Add project root for StageIO import
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Local
+from shared.logger import get_logger
+from shared.segment_store import copy_segments, load_segments, save_segments
+logger = get_logger(__name__)
+
 try:
     from shared.stage_utils import StageIO, get_stage_logger
     from shared.config import load_config
@@ -64,10 +66,9 @@ def align_mlx_segments(
         logger.error("MLX-Whisper not installed. Install with: pip install mlx-whisper", exc_info=True)
         return False
     
-    # Load existing segments
+    # Load existing segments (columnar sidecar when present)
     logger.info(f"Loading segments from: {segments_file}")
-    with open(segments_file) as f:
-        data = json.load(f)
+    data = load_segments(segments_file)
     
     # Handle both dict {"segments": [...]} and list [...] formats
     if isinstance(data, list):
@@ -83,12 +84,11 @@ def align_mlx_segments(
         return False
     
     # Check if already aligned
-    has_words = segments[0].get("words", []) if segments and isinstance(segments[0], dict) else []
+    has_words = segments[0].get("words", []) if segments and isinstance(segments[0], Mapping) else []
     if has_words and len(has_words) > 0:
         logger.info(f"✓ Segments already have word-level timestamps ({len(has_words)} words in first segment)")
         logger.info("Skipping alignment - copying input to output")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        copy_segments(segments_file, output_file)
         return True
     
     logger.info(f"Re-transcribing with word-level timestamps...")
@@ -136,8 +136,7 @@ def align_mlx_segments(
         "text": result.get("text", "")
     }
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    save_segments(output_file, output_data)
     
     logger.info(f"✓ Aligned segments saved: {output_file}")
     
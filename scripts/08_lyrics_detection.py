@@ -22,6 +22,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.stage_utils import StageIO
 from shared.config import load_config
 from shared.logger import get_logger
+from shared.segment_filters import DEFAULT_CHORUS_REPEATS, classify_lyrics, lyrics_rule
+from shared.song_detection import load_song_map
 
 logger = get_logger(__name__)
 
@@ -30,41 +32,16 @@ def detect_lyrics_simple(text: str) -> bool:
     """
     Simple lyrics detection heuristic.
     
+    Per-segment rules only; see classify_lyrics() for the cross-segment
+    chorus rule.
+    
     Args:
         text: Segment text
         
     Returns:
         True if likely lyrics
     """
-    # Simple heuristics for lyrics detection
-    lyrics_patterns = [
-        'la la la',
-        'na na na',
-        'ho ho ho',
-        'sha la la',
-        'doo doo doo',
-        'oh oh oh',
-        'yeah yeah yeah',
-    ]
-    
-    text_lower = text.lower()
-    
-    # Check for repetitive patterns
-    if any(pattern in text_lower for pattern in lyrics_patterns):
-        return True
-    
-    # Check for high repetition
-    words = text_lower.split()
-    if len(words) > 3:
-        word_counts = {}
-        for word in words:
-            word_counts[word] = word_counts.get(word, 0) + 1
-        
-        # If any word repeats 3+ times in short segment, likely lyrics
-        if any(count >= 3 for count in word_counts.values()):
-            return True
-    
-    return False
+    return lyrics_rule(text) is not None
 
 
 def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
@@ -93,6 +70,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
         lyrics_enabled = config.get("STAGE_08_LYRICS_ENABLED", "true").lower() == "true"
         lyrics_threshold = float(config.get("LYRICS_DETECTION_THRESHOLD", "0.7"))
         workflow = config.get("WORKFLOW", "transcribe")
+        chorus_repeats = int(config.get("LYRICS_CHORUS_REPEATS", DEFAULT_CHORUS_REPEATS))
         
         # Override with job.json parameters (AD-006)
         job_json_path = job_dir / "job.json"
@@ -113,6 +91,10 @@ def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
                             old_threshold = lyrics_threshold
                             lyrics_threshold = float(lyrics_config['threshold'])
                             logger.info(f"  lyrics_detection.threshold override: {old_threshold} → {lyrics_threshold} (from job.json)")
+                        if lyrics_config.get('chorus_repeats') is not None:
+                            old_repeats = chorus_repeats
+                            chorus_repeats = int(lyrics_config['chorus_repeats'])
+                            logger.info(f"  lyrics_detection.chorus_repeats override: {old_repeats} → {chorus_repeats} (from job.json)")
                     
                     # Override workflow
                     if 'workflow' in job_data and job_data['workflow']:
@@ -126,6 +108,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
         
         logger.info(f"Using lyrics_detection enabled: {lyrics_enabled}")
         logger.info(f"Using lyrics_detection threshold: {lyrics_threshold}")
+        logger.info(f"Using lyrics_detection chorus_repeats: {chorus_repeats}")
         logger.info(f"Using workflow: {workflow}")
         
         if not lyrics_enabled:
@@ -181,14 +164,19 @@ def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
         
         logger.info(f"Processing {len(segments)} segments for lyrics detection")
         
-        # Detect lyrics in each segment
+        # Detect lyrics across all segments (per-segment, chorus and song map rules)
+        # Song intervals detected in the audio before ASR (demux stage)
+        song_map = load_song_map(job_dir)
+        songs = song_map["songs"] if song_map else None
+        if songs:
+            logger.info(f"Using audio song map: {len(songs)} song interval(s)")
+        
+        reasons, rule_hits = classify_lyrics(segments, chorus_repeats, songs=songs)
         lyrics_count = 0
-        for segment in segments:
-            text = segment.get("text", "")
-            is_lyrics = detect_lyrics_simple(text)
-            segment["is_lyrics"] = is_lyrics
-            
-            if is_lyrics:
+        for segment, rule in zip(segments, reasons):
+            segment["is_lyrics"] = rule is not None
+            if rule:
+                segment["lyrics_rule"] = rule
                 lyrics_count += 1
         
         # Save annotated transcript
@@ -197,6 +185,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
             "metadata": {
                 "total_segments": len(segments),
                 "lyrics_segments": lyrics_count,
+                "rule_hits": dict(rule_hits),
                 "stage": stage_name
             }
         }
@@ -214,9 +203,11 @@ def run_stage(job_dir: Path, stage_name: str = "08_lyrics_detection") -> int:
         logger.info(f"  Total segments: {len(segments)}")
         logger.info(f"  Lyrics segments: {lyrics_count}")
         logger.info(f"  Lyrics percentage: {lyrics_count/len(segments)*100:.1f}%")
+        for rule, hits in rule_hits.most_common():
+            logger.info(f"    {rule}: {hits}")
         logger.info("=" * 80)
         
-        io.finalize(status="success")
+        io.finalize(status="success", lyrics_segments=lyrics_count, rule_hits=dict(rule_hits))
         return 0
         
     except Exception as e:
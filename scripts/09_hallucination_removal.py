@@ -14,7 +14,6 @@ import sys
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
-import re
 
 # Add project root
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -23,6 +22,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.stage_utils import StageIO
 from shared.config import load_config
 from shared.logger import get_logger
+from shared.segment_store import load_segments, save_segments
+from shared.segment_filters import (
+    DEFAULT_LOOP_THRESHOLD,
+    classify_hallucinations,
+    hallucination_rule,
+)
 
 logger = get_logger(__name__)
 
@@ -31,53 +36,16 @@ def is_hallucination(text: str) -> bool:
     """
     Detect if segment is likely a hallucination.
     
+    Per-segment rules only; see classify_hallucinations() for the
+    cross-segment loop rule.
+    
     Args:
         text: Segment text
         
     Returns:
         True if likely hallucination
     """
-    if not text or len(text.strip()) == 0:
-        return True
-    
-    text_lower = text.lower().strip()
-    
-    # Common hallucination patterns
-    hallucination_patterns = [
-        r'^thanks for watching',
-        r'^thank you for watching',
-        r'^subscribe',
-        r'^like and subscribe',
-        r'^please subscribe',
-        r'^don\'t forget to',
-        r'^visit our website',
-        r'^www\.',
-        r'^http',
-        r'^\[music\]',
-        r'^\[applause\]',
-        r'^\[laughter\]',
-        r'^\[.*\]$',  # Pure annotation markers
-    ]
-    
-    for pattern in hallucination_patterns:
-        if re.search(pattern, text_lower):
-            return True
-    
-    # Very short segments (often artifacts)
-    if len(text_lower) < 3:
-        return True
-    
-    # Excessive repetition (same word 5+ times)
-    words = text_lower.split()
-    if len(words) >= 5:
-        word_counts = {}
-        for word in words:
-            word_counts[word] = word_counts.get(word, 0) + 1
-        
-        if any(count >= len(words) * 0.6 for count in word_counts.values()):
-            return True
-    
-    return False
+    return hallucination_rule(text) is not None
 
 
 def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> int:
@@ -106,6 +74,7 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
         hallucination_enabled = config.get("STAGE_09_HALLUCINATION_ENABLED", "true").lower() == "true"
         confidence_threshold = float(config.get("HALLUCINATION_CONFIDENCE_THRESHOLD", "0.5"))
         workflow = config.get("WORKFLOW", "transcribe")
+        loop_threshold = int(config.get("HALLUCINATION_LOOP_THRESHOLD", DEFAULT_LOOP_THRESHOLD))
         
         # Override with job.json parameters (AD-006)
         job_json_path = job_dir / "job.json"
@@ -126,6 +95,10 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
                             old_threshold = confidence_threshold
                             confidence_threshold = float(hall_config['confidence_threshold'])
                             logger.info(f"  hallucination_removal.confidence_threshold override: {old_threshold} → {confidence_threshold} (from job.json)")
+                        if hall_config.get('loop_threshold') is not None:
+                            old_loop = loop_threshold
+                            loop_threshold = int(hall_config['loop_threshold'])
+                            logger.info(f"  hallucination_removal.loop_threshold override: {old_loop} → {loop_threshold} (from job.json)")
                     
                     # Override workflow
                     if 'workflow' in job_data and job_data['workflow']:
@@ -139,6 +112,7 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
         
         logger.info(f"Using hallucination_removal enabled: {hallucination_enabled}")
         logger.info(f"Using confidence_threshold: {confidence_threshold}")
+        logger.info(f"Using loop_threshold: {loop_threshold}")
         logger.info(f"Using workflow: {workflow}")
         
         if not hallucination_enabled:
@@ -150,15 +124,6 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
                 io.finalize_stage_manifest(exit_code=0)
                 return 0
         
-        # Load configuration
-        config = load_config()
-        removal_enabled = config.get("STAGE_09_HALLUCINATION_ENABLED", "true").lower() == "true"
-        
-        if not removal_enabled:
-            logger.warning("Hallucination removal is MANDATORY for subtitle workflow")
-            logger.info("Continuing with hallucination removal despite config setting")
-            # Don't skip - this is mandatory for subtitle workflow
-        
         # Find input transcript (prefer lyrics detection output)
         input_file = None
         
@@ -206,8 +171,7 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
         logger.info(f"Loading transcript: {input_file}")
         io.track_input(input_file, "transcript")
         
-        with open(input_file, 'r') as f:
-            data = json.load(f)
+        data = load_segments(input_file)
         
         # Handle both dict and list formats
         if isinstance(data, dict):
@@ -219,21 +183,18 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
         
         logger.info(f"Processing {len(segments)} segments for hallucination removal")
         
-        # Remove hallucinations
+        # Remove hallucinations (lyrics are legitimate even if repetitive)
+        reasons, rule_hits = classify_hallucinations(segments, loop_threshold)
         cleaned_segments = []
         removed_count = 0
         
-        for segment in segments:
-            text = segment.get("text", "")
-            
-            # Skip lyrics (they're legitimate even if repetitive)
-            is_lyrics = segment.get("is_lyrics", False)
-            
-            if not is_lyrics and is_hallucination(text):
+        for segment, rule in zip(segments, reasons):
+            if rule:
                 segment["removed"] = True
                 segment["reason"] = "hallucination"
+                segment["rule"] = rule
                 removed_count += 1
-                logger.debug(f"Removed hallucination: '{text[:50]}'")
+                logger.debug(f"Removed hallucination ({rule}): '{segment.get('text', '')[:50]}'")
             else:
                 segment["removed"] = False
                 cleaned_segments.append(segment)
@@ -246,13 +207,14 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
                 "original_segments": len(segments),
                 "cleaned_segments": len(cleaned_segments),
                 "removed_segments": removed_count,
+                "rule_hits": dict(rule_hits),
+                "loop_threshold": loop_threshold,
                 "stage": stage_name
             }
         }
         
         output_file = io.stage_dir / "transcript_cleaned.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        save_segments(output_file, output_data)
         io.track_output(output_file, "cleaned")
         
         logger.info(f"Created cleaned transcript: {output_file}")
@@ -264,9 +226,11 @@ def run_stage(job_dir: Path, stage_name: str = "09_hallucination_removal") -> in
         logger.info(f"  Cleaned segments: {len(cleaned_segments)}")
         logger.info(f"  Removed segments: {removed_count}")
         logger.info(f"  Removal rate: {removed_count/len(segments)*100:.1f}%")
+        for rule, hits in rule_hits.most_common():
+            logger.info(f"    {rule}: {hits}")
         logger.info("=" * 80)
         
-        io.finalize(status="success")
+        io.finalize(status="success", removed_segments=removed_count, rule_hits=dict(rule_hits))
         return 0
         
     except Exception as e:
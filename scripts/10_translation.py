@@ -25,6 +25,7 @@ import os
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 
 import sys
+import time
 import logging
 from pathlib import Path
 
@@ -44,6 +45,9 @@ from dataclasses import dataclass
 
 # Local
 from shared.logger import get_logger
+from shared.translation_quantization import resolve_compute_type, load_int8_model, check_parity
+from shared.resource_monitor import MODEL_LOAD_PHASE, phase_timer
+from shared.job_events import emit as emit_event
 logger = get_logger(__name__)
 
 try:
@@ -187,6 +191,7 @@ class TranslationConfig:
     max_new_tokens: int = 128
     num_beams: int = 4
     batch_size: int = 8  # for batch processing
+    compute_type: str = "float32"  # float32 | int8 (CPU only, like WHISPER_COMPUTE_TYPE)
     skip_english_threshold: float = 0.7  # skip if already mostly English
     use_toolkit: bool = True  # use IndicTransToolkit if available
     
@@ -242,6 +247,14 @@ class IndicTrans2Translator:
         self.tokenizer = None
         self.processor = None
         self.device = self._select_device()
+        self.compute_type = resolve_compute_type(self.config.compute_type, self.device)
+        self.int8_backend: Optional[str] = None
+        self._fp32_model = None
+        self._hf_token: Optional[str] = None
+        self._parity_pending = False
+        # Generated tokens and generate() seconds, for throughput metrics
+        self._generated_tokens = 0
+        self._generate_seconds = 0.0
         
         # Check if toolkit should be used
         self.use_toolkit = (
@@ -323,6 +336,7 @@ class IndicTrans2Translator:
                 return "cpu"
         return self.config.device
     
+    @phase_timer(MODEL_LOAD_PHASE)
     def load_model(self) -> Any:
         """Load IndicTrans2 model and tokenizer"""
         if self.model is not None:
@@ -339,18 +353,26 @@ class IndicTrans2Translator:
             self._log("⚠ No HuggingFace token found - may fail for gated models", level="warning")
         
         try:
+            self._hf_token = hf_token
             self.tokenizer = AutoTokenizer.from_pretrained(
                 self.config.model_name,
                 trust_remote_code=True,
                 token=hf_token
             )
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(
-                self.config.model_name,
-                trust_remote_code=True,
-                token=hf_token
-            )
-            self.model.to(self.device)
-            self.model.eval()
+            if self.compute_type == "int8":
+                # IndicTrans2 uses separate source/target vocabularies, so only
+                # dynamic quantization applies (no CTranslate2 id round-trip)
+                self.model, self.int8_backend = load_int8_model(
+                    self.config.model_name,
+                    self.tokenizer,
+                    self._load_fp32_model,
+                    trust_remote_code=True,
+                    allow_ct2=False,
+                    logger_instance=self.logger or logger
+                )
+                self._parity_pending = True
+            else:
+                self.model = self._load_fp32_model()
             
             # MPS cache workaround
             if self.device == "mps":
@@ -405,6 +427,60 @@ class IndicTrans2Translator:
                 self._log(f"Failed to load IndicTrans2 model: {e}", level="error")
                 raise
     
+    def _load_fp32_model(self) -> Any:
+        """Load the full-precision HF model (kept for the int8 parity check)"""
+        if self._fp32_model is None:
+            self._fp32_model = AutoModelForSeq2SeqLM.from_pretrained(
+                self.config.model_name,
+                trust_remote_code=True,
+                token=self._hf_token
+            )
+            self._fp32_model.to(self.device)
+            self._fp32_model.eval()
+        return self._fp32_model
+    
+    def _ensure_int8_parity(self, texts: List[str]) -> None:
+        """
+        Verify the int8 model against fp32 once, before the first segment.
+        
+        Uses the fixed reference set of the language pair (the job's first
+        segments seed it if there is none); the result is cached per model,
+        language pair and compute type, so later jobs skip the fp32 run.
+        """
+        if not self._parity_pending:
+            return
+        self._parity_pending = False
+        int8_model = self.model
+        
+        def translate_with(get_model: Any) -> Any:
+            def run(batch: List[str]) -> List[str]:
+                saved, self.model = self.model, get_model()
+                try:
+                    return [self.translate_text(t, skip_english=False) for t in batch]
+                finally:
+                    self.model = saved
+            return run
+        
+        parity = check_parity(
+            self.config.model_name,
+            self.int8_backend,
+            texts,
+            translate_with(self._load_fp32_model),
+            translate_with(lambda: int8_model),
+            logger_instance=self.logger or logger,
+            source_lang=self.config.src_lang,
+            target_lang=self.config.tgt_lang,
+            compute_type=self.compute_type
+        )
+        
+        if parity.get('passed'):
+            self._fp32_model = None
+            return
+        
+        self.model = self._load_fp32_model()
+        self.compute_type = "float32"
+        self.int8_backend = None
+    
     def _is_mostly_english(self, text: str) -> bool:
         """
         Check if text is already mostly English (for Hinglish detection).
@@ -541,6 +617,7 @@ class IndicTrans2Translator:
                         else:
                             self.logger.debug(f"  encoded['{key}'] = {tensor}")
                 
+                started = time.time()
                 with torch.no_grad():
                     output = self.model.generate(
                         **encoded,
@@ -548,6 +625,9 @@ class IndicTrans2Translator:
                         num_beams=self.config.num_beams,
                         use_cache=use_cache_param,  # Disable cache on MPS to avoid NoneType errors
                     )
+                self._generate_seconds += time.time() - started
+                if output is not None and hasattr(output, 'shape'):
+                    self._generated_tokens += int(output.shape[-1])
                 
                 # Validate output
                 if output is None or not hasattr(output, 'shape') or output.shape[0] == 0:
@@ -627,8 +707,14 @@ class IndicTrans2Translator:
         if not self.model:
             self.load_model()
         
-        self._log(f"Translating {len(segments)} segments...")
+        self._ensure_int8_parity([
+            seg.get('text', '') for seg in segments
+            if not self._is_mostly_english(seg.get('text', ''))
+        ])
+        
+        self._log(f"Translating {len(segments)} segments ({self.compute_type})...")
         translated_segments = []
+        tokens_before, seconds_before = self._generated_tokens, self._generate_seconds
         
         for i, segment in enumerate(segments):
             # Create a copy of the segment
@@ -659,6 +745,10 @@ class IndicTrans2Translator:
                 self._log(f"  Translated {i + 1}/{len(segments)} segments...")
         
         self._log("✓ Translation complete")
+        emit_event("throughput", kind="translation", model=self.config.model_name,
+                   tokens=self._generated_tokens - tokens_before,
+                   seconds=round(self._generate_seconds - seconds_before, 3),
+                   lines=len(segments))
         return translated_segments
     
     def translate_srt_file(
@@ -688,6 +778,9 @@ class IndicTrans2Translator:
             subtitles = list(srt.parse(f.read()))
         
         self._log(f"Total subtitles found: {len(subtitles)}")
+        self._ensure_int8_parity([
+            sub.content for sub in subtitles if not self._is_mostly_english(sub.content)
+        ])
         
         for i, sub in enumerate(subtitles):
             original = sub.content
@@ -740,7 +833,8 @@ def translate_whisperx_result(
     source_result: Dict[str, Any],
     source_lang: str = "hi",
     target_lang: str = "en",
-    logger: logging.Logger = None
+    logger: logging.Logger = None,
+    compute_type: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Translate WhisperX result using IndicTrans2.
@@ -755,6 +849,7 @@ def translate_whisperx_result(
         source_lang: Source language code (Whisper code, e.g., 'hi', 'ta', 'bn')
         target_lang: Target language code (Whisper code, e.g., 'en', 'gu')
         logger: Logger instance
+        compute_type: float32 | int8 (default: TRANSLATION_COMPUTE_TYPE env)
         
     Returns:
         Translated result dictionary with same structure
@@ -791,7 +886,8 @@ def translate_whisperx_result(
         model_name=model_name,
         device="auto",
         src_lang=src_lang_code,
-        tgt_lang=tgt_lang_code
+        tgt_lang=tgt_lang_code,
+        compute_type=compute_type or os.environ.get('TRANSLATION_COMPUTE_TYPE', 'float32')
     )
     translator = IndicTrans2Translator(
         config=config,
@@ -864,6 +960,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
     from shared.stage_utils import StageIO
     from shared.config_loader import load_config
     from shared.cost_tracker import CostTracker
+    from shared.segment_store import load_segments, save_segments
     
     io = StageIO(stage_name, job_dir, enable_manifest=True)
     logger_stage = io.get_stage_logger()
@@ -881,6 +978,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
         target_langs = config.get("TARGET_LANGUAGE", "en").split(",")
         device = config.get("TRANSLATION_DEVICE", "auto")
         num_beams = int(config.get("TRANSLATION_NUM_BEAMS", "4"))
+        compute_type = config.get("TRANSLATION_COMPUTE_TYPE", "float32")
         workflow = config.get("WORKFLOW", "transcribe")
         
         # Override with job.json parameters (AD-006)
@@ -918,6 +1016,10 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
                             old_beams = num_beams
                             num_beams = int(trans_config['num_beams'])
                             logger_stage.info(f"  translation.num_beams override: {old_beams} → {num_beams} (from job.json)")
+                        if 'compute_type' in trans_config and trans_config['compute_type']:
+                            old_compute = compute_type
+                            compute_type = trans_config['compute_type']
+                            logger_stage.info(f"  translation.compute_type override: {old_compute} → {compute_type} (from job.json)")
                     
                     # Override workflow
                     if 'workflow' in job_data and job_data['workflow']:
@@ -933,6 +1035,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
         logger_stage.info(f"Using target_languages: {target_langs}")
         logger_stage.info(f"Using translation_model: {translation_model}")
         logger_stage.info(f"Using device: {device}")
+        logger_stage.info(f"Using compute_type: {compute_type}")
         logger_stage.info(f"Using workflow: {workflow}")
         
         if not translation_enabled:
@@ -977,7 +1080,8 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
         # Create translator configuration
         trans_config = TranslationConfig(
             device=device,
-            num_beams=num_beams
+            num_beams=num_beams,
+            compute_type=compute_type
         )
         
         # Create translator
@@ -985,22 +1089,21 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
         translator = IndicTrans2Translator(config=trans_config)
         
         try:
+            # Load input transcript once (columnar sidecar when present)
+            transcript_data = load_segments(input_files[0])
+            
+            # Extract segments
+            if isinstance(transcript_data, dict):
+                segments = transcript_data.get('segments', [])
+            else:
+                segments = transcript_data
+            
             # For each target language, translate
             for target_lang in target_langs:
                 output_file = io.stage_dir / f"translated_{target_lang}.json"
                 
                 logger_stage.info(f"Translating to {target_lang}...")
                 
-                # Load input transcript
-                with open(input_files[0], 'r', encoding='utf-8') as f:
-                    transcript_data = json.load(f)
-                
-                # Extract segments
-                if isinstance(transcript_data, dict):
-                    segments = transcript_data.get('segments', [])
-                else:
-                    segments = transcript_data
-                
                 # Translate segments
                 translated_segments = []
                 for segment in segments:
@@ -1022,8 +1125,7 @@ def run_stage(job_dir: Path, stage_name: str = "08_translation") -> int:
                     'source_language': transcript_data.get('language', 'unknown') if isinstance(transcript_data, dict) else 'unknown'
                 }
                 
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(output_data, f, indent=2, ensure_ascii=False)
+                save_segments(output_file, output_data)
                 
                 io.track_output(output_file, "translation")
                 logger_stage.info(f"Created: {output_file}")
@@ -1109,6 +1211,12 @@ def main() -> None:
         default=4,
         help="Number of beams for beam search (higher = better quality, slower)"
     )
+    parser.add_argument(
+        "--compute-type",
+        default="float32",
+        choices=["float32", "int8"],
+        help="Model precision (int8 = quantized CPU inference)"
+    )
     
     args = parser.parse_args()
     
@@ -1116,6 +1224,7 @@ def main() -> None:
     config = TranslationConfig(
         device=args.device,
         num_beams=args.num_beams,
+        compute_type=args.compute_type,
     )
     
     # Create translator
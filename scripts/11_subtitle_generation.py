@@ -5,7 +5,8 @@ Subtitle Generation Stage (11_subtitle_generation)
 Generates SRT subtitle files from translated transcripts.
 
 Input: Translated transcript segments (from 10_translation)
-Output: SRT subtitle files for all target languages
+Output: SRT subtitle files for all target languages (plus VTT/ASS when
+        SUBTITLE_FORMAT / subtitle.format lists them, e.g. "srt,vtt")
 """
 
 # Standard library
@@ -21,56 +22,39 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from shared.stage_utils import StageIO
 from shared.config import load_config
 from shared.logger import get_logger
+from shared.segment_store import load_segments
+from shared.subtitle_io import FORMATS, format_timestamp, write_subtitles
+from shared.subtitle_reflow import ReflowSettings, reflow_segments
 
 logger = get_logger(__name__)
 
 
 def format_timestamp_srt(seconds: float) -> str:
     """Format seconds as SRT timestamp (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+    return format_timestamp(seconds, 'srt')
 
 
-def generate_srt(segments: List[Dict], output_path: Path, language: str = "en") -> int:
+def generate_srt(segments: List[Dict], output_path: Path, language: str = "en",
+                 formats: Optional[List[str]] = None) -> int:
     """
     Generate SRT subtitle file from segments.
     
+    Additional formats (vtt, ass) are written next to the SRT file from
+    the same pass over the segments.
+    
     Args:
         segments: List of segment dicts with start, end, text
         output_path: Output SRT file path
         language: Language code for filename
+        formats: Extra formats to write alongside the SRT file
         
     Returns:
         Number of subtitles generated
     """
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for i, segment in enumerate(segments, 1):
-            # Skip removed or empty segments
-            if segment.get("removed", False):
-                continue
-            
-            text = segment.get("text", "").strip()
-            if not text:
-                continue
-            
-            # Segment number
-            f.write(f"{i}\n")
-            
-            # Timestamps
-            start = format_timestamp_srt(segment.get('start', 0))
-            end = format_timestamp_srt(segment.get('end', 0))
-            f.write(f"{start} --> {end}\n")
-            
-            # Text
-            f.write(f"{text}\n")
-            
-            # Blank line between segments
-            f.write("\n")
-    
-    return i
+    paths = [output_path] + [
+        output_path.with_suffix(f".{fmt}") for fmt in (formats or []) if fmt != "srt"
+    ]
+    return write_subtitles(segments, *paths, title=language)
 
 
 def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
@@ -100,6 +84,7 @@ def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
         subtitle_format = config.get("SUBTITLE_FORMAT", "srt")
         target_langs = config.get("TARGET_LANGUAGE", "en").split(",")
         workflow = config.get("WORKFLOW", "transcribe")
+        subtitle_overrides = {}
         
         # Override with job.json parameters (AD-006)
         job_json_path = job_dir / "job.json"
@@ -118,6 +103,7 @@ def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
                     # Override subtitle parameters
                     if 'subtitle' in job_data:
                         sub_config = job_data['subtitle']
+                        subtitle_overrides = sub_config
                         if 'format' in sub_config and sub_config['format']:
                             old_format = subtitle_format
                             subtitle_format = sub_config['format']
@@ -138,6 +124,19 @@ def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
         logger.info(f"Using target_languages: {target_langs}")
         logger.info(f"Using workflow: {workflow}")
         
+        # Cue layout limits (SUBTITLE_*, SEGMENT_MERGE_*, CPS_*)
+        reflow = ReflowSettings.from_config(overrides=subtitle_overrides)
+        reflow_stats = {}
+        logger.info(f"Using reflow: {reflow.enabled} (max {reflow.max_lines}x{reflow.max_line_length} chars, "
+                    f"{reflow.min_duration}-{reflow.max_duration}s, {reflow.max_cps} CPS)")
+        
+        # SRT is always written (the mux stage reads it); other formats
+        # are rendered alongside it from the same segments
+        extra_formats = [
+            fmt.strip().lower() for fmt in str(subtitle_format).split(",")
+            if fmt.strip().lower() in FORMATS and fmt.strip().lower() != "srt"
+        ]
+        
         if not subtitle_enabled:
             logger.info("Subtitle generation disabled, skipping")
             io.finalize_stage_manifest(exit_code=0)
@@ -182,17 +181,21 @@ def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
             logger.info(f"Using transcript: {input_file}")
             io.track_input(input_file, "transcript")
             
-            with open(input_file, 'r') as f:
-                data = json.load(f)
+            data = load_segments(input_file)
             
             segments = data.get("segments", [])
             if not segments:
                 segments = data if isinstance(data, list) else []
             
+            if reflow.enabled:
+                segments, reflow_stats["source"] = reflow_segments(segments, reflow)
+                logger.info(f"Reflow: {reflow_stats['source']}")
+            
             # Generate subtitle for original language
             srt_file = io.stage_dir / "subtitles.srt"
-            count = generate_srt(segments, srt_file)
-            io.track_output(srt_file, "subtitle")
+            count = generate_srt(segments, srt_file, formats=extra_formats)
+            for fmt_file in [srt_file] + [srt_file.with_suffix(f".{fmt}") for fmt in extra_formats]:
+                io.track_output(fmt_file, "subtitle")
             
             logger.info(f"Generated {count} subtitles: {srt_file}")
             
@@ -220,8 +223,7 @@ def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
                 logger.info(f"Processing: {trans_file.name}")
                 io.track_input(trans_file, "translation")
                 
-                with open(trans_file, 'r') as f:
-                    data = json.load(f)
+                data = load_segments(trans_file)
                 
                 segments = data.get("segments", [])
                 if not segments:
@@ -230,24 +232,29 @@ def run_stage(job_dir: Path, stage_name: str = "11_subtitle_generation") -> int:
                 # Extract language from filename (transcript_en.json -> en)
                 lang = trans_file.stem.split("_")[-1] if "_" in trans_file.stem else "en"
                 
+                if reflow.enabled:
+                    segments, reflow_stats[lang] = reflow_segments(segments, reflow)
+                    logger.info(f"Reflow ({lang}): {reflow_stats[lang]}")
+                
                 # Generate SRT
                 srt_file = io.stage_dir / f"subtitles_{lang}.srt"
-                count = generate_srt(segments, srt_file, lang)
-                io.track_output(srt_file, "subtitle")
+                count = generate_srt(segments, srt_file, lang, formats=extra_formats)
+                for fmt_file in [srt_file] + [srt_file.with_suffix(f".{fmt}") for fmt in extra_formats]:
+                    io.track_output(fmt_file, "subtitle")
                 
                 logger.info(f"Generated {count} subtitles for {lang}: {srt_file.name}")
                 total_subtitles += count
         
         # Summary
-        srt_files = list(io.stage_dir.glob("*.srt"))
+        srt_files = sorted(f for fmt in FORMATS for f in io.stage_dir.glob(f"*.{fmt}"))
         logger.info("=" * 80)
         logger.info("Subtitle Generation Complete")
-        logger.info(f"  SRT files generated: {len(srt_files)}")
+        logger.info(f"  Subtitle files generated: {len(srt_files)}")
         for srt_file in srt_files:
             logger.info(f"    - {srt_file.name}")
         logger.info("=" * 80)
         
-        io.finalize(status="success")
+        io.finalize(status="success", reflow=reflow_stats)
         return 0
         
     except Exception as e:
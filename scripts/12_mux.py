@@ -15,6 +15,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from shared.stage_utils import StageIO
 from shared.config import load_config
+from shared.mux_engine import SubtitleTrack, mux_job, output_container, plan_clip
 
 def main() -> int:
     """
@@ -48,6 +49,9 @@ def main() -> int:
         output_format = getattr(config, 'mux_output_format', 'mkv')
         default_subtitle_track = getattr(config, 'mux_default_subtitle', 'en')
         target_langs = getattr(config, 'target_language', 'en').split(',')
+        containers = []
+        remux = "auto"
+        media_processing = {}
         
         # Override with job.json parameters (AD-006)
         job_json_path = stage_io.output_base / "job.json"
@@ -74,6 +78,14 @@ def main() -> int:
                             old_default = default_subtitle_track
                             default_subtitle_track = mux_config['default_subtitle_track']
                             logger.info(f"  mux.default_subtitle_track override: {old_default} → {default_subtitle_track} (from job.json)")
+                        if mux_config.get('containers'):
+                            containers = mux_config['containers']
+                            logger.info(f"  mux.containers override: {containers} (from job.json)")
+                        if mux_config.get('remux'):
+                            remux = mux_config['remux']
+                            logger.info(f"  mux.remux override: {remux} (from job.json)")
+                    
+                    media_processing = job_data.get('media_processing', {})
             except Exception as e:
                 logger.warning(f"Failed to read job.json parameters: {e}")
         else:
@@ -155,130 +167,64 @@ def main() -> int:
         movie_dir = stage_io.stage_dir / original_name
         movie_dir.mkdir(parents=True, exist_ok=True)
         
-        # Use original filename with subtitle suffix, preserve format
-        output_filename = f"{original_name}_subtitled{original_ext}"
-        output_file = movie_dir / output_filename
+        # Use original filename with subtitle suffix; container follows the
+        # source (AVI and unknown formats → MKV) unless mux.containers is set
+        if isinstance(containers, str):
+            containers = containers.split(',')
+        containers = [c.strip().lower() for c in containers if c.strip().lower() in ("mp4", "mkv")]
+        containers = containers or [output_container(input_path)]
+        outputs = [(movie_dir / f"{original_name}_subtitled.{c}", c) for c in containers]
+        output_file = outputs[0][0]
+        subtitle_codec = "mov_text" if containers[0] == "mp4" else "srt"
         
         # Track configuration
         stage_io.set_config({
-            "subtitle_codec": "auto",  # Will be set below
+            "subtitle_codec": subtitle_codec,
             "subtitle_count": len(subtitle_files),
-            "container_format": original_ext
+            "container_format": original_ext,
+            "containers": containers
         })
         
         logger.info(f"Original file: {input_path.name}")
-        logger.info(f"Output format: {original_ext} (preserved from original)")
+        logger.info(f"Output format: {', '.join(containers)} (source: {original_ext})")
         logger.info(f"Movie directory: {movie_dir}")
         
-        # Mux video with subtitles using ffmpeg
-        # For MP4: use mov_text codec, for MKV/WebM: use srt codec, for other: try both
-        if original_ext.lower() in ['.mp4', '.m4v']:
-            subtitle_codec = "mov_text"
-            logger.info(f"Using mov_text codec for MP4 container")
-        elif original_ext.lower() in ['.mkv', '.webm']:
-            subtitle_codec = "srt"
-            logger.info(f"Using srt codec for {original_ext} container")
-        else:
-            # Default to srt for unknown formats
-            subtitle_codec = "srt"
-            logger.info(f"Using srt codec (default) for {original_ext} container")
-        
-        # Update config with actual codec
-        stage_io.set_config({"subtitle_codec": subtitle_codec})
-        
-        # Build ffmpeg command with multiple subtitle inputs
-        cmd = ["ffmpeg", "-i", str(input_file)]
-        
-        # Add each subtitle file as an input
-        for sub_file in subtitle_files:
-            cmd.extend(["-i", str(sub_file)])
-        
-        # Copy video and audio streams
-        cmd.extend(["-c:v", "copy", "-c:a", "copy"])
-        
-        # Set subtitle codec for all subtitle streams
-        cmd.extend(["-c:s", subtitle_codec])
-        
-        # Add metadata for each subtitle stream
         # Extract language code from filename (e.g., "movie.hi.srt" -> "hi")
+        tracks = []
         for idx, sub_file in enumerate(subtitle_files):
-            stem = sub_file.stem  # e.g., "Jaane Tu Ya Jaane Na.hi"
-            parts = stem.split('.')
-            
-            # Try to extract language code (last part before extension)
-            if len(parts) >= 2:
-                lang_code = parts[-1].lower()  # e.g., "hi", "en", "gu"
-            else:
-                lang_code = "und"  # undefined
-            
-            # Map 2-letter codes to 3-letter ISO 639-2 codes for better compatibility
-            lang_map = {
-                "hi": "hin",  # Hindi
-                "en": "eng",  # English
-                "gu": "guj",  # Gujarati
-                "ta": "tam",  # Tamil
-                "te": "tel",  # Telugu
-                "bn": "ben",  # Bengali
-                "mr": "mar",  # Marathi
-                "kn": "kan",  # Kannada
-                "ml": "mal",  # Malayalam
-                "pa": "pan",  # Punjabi
-                "ur": "urd",  # Urdu
-            }
-            
-            lang_code_3 = lang_map.get(lang_code, lang_code)
-            
-            # Set language metadata
-            cmd.extend([f"-metadata:s:s:{idx}", f"language={lang_code_3}"])
-            
-            # Set title metadata (for display in players)
-            lang_names = {
-                "hin": "Hindi",
-                "eng": "English",
-                "guj": "Gujarati",
-                "tam": "Tamil",
-                "tel": "Telugu",
-                "ben": "Bengali",
-                "mar": "Marathi",
-                "kan": "Kannada",
-                "mal": "Malayalam",
-                "pan": "Punjabi",
-                "urd": "Urdu",
-            }
-            lang_title = lang_names.get(lang_code_3, lang_code_3.upper())
-            cmd.extend([f"-metadata:s:s:{idx}", f"title={lang_title}"])
-            
-            logger.info(f"  Subtitle track {idx}: {lang_title} ({lang_code_3})")
+            parts = sub_file.stem.split('.')
+            lang_code = parts[-1].lower() if len(parts) >= 2 else "und"
+            track = SubtitleTrack(sub_file, lang_code)
+            tracks.append(track)
+            logger.info(f"  Subtitle track {idx}: {track.label} ({track.iso})")
         
-        # Mark first subtitle as default (usually Hindi or source language)
-        cmd.extend(["-disposition:s:0", "default"])
-        
-        # Map all streams
-        cmd.extend(["-map", "0:v", "-map", "0:a"])
-        for idx in range(len(subtitle_files)):
-            cmd.extend(["-map", f"{idx+1}:s"])
-        
-        cmd.extend(["-y", str(output_file)])
+        # Keyframe-aligned stream-copy clip when the job is clipped
+        clip = None
+        if media_processing.get("mode") == "clip":
+            clip = plan_clip(input_path, media_processing.get("start_time"), media_processing.get("end_time"))
         
         logger.info(f"Muxing video with subtitles")
-        logger.info(f"  Output: {output_file}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            logger.error(f"ffmpeg failed with code {result.returncode}")
-            logger.error(f"stderr: {result.stderr}")
-            stage_io.add_error(f"ffmpeg failed: {result.stderr[:200]}")
+        for path, _ in outputs:
+            logger.info(f"  Output: {path}")
+        try:
+            mux_result = mux_job(input_path, tracks, outputs, clip=clip, remux=remux, logger_instance=logger)
+        except RuntimeError as e:
+            logger.error(f"ffmpeg failed: {e}")
+            stage_io.add_error(f"ffmpeg failed: {str(e)[:200]}")
             stage_io.finalize(status="failed", error="Muxing failed")
             return 1
         
         logger.info(f"✓ Video muxed successfully")
         
         # Track output
-        output_size_mb = output_file.stat().st_size / (1024*1024) if output_file.exists() else 0
-        stage_io.track_output(output_file, "video",
-                             format=original_ext[1:],
-                             subtitle_tracks=len(subtitle_files),
-                             size_mb=round(output_size_mb, 2))
+        output_size_mb = 0
+        for path, container in outputs:
+            size_mb = path.stat().st_size / (1024*1024) if path.exists() else 0
+            output_size_mb += size_mb
+            stage_io.track_output(path, "video",
+                                 format=container,
+                                 subtitle_tracks=len(subtitle_files),
+                                 size_mb=round(size_mb, 2))
         
         # Create final_output.mp4 symlink at job directory root
         output_dir = stage_io.output_base
@@ -305,7 +251,10 @@ def main() -> int:
             "input_file": str(input_file),
             "subtitle_files": [str(f) for f in subtitle_files],
             "subtitle_count": len(subtitle_files),
-            "output_file": str(output_file)
+            "output_file": str(output_file),
+            "output_files": [str(path) for path, _ in outputs],
+            "mux_mode": mux_result["mode"],
+            "clip": mux_result["clip"]
         }
         metadata_file = stage_io.save_metadata(metadata)
         stage_io.track_intermediate(metadata_file, retained=True,
@@ -315,7 +264,8 @@ def main() -> int:
         stage_io.finalize(status="success",
                          subtitle_tracks=len(subtitle_files),
                          output_size_mb=round(output_size_mb, 2),
-                         codec=subtitle_codec)
+                         codec=subtitle_codec,
+                         mux_mode=mux_result["mode"])
         
         logger.info("=" * 60)
         logger.info("MUX STAGE COMPLETE")
@@ -391,5 +341,43 @@ def run_stage(job_dir: Path, stage_name: str = "12_mux") -> int:
     # This wrapper just provides the standard run_stage() interface
     return main()
 
+def attach_main(argv=None) -> int:
+    """
+    Add or replace subtitle tracks on an already-muxed file (no source read).
+    
+    Usage:
+        python scripts/12_mux.py --attach movie_subtitled.mkv movie.ta.srt movie.gu.srt [-o out.mp4 ...]
+    
+    Returns:
+        int: Exit code (0 for success, non-zero for failure)
+    """
+    import argparse
+    from shared.logger import get_logger
+    from shared.mux_engine import attach_subtitles
+    
+    logger = get_logger("12_mux")
+    parser = argparse.ArgumentParser(description="Add/replace subtitle tracks without re-encoding")
+    parser.add_argument("--attach", required=True, type=Path, help="Muxed video to update")
+    parser.add_argument("subtitles", nargs="+", type=Path, help="Subtitle files named <name>.<lang>.<ext>")
+    parser.add_argument("-o", "--output", action="append", type=Path, default=[],
+                        help="Write here instead of updating in place (repeat for MP4 + MKV)")
+    parser.add_argument("--keep-existing", action="store_true",
+                        help="Keep existing tracks in the same languages")
+    args = parser.parse_args(argv)
+    
+    tracks = [SubtitleTrack(path, path.stem.split('.')[-1].lower() if '.' in path.stem else "und")
+              for path in args.subtitles]
+    outputs = [(path, output_container(path)) for path in args.output] or None
+    try:
+        result = attach_subtitles(args.attach, tracks, outputs, replace=not args.keep_existing)
+    except (RuntimeError, OSError) as e:
+        logger.error(f"Attach failed: {e}")
+        return 1
+    logger.info(f"Kept tracks: {result['kept'] or 'none'}; added: {result['added']}")
+    return 0
+
+
 if __name__ == "__main__":
+    if "--attach" in sys.argv[1:]:
+        sys.exit(attach_main())
     sys.exit(main())
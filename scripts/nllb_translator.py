@@ -11,6 +11,7 @@ https://huggingface.co/facebook/nllb-200-distilled-600M
 # Standard library
 import os
 import json
+import time
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional, Any
@@ -21,6 +22,10 @@ import torch
 
 # Local
 from shared.logger import get_logger
+from shared.batch_controller import AdaptiveBatchController
+from shared.job_events import emit as emit_event
+from shared.translation_batching import dedupe_texts, length_sorted_order, token_budget_batch_size
+from shared.translation_quantization import resolve_compute_type, load_int8_model, check_parity
 logger = get_logger(__name__)
 
 try:
@@ -107,8 +112,11 @@ class NLLBConfig:
     tgt_lang: str = "eng_Latn"
     device: str = "mps"  # auto-detect: mps, cuda, or cpu
     max_length: int = 512
-    batch_size: int = 8
+    batch_size: int = 8  # starting size; tuned online if adaptive_batch_size
+    max_batch_tokens: int = 4096  # padded-token budget per batch
     num_beams: int = 4
+    adaptive_batch_size: bool = True
+    compute_type: str = "float32"  # float32 | int8 (CPU only, like WHISPER_COMPUTE_TYPE)
 
 
 class NLLBTranslator:
@@ -165,14 +173,91 @@ class NLLBTranslator:
             src_lang=self.config.src_lang
         )
         
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(
-            self.config.model_name
-        ).to(self.config.device)
+        self.compute_type = resolve_compute_type(self.config.compute_type, self.config.device)
+        self.int8_backend: Optional[str] = None
+        self._fp32_model = None
+        self._parity_pending = False
+        
+        if self.compute_type == "int8":
+            self.model, self.int8_backend = load_int8_model(
+                self.config.model_name,
+                self.tokenizer,
+                self._load_fp32_model,
+                logger_instance=self.logger or logger
+            )
+            self._parity_pending = True
+        else:
+            self.model = self._load_fp32_model()
         
-        self.model.eval()  # Set to evaluation mode
+        self.batch_controller = self._create_batch_controller()
         
         if self.logger:
-            self.logger.info("NLLB model loaded successfully")
+            self.logger.info(f"NLLB model loaded successfully ({self.compute_type})")
+    
+    def _load_fp32_model(self) -> Any:
+        """Load the full-precision HF model (kept for the int8 parity check)"""
+        if self._fp32_model is None:
+            self._fp32_model = AutoModelForSeq2SeqLM.from_pretrained(
+                self.config.model_name
+            ).to(self.config.device)
+            self._fp32_model.eval()  # Set to evaluation mode
+        return self._fp32_model
+    
+    def _create_batch_controller(self) -> AdaptiveBatchController:
+        """Batch controller keyed by the compute type actually in use"""
+        compute_key = f"int8-{self.int8_backend}" if self.int8_backend else self.compute_type
+        return AdaptiveBatchController(
+            self.config.model_name,
+            compute_key,
+            device=self.config.device,
+            initial_batch_size=self.config.batch_size,
+            enabled=self.config.adaptive_batch_size,
+            logger_instance=self.logger
+        )
+    
+    def _ensure_int8_parity(self, texts: List[str]) -> None:
+        """
+        Verify the int8 model against fp32 once, before the first batch.
+        
+        Uses the fixed reference set of the language pair (the job's first
+        segments, which are in the source language, seed it if there is
+        none); the result is cached per model, language pair and compute
+        type, so the fp32 model is only loaded on the first run.
+        """
+        if not self._parity_pending:
+            return
+        self._parity_pending = False
+        int8_model = self.model
+        
+        def translate_with(get_model: Any) -> Any:
+            def run(batch: List[str]) -> List[str]:
+                saved, self.model = self.model, get_model()
+                try:
+                    return self.translate_batch(batch)
+                finally:
+                    self.model = saved
+            return run
+        
+        parity = check_parity(
+            self.config.model_name,
+            self.int8_backend,
+            texts,
+            translate_with(self._load_fp32_model),
+            translate_with(lambda: int8_model),
+            logger_instance=self.logger or logger,
+            source_lang=self.config.src_lang,
+            target_lang=self.config.tgt_lang,
+            compute_type=self.compute_type
+        )
+        
+        if parity.get('passed'):
+            self._fp32_model = None
+            return
+        
+        self.model = self._load_fp32_model()
+        self.compute_type = "float32"
+        self.int8_backend = None
+        self.batch_controller = self._create_batch_controller()
     
     def translate_text(self, text: str) -> str:
         """
@@ -282,16 +367,59 @@ class NLLBTranslator:
         # Extract texts
         texts = [seg.get('text', '') for seg in segments]
         
-        # Translate in batches
-        translated_texts = []
-        for i in range(0, len(texts), self.config.batch_size):
-            batch = texts[i:i + self.config.batch_size]
-            translated_batch = self.translate_batch(batch)
-            translated_texts.extend(translated_batch)
+        self._ensure_int8_parity(texts)
+        
+        # Translate each distinct line once, longest first, in token-budget batches
+        deduped = dedupe_texts(texts)
+        unique = deduped.unique
+        if self.logger and deduped.duplicates:
+            self.logger.info(
+                f"Deduplicated {len(texts)} segments → {len(unique)} unique lines "
+                f"({deduped.duplicates} repeats reuse a translation)"
+            )
+        
+        lengths = [
+            min(len(ids), self.config.max_length)
+            for ids in self.tokenizer(unique, add_special_tokens=True)['input_ids']
+        ] if unique else []
+        order = length_sorted_order(lengths)
+        
+        # Batch size tuned online from tokens/sec throughput, capped by the token budget
+        controller = self.batch_controller
+        unique_translations: List[str] = [""] * len(unique)
+        i = 0
+        generate_seconds = 0.0
+        while i < len(order):
+            size = token_budget_batch_size(
+                lengths[order[i]], self.config.max_batch_tokens, controller.batch_size
+            )
+            batch_ids = order[i:i + size]
+            started = time.time()
+            try:
+                translated_batch = self.translate_batch([unique[j] for j in batch_ids])
+            except Exception as e:
+                # Only OOM shrinks the batch; anything else is a real error
+                if not controller.should_back_off(e):
+                    raise
+                controller.on_failure(e)
+                continue
+            elapsed = time.time() - started
+            generate_seconds += elapsed
+            controller.record(sum(lengths[j] for j in batch_ids), elapsed, len(batch_ids))
+            for j, translated_text in zip(batch_ids, translated_batch):
+                unique_translations[j] = translated_text
+            i += len(batch_ids)
             
             if self.logger:
-                progress = min(i + self.config.batch_size, len(texts))
-                self.logger.info(f"Translated {progress}/{len(texts)} segments")
+                self.logger.info(f"Translated {i}/{len(unique)} unique lines")
+        
+        controller.save()
+        translated_texts = deduped.scatter(unique_translations, texts)
+        
+        # Throughput and line reuse for the fleet metrics (shared/metrics_exporter.py)
+        emit_event("throughput", kind="translation", model=self.config.model_name,
+                   tokens=sum(lengths), seconds=round(generate_seconds, 3), lines=len(unique))
+        emit_event("cache", cache="translation", hits=deduped.duplicates, misses=len(unique))
         
         # Create translated segments
         translated_segments = []
@@ -93,6 +93,14 @@ if [ -n "$JOB_ID" ]; then
     else
         echo "  ⚠️  Manifest not found (job not initialized)"
     fi
+    
+    # Live progress and ETA from the job's event stream
+    if [ -f "$JOB_DIR/events.jsonl" ]; then
+        echo ""
+        echo "  ⏱️  Live Progress:"
+        echo ""
+        python3 "$PROJECT_ROOT/tools/pipeline-status.py" "$JOB_DIR" | sed 's/^/    /'
+    fi
     echo ""
     echo "────────────────────────────────────────────────────"
     echo ""
@@ -123,6 +131,7 @@ echo "  Prepare job:           ./prepare-job.sh in/movie.mp4"
 echo "  Run pipeline:          ./run_pipeline.sh --job <job_id>"
 echo "  Resume pipeline:       ./resume-pipeline.sh <job_id>"
 echo "  Check job status:      ./scripts/pipeline-status.sh <job_id>"
+echo "  Live progress/ETAs:    ./tools/pipeline-status.py --follow"
 echo ""
 
 echo "🔧 EXECUTION MODES"
@@ -32,10 +32,10 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Import centralized stage ordering
 from shared.stage_order import get_all_stage_dirs
 
-from shared.logger import PipelineLogger, get_logger
+from shared.logger import get_logger
 from shared.environment_manager import EnvironmentManager
 from scripts.filename_parser import parse_filename
-from shared.config_loader import Config
+from shared.config_loader import load_config
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -257,7 +257,8 @@ def create_job_config(job_dir: Path, job_id: str, workflow: str,
                       media_url: Optional[str] = None,
                       tmdb_title: Optional[str] = None,
                       tmdb_year: Optional[int] = None,
-                      youtube_metadata: Optional[Dict] = None) -> None:
+                      youtube_metadata: Optional[Dict] = None,
+                      profile_stages: Optional[str] = None) -> None:
     """Create job.json configuration file with environment mappings"""
     
     parsed = parse_filename(input_media.name)
@@ -294,10 +295,37 @@ def create_job_config(job_dir: Path, job_id: str, workflow: str,
             stage_environments[stage] = env
     
     # Load configuration to get source_separation settings
-    from shared.config import Config
-    config = Config(PROJECT_ROOT)
+    from shared.config import load_env_config
+    config = load_env_config(PROJECT_ROOT)
     sep_enabled = config.get('SOURCE_SEPARATION_ENABLED', 'true').lower() == 'true'
     sep_quality = config.get('SOURCE_SEPARATION_QUALITY', 'balanced')
+    sep_segment_seconds = float(config.get('SOURCE_SEPARATION_SEGMENT_SECONDS', '120'))
+    sep_overlap_seconds = float(config.get('SOURCE_SEPARATION_OVERLAP_SECONDS', '2'))
+    sep_workers = int(config.get('SOURCE_SEPARATION_WORKERS', '0'))
+    sep_skip_non_speech = config.get('SOURCE_SEPARATION_SKIP_NON_SPEECH', 'true').lower() == 'true'
+    sep_mode = config.get('SOURCE_SEPARATION_MODE', 'full')
+    sep_music_threshold = float(config.get('SOURCE_SEPARATION_MUSIC_THRESHOLD', '0.5'))
+    vad_backend = config.get('PYANNOTE_VAD_BACKEND', 'auto')
+    vad_window_seconds = float(config.get('PYANNOTE_VAD_WINDOW_SECONDS', '300'))
+    vad_overlap_seconds = float(config.get('PYANNOTE_VAD_OVERLAP_SECONDS', '5'))
+    vad_workers = int(config.get('PYANNOTE_VAD_WORKERS', '1'))
+    vad_merge_gap = float(config.get('PYANNOTE_MERGE_GAP', '0.2'))
+    song_enabled = config.get('SONG_DETECTION_ENABLED', 'true').lower() == 'true'
+    song_threshold = float(config.get('SONG_DETECTION_THRESHOLD', '0.55'))
+    song_min_seconds = float(config.get('SONG_DETECTION_MIN_SECONDS', '45'))
+    mux_containers = [c.strip() for c in config.get('MUX_CONTAINERS', '').split(',') if c.strip()]
+    mux_remux = config.get('MUX_REMUX', 'auto')
+    
+    # Profiling (--profile enables it for the given stages)
+    profiling_enabled = config.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    profiling_stages = config.get('PROFILING_STAGES', '')
+    if profile_stages is not None:
+        profiling_enabled = True
+        profiling_stages = profile_stages
+    profiling_stages = [s.strip() for s in profiling_stages.split(',') if s.strip()]
+    profiling_mode = config.get('PROFILING_MODE', 'cprofile')
+    profiling_interval_ms = float(config.get('PROFILING_INTERVAL_MS', '10'))
+    profiling_tracemalloc_top = int(config.get('PROFILING_TRACEMALLOC_TOP', '0'))
     
     job_config = {
         "job_id": job_id,
@@ -320,7 +348,36 @@ def create_job_config(job_dir: Path, job_id: str, workflow: str,
         },
         "source_separation": {
             "enabled": sep_enabled,
-            "quality": sep_quality
+            "quality": sep_quality,
+            "segment_seconds": sep_segment_seconds,
+            "overlap_seconds": sep_overlap_seconds,
+            "workers": sep_workers,
+            "skip_non_speech": sep_skip_non_speech,
+            "mode": sep_mode,
+            "music_threshold": sep_music_threshold
+        },
+        "vad": {
+            "backend": vad_backend,
+            "window_seconds": vad_window_seconds,
+            "overlap_seconds": vad_overlap_seconds,
+            "workers": vad_workers,
+            "merge_gap": vad_merge_gap
+        },
+        "song_detection": {
+            "enabled": song_enabled,
+            "threshold": song_threshold,
+            "min_song_seconds": song_min_seconds
+        },
+        "mux": {
+            "containers": mux_containers,
+            "remux": mux_remux
+        },
+        "profiling": {
+            "enabled": profiling_enabled,
+            "stages": profiling_stages,
+            "mode": profiling_mode,
+            "interval_ms": profiling_interval_ms,
+            "tracemalloc_top": profiling_tracemalloc_top
         },
         "tmdb_enrichment": {
             # Enhancement #2: Hybrid TMDB approach for YouTube URLs
@@ -393,8 +450,8 @@ def create_env_file(job_dir: Path, job_id: str, workflow: str,
     # Prepare media path
     media_path = job_dir / "media" / input_media.name
     
-    # Load configuration from .env.pipeline
-    config = Config(PROJECT_ROOT)
+    # Load configuration from .env.pipeline (cached per process)
+    config = load_config(PROJECT_ROOT)
     
     # Extract hardware settings from hardware_cache
     hardware_info = hardware_config.get("hardware", {})
@@ -659,6 +716,15 @@ def main() -> None:
         help="TMDB movie release year (optional, improves TMDB accuracy)"
     )
     
+    parser.add_argument(
+        "--profile",
+        metavar="STAGES",
+        nargs="?",
+        const="",
+        help="Profile pipeline stages (comma-separated names/patterns, empty = all); "
+             "mode and tracemalloc come from PROFILING_* in config/.env.pipeline"
+    )
+    
     args = parser.parse_args()
     
     # Validate userId exists
@@ -857,7 +923,8 @@ def main() -> None:
         media_url=media_url,  # Pass URL if downloaded from online
         tmdb_title=args.tmdb_title,  # Enhancement #2: TMDB for YouTube movies
         tmdb_year=args.tmdb_year,  # Enhancement #2: TMDB year
-        youtube_metadata=youtube_metadata  # Enhancement #3: YouTube metadata for glossary
+        youtube_metadata=youtube_metadata,  # Enhancement #3: YouTube metadata for glossary
+        profile_stages=args.profile
     )
     
     # Create environment file
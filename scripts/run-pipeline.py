@@ -18,6 +18,7 @@ import os
 import json
 import argparse
 import subprocess
+import time
 import traceback
 import logging
 from pathlib import Path
@@ -27,11 +28,14 @@ from typing import Optional, Dict, List, Any
 # Add paths for imports
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
+
+# Stage-entry fields the orchestrator owns in manifest.json (stages own the rest)
+MANIFEST_STAGE_FIELDS = ("name", "status", "start_time", "end_time", "duration_seconds", "resources")
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from shared.logger import PipelineLogger, get_logger
+from shared.logger import LOG_JSONL_ENV, PipelineLogger, get_logger
 from shared.environment_manager import EnvironmentManager
-from shared.config_loader import Config
+from shared.config_loader import load_config
 from shared.stage_order import get_stage_dir
 from shared.stage_dependencies import (
     validate_stage_dependencies,
@@ -41,6 +45,14 @@ from shared.stage_dependencies import (
 from shared.workflow_cache import WorkflowCacheIntegration
 from shared.baseline_cache_orchestrator import BaselineCacheOrchestrator
 from shared.cost_tracker import CostTracker
+from shared.subtitle_io import format_timestamp, write_subtitles
+from shared.subtitle_reflow import ReflowSettings, reflow_segments
+from shared.mux_engine import SubtitleTrack, mux_job, output_container, plan_clip
+from shared.resource_monitor import DEFAULT_SAMPLE_INTERVAL, ResourceMonitor, with_phases
+from shared.profiling import ProfilingSettings, profiled_stage
+from shared.job_config import JOB_CONFIG_ENV, JobConfigSnapshot, read_env_file
+from shared.manifest import ManifestWriter
+from shared.job_events import EVENTS_ENV, JOB_ENV, STAGE_ENV, EventStream, events_path
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -48,11 +60,7 @@ logger = get_logger(__name__)
 
 def format_timestamp_srt(seconds: float) -> str:
     """Format seconds as SRT timestamp (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+    return format_timestamp(seconds, 'srt')
 
 
 def normalize_segments_data(data: Dict[str, Any]) -> Any:
@@ -77,28 +85,14 @@ def normalize_segments_data(data: Dict[str, Any]) -> Any:
     return data, segments
 
 
-def generate_srt_from_segments(segments: List[Dict], output_path: Path) -> bool:
-    """Generate SRT subtitle file from segments"""
+def generate_srt_from_segments(segments: List[Dict], output_path: Path,
+                               reflow: Optional[ReflowSettings] = None) -> bool:
+    """Generate SRT subtitle file from segments (reflowed into cues if enabled)"""
     try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(segments, 1):
-                # Segment number
-                f.write(f"{i}\n")
-                
-                # Timestamps
-                start = format_timestamp_srt(segment.get('start', 0))
-                end = format_timestamp_srt(segment.get('end', 0))
-                f.write(f"{start} --> {end}\n")
-                
-                # Text
-                text = segment.get('text', '').strip()
-                f.write(f"{text}\n")
-                
-                # Blank line between segments
-                f.write("\n")
-        
+        if reflow is not None and reflow.enabled:
+            segments, stats = reflow_segments(segments, reflow)
+            logging.getLogger(__name__).info(f"Reflow: {stats}")
+        write_subtitles(segments, output_path)
         return True
     except Exception as e:
         logging.getLogger(__name__).error(f"Error generating SRT: {e}", exc_info=True)
@@ -118,15 +112,22 @@ class IndicTrans2Pipeline:
         self.scripts_dir = PROJECT_ROOT / "scripts"
         
         # Load main configuration for fallback defaults
-        self.main_config = Config(PROJECT_ROOT)
+        self.main_config = load_config(PROJECT_ROOT)  # cached: shared with ReflowSettings etc.
         
         # Load job configuration
         self.job_config = self._load_config("job.json")
         self.manifest = self._load_config("manifest.json")
+        self.manifest_writer = ManifestWriter(self.job_dir / "manifest.json", self._merge_manifest)
         
         # Initialize environment manager
         self.env_manager = EnvironmentManager(PROJECT_ROOT)
         
+        # Resolve every setting once per run (defaults -> .env.pipeline ->
+        # job .env/job.json -> environment); stage processes load the saved
+        # snapshot instead of re-parsing the files
+        self.config_snapshot = JobConfigSnapshot.resolve(self.job_dir, PROJECT_ROOT)
+        os.environ[JOB_CONFIG_ENV] = str(self.config_snapshot.save())
+        
         # Load job-specific environment configuration
         self.env_config = self._load_env_config()
         
@@ -141,6 +142,8 @@ class IndicTrans2Pipeline:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         log_file = job_dir / f"99_pipeline_{timestamp}.log"
         
+        # JSON-lines sidecars (<log>.jsonl) for tools/analyze-logs.py; stages inherit the setting
+        os.environ[LOG_JSONL_ENV] = self.env_config.get(LOG_JSONL_ENV, os.environ.get(LOG_JSONL_ENV, "true"))
         self.logger = PipelineLogger(
             module_name="pipeline",
             log_file=log_file,
@@ -163,6 +166,25 @@ class IndicTrans2Pipeline:
         # Initialize glossary manager (will be loaded in stage)
         self.glossary_manager = None
         
+        # Per-stage resource sampling (0 = start/end snapshots only)
+        try:
+            interval = float(self.env_config.get("RESOURCE_SAMPLE_INTERVAL", DEFAULT_SAMPLE_INTERVAL))
+        except ValueError:
+            interval = DEFAULT_SAMPLE_INTERVAL
+        self.resource_sample_interval = interval if interval > 0 else None
+        
+        # Per-job profiling of selected stages (job.json "profiling")
+        self.profiling = ProfilingSettings.from_job(self.job_config, self.env_config)
+        if self.profiling.enabled:
+            stages = ", ".join(self.profiling.stages) or "all"
+            self.logger.info(f"🔬 Profiling ({self.profiling.mode}): {stages}")
+        
+        # Structured event stream (events.jsonl); stage processes inherit the
+        # environment and append their progress to the same file
+        self.events = EventStream(events_path(self.job_dir), self.job_config["job_id"])
+        os.environ[EVENTS_ENV] = str(self.events.path)
+        os.environ[JOB_ENV] = self.job_config["job_id"]
+        
         # Log cache configuration
         cache_config = self.env_manager.hardware_cache.get("cache", {})
         if cache_config:
@@ -210,18 +232,10 @@ class IndicTrans2Pipeline:
         env_file = self.job_dir / f".{job_id}.env"
         
         if not env_file.exists():
-            self.logger.warning(f"Job .env file not found: {env_file}")
+            logger.warning(f"Job .env file not found: {env_file}")
             return {}
         
-        config = {}
-        with open(env_file) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    config[key] = value
-        
-        return config
+        return read_env_file(env_file)
     
     def _is_indic_language(self, lang_code: str) -> bool:
         """Check if a language code is an Indic language supported by IndicTrans2"""
@@ -240,29 +254,69 @@ class IndicTrans2Pipeline:
         with open(config_file) as f:
             return json.load(f)
     
-    def _save_manifest(self) -> None:
-        """Save manifest to file"""
-        manifest_file = self.job_dir / "manifest.json"
-        self.manifest["updated_at"] = datetime.now().isoformat()
+    def _save_manifest(self, force: bool = True, status: Optional[str] = None) -> None:
+        """Save manifest to file (atomic; merged with records written by stages)"""
+        with self.manifest_writer.lock:
+            if status is not None:
+                self.manifest["status"] = status
+            self.manifest["updated_at"] = datetime.now().isoformat()
+        self.manifest_writer.save(force=force)
+    
+    def _merge_manifest(self, on_disk: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the orchestrator's fields to manifest.json as it is on disk
         
-        with open(manifest_file, 'w') as f:
-            json.dump(self.manifest, f, indent=2)
+        The orchestrator owns the top-level status and its stage list
+        entries; stage processes add their own records and the
+        "pipeline" section, which are kept. Runs under
+        manifest_writer.lock (possibly on the debounce timer thread), so
+        it only reads self.manifest.
+        """
+        disk_stages = on_disk.get("stages", [])
+        if isinstance(disk_stages, dict):
+            disk_stages = [{"name": name, **entry} for name, entry in disk_stages.items()
+                           if isinstance(entry, dict)]
+        by_name = {entry.get("name"): entry for entry in disk_stages if isinstance(entry, dict)}
+        
+        stages = []
+        for entry in self.manifest.get("stages", []):
+            on_disk_entry = by_name.pop(entry.get("name"), None)
+            if on_disk_entry is None:
+                stages.append(entry)
+            else:
+                owned = {key: entry[key] for key in MANIFEST_STAGE_FIELDS if key in entry}
+                stages.append({**on_disk_entry, **owned})
+        stages.extend(by_name.values())
+        
+        merged = dict(on_disk, stages=stages)
+        for key in ("status", "updated_at"):
+            if key in self.manifest:
+                merged[key] = self.manifest[key]
+        for key, value in self.manifest.items():
+            merged.setdefault(key, value)
+        return merged
     
     def _update_stage_status(self, stage_name: str, status: str, 
-                            duration: Optional[float] = None):
-        """Update stage status in manifest"""
-        for stage in self.manifest["stages"]:
-            if stage["name"] == stage_name:
-                stage["status"] = status
-                if status == "running":
-                    stage["start_time"] = datetime.now().isoformat()
-                elif status in ["completed", "failed"]:
-                    stage["end_time"] = datetime.now().isoformat()
-                    if duration:
-                        stage["duration_seconds"] = duration
-                break
-        
-        self._save_manifest()
+                            duration: Optional[float] = None,
+                            resources: Optional[Dict[str, Any]] = None):
+        """Update stage status (and resource usage) in manifest"""
+        with self.manifest_writer.lock:
+            for stage in self.manifest["stages"]:
+                if stage["name"] == stage_name:
+                    stage["status"] = status
+                    if status == "running":
+                        stage["start_time"] = datetime.now().isoformat()
+                    elif status in ["completed", "failed"]:
+                        stage["end_time"] = datetime.now().isoformat()
+                        if duration:
+                            stage["duration_seconds"] = duration
+                        if resources:
+                            stage["resources"] = resources
+                    break
+        
+        # Completion/failure is written at once; "running" is debounced
+        # (a fast stage's start and end then cost one write)
+        self._save_manifest(force=status != "running")
     
     def _get_stage_environment(self, stage_name: str) -> Optional[str]:
         """Get the required environment for a stage"""
@@ -567,6 +621,8 @@ class IndicTrans2Pipeline:
         if not segments_file.exists():
             # Check for cached baseline (AD-014)
             cache_hit = cache_orchestrator.try_restore_from_cache(media_file)
+            if cache_orchestrator.enabled:
+                self.events.emit("cache", cache="baseline", hits=int(cache_hit), misses=int(not cache_hit))
             
             if cache_hit:
                 # Run post-alignment stages only
@@ -687,46 +743,127 @@ class IndicTrans2Pipeline:
     
     def _execute_stages(self, stages: List[tuple]) -> bool:
         """Execute list of stages"""
+        self.events.emit("plan", stages=[stage_name for stage_name, _ in stages])
         for stage_name, stage_func in stages:
             # Check if resuming and stage already completed
             if self.resume:
                 stage_status = self._get_stage_status(stage_name)
                 if stage_status == "completed":
                     self.logger.info(f"⏭  Stage {stage_name}: SKIPPED (already completed)")
+                    self.events.emit("stage_skipped", stage_name, reason="already completed")
                     continue
             
             # Execute stage
             self.logger.info(f"▶️  Stage {stage_name}: STARTING")
             self._update_stage_status(stage_name, "running")
+            self.events.emit("stage_start", stage_name)
+            os.environ[STAGE_ENV] = stage_name
             
             start_time = datetime.now()
+            monitor = ResourceMonitor(interval=self.resource_sample_interval)
+            monitor.start()
             
             try:
-                success = stage_func()
+                with profiled_stage(self.profiling, stage_name, self._stage_path(stage_name)):
+                    success = stage_func()
                 
                 duration = (datetime.now() - start_time).total_seconds()
+                resources = self._collect_stage_resources(stage_name, monitor, start_time)
                 
                 if success:
-                    self.logger.info(f"✅ Stage {stage_name}: COMPLETED ({duration:.1f}s)")
-                    self._update_stage_status(stage_name, "completed", duration)
+                    self.logger.info(f"✅ Stage {stage_name}: COMPLETED ({duration:.1f}s)",
+                                     extra={"stage": stage_name, "duration": duration})
+                    self._log_stage_resources(resources)
+                    self._update_stage_status(stage_name, "completed", duration, resources)
                     
                     # NEW (Week 4 Feature 1): Display real-time cost after stage completion
                     self._display_stage_cost(stage_name)
                 else:
-                    self.logger.error(f"❌ Stage {stage_name}: FAILED")
-                    self._update_stage_status(stage_name, "failed", duration)
-                    return False
+                    self.logger.error(f"❌ Stage {stage_name}: FAILED",
+                                      extra={"stage": stage_name, "duration": duration,
+                                             "error_class": "StageFailed"})
+                    self._update_stage_status(stage_name, "failed", duration, resources)
                     
             except Exception as e:
                 duration = (datetime.now() - start_time).total_seconds()
-                self.logger.error(f"❌ Stage {stage_name}: EXCEPTION: {e}", exc_info=True)
+                resources = self._collect_stage_resources(stage_name, monitor, start_time)
+                self.logger.error(f"❌ Stage {stage_name}: EXCEPTION: {e}", exc_info=True,
+                                  extra={"stage": stage_name, "duration": duration})
                 if self.debug:
                     self.logger.error(f"Traceback: {traceback.format_exc()}", exc_info=True)
-                self._update_stage_status(stage_name, "failed", duration)
+                self._update_stage_status(stage_name, "failed", duration, resources)
+                self._emit_stage_end(stage_name, "failed", duration, resources, error=str(e))
+                return False
+            finally:
+                os.environ.pop(STAGE_ENV, None)
+            
+            self._emit_stage_end(stage_name, "completed" if success else "failed", duration, resources)
+            if not success:
                 return False
         
         return True
     
+    def _emit_stage_end(self, stage_name: str, status: str, duration: float,
+                        resources: Dict[str, Any], **fields: Any) -> None:
+        """Append a stage_end event with the headline resource numbers"""
+        summary = {
+            key: resources[key]
+            for key in ("cpu_seconds", "peak_rss_mb", "gpu_peak_mb", "model_load_seconds")
+            if key in resources
+        }
+        self.events.emit("stage_end", stage_name, status=status,
+                         duration=round(duration, 2), **summary, **fields)
+    
+    def _collect_stage_resources(self, stage_name: str, monitor: ResourceMonitor,
+                                 start_time: datetime) -> Dict[str, Any]:
+        """
+        Stop the stage's resource monitor and merge what the stage recorded.
+        
+        The orchestrator's sample of the process tree gives CPU, peak RSS,
+        I/O and accelerator memory; the stage's own resources.json (written
+        by StageIO) adds its model load / compute split.
+        
+        Args:
+            stage_name: Name of the stage
+            monitor: Monitor started before the stage ran
+            start_time: Stage start time
+            
+        Returns:
+            Resource dictionary for the pipeline manifest
+        """
+        resources = monitor.stop()
+        try:
+            stage_file = self._stage_path(stage_name) / "resources.json"
+            if stage_file.exists() and stage_file.stat().st_mtime >= start_time.timestamp():
+                with open(stage_file) as f:
+                    stage_resources = json.load(f)
+                resources = with_phases(resources, stage_resources.get("phases", {}))
+                if "gpu_peak_mb" in stage_resources:
+                    resources["gpu_peak_mb"] = max(
+                        resources.get("gpu_peak_mb", 0.0), stage_resources["gpu_peak_mb"]
+                    )
+        except (ValueError, OSError) as e:
+            self.logger.debug(f"Could not read stage resources for {stage_name}: {e}")
+        return resources
+    
+    def _log_stage_resources(self, resources: Dict[str, Any]) -> None:
+        """Log a one-line resource summary for a completed stage"""
+        parts = []
+        if "cpu_seconds" in resources:
+            parts.append(f"CPU {resources['cpu_seconds']:.1f}s ({resources['cpu_utilization']:.1f}x)")
+        if "peak_rss_mb" in resources:
+            parts.append(f"peak RSS {resources['peak_rss_mb']:.0f} MB")
+        if "read_bytes" in resources:
+            parts.append(
+                f"I/O {resources['read_bytes'] / 1e6:.0f}/{resources['write_bytes'] / 1e6:.0f} MB r/w"
+            )
+        if "gpu_peak_mb" in resources:
+            parts.append(f"GPU {resources['gpu_peak_mb']:.0f} MB")
+        if resources.get("model_load_seconds"):
+            parts.append(f"model load {resources['model_load_seconds']:.1f}s")
+        if parts:
+            self.logger.info(f"   📊 {', '.join(parts)}")
+    
     def _get_stage_status(self, stage_name: str) -> Optional[str]:
         """Get current status of a stage"""
         for stage in self.manifest["stages"]:
@@ -800,6 +937,64 @@ class IndicTrans2Pipeline:
     # Stage Implementations
     # ========================================================================
     
+    def _detect_songs(self, audio_file: Path, analysis: Dict, stage_io: Any) -> Optional[Dict]:
+        """
+        Map song intervals in the demuxed audio before ASR (non-fatal).
+        
+        Writes song_map.json next to audio.wav; the map is cached per
+        media_id, so reruns over the same media skip detection.
+        
+        Returns:
+            Manifest summary, or None if disabled or failed
+        """
+        song_config = self.job_config.get("song_detection", {})
+        enabled = song_config.get("enabled")
+        if enabled is None:
+            enabled = self.env_config.get("SONG_DETECTION_ENABLED", "true").lower() == "true"
+        if not enabled:
+            return None
+        
+        try:
+            from shared.song_detection import detect_song_map, load_soundtrack, song_map_path
+            
+            # An explicit 0 in job.json is a value, not "unset"
+            threshold = song_config.get("threshold")
+            if threshold is None:
+                threshold = self.env_config.get("SONG_DETECTION_THRESHOLD", "0.55")
+            min_seconds = song_config.get("min_song_seconds")
+            if min_seconds is None:
+                min_seconds = self.env_config.get("SONG_DETECTION_MIN_SECONDS", "45")
+            threshold, min_seconds = float(threshold), float(min_seconds)
+            tmdb_config = self.job_config.get("tmdb_enrichment", {})
+            soundtrack = load_soundtrack(
+                tmdb_config.get("title") or self.job_config.get("title"),
+                tmdb_config.get("year") or self.job_config.get("year")
+            )
+            
+            song_map = detect_song_map(
+                audio_file,
+                media_id=analysis.get("media_id"),
+                clip=analysis.get("clip"),
+                threshold=threshold,
+                min_song_seconds=min_seconds,
+                soundtrack=soundtrack
+            )
+            stage_io.track_output(song_map_path(audio_file), "song_map", format="json")
+            
+            songs = song_map["songs"]
+            song_seconds = sum(song["duration"] for song in songs)
+            source = "cache" if song_map.get("cached") else f"{song_map.get('detect_seconds', 0):.1f}s"
+            self.logger.info(f"  Songs: {len(songs)} ({song_seconds:.0f}s of audio, {source})")
+            return {
+                "songs": len(songs),
+                "song_seconds": round(song_seconds, 1),
+                "matched_tracks": song_map.get("matched_tracks", 0),
+                "cached": song_map.get("cached", False),
+            }
+        except Exception as e:
+            self.logger.warning(f"Song detection failed, continuing without song map: {e}")
+            return None
+    
     def _stage_demux(self) -> bool:
         """Stage 1: Extract audio from video (full or clipped)"""
         
@@ -889,51 +1084,25 @@ class IndicTrans2Pipeline:
             self.logger.info("Extracting audio from full media...")
             stage_logger.info("Full media extraction")
         
-        # Build ffmpeg command
-        cmd = ["ffmpeg", "-y"]
-        
-        # Add log level based on debug mode
-        if not self.debug:
-            cmd.extend(["-loglevel", "error"])
-        
-        # Add start time if clipping
-        if processing_mode == "clip" and start_time:
-            cmd.extend(["-ss", start_time])
-        
-        # Add input file
-        cmd.extend(["-i", str(input_media)])
-        
-        # Add end time if clipping
-        if processing_mode == "clip" and end_time:
-            cmd.extend(["-to", end_time])
-        
-        # Add output options
-        cmd.extend([
-            "-vn",  # No video
-            "-acodec", "pcm_s16le",
-            "-ar", "16000",  # 16kHz for Whisper
-            "-ac", "1",  # Mono
-            str(audio_output)
-        ])
-        
         try:
             # Set up environment with debug flag
             env = os.environ.copy()
             env['DEBUG_MODE'] = 'true' if self.debug else 'false'
             env['LOG_LEVEL'] = 'DEBUG' if self.debug else 'INFO'
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
+            # Single decode: PCM, duration, loudness envelope, feature
+            # vector and fingerprint all come from one ffmpeg pass
+            from shared.demux_analysis import demux_audio, manifest_summary
+            is_clip = processing_mode == "clip"
+            analysis = demux_audio(
+                input_media,
+                audio_output,
+                start_time=start_time if is_clip else None,
+                end_time=end_time if is_clip else None,
+                quiet=not self.debug,
                 env=env
             )
             
-            if self.debug and result.stderr:
-                self.logger.debug(f"FFmpeg output: {result.stderr}")
-                stage_logger.debug(f"FFmpeg stderr:\n{result.stderr}")
-            
             if audio_output.exists():
                 size_mb = audio_output.stat().st_size / (1024 * 1024)
                 mode_str = f"clip ({start_time} to {end_time})" if processing_mode == "clip" else "full media"
@@ -945,12 +1114,24 @@ class IndicTrans2Pipeline:
                                      channels=1,
                                      size_mb=round(size_mb, 2))
                 
+                analysis_file = stage_io.get_output_path("audio_analysis.json")
+                stage_io.track_output(analysis_file, "audio_analysis", format="json")
+                
+                song_summary = self._detect_songs(audio_output, analysis, stage_io)
+                
                 # Finalize manifest with success
                 stage_io.finalize(status="success", 
                                  output_size_mb=round(size_mb, 2),
-                                 processing_mode=processing_mode)
+                                 processing_mode=processing_mode,
+                                 audio_analysis=manifest_summary(analysis),
+                                 song_detection=song_summary)
                 
                 self.logger.info(f"✓ Audio extracted from {mode_str}: {audio_output.name} ({size_mb:.1f} MB)")
+                self.logger.info(
+                    f"  Duration: {analysis['duration']:.1f}s, "
+                    f"loudness: {analysis['loudness']['rms_dbfs']:.1f} dBFS, "
+                    f"decode: {analysis['decode_seconds']:.1f}s"
+                )
                 stage_logger.info(f"Successfully extracted audio: {size_mb:.1f} MB")
                 stage_logger.info(f"Stage log: {stage_io.stage_log.relative_to(self.job_dir)}")
                 stage_logger.info(f"Stage manifest: {stage_io.manifest_path.relative_to(self.job_dir)}")
@@ -999,7 +1180,7 @@ class IndicTrans2Pipeline:
                 stage_logger.error(f"FFmpeg command failed: {stderr}")
             
             # Always log full error for debugging
-            stage_logger.error(f"FFmpeg command: {' '.join(cmd)}")
+            stage_logger.error(f"FFmpeg command: {' '.join(e.cmd)}")
             stage_logger.error(f"Full FFmpeg output:\n{stderr}")
             
             stage_io.add_error(f"FFmpeg failed (exit {e.returncode}): {stderr[:100]}")
@@ -1271,8 +1452,6 @@ class IndicTrans2Pipeline:
         self.logger.info("This improves transcription accuracy, especially for movies with music/noise")
         
         try:
-            import subprocess
-            
             # Get Python executable from PyAnnote environment (dedicated for VAD)
             python_exe = self.env_manager.get_python_executable("pyannote")
             self.logger.info(f"Using PyAnnote environment: {python_exe}")
@@ -1310,7 +1489,6 @@ class IndicTrans2Pipeline:
             segments_file = output_dir / "speech_segments.json"
             if segments_file.exists():
                 # Read and log statistics
-                import json
                 with open(segments_file) as f:
                     vad_data = json.load(f)
                 
@@ -1371,7 +1549,6 @@ class IndicTrans2Pipeline:
         vad_info = ""
         if vad_file.exists():
             try:
-                import json
                 with open(vad_file) as f:
                     vad_data = json.load(f)
                 if 'segments' in vad_data and vad_data['segments']:
@@ -1442,7 +1619,6 @@ class IndicTrans2Pipeline:
             return False
         
         # Add retry logic for file detection with exponential backoff
-        import time
         segments_file = output_dir / "segments.json"
         
         # Retry up to 5 times with exponential backoff
@@ -1543,7 +1719,6 @@ logger.info(f"Transcription completed: {{len(segments)}} segments")
         
         try:
             # Run the MLX script in venv/mlx environment
-            import subprocess
             
             # Get Python executable from MLX environment
             python_exe = self.env_manager.get_python_executable("mlx")
@@ -1595,8 +1770,6 @@ logger.info(f"Transcription completed: {{len(segments)}} segments")
                          Format: [{"start": 0.5, "end": 3.2}, ...]
         """
         
-        import subprocess
-        
         # Get Python executable from WhisperX environment
         python_exe = self.env_manager.get_python_executable("whisperx")
         self.logger.info(f"Using WhisperX environment: {python_exe}")
@@ -1754,8 +1927,6 @@ logger.info(f"Transcription completed: {{len(segments)}} segments")
         python_exe = self.env_manager.get_python_executable("whisperx")
         
         try:
-            import subprocess
-            
             cmd = [
                 str(python_exe),
                 str(alignment_script),
@@ -2153,17 +2324,10 @@ logger.info(f"Transcription completed: {{len(segments)}} segments")
                 # Apply glossary post-processing if available
                 if hasattr(self, 'glossary_manager') and self.glossary_manager:
                     try:
-                        glossary_applied_count = 0
-                        for segment in segments:
-                            if 'text' in segment:
-                                original_text = segment['text']
-                                polished_text = self.glossary_manager.apply_to_text(
-                                    original_text,
-                                    context="translation"
-                                )
-                                if polished_text != original_text:
-                                    segment['text'] = polished_text
-                                    glossary_applied_count += 1
+                        glossary_applied_count = self.glossary_manager.apply_to_segments(
+                            segments,
+                            context="translation"
+                        )
                         
                         if glossary_applied_count > 0:
                             # Save the glossary-enhanced version
@@ -2205,7 +2369,6 @@ logger.info(f"Transcription completed: {{len(segments)}} segments")
         except Exception as e:
             self.logger.error(f"Unexpected error in hybrid translation: {e}", exc_info=True)
             if self.debug:
-                import traceback
                 self.logger.debug(traceback.format_exc())
             self.logger.warning("Falling back to alternative translation method")
             
@@ -2260,6 +2423,7 @@ logger.info(f"Transcription completed: {{len(segments)}} segments")
         device = self.env_config.get("INDICTRANS2_DEVICE", self.main_config.indictrans2_device)
         num_beams = self.env_config.get("INDICTRANS2_NUM_BEAMS", "4")
         max_tokens = self.env_config.get("INDICTRANS2_MAX_NEW_TOKENS", "128")
+        compute_type = self.env_config.get("TRANSLATION_COMPUTE_TYPE", "float32")
         
         # Dynamically select model based on language pair (no hardcoding)
         # Model selection happens in indictrans2_translator.py based on source/target
@@ -2302,6 +2466,7 @@ import os
 os.environ['INDICTRANS2_DEVICE'] = '{device}'
 os.environ['INDICTRANS2_NUM_BEAMS'] = '{num_beams}'
 os.environ['INDICTRANS2_MAX_NEW_TOKENS'] = '{max_tokens}'
+os.environ['TRANSLATION_COMPUTE_TYPE'] = '{compute_type}'
 
 # translate_whisperx_result will auto-select the right model based on language pair
 translated = translate_whisperx_result(segments, '{source_lang}', '{target_lang}', logger)
@@ -2344,17 +2509,10 @@ logger.info(f"Translated {{len(translated['segments'])}} segments")
                         
                         data, segments = normalize_segments_data(raw_data)
                         
-                        glossary_applied_count = 0
-                        for segment in segments:
-                            if 'text' in segment:
-                                original_text = segment['text']
-                                polished_text = self.glossary_manager.apply_to_text(
-                                    original_text,
-                                    context="translation"
-                                )
-                                if polished_text != original_text:
-                                    segment['text'] = polished_text
-                                    glossary_applied_count += 1
+                        glossary_applied_count = self.glossary_manager.apply_to_segments(
+                            segments,
+                            context="translation"
+                        )
                         
                         if glossary_applied_count > 0:
                             # Save the glossary-enhanced version
@@ -2374,6 +2532,10 @@ logger.info(f"Translated {{len(translated['segments'])}} segments")
             self.logger.error(f"Translation error: {e.stderr}", exc_info=True)
             return False
     
+    def _subtitle_reflow_settings(self) -> ReflowSettings:
+        """Cue layout limits from config with job.json "subtitle" overrides (AD-006)"""
+        return ReflowSettings.from_config(self.main_config, self.job_config.get("subtitle"))
+    
     def _stage_subtitle_generation(self) -> bool:
         """Stage 8: Generate SRT subtitle file in target language"""
         
@@ -2413,7 +2575,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments")
             return False
         
         # Generate SRT file
-        if generate_srt_from_segments(segments, output_srt):
+        if generate_srt_from_segments(segments, output_srt, self._subtitle_reflow_settings()):
             # AD-001: Keep subtitle in stage directory only (no copy to subtitles/)
             self.logger.info(f"✓ Subtitles generated: {output_srt.relative_to(self.job_dir)}")
             return True
@@ -2456,7 +2618,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments")
             return False
         
         # Generate SRT file
-        if generate_srt_from_segments(segments, output_srt):
+        if generate_srt_from_segments(segments, output_srt, self._subtitle_reflow_settings()):
             # AD-001: Keep subtitle in stage directory only (no copy to subtitles/)
             self.logger.info(f"✓ Source subtitles generated: {output_srt.relative_to(self.job_dir)}")
             return True
@@ -2518,6 +2680,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments")
         device = self.env_config.get("INDICTRANS2_DEVICE", self.main_config.indictrans2_device)
         num_beams = self.env_config.get("INDICTRANS2_NUM_BEAMS", "4")
         max_tokens = self.env_config.get("INDICTRANS2_MAX_NEW_TOKENS", "128")
+        compute_type = self.env_config.get("TRANSLATION_COMPUTE_TYPE", "float32")
         
         self.logger.info(f"Using IndicTrans2 device: {device} (from job config)")
         self.logger.info(f"Translation: {source_lang} → {target_lang}")
@@ -2556,6 +2719,7 @@ import os
 os.environ['INDICTRANS2_DEVICE'] = '{device}'
 os.environ['INDICTRANS2_NUM_BEAMS'] = '{num_beams}'
 os.environ['INDICTRANS2_MAX_NEW_TOKENS'] = '{max_tokens}'
+os.environ['TRANSLATION_COMPUTE_TYPE'] = '{compute_type}'
 
 # translate_whisperx_result will auto-select the right model based on language pair
 translated = translate_whisperx_result(segments, '{source_lang}', '{target_lang}', logger)
@@ -2603,6 +2767,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
         # Get configuration from job's .env file (set by prepare-job)
         device = self.env_config.get("NLLB_DEVICE", "mps")
         model_size = self.env_config.get("NLLB_MODEL_SIZE", "600M")
+        compute_type = self.env_config.get("TRANSLATION_COMPUTE_TYPE", "float32")
         
         # Model name based on size
         model_map = {
@@ -2647,7 +2812,8 @@ logger = PipelineLogger(module_name='nllb', log_file=log_file, log_level='{"DEBU
 # Configure NLLB
 config = NLLBConfig(
     model_name='{model_name}',
-    device='{device}'
+    device='{device}',
+    compute_type='{compute_type}'
 )
 
 # Translate
@@ -2699,6 +2865,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments")
         # Get configuration from job's .env file
         device = self.env_config.get("NLLB_DEVICE", "mps")
         model_size = self.env_config.get("NLLB_MODEL_SIZE", "600M")
+        compute_type = self.env_config.get("TRANSLATION_COMPUTE_TYPE", "float32")
         
         # Model name based on size
         model_map = {
@@ -2737,7 +2904,8 @@ logger = PipelineLogger(module_name='nllb_{target_lang}', log_file=log_file, log
 # Configure NLLB
 config = NLLBConfig(
     model_name='{model_name}',
-    device='{device}'
+    device='{device}',
+    compute_type='{compute_type}'
 )
 
 # Translate
@@ -2798,7 +2966,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
             return False
         
         # Generate SRT file
-        if generate_srt_from_segments(segments, output_srt):
+        if generate_srt_from_segments(segments, output_srt, self._subtitle_reflow_settings()):
             self.logger.info(f"{target_lang.upper()} subtitles generated: {output_srt}")
             return True
         else:
@@ -2827,7 +2995,7 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
             return False
         
         # Generate SRT file
-        if generate_srt_from_segments(segments, output_srt):
+        if generate_srt_from_segments(segments, output_srt, self._subtitle_reflow_settings()):
             self.logger.info(f"Target subtitles generated: {output_srt}")
             return True
         else:
@@ -2949,177 +3117,55 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
         
         self.logger.info(f"Muxing video with {len(subtitle_files)} subtitle tracks: {', '.join(subtitle_langs)}")
         
-        # Detect source file extension and use same format for output
-        source_ext = input_media.suffix.lower()  # e.g., '.mp4', '.mkv', '.avi'
-        
-        # Determine output format
-        if source_ext in ['.mp4', '.m4v']:
-            output_ext = '.mp4'
-            subtitle_codec = 'mov_text'  # MP4 subtitle format
-        elif source_ext in ['.mkv', '.webm']:
-            output_ext = '.mkv'
-            subtitle_codec = 'srt'  # MKV subtitle format
-        elif source_ext in ['.avi']:
-            output_ext = '.mkv'  # AVI doesn't support subtitle tracks well, use MKV
-            subtitle_codec = 'srt'
-            self.logger.info(f"Source is AVI, using MKV for subtitle support")
-        else:
-            # Default to MKV for unknown formats (best subtitle support)
-            output_ext = '.mkv'
-            subtitle_codec = 'srt'
-            self.logger.info(f"Unknown format {source_ext}, using MKV for subtitle support")
+        # Output containers: job.json mux.containers > MUX_CONTAINERS > source format
+        # (AVI and unknown formats go to MKV for subtitle support)
+        mux_config = self.job_config.get("mux", {})
+        containers = mux_config.get("containers") or self.env_config.get("MUX_CONTAINERS", "")
+        if isinstance(containers, str):
+            containers = [c.strip().lower() for c in containers.split(",") if c.strip()]
+        containers = [c for c in containers if c in ("mp4", "mkv")] or [output_container(input_media)]
+        remux = mux_config.get("remux") or self.env_config.get("MUX_REMUX", "auto")
         
-        # Output video file in 12_mux directory
-        output_video = output_dir / f"{title}_subtitled{output_ext}"
+        # Output video files in 12_mux directory (one per container)
+        outputs = [(output_dir / f"{title}_subtitled.{c}", c) for c in containers]
         
         # AD-001: Final video stays in 12_mux/ only (no copy to media/)
-        self.logger.info(f"📤 Output: {output_video.relative_to(self.job_dir)}")
-        self.logger.info(f"Output format: {output_ext} (source: {source_ext})")
-        
-        # Build ffmpeg command
-        cmd = ["ffmpeg", "-y"]
-        
-        # Add log level based on debug mode
-        if not self.debug:
-            cmd.extend(["-loglevel", "error"])
-        
-        # Add clipping if configured
-        if processing_mode == "clip" and start_time:
-            cmd.extend(["-ss", start_time])
-        
-        # Add input files - video first, then all subtitles
-        cmd.extend(["-i", str(input_media)])  # Video input (index 0)
-        for sub_file in subtitle_files:
-            cmd.extend(["-i", str(sub_file)])  # Subtitle inputs (indices 1, 2, 3...)
-        
-        # Add end time if clipping
-        if processing_mode == "clip" and end_time:
-            cmd.extend(["-to", end_time])
-        
-        # Map streams: video, audio, all subtitles
-        cmd.extend([
-            "-map", "0:v",  # Video from input 0
-            "-map", "0:a",  # Audio from input 0
-        ])
-        
-        # Map all subtitle files
-        for i in range(len(subtitle_files)):
-            cmd.extend(["-map", str(i + 1)])  # Subtitle from input 1, 2, 3...
-        
-        # Copy codecs (no re-encoding)
-        cmd.extend(["-c", "copy"])
-        
-        # Set subtitle codec based on output format
-        cmd.extend(["-c:s", subtitle_codec])
-        
-        # Add metadata for each subtitle track
-        # Map 2-letter codes to ISO 639-2 (3-letter) for better player compatibility
-        lang_map_iso639_2 = {
-            "hi": "hin",  # Hindi
-            "en": "eng",  # English
-            "gu": "guj",  # Gujarati
-            "ta": "tam",  # Tamil
-            "te": "tel",  # Telugu
-            "bn": "ben",  # Bengali
-            "mr": "mar",  # Marathi
-            "kn": "kan",  # Kannada
-            "ml": "mal",  # Malayalam
-            "pa": "pan",  # Punjabi
-            "ur": "urd",  # Urdu
-            "as": "asm",  # Assamese
-            "or": "ori",  # Odia
-            "ne": "nep",  # Nepali
-            "sd": "snd",  # Sindhi
-            "si": "sin",  # Sinhala
-            "sa": "san",  # Sanskrit
-            "es": "spa",  # Spanish
-            "ru": "rus",  # Russian
-            "zh": "chi",  # Chinese
-            "ar": "ara",  # Arabic
-            "fr": "fra",  # French
-            "de": "deu",  # German
-            "pt": "por",  # Portuguese
-        }
-        
-        # Map to full language names for display
-        lang_names = {
-            "hin": "Hindi", "hi": "Hindi",
-            "eng": "English", "en": "English",
-            "guj": "Gujarati", "gu": "Gujarati",
-            "tam": "Tamil", "ta": "Tamil",
-            "tel": "Telugu", "te": "Telugu",
-            "ben": "Bengali", "bn": "Bengali",
-            "mar": "Marathi", "mr": "Marathi",
-            "kan": "Kannada", "kn": "Kannada",
-            "mal": "Malayalam", "ml": "Malayalam",
-            "pan": "Punjabi", "pa": "Punjabi",
-            "urd": "Urdu", "ur": "Urdu",
-            "asm": "Assamese", "as": "Assamese",
-            "ori": "Odia", "or": "Odia",
-            "nep": "Nepali", "ne": "Nepali",
-            "snd": "Sindhi", "sd": "Sindhi",
-            "sin": "Sinhala", "si": "Sinhala",
-            "san": "Sanskrit", "sa": "Sanskrit",
-            "spa": "Spanish", "es": "Spanish",
-            "rus": "Russian", "ru": "Russian",
-            "chi": "Chinese", "zh": "Chinese",
-            "ara": "Arabic", "ar": "Arabic",
-            "fra": "French", "fr": "French",
-            "deu": "German", "de": "German",
-            "por": "Portuguese", "pt": "Portuguese",
-        }
-        
-        for i, lang in enumerate(subtitle_langs):
-            # Convert to ISO 639-2 (3-letter code)
-            lang_iso = lang_map_iso639_2.get(lang, lang)
-            # Get full language name
-            lang_title = lang_names.get(lang, lang.upper())
-            
-            cmd.extend([
-                "-metadata:s:s:" + str(i), f"language={lang_iso}",
-                "-metadata:s:s:" + str(i), f"title={lang_title}",
-            ])
-        
-        # Output file
-        cmd.append(str(output_video))
+        for output_video, _ in outputs:
+            self.logger.info(f"📤 Output: {output_video.relative_to(self.job_dir)}")
+        self.logger.info(f"Output format: {', '.join(containers)} (source: {input_media.suffix.lower()})")
         
+        tracks = [SubtitleTrack(sub_file, lang) for sub_file, lang in zip(subtitle_files, subtitle_langs)]
         mode_str = f"clipped ({start_time} to {end_time})" if processing_mode == "clip" else "full"
         self.logger.info(f"Creating {mode_str} video with {len(subtitle_files)} subtitle tracks...")
-        for i, lang in enumerate(subtitle_langs):
-            lang_iso = lang_map_iso639_2.get(lang, lang)
-            lang_title = lang_names.get(lang, lang.upper())
-            self.logger.info(f"  • Track {i}: {lang_title} ({lang_iso})")
+        for i, track in enumerate(tracks):
+            self.logger.info(f"  • Track {i}: {track.label} ({track.iso})")
         
         try:
-            # Set up environment with debug flag
-            env = os.environ.copy()
-            env['DEBUG_MODE'] = 'true' if self.debug else 'false'
-            env['LOG_LEVEL'] = 'DEBUG' if self.debug else 'INFO'
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True,
-                env=env
+            # Keyframe-aligned stream-copy clip (reads only around the cut point)
+            clip = None
+            if processing_mode == "clip" and (start_time or end_time):
+                clip = plan_clip(input_media, start_time, end_time)
+            
+            result = mux_job(
+                input_media, tracks, outputs, clip=clip, remux=remux,
+                loglevel="info" if self.debug else "error",
+                logger_instance=self.logger
             )
             
-            if self.debug and result.stderr:
-                self.logger.debug(f"FFmpeg output: {result.stderr}")
-            
-            if output_video.exists():
+            for output_video, _ in outputs:
+                if not output_video.exists():
+                    self.logger.error(f"Video muxing failed - no output file: {output_video.name}")
+                    return False
                 size_mb = output_video.stat().st_size / (1024 * 1024)
                 self.logger.info(f"✓ Video created: {output_video.relative_to(self.job_dir)} ({size_mb:.1f} MB)")
-                self.logger.info(f"✓ Video contains {len(subtitle_files)} subtitle tracks: {', '.join([l.upper() for l in subtitle_langs])}")
-                
-                # AD-001: Final video stays in 12_mux/ only (no copy to media/)
-                return True
-            else:
-                self.logger.error("Video muxing failed - no output file")
-                return False
+            self.logger.info(f"✓ Video contains {len(subtitle_files)} subtitle tracks: {', '.join([l.upper() for l in subtitle_langs])}")
+            self.logger.info(f"Mux mode: {result['mode']} ({result['seconds']}s)")
+            
+            # AD-001: Final video stays in 12_mux/ only (no copy to media/)
+            return True
                 
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"FFmpeg muxing error: {e.stderr}", exc_info=True)
+        except Exception as e:
+            self.logger.error(f"FFmpeg muxing error: {e}", exc_info=True)
             return False
     
     # ========================================================================
@@ -3132,8 +3178,15 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
         self.logger.info(f"Job ID: {self.job_config['job_id']}")
         self.logger.info(f"Job directory: {self.job_dir}")
         
-        self.manifest["status"] = "running"
-        self._save_manifest()
+        self._save_manifest(status="running")
+        started = time.time()
+        self.events.emit(
+            "job_start",
+            workflow=self.workflow,
+            source_language=self.job_config.get("source_language"),
+            target_languages=self.job_config.get("target_languages", []),
+            resume=self.resume
+        )
         
         if self.workflow == "transcribe":
             success = self.run_transcribe_workflow()
@@ -3146,17 +3199,17 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
             success = False
         
         if success:
-            self.manifest["status"] = "completed"
             self.logger.info("=" * 80)
             self.logger.info("PIPELINE COMPLETED SUCCESSFULLY")
             self.logger.info("=" * 80)
         else:
-            self.manifest["status"] = "failed"
             self.logger.error("=" * 80)
             self.logger.error("PIPELINE FAILED")
             self.logger.error("=" * 80)
         
-        self._save_manifest()
+        self._save_manifest(status="completed" if success else "failed")
+        self.events.emit("job_end", status=self.manifest["status"],
+                         duration=round(time.time() - started, 2))
         return success
     
     def _stage_hallucination_removal(self) -> bool:
@@ -3334,7 +3387,6 @@ logger.info(f"Translated {{len(translated['segments'])}} segments to {target_lan
         except Exception as e:
             self.logger.error(f"Error in hallucination removal: {e}", exc_info=True)
             if self.main_config.debug_mode:
-                import traceback
                 self.logger.error(f"Traceback: {traceback.format_exc()}", exc_info=True)
             
             # Graceful degradation - continue with original segments
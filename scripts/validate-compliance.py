@@ -464,13 +464,17 @@ class ComplianceChecker:
         
         content_lower = self.content.lower()
         
-        # Check for job.json loading
+        # Check for job.json loading (directly or via the job config snapshot,
+        # which carries job.json and applies its AD-006 precedence)
         if 'job.json' in self.content and 'open(' in self.content:
             has_job_json_load = True
+        if 'load_job_config(' in self.content or 'JobConfigSnapshot' in self.content:
+            has_job_json_load = True
         
         # Check for parameter override pattern (multiple valid patterns)
         if ('job_data.get(' in self.content or "job_data['" in self.content or
-            'job_config.get(' in self.content or "job_config['" in self.content):
+            'job_config.get(' in self.content or "job_config['" in self.content or
+            '.param(' in self.content or '.section(' in self.content):
             has_param_override = True
         
         # Check for override logging (multiple valid patterns)
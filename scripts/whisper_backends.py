@@ -23,6 +23,7 @@ from typing import List, Dict, Optional, Any, Tuple
 
 # Third-party
 from abc import ABC, abstractmethod
+import numpy as np
 
 # Add project root to path for imports
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -38,6 +39,9 @@ warnings.filterwarnings('ignore', message='Model was trained with torch')
 class WhisperBackend(ABC):
     """Abstract base class for Whisper backends"""
     
+    # True if transcribe() actually batches by batch_size (adaptive tuning)
+    supports_batching = False
+    
     @abstractmethod
     def load_model(self) -> bool:
         """Load the model. Returns True if successful."""
@@ -81,6 +85,25 @@ class WhisperBackend(ABC):
         """Backend name."""
         pass
     
+    def detect_language(self, audio: Any) -> Optional[str]:
+        """
+        Detect the spoken language of a short audio clip (optional).
+
+        Used by MediaASRContext to identify the language once per media
+        on a few speech regions. Returns None if unsupported, in which case
+        transcribe() is called with language="auto" as before.
+        """
+        return None
+
+    def encode_prompt(self, text: str) -> Optional[List[int]]:
+        """
+        Tokenize a bias prompt (optional).
+
+        Used by MediaASRContext to tokenize each distinct prompt once and
+        trim it to Whisper's prompt budget. Returns None if unsupported.
+        """
+        return None
+
     def cleanup(self) -> None:
         """Clean up resources (optional, can be overridden)."""
         pass
@@ -89,6 +112,8 @@ class WhisperBackend(ABC):
 class WhisperXBackend(WhisperBackend):
     """WhisperX backend using CTranslate2 (CPU/CUDA only)"""
     
+    supports_batching = True
+    
     def __init__(
         self,
         model_name: str,
@@ -217,7 +242,7 @@ class WhisperXBackend(WhisperBackend):
         character names, and domain-specific terminology.
         
         Args:
-            audio_file: Path to audio file
+            audio_file: Path to audio file, or 16 kHz float32 samples
             language: Source language code
             task: 'transcribe' or 'translate'
             batch_size: Batch size for inference
@@ -231,7 +256,8 @@ class WhisperXBackend(WhisperBackend):
         if not self.model:
             raise RuntimeError("Model not loaded")
         
-        audio = load_audio(audio_file)
+        # Windowed/streamed callers pass samples already read from disk
+        audio = audio_file if isinstance(audio_file, np.ndarray) else load_audio(audio_file)
         
         # Build transcribe parameters
         transcribe_params = {
@@ -263,7 +289,20 @@ class WhisperXBackend(WhisperBackend):
                 raise
         
         return result
-    
+
+    def detect_language(self, audio: Any) -> Optional[str]:
+        """Detect language of an audio clip with the loaded pipeline (first 30s)"""
+        if not self.model or not hasattr(self.model, 'detect_language'):
+            return None
+        return self.model.detect_language(audio)
+
+    def encode_prompt(self, text: str) -> Optional[List[int]]:
+        """Tokenize a prompt the way faster-whisper does (leading space, no specials)"""
+        hf_tokenizer = getattr(getattr(self.model, 'model', None), 'hf_tokenizer', None)
+        if hf_tokenizer is None:
+            return None
+        return hf_tokenizer.encode(" " + text.strip(), add_special_tokens=False).ids
+
     def load_align_model(self, language: str) -> bool:
         """Load WhisperX alignment model"""
         import whisperx
@@ -292,7 +331,7 @@ class WhisperXBackend(WhisperBackend):
             self.logger.warning("Alignment model not loaded")
             return {"segments": segments}
         
-        audio = load_audio(audio_file)
+        audio = audio_file if isinstance(audio_file, np.ndarray) else load_audio(audio_file)
         
         result = whisperx.align(
             segments,
@@ -461,19 +500,16 @@ class MLXWhisperBackend(WhisperBackend):
         }
         
         # Handle language auto-detection for MLX
+        # (normally resolved once per media by MediaASRContext before we get here)
         if language == "auto" or language is None:
             self.logger.info("  🔍 Auto-detecting language (MLX doesn't support 'auto')...")
             try:
-                # Use MLX to detect language with first 30 seconds
-                import mlx_whisper
-                detect_result = mlx_whisper.transcribe(
-                    audio_file,
-                    path_or_hf_repo=model_path,
-                    verbose=False,
-                    language=None,  # Let MLX auto-detect
-                    word_timestamps=False
-                )
-                detected_lang = detect_result.get("language", "en")
+                # Detect on the first 30 seconds only, not the whole file
+                from shared.audio_utils import load_audio_segment
+                clip = audio_file
+                if isinstance(audio_file, (str, Path)):
+                    clip = load_audio_segment(audio_file, 0.0, 30.0)
+                detected_lang = self.detect_language(clip) or "en"
                 self.logger.info(f"  ✓ Detected language: {detected_lang}")
                 language = detected_lang
                 mlx_options["language"] = language
@@ -546,6 +582,25 @@ class MLXWhisperBackend(WhisperBackend):
             
             raise
     
+    def detect_language(self, audio: Any) -> Optional[str]:
+        """Detect language of a short clip by decoding it without a language hint"""
+        if not self.model_loaded:
+            return None
+        result = self.mlx.transcribe(
+            audio,
+            path_or_hf_repo=self._map_model_name(self.model_name),
+            verbose=False,
+            language=None,
+            word_timestamps=False,
+            condition_on_previous_text=False
+        )
+        return result.get("language")
+
+    def encode_prompt(self, text: str) -> Optional[List[int]]:
+        """Tokenize a prompt the way mlx_whisper.decoding does"""
+        from mlx_whisper.tokenizer import get_tokenizer
+        return get_tokenizer(multilingual=True).encode(" " + text.strip())
+
     def _map_model_name(self, model_name: str) -> str:
         """Map WhisperX model names to MLX format"""
         # MLX uses model sizes: tiny, base, small, medium, large, large-v2, large-v3
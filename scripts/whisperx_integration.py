@@ -20,6 +20,7 @@ import os
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 
 import json
+import time
 import warnings
 from pathlib import Path
 import logging
@@ -58,6 +59,10 @@ from whisper_backends import create_backend, get_recommended_backend
 # Local
 from shared.logger import get_logger
 from shared.config import load_config
+from shared.resource_monitor import MODEL_LOAD_PHASE, phase_timer
+from shared.job_events import ProgressReporter, heartbeat
+from shared.subtitle_io import format_timestamp, write_subtitles
+from shared.segment_store import copy_segments, save_segments
 logger = get_logger(__name__)
 
 # Audio loading utility
@@ -121,7 +126,8 @@ class WhisperXProcessor:
         compression_ratio_threshold: float = 2.4,
         condition_on_previous_text: bool = False,  # False prevents hallucination loops
         initial_prompt: str = "",
-        logger: Optional[PipelineLogger] = None
+        logger: Optional[PipelineLogger] = None,
+        vad_file: Optional[Path] = None
     ):
         """
         Initialize WhisperX processor
@@ -143,6 +149,7 @@ class WhisperXProcessor:
             condition_on_previous_text: Condition on previous text
             initial_prompt: Initial prompt for transcription
             logger: Logger instance
+            vad_file: VAD speech_segments.json (language-ID probe regions)
         """
         self.model_name = model_name
         self.device = device
@@ -166,6 +173,11 @@ class WhisperXProcessor:
         self.compression_ratio_threshold = compression_ratio_threshold
         self.condition_on_previous_text = condition_on_previous_text
         self.initial_prompt = initial_prompt
+        self.vad_file = vad_file
+
+        # Per-media ASR context (language ID + bias prompts, built once)
+        self._asr_contexts: Dict[str, Any] = {}
+        self._batch_controller: Optional[Any] = None
 
         # Backend instance
         self.backend = None
@@ -185,6 +197,7 @@ class WhisperXProcessor:
         from shared.logger import PipelineLogger
         return PipelineLogger("whisperx")
 
+    @phase_timer(MODEL_LOAD_PHASE)
     def load_model(self) -> None:
         """Load Whisper model using appropriate backend"""
         self.logger.info(f"Loading Whisper model: {self.model_name}")
@@ -260,6 +273,7 @@ class WhisperXProcessor:
         self.logger.info(f"  ✓ Model loaded with backend: {self.backend.name}")
         self.logger.info(f"  ✓ Active device: {self.device}")
 
+    @phase_timer(MODEL_LOAD_PHASE)
     def load_align_model(self, language: str) -> None:
         """
         Load alignment model for word-level timestamps
@@ -278,6 +292,43 @@ class WhisperXProcessor:
         else:
             self.logger.warning("  ⚠ Alignment model not available")
     
+    def get_asr_context(self, audio_file: str, duration: Optional[float] = None) -> Any:
+        """
+        Get the per-media ASR context, creating it on first use.
+
+        The context is cached per audio file, so both steps of a two-step
+        transcribe + translate run share one language detection and one
+        set of built bias prompts.
+        """
+        # Lazy import: whisperx_module/__init__ imports this module
+        from whisperx_module.asr_context import MediaASRContext
+        
+        key = str(audio_file)
+        if key not in self._asr_contexts:
+            self._asr_contexts[key] = MediaASRContext.from_vad_file(
+                key, self.vad_file, duration=duration, logger_instance=self.logger
+            )
+        return self._asr_contexts[key]
+
+    def get_batch_controller(self, batch_size: int) -> Any:
+        """
+        Get the adaptive batch-size controller for the loaded backend.
+
+        Created once per processor so both steps of a two-step run keep
+        tuning the same controller; starts from the learned optimum for
+        this host/model/compute type if one is cached.
+        """
+        if self._batch_controller is None:
+            from shared.batch_controller import AdaptiveBatchController
+            config = load_config()
+            self._batch_controller = AdaptiveBatchController.for_backend(
+                self.backend,
+                batch_size,
+                enabled=str(config.get('ADAPTIVE_BATCH_SIZE', True)).lower() in ('true', '1', 'yes'),
+                logger_instance=self.logger
+            )
+        return self._batch_controller
+
     def cleanup(self) -> None:
         """Clean up resources"""
         if self.backend:
@@ -410,6 +461,14 @@ class WhisperXProcessor:
         if batch_size != original_batch_size:
             self.logger.info(f"  🎯 MPS optimization: batch_size {original_batch_size} → {batch_size}")
 
+        # Determine audio duration
+        audio_duration = self._get_audio_duration(audio_file)
+        self.logger.info(f"  Audio duration: {audio_duration:.1f}s ({audio_duration/60:.1f} minutes)")
+
+        # Resolve "auto" once per media (not once per window/chunk)
+        asr_context = self.get_asr_context(audio_file, audio_duration)
+        source_lang = asr_context.resolve_language(self.backend, source_lang)
+
         # Determine task
         # For transcribe-only workflows, always transcribe (never translate)
         # For subtitle workflow, always transcribe in source language (translation happens in separate stage)
@@ -431,10 +490,6 @@ class WhisperXProcessor:
             task = "translate" if source_lang != target_lang else "transcribe"
             self.logger.info(f"  Task: {task}")
         
-        # Determine audio duration
-        audio_duration = self._get_audio_duration(audio_file)
-        self.logger.info(f"  Audio duration: {audio_duration:.1f}s ({audio_duration/60:.1f} minutes)")
-        
         # Strategy selection logic
         if bias_strategy == "chunked_windows":
             # Phase 3: Window-specific bias (most accurate)
@@ -489,10 +544,11 @@ class WhisperXProcessor:
             duration = librosa.get_duration(path=audio_file)
             return duration
         except Exception as e:
-            # Fallback: load and calculate duration
+            # Fallback: read the duration from the WAV header (no decoding)
             try:
-                audio = load_audio(audio_file)
-                return len(audio) / 16000  # 16kHz sample rate
+                from shared.audio_utils import PCMReader
+                with PCMReader(audio_file) as reader:
+                    return reader.duration
             except:
                 # Last resort: use file size estimate (very rough)
                 import os
@@ -513,28 +569,22 @@ class WhisperXProcessor:
         # Load config for filtering thresholds
         config = load_config()
         
-        # Create global bias prompts from bias windows
+        # Create global bias prompt from bias windows (built once per media)
         initial_prompt = None
         
         if bias_windows:
             self.logger.info(f"  Bias windows available: {len(bias_windows)}")
             
-            # Collect all unique bias terms across windows
-            all_terms = set()
-            for window in bias_windows:
-                all_terms.update(window.bias_terms)
+            # initial_prompt: up to 50 unique terms as context (comma-separated sentence)
+            # Note: WhisperX only supports initial_prompt, not hotwords
+            prompt = self.get_asr_context(audio_file).global_prompt(bias_windows, self.backend)
             
-            # Create global bias prompts
-            top_terms = list(all_terms)[:50]  # Limit to top 50 terms
-            
-            if top_terms:
-                # initial_prompt: up to 50 terms as context (comma-separated sentence)
-                # Note: WhisperX only supports initial_prompt, not hotwords
-                initial_prompt = ", ".join(top_terms)
+            if prompt:
+                initial_prompt = prompt.text
                 
                 self.logger.info(f"  🎯 Active bias prompting enabled:")
-                self.logger.info(f"    Initial prompt: {len(top_terms)} terms")
-                self.logger.debug(f"    Preview: {', '.join(top_terms[:5])}...")
+                self.logger.info(f"    Initial prompt: {prompt.num_terms} terms")
+                self.logger.debug(f"    Preview: {', '.join(prompt.terms[:5])}...")
         
         # Log parameters
         self.logger.info(f"  Transcription options:")
@@ -548,41 +598,32 @@ class WhisperXProcessor:
         log_mps_memory(self.logger, "  Before transcription - ")
 
         try:
-            import time
-            import threading
-            
             start_time = time.time()
             self.logger.info(f"  🎙️ Starting transcription at {time.strftime('%H:%M:%S')}...")
             
-            # Progress heartbeat for long-running transcriptions
-            heartbeat_active = True
-            def progress_heartbeat() -> None:
-                """Log periodic progress to detect hangs"""
-                last_log = start_time
-                while heartbeat_active:
-                    time.sleep(60)  # Every 60 seconds
-                    if heartbeat_active:
-                        elapsed = time.time() - last_log
-                        total_elapsed = time.time() - start_time
-                        self.logger.info(f"  ⏱️  Still transcribing... {total_elapsed/60:.1f} minutes elapsed")
-                        last_log = time.time()
-            
-            # Start heartbeat thread
-            heartbeat_thread = threading.Thread(target=progress_heartbeat, daemon=True)
-            heartbeat_thread.start()
-            
-            try:
-                result = self.backend.transcribe(
-                    audio_file,
-                    language=source_lang,
-                    task=task,
-                    batch_size=batch_size,
-                    initial_prompt=initial_prompt
-                )
-            finally:
-                # Stop heartbeat
-                heartbeat_active = False
-                heartbeat_thread.join(timeout=1.0)
+            # Progress heartbeat for long-running transcriptions (log + event stream)
+            with heartbeat(self.logger, "Still transcribing..."):
+                block_seconds = self._stream_block_seconds(config.get('WHISPER_STREAM_BLOCK_SECONDS', 600))
+                audio_duration = self.get_asr_context(audio_file).duration
+                if audio_duration is None:
+                    audio_duration = self._get_audio_duration(audio_file)
+                
+                if block_seconds > 0 and audio_duration > block_seconds:
+                    result = self._transcribe_streamed(
+                        audio_file, source_lang, task,
+                        batch_size, initial_prompt, block_seconds
+                    )
+                else:
+                    result = self.backend.transcribe(
+                        audio_file,
+                        language=source_lang,
+                        task=task,
+                        batch_size=batch_size,
+                        initial_prompt=initial_prompt
+                    )
+                    ProgressReporter(total=1, total_audio_seconds=audio_duration).update(
+                        done=1, audio_seconds=audio_duration
+                    )
             
             elapsed = time.time() - start_time
             self.logger.info(f"  ✓ Transcription complete: {len(result.get('segments', []))} segments in {elapsed:.1f}s ({elapsed/60:.1f} min)")
@@ -609,6 +650,128 @@ class WhisperXProcessor:
             result = self._apply_bias_context(result, bias_windows)
 
         return result
+
+    def _stream_block_seconds(self, value: Any) -> int:
+        """
+        Validated WHISPER_STREAM_BLOCK_SECONDS (0 disables streaming)
+
+        Args:
+            value: Configured value
+
+        Returns:
+            Block length in seconds, at least MIN_STREAM_BLOCK_SECONDS, or 0
+        """
+        from whisperx_module.asr_context import MIN_STREAM_BLOCK_SECONDS
+        try:
+            block_seconds = int(float(value))
+        except (TypeError, ValueError):
+            self.logger.warning(f"Invalid WHISPER_STREAM_BLOCK_SECONDS={value!r}; using 600")
+            return 600
+        if block_seconds <= 0:
+            return 0
+        if block_seconds < MIN_STREAM_BLOCK_SECONDS:
+            self.logger.warning(
+                f"WHISPER_STREAM_BLOCK_SECONDS={block_seconds} is below the minimum; "
+                f"using {MIN_STREAM_BLOCK_SECONDS}"
+            )
+            return MIN_STREAM_BLOCK_SECONDS
+        return block_seconds
+
+    def _transcribe_streamed(
+        self,
+        audio_file: str,
+        source_lang: str,
+        task: str,
+        batch_size: int,
+        initial_prompt: Optional[str],
+        block_seconds: int
+    ) -> Dict[str, Any]:
+        """
+        Bounded-memory whole-file transcription for long media
+        
+        Reads fixed-size blocks from a memory-mapped PCM reader into one
+        preallocated buffer instead of decoding the whole file, so peak
+        audio memory is one block regardless of media length. Block ends
+        are snapped to VAD silence gaps; blocks cut mid-speech overlap by
+        one second and the duplicates are merged.
+        
+        Args:
+            audio_file: Path to audio file
+            source_lang: Source language code
+            task: 'transcribe' or 'translate'
+            batch_size: Batch size for processing
+            initial_prompt: Global bias prompt (same for every block)
+            block_seconds: Nominal block length in seconds
+            
+        Returns:
+            Transcription result on the global timeline
+        """
+        from shared.audio_utils import PCMReader, AudioWindowBuffer
+        from whisperx_module.asr_context import plan_stream_blocks
+        
+        asr_context = self.get_asr_context(audio_file)
+        controller = self.get_batch_controller(batch_size)
+        all_segments = []
+        language = source_lang
+        
+        with PCMReader(audio_file) as reader:
+            blocks = plan_stream_blocks(
+                reader.duration, block_seconds, asr_context.speech_regions
+            )
+            max_block = max(end - start for start, end in blocks)
+            buffer = AudioWindowBuffer(reader, max_block)
+            progress = ProgressReporter(
+                total=len(blocks), unit="block", total_audio_seconds=reader.duration
+            )
+            
+            self.logger.info(
+                f"  📼 Streaming {reader.duration:.0f}s in {len(blocks)} blocks "
+                f"(buffer {buffer.nbytes / 1e6:.0f} MB, "
+                f"{'memory-mapped' if reader.memory_mapped else 'decoded'} reader)"
+            )
+            
+            for i, (start, end) in enumerate(blocks, 1):
+                self.logger.info(f"  Block {i}/{len(blocks)}: {start:.1f}s - {end:.1f}s")
+                block_audio = buffer.window(start, end)
+                block_result = controller.run(
+                    lambda size: self.backend.transcribe(
+                        block_audio,
+                        language=language,
+                        task=task,
+                        batch_size=size,
+                        initial_prompt=initial_prompt
+                    ),
+                    work=end - start,
+                    on_retry=lambda: cleanup_mps_memory(self.logger)
+                )
+                
+                # Keep later blocks on the language of the first one
+                if language in (None, "auto") and block_result.get('language'):
+                    language = block_result['language']
+                
+                for segment in block_result.get('segments', []):
+                    segment['start'] += start
+                    segment['end'] += start
+                    for word in segment.get('words', []):
+                        if 'start' in word:
+                            word['start'] += start
+                        if 'end' in word:
+                            word['end'] += start
+                all_segments.extend(block_result.get('segments', []))
+                cleanup_mps_memory(self.logger)
+                progress.update(done=i, audio_seconds=end)
+            
+            self.logger.debug(
+                f"  Stream buffer: {buffer.samples_read} samples read for "
+                f"{buffer.samples_served} served"
+            )
+        
+        controller.save()
+        
+        return {
+            "segments": self._merge_overlapping_segments(all_segments),
+            "language": language
+        }
     
     def _transcribe_hybrid(
         self,
@@ -648,21 +811,15 @@ class WhisperXProcessor:
         
         self.logger.info(f"  🎯 PHASE 2: Hybrid bias strategy")
         
-        # Create global bias terms from all unique terms across windows
-        all_terms = set()
-        for window in bias_windows:
-            all_terms.update(window.bias_terms)
-        
-        top_terms = list(all_terms)[:50]
+        config = load_config()
         
         # Use first window's terms as initial prompt (provides early context)
-        initial_prompt = None
-        if bias_windows and bias_windows[0].bias_terms:
-            # Get up to 50 terms from first window for initial context
-            first_window_terms = list(bias_windows[0].bias_terms)[:50]
-            initial_prompt = ", ".join(first_window_terms)
+        prompt = None
+        if bias_windows:
+            prompt = self.get_asr_context(audio_file).window_prompt(bias_windows[0], self.backend)
+        initial_prompt = prompt.text if prompt else None
         
-        self.logger.info(f"    • Initial prompt: {len(first_window_terms) if initial_prompt else 0} terms from first window")
+        self.logger.info(f"    • Initial prompt: {prompt.num_terms if prompt else 0} terms from first window")
         self.logger.info(f"    • Strategy: Early context + Whisper's adaptation")
         
         # Log memory before
@@ -725,18 +882,7 @@ class WhisperXProcessor:
         Returns:
             Transcription result with window-specific bias metadata
         """
-        import whisperx
-        import numpy as np
-        
-        # Import load_audio with fallback
-        try:
-            from whisperx.audio import load_audio as _load_audio
-        except ImportError:
-            import librosa
-            def _load_audio(file: str, sr: int = 16000) -> Any:
-                """ Load Audio."""
-                audio, _ = librosa.load(file, sr=sr, mono=True)
-                return audio
+        from shared.audio_utils import PCMReader, AudioWindowBuffer
         
         if not bias_windows:
             # Fall back to regular transcription
@@ -747,69 +893,85 @@ class WhisperXProcessor:
                 batch_size=batch_size
             )
         
+        config = load_config()
+        asr_context = self.get_asr_context(audio_file)
+        controller = self.get_batch_controller(batch_size)
+        
         self.logger.info(f"  🎯 PHASE 3: Chunked windows strategy")
         self.logger.info(f"    • Processing {len(bias_windows)} bias windows")
         self.logger.info(f"    • Window-specific bias terms (adaptive)")
         
-        # Load full audio
-        audio = _load_audio(audio_file)
-        sample_rate = 16000  # Whisper standard sample rate
+        # Read windows through one fixed-size buffer instead of loading the
+        # full file; overlapping windows only read their new samples
+        with PCMReader(audio_file) as reader:
+            sample_rate = reader.sample_rate
+            buffer = AudioWindowBuffer(
+                reader, max(w.end_time - w.start_time for w in bias_windows)
+            )
         
-        all_segments = []
-        total_windows = len(bias_windows)
+            all_segments = []
+            total_windows = len(bias_windows)
+            progress = ProgressReporter(
+                total=total_windows, unit="window", total_audio_seconds=reader.duration
+            )
         
-        # Process each bias window
-        for i, window in enumerate(bias_windows, 1):
-            self.logger.info(f"  Window {i}/{total_windows}: {window.start_time:.1f}s - {window.end_time:.1f}s")
+            # Process each bias window
+            for i, window in enumerate(bias_windows, 1):
+                self.logger.info(f"  Window {i}/{total_windows}: {window.start_time:.1f}s - {window.end_time:.1f}s")
             
-            # Extract audio chunk for this window
-            start_sample = int(window.start_time * sample_rate)
-            end_sample = int(window.end_time * sample_rate)
-            chunk_audio = audio[start_sample:end_sample]
+                # Extract audio chunk for this window
+                chunk_audio = buffer.window(window.start_time, window.end_time)
             
-            # Skip if chunk is too short
-            if len(chunk_audio) < sample_rate * 0.5:  # Skip chunks < 0.5 seconds
-                self.logger.warning(f"    ⚠️  Skipping window (too short)")
-                continue
+                # Skip if chunk is too short
+                if len(chunk_audio) < sample_rate * 0.5:  # Skip chunks < 0.5 seconds
+                    self.logger.warning(f"    ⚠️  Skipping window (too short)")
+                    continue
             
-            # Create window-specific bias prompt
-            window_terms = list(window.bias_terms)[:50]  # Up to 50 terms
-            initial_prompt = ", ".join(window_terms) if window_terms else None
+                # Window-specific bias prompt (shared with windows using the same terms)
+                prompt = asr_context.window_prompt(window, self.backend)
+                initial_prompt = prompt.text if prompt else None
             
-            self.logger.info(f"    • Bias: {len(window_terms)} terms")
-            self.logger.debug(f"    • Preview: {', '.join(window_terms[:3])}...")
+                self.logger.info(f"    • Bias: {prompt.num_terms if prompt else 0} terms")
+                if prompt:
+                    self.logger.debug(f"    • Preview: {', '.join(prompt.terms[:3])}...")
             
-            # Transcribe chunk with window-specific bias
-            try:
-                log_mps_memory(self.logger, f"    Before window {i} - ")
+                # Transcribe chunk with window-specific bias
+                try:
+                    log_mps_memory(self.logger, f"    Before window {i} - ")
                 
-                chunk_result = self.backend.transcribe(
-                    chunk_audio,  # NumPy array (WhisperX supports this)
-                    language=source_lang,
-                    task=task,
-                    batch_size=batch_size,
-                    initial_prompt=initial_prompt
-                )
+                    chunk_result = controller.run(
+                        lambda size: self.backend.transcribe(
+                            chunk_audio,  # NumPy array (WhisperX supports this)
+                            language=source_lang,
+                            task=task,
+                            batch_size=size,
+                            initial_prompt=initial_prompt
+                        ),
+                        work=len(chunk_audio) / sample_rate,
+                        on_retry=lambda: cleanup_mps_memory(self.logger)
+                    )
                 
-                # Adjust timestamps to global timeline
-                for segment in chunk_result.get('segments', []):
-                    segment['start'] += window.start_time
-                    segment['end'] += window.start_time
-                    # Add window-specific metadata
-                    segment['bias_window_id'] = window.window_id
-                    segment['bias_terms'] = window.bias_terms
-                    segment['bias_strategy'] = 'chunked_windows'
+                    # Adjust timestamps to global timeline
+                    for segment in chunk_result.get('segments', []):
+                        segment['start'] += window.start_time
+                        segment['end'] += window.start_time
+                        # Add window-specific metadata
+                        segment['bias_window_id'] = window.window_id
+                        segment['bias_terms'] = window.bias_terms
+                        segment['bias_strategy'] = 'chunked_windows'
                 
-                all_segments.extend(chunk_result.get('segments', []))
-                self.logger.info(f"    ✓ Window complete: {len(chunk_result.get('segments', []))} segments")
+                    all_segments.extend(chunk_result.get('segments', []))
+                    self.logger.info(f"    ✓ Window complete: {len(chunk_result.get('segments', []))} segments")
                 
-            except Exception as e:
-                self.logger.error(f"    ✗ Window {i} failed: {e}", exc_info=True)
-                # Continue with other windows - partial results better than none
-                continue
-            finally:
-                cleanup_mps_memory(self.logger)
-        
+                except Exception as e:
+                    self.logger.error(f"    ✗ Window {i} failed: {e}", exc_info=True)
+                    # Continue with other windows - partial results better than none
+                    continue
+                finally:
+                    cleanup_mps_memory(self.logger)
+                    progress.update(done=i, audio_seconds=window.end_time)
+
+        controller.save()
         self.logger.info(f"  Merging {len(all_segments)} segments from {total_windows} windows...")
 
         # Merge overlapping segments from adjacent windows
@@ -821,6 +983,7 @@ class WhisperXProcessor:
         filtered_segments = self.filter_low_confidence_segments(merged_segments, min_logprob, min_duration)
 
         self.logger.info(f"  ✓ Chunked transcription complete: {len(filtered_segments)} merged segments")
+        self.logger.debug(f"  ASR context reuse: {asr_context.stats()}")
 
         return {
             "segments": filtered_segments,
@@ -942,6 +1105,9 @@ class WhisperXProcessor:
                     # Continue with other chunks, partial results better than none
                     continue
         
+        if self._batch_controller is not None:
+            self._batch_controller.save()
+        
         # Merge all chunks
         self.logger.info(f"  Merging {len(chunk_results)} processed chunks...")
         merged_result = chunker.merge_chunk_results(chunk_results)
@@ -964,23 +1130,30 @@ class WhisperXProcessor:
         batch_size: int,
         max_retries: int = 3
     ) -> Dict[str, Any]:
-        """Process a single chunk with retry logic"""
-        from shared.mps_utils import retry_with_degradation
+        """
+        Process a single chunk, backing off the batch size on OOM
+        
+        The adaptive controller shrinks the batch smoothly (x0.75) and
+        remembers the failed size as a ceiling for later chunks; other
+        errors are raised at once.
+        """
+        controller = self.get_batch_controller(batch_size)
         
-        # Simple retry wrapper - the decorator doesn't work well here
-        # because we need to modify chunker's state
         for attempt in range(max_retries):
             try:
-                return chunker.process_chunk_with_bias(
-                    chunk, self.backend, language, task, batch_size
+                started = time.time()
+                result = chunker.process_chunk_with_bias(
+                    chunk, self.backend, language, task, controller.batch_size
                 )
+                chunk_seconds = chunk.get('duration', 0.0) if isinstance(chunk, dict) else getattr(chunk, 'duration', 0.0)
+                controller.record(chunk_seconds, time.time() - started)
+                return result
             except Exception as e:
                 self.logger.warning(f"    ⚠️  Attempt {attempt + 1} failed: {e}")
                 
-                if attempt < max_retries - 1:
-                    # Reduce batch size for retry
-                    batch_size = max(batch_size // 2, 4)
-                    self.logger.warning(f"    🔄 Retrying with batch_size={batch_size}")
+                if attempt < max_retries - 1 and controller.should_back_off(e):
+                    controller.on_failure(e)
+                    self.logger.warning(f"    🔄 Retrying with batch_size={controller.batch_size}")
                     cleanup_mps_memory(self.logger)
                 else:
                     raise
@@ -1105,20 +1278,36 @@ class WhisperXProcessor:
             lang_name = lang_names.get(target_lang, target_lang.lower())
             lang_suffix = f"_{lang_name}"
 
+        # Serialize the full result once; the same text goes to every copy
+        result_text = json.dumps(result, indent=2, ensure_ascii=False)
+        segments = result.get("segments", [])
+
         # Save full JSON result with basename
         # Pattern: {stage}_{lang}_whisperx.json or {stage}_whisperx.json
         json_file = output_dir / f"{basename}{lang_suffix}_whisperx.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        json_file.write_text(result_text, encoding="utf-8")
         self.logger.info(f"  Saved: {json_file}")
 
+        # Save primary files with proper stage naming (Task #5)
+        # Pattern: {stage}_transcript.json and {stage}_segments.json
+        # Segments get a columnar sidecar (shared/segment_store.py) that
+        # later stages load instead of parsing the JSON
+        primary_json = output_dir / f"{basename}_transcript.json"
+        with open(primary_json, "w", encoding="utf-8") as f:
+            f.write(result_text)
+            f.flush()
+            os.fsync(f.fileno())  # Ensure data is written to disk
+        self.logger.info(f"  Saved: {primary_json}")
+        
+        primary_segments = save_segments(output_dir / f"{basename}_segments.json", segments)
+        self.logger.info(f"  Saved: {primary_segments}")
+
         # Save segments as JSON (cleaner format) with basename
         # Pattern: {stage}_{lang}_segments.json or {stage}_segments.json
         segments_file = output_dir / f"{basename}{lang_suffix}_segments.json"
-        segments = result.get("segments", [])
-        with open(segments_file, "w", encoding="utf-8") as f:
-            json.dump(segments, f, indent=2, ensure_ascii=False)
-        self.logger.info(f"  Saved: {segments_file}")
+        if segments_file != primary_segments:
+            copy_segments(primary_segments, segments_file)
+            self.logger.info(f"  Saved: {segments_file}")
 
         # Save as plain text transcript with basename
         # Pattern: {stage}_{lang}_transcript.txt or {stage}_transcript.txt
@@ -1136,31 +1325,12 @@ class WhisperXProcessor:
         self._save_as_srt(segments, srt_file)
         self.logger.info(f"  Saved: {srt_file}")
         
-        # Save primary files with proper stage naming (Task #5)
-        # Pattern: {stage}_transcript.json and {stage}_segments.json
-        primary_json = output_dir / f"{basename}_transcript.json"
-        with open(primary_json, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-            f.flush()
-            os.fsync(f.fileno())  # Ensure data is written to disk
-        self.logger.info(f"  Saved: {primary_json}")
-        
-        primary_segments = output_dir / f"{basename}_segments.json"
-        with open(primary_segments, "w", encoding="utf-8") as f:
-            json.dump(segments, f, indent=2, ensure_ascii=False)
-            f.flush()
-            os.fsync(f.fileno())  # Ensure data is written to disk
-        self.logger.info(f"  Saved: {primary_segments}")
-        
         # Also save with legacy names for backward compatibility
         # TODO: Remove after all stages updated to use new naming
         legacy_json = output_dir / "transcript.json"
-        with open(legacy_json, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        legacy_json.write_text(result_text, encoding="utf-8")
         
-        legacy_segments = output_dir / "segments.json"
-        with open(legacy_segments, "w", encoding="utf-8") as f:
-            json.dump(segments, f, indent=2, ensure_ascii=False)
+        copy_segments(primary_segments, output_dir / "segments.json")
 
     def _save_as_srt(self, segments: List[Dict], srt_file: Path) -> None:
         """
@@ -1170,23 +1340,7 @@ class WhisperXProcessor:
             segments: List of WhisperX segments
             srt_file: Output SRT file path
         """
-        with open(srt_file, "w", encoding="utf-8") as f:
-            for i, segment in enumerate(segments, 1):
-                start = segment.get("start", 0)
-                end = segment.get("end", start + 1)
-                text = segment.get("text", "").strip()
-
-                if not text:
-                    continue
-
-                # Format timestamps as HH:MM:SS,mmm
-                start_time = self._format_srt_time(start)
-                end_time = self._format_srt_time(end)
-
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n")
-                f.write("\n")
+        write_subtitles(segments, srt_file)
 
     def _format_srt_time(self, seconds: float) -> str:
         """
@@ -1198,12 +1352,7 @@ class WhisperXProcessor:
         Returns:
             Formatted timestamp string
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
-
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+        return format_timestamp(seconds, 'srt')
 
 
 def run_whisperx_pipeline(
@@ -1225,7 +1374,8 @@ def run_whisperx_pipeline(
     beam_size: int = 5,
     no_speech_threshold: float = 0.6,
     logprob_threshold: float = -1.0,
-    compression_ratio_threshold: float = 2.4
+    compression_ratio_threshold: float = 2.4,
+    vad_file: Optional[Path] = None
 ) -> Dict[str, Any]:
     """
     Run complete WhisperX pipeline
@@ -1250,6 +1400,7 @@ def run_whisperx_pipeline(
         no_speech_threshold: Threshold for no speech detection
         logprob_threshold: Log probability threshold
         compression_ratio_threshold: Compression ratio threshold
+        vad_file: VAD speech_segments.json (used for one-time language ID)
 
     Returns:
         WhisperX result dict
@@ -1269,7 +1420,8 @@ def run_whisperx_pipeline(
         no_speech_threshold=no_speech_threshold,
         logprob_threshold=logprob_threshold,
         compression_ratio_threshold=compression_ratio_threshold,
-        logger=logger
+        logger=logger,
+        vad_file=vad_file
     )
 
     try:
@@ -1688,6 +1840,11 @@ def main() -> Any:
     else:
         logger.info("Bias injection disabled in configuration")
     
+    # VAD speech regions (probe regions for one-time language identification)
+    vad_file = stage_io.get_input_path("speech_segments.json", from_stage="pyannote_vad")
+    if not vad_file.exists():
+        vad_file = None
+    
     try:
         # Run WhisperX pipeline
         logger.info("Starting WhisperX transcription...")
@@ -1710,7 +1867,8 @@ def main() -> Any:
             beam_size=beam_size,
             no_speech_threshold=no_speech_threshold,
             logprob_threshold=logprob_threshold,
-            compression_ratio_threshold=compression_ratio_threshold
+            compression_ratio_threshold=compression_ratio_threshold,
+            vad_file=vad_file
         )
         
         logger.info(f"✓ ASR completed successfully")
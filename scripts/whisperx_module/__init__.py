@@ -37,6 +37,7 @@ from .chunking import AudioChunker
 from .transcription import TranscriptionEngine
 from .postprocessing import ResultProcessor
 from .alignment import AlignmentEngine
+from .asr_context import MediaASRContext
 
 __all__ = [
     'WhisperXProcessor',
@@ -46,6 +47,7 @@ __all__ = [
     'TranscriptionEngine',
     'ResultProcessor',
     'AlignmentEngine',
+    'MediaASRContext',
 ]
 
 __version__ = "2.0.0"
@@ -0,0 +1,445 @@
+"""
+asr_context.py - Per-media ASR context shared across transcribe calls
+
+Handles:
+- One-time language identification on representative VAD speech regions
+- One-time construction (and tokenization) of each distinct bias prompt
+- Sharing both across every window/chunk of the same media file
+
+Every windowed or chunked transcribe call used to re-run language detection
+when source_lang == "auto" and rebuild its initial_prompt by joining the
+window's bias terms. On long media that is one encoder pass and one
+tokenizer call per window; the context reduces it to one per media and one
+per distinct prompt.
+
+Per AD-002: lives in whisperx_module/ next to the bias prompting strategies.
+"""
+
+# Standard library
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Tuple, Union
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Whisper keeps at most n_text_ctx // 2 - 1 = 223 prompt tokens; anything
+# longer is silently truncated from the left (dropping the first terms).
+MAX_PROMPT_TOKENS = 223
+MAX_PROMPT_TERMS = 50
+
+# Language probing (Whisper's detector only looks at the first 30s)
+PROBE_SECONDS = 30.0
+MAX_PROBE_REGIONS = 3
+MIN_PROBE_SECONDS = 2.0
+
+# Streamed blocks shorter than this cost more in per-call overhead than
+# they save in memory (WHISPER_STREAM_BLOCK_SECONDS is raised to it)
+MIN_STREAM_BLOCK_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class BiasPrompt:
+    """
+    A built bias prompt, shared by every window that uses the same terms.
+
+    Attributes:
+        text: Prompt text passed to the backend as initial_prompt
+        terms: Terms included in the prompt (after token-budget trimming)
+        tokens: Token ids for the prompt (None if backend has no tokenizer)
+    """
+    text: str
+    terms: Tuple[str, ...]
+    tokens: Optional[Tuple[int, ...]] = None
+
+    @property
+    def num_terms(self) -> int:
+        """Number of bias terms in the prompt."""
+        return len(self.terms)
+
+
+def window_terms(window: Any) -> List[str]:
+    """
+    Get bias terms from a bias window.
+
+    Windows built by shared.bias_window_generator expose ``terms`` while
+    ASR-side windows expose ``bias_terms``; accept either.
+    """
+    terms = getattr(window, 'bias_terms', None)
+    if terms is None:
+        terms = getattr(window, 'terms', None)
+    return list(terms or [])
+
+
+def load_speech_regions(vad_file: Optional[Union[Path, str]]) -> List[Tuple[float, float]]:
+    """
+    Load speech regions from a VAD ``speech_segments.json`` file.
+
+    Args:
+        vad_file: Path to speech_segments.json (``{"segments": [...]}``)
+
+    Returns:
+        List of (start, end) tuples in seconds, empty if unavailable
+    """
+    if not vad_file:
+        return []
+
+    vad_file = Path(vad_file)
+    if not vad_file.exists():
+        return []
+
+    try:
+        with open(vad_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not read VAD segments from {vad_file}: {e}")
+        return []
+
+    segments = data.get('segments', []) if isinstance(data, dict) else data
+    regions = []
+    for seg in segments or []:
+        try:
+            start, end = float(seg['start']), float(seg['end'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if end > start:
+            regions.append((start, end))
+    return regions
+
+
+def select_probe_regions(
+    speech_regions: List[Tuple[float, float]],
+    duration: Optional[float] = None,
+    max_regions: int = MAX_PROBE_REGIONS,
+    probe_seconds: float = PROBE_SECONDS
+) -> List[Tuple[float, float]]:
+    """
+    Pick a few representative speech regions for language identification.
+
+    The timeline is split into ``max_regions`` equal parts and the longest
+    speech region of each part is taken, so the probes cover the beginning,
+    middle and end of the media rather than only the opening credits.
+    Without VAD data, evenly spaced probes over the whole duration are used.
+
+    Args:
+        speech_regions: VAD speech regions as (start, end) tuples
+        duration: Media duration in seconds (for the no-VAD fallback)
+        max_regions: Maximum number of probes
+        probe_seconds: Length of each probe in seconds
+
+    Returns:
+        List of (start, end) probe windows, sorted by start time
+    """
+    regions = [r for r in speech_regions if r[1] - r[0] >= MIN_PROBE_SECONDS]
+
+    if not regions:
+        if not duration or duration <= 0:
+            return []
+        if duration <= probe_seconds:
+            return [(0.0, duration)]
+        step = duration / max_regions
+        probes = []
+        for i in range(max_regions):
+            center = step * (i + 0.5)
+            start = max(0.0, min(center - probe_seconds / 2, duration - probe_seconds))
+            probes.append((start, start + probe_seconds))
+        return probes
+
+    timeline_end = max(end for _, end in regions)
+    part = timeline_end / max_regions if timeline_end > 0 else 0.0
+
+    best: Dict[int, Tuple[float, float]] = {}
+    for start, end in regions:
+        idx = min(int(start / part), max_regions - 1) if part > 0 else 0
+        current = best.get(idx)
+        if current is None or (end - start) > (current[1] - current[0]):
+            best[idx] = (start, end)
+
+    return [
+        (start, min(end, start + probe_seconds))
+        for start, end in sorted(best.values())
+    ]
+
+
+def plan_stream_blocks(
+    duration: float,
+    block_seconds: float,
+    speech_regions: Optional[List[Tuple[float, float]]] = None,
+    overlap_seconds: float = 1.0,
+    search_fraction: float = 0.2,
+    min_gap_seconds: float = 0.3
+) -> List[Tuple[float, float]]:
+    """
+    Split a long media timeline into fixed-size transcription blocks.
+
+    Block boundaries are moved back to the middle of the latest VAD
+    silence gap in the last ``search_fraction`` of each block, so no
+    utterance is cut. Where no gap is available the block is cut at the
+    nominal length and the next block starts ``overlap_seconds`` earlier
+    (duplicates are merged afterwards). The overlap is clamped to half a
+    block, so every block moves the start forward.
+
+    Args:
+        duration: Media duration in seconds
+        block_seconds: Nominal block length in seconds
+        speech_regions: VAD speech regions as (start, end) tuples
+        overlap_seconds: Overlap used when no silence gap is found
+        search_fraction: Fraction of the block searched for a gap
+        min_gap_seconds: Minimum silence length to cut in
+
+    Returns:
+        List of (start, end) blocks covering [0, duration]
+
+    Raises:
+        ValueError: If block_seconds is not positive
+    """
+    if block_seconds <= 0:
+        raise ValueError(f"block_seconds must be positive, got {block_seconds}")
+    if duration <= 0:
+        return []
+    overlap_seconds = min(max(overlap_seconds, 0.0), block_seconds / 2)
+
+    regions = sorted(speech_regions or [])
+    gap_points = [
+        (prev_end + next_start) / 2
+        for (_, prev_end), (next_start, _) in zip(regions, regions[1:])
+        if next_start - prev_end >= min_gap_seconds
+    ]
+
+    blocks = []
+    start = 0.0
+    while start < duration:
+        nominal_end = start + block_seconds
+        if nominal_end >= duration:
+            blocks.append((start, duration))
+            break
+
+        earliest = nominal_end - block_seconds * search_fraction
+        candidates = [g for g in gap_points if earliest <= g <= nominal_end and g > start]
+        if candidates:
+            cut = candidates[-1]
+            blocks.append((start, cut))
+            start = cut
+        else:
+            blocks.append((start, nominal_end))
+            start = nominal_end - overlap_seconds
+
+    return blocks
+
+
+@dataclass
+class MediaASRContext:
+    """
+    ASR state computed once per media file and shared by all windows.
+
+    Example:
+        >>> context = MediaASRContext("audio.wav", speech_regions=regions)
+        >>> language = context.resolve_language(backend, "auto")
+        >>> prompt = context.window_prompt(window, backend)
+        >>> backend.transcribe(chunk, language=language,
+        ...                    initial_prompt=prompt.text if prompt else None)
+    """
+    audio_file: str
+    speech_regions: List[Tuple[float, float]] = field(default_factory=list)
+    duration: Optional[float] = None
+    max_prompt_terms: int = MAX_PROMPT_TERMS
+    max_prompt_tokens: int = MAX_PROMPT_TOKENS
+    logger: Any = None
+
+    detected_language: Optional[str] = field(default=None, init=False)
+    language_votes: Dict[str, int] = field(default_factory=dict, init=False)
+    _prompts: Dict[Tuple[str, ...], Optional[BiasPrompt]] = field(default_factory=dict, init=False)
+    _prompt_requests: int = field(default=0, init=False)
+    _tokenizer_calls: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        """Normalize the audio path and fall back to the module logger."""
+        self.audio_file = str(self.audio_file)
+        if self.logger is None:
+            self.logger = logger
+
+    @classmethod
+    def from_vad_file(
+        cls,
+        audio_file: Union[Path, str],
+        vad_file: Optional[Union[Path, str]] = None,
+        duration: Optional[float] = None,
+        logger_instance: Any = None
+    ) -> 'MediaASRContext':
+        """
+        Create a context using speech regions from a VAD stage output.
+
+        Args:
+            audio_file: Path to the media's 16 kHz audio
+            vad_file: Path to speech_segments.json (optional)
+            duration: Media duration in seconds (optional)
+            logger_instance: Logger to use
+
+        Returns:
+            MediaASRContext instance
+        """
+        return cls(
+            audio_file=str(audio_file),
+            speech_regions=load_speech_regions(vad_file),
+            duration=duration,
+            logger=logger_instance
+        )
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Language identification
+    # ─────────────────────────────────────────────────────────────────────
+
+    def resolve_language(self, backend: Any, source_lang: Optional[str]) -> Optional[str]:
+        """
+        Resolve the source language, detecting it at most once per media.
+
+        Explicit languages are returned unchanged. For "auto"/None, a few
+        representative speech regions are probed with the backend's
+        language detector and the majority vote is cached. If the backend
+        cannot detect language, source_lang is returned unchanged so the
+        backend falls back to its own per-call detection.
+
+        Args:
+            backend: Whisper backend (must implement detect_language)
+            source_lang: Requested source language ("auto" to detect)
+
+        Returns:
+            Language code to pass to every transcribe call
+        """
+        if source_lang not in (None, '', 'auto'):
+            return source_lang
+
+        if self.detected_language:
+            return self.detected_language
+
+        detect = getattr(backend, 'detect_language', None)
+        if detect is None:
+            return source_lang
+
+        probes = select_probe_regions(self.speech_regions, self.duration)
+        if not probes:
+            return source_lang
+
+        from shared.audio_utils import load_audio_segment
+
+        votes: Counter = Counter()
+        for start, end in probes:
+            try:
+                audio = load_audio_segment(self.audio_file, start, end)
+                language = detect(audio)
+            except Exception as e:
+                self.logger.warning(f"  Language probe {start:.1f}s-{end:.1f}s failed: {e}")
+                continue
+            if language:
+                votes[language] += 1
+                self.logger.debug(f"  Language probe {start:.1f}s-{end:.1f}s: {language}")
+
+        if not votes:
+            return source_lang
+
+        self.language_votes = dict(votes)
+        self.detected_language = votes.most_common(1)[0][0]
+        self.logger.info(
+            f"  🔍 Detected language once for media: {self.detected_language} "
+            f"(votes: {self.language_votes}, {len(probes)} speech probes)"
+        )
+        return self.detected_language
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Bias prompts
+    # ─────────────────────────────────────────────────────────────────────
+
+    def get_prompt(self, terms: List[str], backend: Any = None) -> Optional[BiasPrompt]:
+        """
+        Get the bias prompt for a list of terms, building it only once.
+
+        Terms are de-duplicated in order and capped at max_prompt_terms.
+        If the backend exposes a tokenizer (encode_prompt), the prompt is
+        tokenized once and trimmed from the end until it fits Whisper's
+        prompt budget; the token ids are kept on the prompt for reuse.
+
+        Args:
+            terms: Bias terms (order = priority)
+            backend: Whisper backend (optional, for tokenization)
+
+        Returns:
+            BiasPrompt, or None if there are no terms
+        """
+        self._prompt_requests += 1
+        key = tuple(dict.fromkeys(t for t in terms if t))[:self.max_prompt_terms]
+        if key in self._prompts:
+            return self._prompts[key]
+
+        prompt = self._build_prompt(key, backend) if key else None
+        self._prompts[key] = prompt
+        return prompt
+
+    def global_prompt(self, bias_windows: Optional[List[Any]], backend: Any = None) -> Optional[BiasPrompt]:
+        """Get the prompt built from the unique terms of all windows."""
+        if not bias_windows:
+            return None
+        all_terms: Dict[str, None] = {}
+        for window in bias_windows:
+            all_terms.update(dict.fromkeys(window_terms(window)))
+        return self.get_prompt(list(all_terms), backend)
+
+    def window_prompt(self, window: Any, backend: Any = None) -> Optional[BiasPrompt]:
+        """Get the prompt for a single bias window (shared with identical windows)."""
+        if window is None:
+            return None
+        return self.get_prompt(window_terms(window), backend)
+
+    def _build_prompt(self, terms: Tuple[str, ...], backend: Any) -> BiasPrompt:
+        """Join and (optionally) tokenize a prompt, trimming to the token budget."""
+        encode = getattr(backend, 'encode_prompt', None) if backend is not None else None
+        text = ", ".join(terms)
+
+        if encode is None:
+            return BiasPrompt(text=text, terms=terms)
+
+        tokens = self._encode(encode, text)
+        while tokens is not None and len(tokens) > self.max_prompt_tokens and len(terms) > 1:
+            # Drop lowest-priority terms proportionally, then re-encode once
+            keep = max(1, int(len(terms) * self.max_prompt_tokens / len(tokens)))
+            terms = terms[:min(keep, len(terms) - 1)]
+            text = ", ".join(terms)
+            tokens = self._encode(encode, text)
+
+        return BiasPrompt(
+            text=text,
+            terms=terms,
+            tokens=tuple(tokens) if tokens is not None else None
+        )
+
+    def _encode(self, encode: Any, text: str) -> Optional[List[int]]:
+        """Call the backend tokenizer, tolerating backends without one."""
+        self._tokenizer_calls += 1
+        try:
+            return encode(text)
+        except Exception as e:
+            self.logger.debug(f"  Prompt tokenization unavailable: {e}")
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return reuse statistics (for logs and stage manifests)."""
+        return {
+            "detected_language": self.detected_language,
+            "language_votes": self.language_votes,
+            "prompt_requests": self._prompt_requests,
+            "distinct_prompts": sum(1 for p in self._prompts.values() if p),
+            "tokenizer_calls": self._tokenizer_calls,
+        }
+
+
+__all__ = [
+    'BiasPrompt',
+    'MediaASRContext',
+    'load_speech_regions',
+    'plan_stream_blocks',
+    'select_probe_regions',
+    'window_terms',
+]
@@ -16,7 +16,6 @@ Version: 2.0.0
 # Standard library
 import sys
 import time
-import threading
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 
@@ -27,6 +26,9 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Local
 from shared.logger import get_logger
 from shared.config_loader import load_config
+from shared.batch_controller import AdaptiveBatchController
+from shared.job_events import heartbeat
+from .asr_context import MediaASRContext
 
 
 class BiasPromptingStrategy:
@@ -40,17 +42,20 @@ class BiasPromptingStrategy:
     - chunked: Best for large files (> 30min), with checkpointing
     """
     
-    def __init__(self, backend: Any, logger: Any):
+    def __init__(self, backend: Any, logger: Any, asr_context: Optional[MediaASRContext] = None):
         """
         Initialize bias prompting strategy manager
         
         Args:
             backend: Whisper backend instance (MLX, WhisperX, CUDA)
             logger: Logger instance
+            asr_context: Per-media ASR context (created on first use if None)
         """
         self.backend = backend
         self.logger = logger
         self.config = load_config()
+        self.asr_context = asr_context
+        self.batch_controller: Optional[AdaptiveBatchController] = None
     
     def transcribe_with_bias(
         self,
@@ -93,14 +98,19 @@ class BiasPromptingStrategy:
         # Optimize batch size for MPS (Apple Silicon)
         batch_size = self._optimize_batch_size(batch_size)
         
-        # Determine task (transcribe vs translate)
-        task = self._determine_task(source_lang, target_lang, workflow_mode)
-        self.logger.info(f"  Task: {task}")
-        
         # Get audio duration for strategy selection
         audio_duration = self._get_audio_duration(audio_file)
         self.logger.info(f"  Duration: {audio_duration:.1f}s ({audio_duration/60:.1f} min)")
         
+        # Resolve "auto" once per media (not once per window/chunk)
+        source_lang = self._get_context(audio_file, audio_duration).resolve_language(
+            self.backend, source_lang
+        )
+        
+        # Determine task (transcribe vs translate)
+        task = self._determine_task(source_lang, target_lang, workflow_mode)
+        self.logger.info(f"  Task: {task}")
+        
         # Route to appropriate strategy
         if bias_strategy == "chunked_windows":
             return self._transcribe_windowed_chunks(
@@ -130,6 +140,23 @@ class BiasPromptingStrategy:
     # Helper Methods
     # ─────────────────────────────────────────────────────────────────────
     
+    def _get_context(self, audio_file: str, duration: Optional[float] = None) -> MediaASRContext:
+        """Get the per-media ASR context, (re)creating it when the media changes"""
+        if self.asr_context is None or self.asr_context.audio_file != str(audio_file):
+            self.asr_context = MediaASRContext(
+                audio_file=str(audio_file), duration=duration, logger=self.logger
+            )
+        return self.asr_context
+    
+    def _get_batch_controller(self, batch_size: int) -> AdaptiveBatchController:
+        """Get the adaptive batch-size controller, created on first use"""
+        if self.batch_controller is None:
+            enabled = str(self.config.get('ADAPTIVE_BATCH_SIZE', 'true')).lower() in ('true', '1', 'yes')
+            self.batch_controller = AdaptiveBatchController.for_backend(
+                self.backend, batch_size, enabled=enabled, logger_instance=self.logger
+            )
+        return self.batch_controller
+    
     def _optimize_batch_size(self, batch_size: int) -> int:
         """Optimize batch size for MPS device"""
         if self.backend.device == "mps":
@@ -155,11 +182,11 @@ class BiasPromptingStrategy:
             import librosa
             return librosa.get_duration(path=audio_file)
         except Exception:
-            # Fallback: load and calculate
+            # Fallback: read the duration from the WAV header (no decoding)
             try:
-                from whisperx.audio import load_audio
-                audio = load_audio(audio_file)
-                return len(audio) / 16000  # 16kHz sample rate
+                from shared.audio_utils import PCMReader
+                with PCMReader(audio_file) as reader:
+                    return reader.duration
             except:
                 # Last resort: file size estimate
                 import os
@@ -188,43 +215,27 @@ class BiasPromptingStrategy:
         
         Uses all unique bias terms as initial_prompt for comprehensive coverage.
         """
-        # Create global bias prompt from all windows
+        # Create global bias prompt from all windows (built once per media)
         initial_prompt = None
-        if bias_windows:
-            all_terms = set()
-            for window in bias_windows:
-                all_terms.update(window.bias_terms)
-            
-            top_terms = list(all_terms)[:50]  # Limit to 50 terms
-            if top_terms:
-                initial_prompt = ", ".join(top_terms)
-                self.logger.info(f"  🎯 Global bias: {len(top_terms)} terms")
-                self.logger.debug(f"    Preview: {', '.join(top_terms[:5])}...")
+        prompt = self._get_context(audio_file).global_prompt(bias_windows, self.backend)
+        if prompt:
+            initial_prompt = prompt.text
+            self.logger.info(f"  🎯 Global bias: {prompt.num_terms} terms")
+            self.logger.debug(f"    Preview: {', '.join(prompt.terms[:5])}...")
         
         # Progress heartbeat for long transcriptions
         start_time = time.time()
         self.logger.info(f"  🎙️ Starting transcription at {time.strftime('%H:%M:%S')}...")
         
-        heartbeat_active = True
-        def progress_heartbeat() -> None:
-            """Log progress every 60s to detect hangs"""
-            while heartbeat_active:
-                time.sleep(60)
-                if heartbeat_active:
-                    elapsed = time.time() - start_time
-                    self.logger.info(f"  ⏱️  Still transcribing... {elapsed/60:.1f} min elapsed")
-        
-        heartbeat_thread = threading.Thread(target=progress_heartbeat, daemon=True)
-        heartbeat_thread.start()
-        
         try:
-            result = self.backend.transcribe(
-                audio_file,
-                language=source_lang,
-                task=task,
-                batch_size=batch_size,
-                initial_prompt=initial_prompt
-            )
+            with heartbeat(self.logger, "Still transcribing..."):
+                result = self.backend.transcribe(
+                    audio_file,
+                    language=source_lang,
+                    task=task,
+                    batch_size=batch_size,
+                    initial_prompt=initial_prompt
+                )
             
             elapsed = time.time() - start_time
             self.logger.info(f"  ✓ Complete: {len(result.get('segments', []))} segments in {elapsed:.1f}s")
@@ -233,9 +244,6 @@ class BiasPromptingStrategy:
             elapsed = time.time() - start_time if 'start_time' in locals() else 0
             self.logger.error(f"  ✗ Failed after {elapsed:.1f}s: {e}", exc_info=True)
             raise
-        finally:
-            heartbeat_active = False
-            heartbeat_thread.join(timeout=1.0)
         
         # Filter low-confidence segments
         result = self._filter_segments(result)
@@ -267,10 +275,10 @@ class BiasPromptingStrategy:
         
         # Use first window's terms as initial prompt
         initial_prompt = None
-        if bias_windows and bias_windows[0].bias_terms:
-            first_window_terms = list(bias_windows[0].bias_terms)[:50]
-            initial_prompt = ", ".join(first_window_terms)
-            self.logger.info(f"    • Initial prompt: {len(first_window_terms)} terms from first window")
+        prompt = self._get_context(audio_file).window_prompt(bias_windows[0], self.backend)
+        if prompt:
+            initial_prompt = prompt.text
+            self.logger.info(f"    • Initial prompt: {prompt.num_terms} terms from first window")
         
         result = self.backend.transcribe(
             audio_file,
@@ -312,19 +320,7 @@ class BiasPromptingStrategy:
         - Each chunk uses window-specific bias terms
         - Merge overlapping segments intelligently
         """
-        # Import load_audio with fallback
-        try:
-            from whisperx.audio import load_audio as _load_audio
-        except ImportError:
-            try:
-                import librosa
-                def _load_audio(file: str, sr: int = 16000) -> Any:
-                    """Load audio with librosa fallback"""
-                    audio, _ = librosa.load(file, sr=sr, mono=True)
-                    return audio
-            except ImportError:
-                self.logger.error("  ✗ Cannot load audio (no whisperx or librosa)", exc_info=True)
-                raise ImportError("Need whisperx or librosa for audio loading")
+        from shared.audio_utils import PCMReader, AudioWindowBuffer
         
         if not bias_windows:
             # Fall back to regular transcription
@@ -335,65 +331,75 @@ class BiasPromptingStrategy:
                 batch_size=batch_size
             )
         
+        asr_context = self._get_context(audio_file)
+        controller = self._get_batch_controller(batch_size)
+        
         self.logger.info(f"  🎯 Windowed chunks strategy")
         self.logger.info(f"    • Processing {len(bias_windows)} bias windows")
         self.logger.info(f"    • Window-specific bias terms (time-aware)")
         
-        # Load full audio
-        audio = _load_audio(audio_file)
-        sample_rate = 16000  # Whisper standard sample rate
+        # Read windows through one fixed-size buffer instead of loading the
+        # full file; overlapping windows only read their new samples
+        with PCMReader(audio_file) as reader:
+            sample_rate = reader.sample_rate
+            buffer = AudioWindowBuffer(
+                reader, max(w.end_time - w.start_time for w in bias_windows)
+            )
         
-        all_segments = []
-        total_windows = len(bias_windows)
+            all_segments = []
+            total_windows = len(bias_windows)
         
-        # Process each bias window
-        for i, window in enumerate(bias_windows, 1):
-            self.logger.info(f"  Window {i}/{total_windows}: {window.start_time:.1f}s - {window.end_time:.1f}s")
+            # Process each bias window
+            for i, window in enumerate(bias_windows, 1):
+                self.logger.info(f"  Window {i}/{total_windows}: {window.start_time:.1f}s - {window.end_time:.1f}s")
             
-            # Extract audio chunk for this window
-            start_sample = int(window.start_time * sample_rate)
-            end_sample = int(window.end_time * sample_rate)
-            chunk_audio = audio[start_sample:end_sample]
+                # Extract audio chunk for this window
+                chunk_audio = buffer.window(window.start_time, window.end_time)
             
-            # Skip if chunk is too short
-            if len(chunk_audio) < sample_rate * 0.5:  # Skip chunks < 0.5 seconds
-                self.logger.warning(f"    ⚠️  Skipping window (too short)")
-                continue
+                # Skip if chunk is too short
+                if len(chunk_audio) < sample_rate * 0.5:  # Skip chunks < 0.5 seconds
+                    self.logger.warning(f"    ⚠️  Skipping window (too short)")
+                    continue
             
-            # Create window-specific bias prompt
-            window_terms = list(window.bias_terms)[:50]  # Up to 50 terms
-            initial_prompt = ", ".join(window_terms) if window_terms else None
+                # Window-specific bias prompt (shared with windows using the same terms)
+                prompt = asr_context.window_prompt(window, self.backend)
+                initial_prompt = prompt.text if prompt else None
             
-            self.logger.info(f"    • Bias: {len(window_terms)} terms")
-            self.logger.debug(f"    • Preview: {', '.join(window_terms[:3])}...")
+                self.logger.info(f"    • Bias: {prompt.num_terms if prompt else 0} terms")
+                if prompt:
+                    self.logger.debug(f"    • Preview: {', '.join(prompt.terms[:3])}...")
             
-            # Transcribe chunk with window-specific bias
-            try:
-                chunk_result = self.backend.transcribe(
-                    chunk_audio,  # NumPy array (WhisperX/MLX supports this)
-                    language=source_lang,
-                    task=task,
-                    batch_size=batch_size,
-                    initial_prompt=initial_prompt
-                )
+                # Transcribe chunk with window-specific bias
+                try:
+                    chunk_result = controller.run(
+                        lambda size: self.backend.transcribe(
+                            chunk_audio,  # NumPy array (WhisperX/MLX supports this)
+                            language=source_lang,
+                            task=task,
+                            batch_size=size,
+                            initial_prompt=initial_prompt
+                        ),
+                        work=len(chunk_audio) / sample_rate
+                    )
                 
-                # Adjust timestamps to global timeline
-                for segment in chunk_result.get('segments', []):
-                    segment['start'] += window.start_time
-                    segment['end'] += window.start_time
-                    # Add window-specific metadata
-                    segment['bias_window_id'] = window.window_id
-                    segment['bias_terms'] = window.bias_terms
-                    segment['bias_strategy'] = 'chunked_windows'
+                    # Adjust timestamps to global timeline
+                    for segment in chunk_result.get('segments', []):
+                        segment['start'] += window.start_time
+                        segment['end'] += window.start_time
+                        # Add window-specific metadata
+                        segment['bias_window_id'] = window.window_id
+                        segment['bias_terms'] = window.bias_terms
+                        segment['bias_strategy'] = 'chunked_windows'
                 
-                all_segments.extend(chunk_result.get('segments', []))
-                self.logger.info(f"    ✓ Window complete: {len(chunk_result.get('segments', []))} segments")
+                    all_segments.extend(chunk_result.get('segments', []))
+                    self.logger.info(f"    ✓ Window complete: {len(chunk_result.get('segments', []))} segments")
                 
-            except Exception as e:
-                self.logger.error(f"    ✗ Window {i} failed: {e}", exc_info=True)
-                # Continue with other windows - partial results better than none
-                continue
-        
+                except Exception as e:
+                    self.logger.error(f"    ✗ Window {i} failed: {e}", exc_info=True)
+                    # Continue with other windows - partial results better than none
+                    continue
+
+        controller.save()
         self.logger.info(f"  Merging {len(all_segments)} segments from {total_windows} windows...")
         
         # Merge overlapping segments from adjacent windows
@@ -539,6 +545,9 @@ class BiasPromptingStrategy:
                     # Continue with other chunks, partial results better than none
                     continue
         
+        if self.batch_controller is not None:
+            self.batch_controller.save()
+        
         # Merge all chunks
         self.logger.info(f"  Merging {len(chunk_results)} processed chunks...")
         merged_result = chunker.merge_chunk_results(chunk_results)
@@ -573,18 +582,24 @@ class BiasPromptingStrategy:
         Returns:
             Chunk transcription result
         """
+        controller = self._get_batch_controller(batch_size)
+        
         for attempt in range(max_retries):
             try:
-                return chunker.process_chunk_with_bias(
-                    chunk, self.backend, language, task, batch_size
+                started = time.time()
+                result = chunker.process_chunk_with_bias(
+                    chunk, self.backend, language, task, controller.batch_size
                 )
+                chunk_seconds = chunk.get('duration', 0.0) if isinstance(chunk, dict) else getattr(chunk, 'duration', 0.0)
+                controller.record(chunk_seconds, time.time() - started)
+                return result
             except Exception as e:
                 self.logger.warning(f"    ⚠️  Attempt {attempt + 1} failed: {e}")
                 
-                if attempt < max_retries - 1:
-                    # Reduce batch size for retry
-                    batch_size = max(batch_size // 2, 4)
-                    self.logger.warning(f"    🔄 Retrying with batch_size={batch_size}")
+                if attempt < max_retries - 1 and controller.should_back_off(e):
+                    # Smooth back-off; the failed size becomes a ceiling
+                    controller.on_failure(e)
+                    self.logger.warning(f"    🔄 Retrying with batch_size={controller.batch_size}")
                 else:
                     raise
         
@@ -24,6 +24,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 # Local
 from shared.logger import get_logger
+from shared.subtitle_io import format_timestamp, write_subtitles
 
 
 class ResultProcessor:
@@ -220,23 +221,7 @@ class ResultProcessor:
             segments: List of WhisperX segments
             srt_file: Output SRT file path
         """
-        with open(srt_file, "w", encoding="utf-8") as f:
-            for i, segment in enumerate(segments, 1):
-                start = segment.get("start", 0)
-                end = segment.get("end", start + 1)
-                text = segment.get("text", "").strip()
-
-                if not text:
-                    continue
-
-                # Format timestamps as HH:MM:SS,mmm
-                start_time = self._format_srt_time(start)
-                end_time = self._format_srt_time(end)
-
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n")
-                f.write("\n")
+        write_subtitles(segments, srt_file)
 
     def _format_srt_time(self, seconds: float) -> str:
         """
@@ -248,12 +233,7 @@ class ResultProcessor:
         Returns:
             Formatted timestamp string
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millis = int((seconds % 1) * 1000)
-
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+        return format_timestamp(seconds, 'srt')
 
 
 __all__ = ['ResultProcessor']
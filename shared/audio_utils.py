@@ -16,8 +16,9 @@ Compliance: DEVELOPER_STANDARDS_COMPLIANCE.md
 """
 
 # Standard library
+import struct
 from pathlib import Path
-from typing import Union, Dict, List, Any, Tuple, Iterator
+from typing import Union, Dict, List, Any, Tuple, Iterator, Optional
 
 # Third-party
 import numpy as np
@@ -160,7 +161,10 @@ def save_audio(
 
 # Compatibility: Provide whisperx-compatible interface
 # This allows drop-in replacement: from shared.audio_utils import load_audio
-__all__ = ['load_audio', 'get_audio_duration', 'save_audio', 'load_audio_segment', 'stream_audio', 'validate_audio_file']
+__all__ = [
+    'load_audio', 'get_audio_duration', 'save_audio', 'load_audio_segment',
+    'stream_audio', 'validate_audio_file', 'PCMReader', 'AudioWindowBuffer'
+]
 
 
 def load_audio_segment(
@@ -280,6 +284,256 @@ def load_audio_segment(
         raise RuntimeError(f"Failed to load audio segment from {file_path} [{start}s-{end}s]: {e}")
 
 
+# WAV format tags (fmt chunk)
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _parse_wav_header(file_path: Path) -> Optional[Dict[str, int]]:
+    """
+    Locate the PCM data chunk of a RIFF/WAVE file
+    
+    Returns:
+        Dict with format_tag, channels, sample_rate, bits, data_offset and
+        data_size, or None if the file is not a plain PCM/float WAV
+    """
+    with open(file_path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            return None
+        
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            
+            if chunk_id == b'fmt ':
+                body = f.read(chunk_size + (chunk_size & 1))
+                format_tag, channels, sample_rate = struct.unpack('<HHI', body[:8])
+                bits = struct.unpack('<H', body[14:16])[0]
+                if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                    format_tag = struct.unpack('<H', body[24:26])[0]
+                fmt = {
+                    'format_tag': format_tag,
+                    'channels': channels,
+                    'sample_rate': sample_rate,
+                    'bits': bits,
+                }
+            elif chunk_id == b'data':
+                if fmt is None:
+                    return None
+                data_offset = f.tell()
+                # ffmpeg writes 0 / 0xFFFFFFFF sizes when streaming to a pipe
+                file_size = file_path.stat().st_size
+                if chunk_size in (0, 0xFFFFFFFF) or data_offset + chunk_size > file_size:
+                    chunk_size = file_size - data_offset
+                fmt.update(data_offset=data_offset, data_size=chunk_size)
+                return fmt
+            else:
+                f.seek(chunk_size + (chunk_size & 1), 1)
+
+
+class PCMReader:
+    """
+    Random-access reader over a WAV file without loading it into memory
+    
+    Plain PCM WAVs (the demux stage writes 16 kHz mono pcm_s16le) are
+    memory-mapped with numpy, so reading a window costs O(window) memory
+    and the OS page cache handles the rest. Anything else (other sample
+    rates, compressed formats) falls back to soundfile seek + read via
+    load_audio_segment().
+    
+    Example:
+        >>> with PCMReader("audio.wav") as reader:
+        ...     window = reader.read(150.0, 180.0)  # 30s float32 at 16 kHz
+    
+    Note:
+        - Peak memory is independent of media duration
+        - Output is always mono float32 in [-1, 1] at sample_rate
+    """
+    
+    _DTYPES = {
+        (_WAVE_FORMAT_PCM, 16): (np.int16, 32768.0),
+        (_WAVE_FORMAT_PCM, 32): (np.int32, 2147483648.0),
+        (_WAVE_FORMAT_IEEE_FLOAT, 32): (np.float32, 1.0),
+    }
+    
+    def __init__(self, file_path: Union[str, Path], sample_rate: int = 16000):
+        """
+        Open a WAV file for windowed reads
+        
+        Args:
+            file_path: Path to audio file
+            sample_rate: Output sample rate in Hz (default: 16000 for Whisper)
+            
+        Raises:
+            FileNotFoundError: If audio file doesn't exist
+        """
+        self.file_path = Path(file_path)
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {self.file_path}")
+        
+        self.sample_rate = sample_rate
+        self._pcm: Optional[np.ndarray] = None
+        self._scale = 1.0
+        
+        header = _parse_wav_header(self.file_path)
+        dtype = None
+        if header and header['sample_rate'] == sample_rate:
+            dtype, self._scale = self._DTYPES.get((header['format_tag'], header['bits']), (None, 1.0))
+        
+        if dtype is not None:
+            channels = header['channels']
+            frame_bytes = np.dtype(dtype).itemsize * channels
+            num_frames = header['data_size'] // frame_bytes
+            self._pcm = np.memmap(
+                self.file_path, dtype=dtype, mode='r',
+                offset=header['data_offset'], shape=(num_frames, channels)
+            )
+            self.num_samples = num_frames
+        else:
+            import soundfile as sf
+            info = sf.info(str(self.file_path))
+            self.num_samples = int(info.duration * sample_rate)
+    
+    @property
+    def memory_mapped(self) -> bool:
+        """True if reads come straight from the memory-mapped PCM data"""
+        return self._pcm is not None
+    
+    @property
+    def duration(self) -> float:
+        """Duration in seconds"""
+        return self.num_samples / self.sample_rate
+    
+    def read_samples(self, start: int, end: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read samples [start, end) as mono float32
+        
+        Args:
+            start: First sample index
+            end: End sample index (exclusive, clamped to file length)
+            out: Optional float32 buffer to write into (avoids an allocation)
+            
+        Returns:
+            Samples (a view of ``out`` if given)
+        """
+        start = max(0, min(start, self.num_samples))
+        end = max(start, min(end, self.num_samples))
+        count = end - start
+        
+        if self._pcm is not None:
+            frames = self._pcm[start:end]
+            target = out[:count] if out is not None else np.empty(count, dtype=np.float32)
+            if frames.shape[1] == 1:
+                np.multiply(frames[:, 0], 1.0 / self._scale, out=target, casting='unsafe')
+            else:
+                np.multiply(frames.mean(axis=1), 1.0 / self._scale, out=target, casting='unsafe')
+            return target
+        
+        if count == 0:
+            return out[:0] if out is not None else np.array([], dtype=np.float32)
+        segment = load_audio_segment(
+            self.file_path, start / self.sample_rate, end / self.sample_rate, self.sample_rate
+        )[:count]
+        if out is None:
+            return segment
+        out[:len(segment)] = segment
+        return out[:len(segment)]
+    
+    def read(self, start: float, end: float) -> np.ndarray:
+        """Read [start, end) seconds as mono float32"""
+        return self.read_samples(int(start * self.sample_rate), int(end * self.sample_rate))
+    
+    def close(self) -> None:
+        """Release the memory map"""
+        self._pcm = None
+    
+    def __enter__(self) -> 'PCMReader':
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class AudioWindowBuffer:
+    """
+    Fixed-size audio buffer for sliding windows over a PCMReader
+    
+    Bias windows and ASR blocks advance with overlap (e.g. 45s windows with
+    a 15s stride). The buffer is allocated once at the maximum window size;
+    when the next window overlaps the previous one, the overlapping samples
+    are shifted to the front in place and only the new samples are read.
+    
+    Example:
+        >>> buffer = AudioWindowBuffer(PCMReader("audio.wav"), max_seconds=60)
+        >>> for window in bias_windows:
+        ...     audio = buffer.window(window.start_time, window.end_time)
+        ...     backend.transcribe(audio, ...)  # view valid until next call
+    """
+    
+    def __init__(self, reader: PCMReader, max_seconds: float):
+        """
+        Allocate the buffer
+        
+        Args:
+            reader: PCMReader to read from
+            max_seconds: Largest window that will be requested
+        """
+        self.reader = reader
+        # +1 sample: int(end * sr) - int(start * sr) can round up by one
+        self.capacity = int(np.ceil(max_seconds * reader.sample_rate)) + 1
+        self._buffer = np.empty(self.capacity, dtype=np.float32)
+        self._start = 0
+        self._length = 0
+        self.samples_read = 0
+        self.samples_served = 0
+    
+    @property
+    def nbytes(self) -> int:
+        """Buffer size in bytes (constant for the buffer's lifetime)"""
+        return self._buffer.nbytes
+    
+    def window(self, start: float, end: float) -> np.ndarray:
+        """
+        Get samples for [start, end) seconds
+        
+        Returns:
+            float32 view into the buffer, overwritten by the next call
+            
+        Raises:
+            ValueError: If the window is larger than the buffer
+        """
+        sr = self.reader.sample_rate
+        first = max(0, min(int(start * sr), self.reader.num_samples))
+        last = max(first, min(int(end * sr), self.reader.num_samples))
+        count = last - first
+        if count > self.capacity:
+            raise ValueError(
+                f"Window {end - start:.1f}s exceeds buffer capacity {self.capacity / sr:.1f}s"
+            )
+        
+        kept = 0
+        buffered_end = self._start + self._length
+        if self._start <= first < buffered_end:
+            kept = min(buffered_end, last) - first
+            offset = first - self._start
+            if offset:
+                self._buffer[:kept] = self._buffer[offset:offset + kept]
+        
+        if kept < count:
+            self.reader.read_samples(first + kept, last, out=self._buffer[kept:count])
+            self.samples_read += count - kept
+        
+        self._start = first
+        self._length = count
+        self.samples_served += count
+        return self._buffer[:count]
+
+
 def stream_audio(audio_file: Path, chunk_size: int = 1024) -> Any:
     """
     Stream audio file in chunks without loading entire file into memory
@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Adaptive Batch-Size Controller
+
+Online batch-size tuning for ASR and translation, replacing the static
+table in hardware_detection.calculate_optimal_batch_size() and the
+halve-on-exception retry in _process_chunk_with_retry().
+
+Handles:
+- Measuring throughput (audio-seconds/sec for ASR, tokens/sec for MT)
+  and process RSS on every batch/chunk
+- Growing the batch size while throughput keeps improving and memory
+  headroom allows, then settling on the best measured size
+- Backing off smoothly (x0.75) on out-of-memory errors or memory
+  pressure, and never growing past a size that failed again (other
+  errors are re-raised at once and do not touch the learned size).
+  Pressure can come from other jobs on the host, so a pressure back-off
+  lasts only while the pressure does and is never persisted
+- Persisting the learned optimum per (host, model, compute_type) in
+  config/hardware_cache.json under "batch_tuning"
+
+Usage:
+    >>> controller = AdaptiveBatchController("large-v3", "int8", device="cuda")
+    >>> for chunk in chunks:
+    ...     t0 = time.time()
+    ...     backend.transcribe(chunk, batch_size=controller.batch_size)
+    ...     controller.record(chunk_seconds, time.time() - t0)
+    >>> controller.save()
+
+Module: shared/batch_controller.py
+"""
+
+# Standard library
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; writes stay atomic
+    fcntl = None
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CACHE_FILE = PROJECT_ROOT / "config" / "hardware_cache.json"
+CACHE_SECTION = "batch_tuning"
+
+
+def tuning_key(model: str, compute_type: str, host: Optional[str] = None) -> str:
+    """Build the hardware-cache key for a (host, model, compute_type) triple"""
+    return f"{host or platform.node() or 'localhost'}|{model}|{compute_type}"
+
+
+def is_out_of_memory(error: BaseException) -> bool:
+    """
+    True if an exception is an out-of-memory failure worth a smaller batch
+
+    Covers MemoryError, torch.cuda.OutOfMemoryError and the RuntimeErrors
+    CUDA/MPS/CPU allocators raise ("... out of memory ..."). Decode
+    errors, bad input and the like are not: retrying them with a smaller
+    batch only hides the real error.
+    """
+    if isinstance(error, MemoryError):
+        return True
+    # Only look at torch if the model already imported it
+    torch = sys.modules.get('torch')
+    oom_type = getattr(getattr(torch, 'cuda', None), 'OutOfMemoryError', None)
+    if isinstance(oom_type, type) and isinstance(error, oom_type):
+        return True
+    return isinstance(error, RuntimeError) and "out of memory" in str(error).lower()
+
+
+@contextmanager
+def _cache_lock(cache_file: Path):
+    """Exclusive advisory lock for read-modify-write of the hardware cache"""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_file.with_name(f"{cache_file.name}.lock"), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _read_cache(cache_file: Path) -> Dict[str, Any]:
+    """Read the hardware cache, returning {} if missing or unreadable"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def get_learned_batch_size(
+    model: str,
+    compute_type: str,
+    cache_file: Optional[Path] = None,
+    host: Optional[str] = None
+) -> Optional[int]:
+    """
+    Get the persisted batch-size optimum for this host/model/compute type.
+
+    Args:
+        model: Model name (e.g. 'large-v3', 'facebook/nllb-200-distilled-600M')
+        compute_type: Compute type (e.g. 'int8', 'float16')
+        cache_file: Hardware cache path (default: config/hardware_cache.json)
+        host: Host name (default: this host)
+
+    Returns:
+        Learned batch size, or None if nothing was learned yet
+    """
+    cache = _read_cache(Path(cache_file or DEFAULT_CACHE_FILE))
+    entry = cache.get(CACHE_SECTION, {}).get(tuning_key(model, compute_type, host))
+    if isinstance(entry, dict) and isinstance(entry.get('batch_size'), int):
+        return entry['batch_size']
+    return None
+
+
+class AdaptiveBatchController:
+    """
+    Online batch-size controller driven by measured throughput and memory.
+
+    Starts from the learned optimum if one is cached, otherwise from the
+    given initial size, and probes upwards by ``growth_factor`` until the
+    throughput gain drops below ``min_gain`` or memory headroom runs out.
+    After converging it keeps watching memory and failures and backs off
+    when needed.
+    """
+
+    BACKOFF_FACTOR = 0.75
+
+    def __init__(
+        self,
+        model: str,
+        compute_type: str,
+        device: str = "cpu",
+        initial_batch_size: int = 8,
+        min_batch_size: int = 1,
+        max_batch_size: int = 64,
+        growth_factor: float = 2.0,
+        min_gain: float = 0.05,
+        memory_headroom: float = 0.15,
+        enabled: bool = True,
+        cache_file: Optional[Path] = None,
+        logger_instance: Optional[Any] = None
+    ):
+        """
+        Create a controller for one model/compute-type combination.
+
+        Args:
+            model: Model name (part of the persistence key)
+            compute_type: Compute type (part of the persistence key)
+            device: Device the model runs on ('cpu', 'cuda', 'mps')
+            initial_batch_size: Starting size when nothing is learned yet
+            min_batch_size: Lower bound for back-off
+            max_batch_size: Upper bound for growth
+            growth_factor: Multiplier applied while probing
+            min_gain: Minimum relative throughput gain to keep growing
+            memory_headroom: Minimum free fraction of GPU memory (cuda/mps) or host RAM
+            enabled: If False the batch size stays fixed (e.g. MLX ignores it)
+            cache_file: Hardware cache path (default: config/hardware_cache.json)
+            logger_instance: Optional logger
+        """
+        self.model = model
+        self.compute_type = compute_type
+        self.device = device
+        self.min_batch_size = max(1, min_batch_size)
+        self.max_batch_size = max(self.min_batch_size, max_batch_size)
+        self.growth_factor = growth_factor
+        self.min_gain = min_gain
+        self.memory_headroom = memory_headroom
+        self.enabled = enabled
+        self.cache_file = Path(cache_file or DEFAULT_CACHE_FILE)
+        self.logger = logger_instance or logger
+        self.key = tuning_key(model, compute_type)
+
+        learned = get_learned_batch_size(model, compute_type, self.cache_file) if enabled else None
+        self.learned = learned is not None
+        self.batch_size = self._clamp(learned if learned is not None else initial_batch_size)
+
+        self._ceiling = self.max_batch_size
+        self._converged = self.learned or not enabled
+        self._warmed_up = False
+        self._previous_size: Optional[int] = None
+        self._throughput: Dict[int, float] = {}
+        self._peak_rss = 0
+        self._changed = False
+        # Size to persist: batch_size minus temporary pressure back-offs
+        self._learned_size = self.batch_size
+        self._pressured = False
+
+    @classmethod
+    def for_backend(
+        cls,
+        backend: Any,
+        initial_batch_size: int,
+        enabled: bool = True,
+        logger_instance: Optional[Any] = None
+    ) -> 'AdaptiveBatchController':
+        """
+        Create a controller for a Whisper backend.
+
+        Backends that ignore batch_size (``supports_batching = False``,
+        e.g. MLX) get a disabled controller so nothing is probed or stored.
+        """
+        return cls(
+            getattr(backend, 'model_name', 'unknown'),
+            getattr(backend, 'compute_type', 'default'),
+            device=getattr(backend, 'device', 'cpu'),
+            initial_batch_size=initial_batch_size,
+            enabled=enabled and getattr(backend, 'supports_batching', False),
+            logger_instance=logger_instance
+        )
+
+    @property
+    def converged(self) -> bool:
+        """True once probing has settled on a batch size"""
+        return self._converged
+
+    @property
+    def can_back_off(self) -> bool:
+        """True if a failure can be retried with a smaller batch"""
+        return self.enabled and self.batch_size > self.min_batch_size
+
+    def should_back_off(self, error: BaseException) -> bool:
+        """True if ``error`` is an OOM that a smaller batch may avoid"""
+        return self.can_back_off and is_out_of_memory(error)
+
+    def record(self, work: float, elapsed: float, batch_size: Optional[int] = None) -> int:
+        """
+        Record one measured batch/chunk and pick the next batch size.
+
+        Args:
+            work: Work done (audio seconds for ASR, tokens for translation)
+            elapsed: Wall-clock seconds it took
+            batch_size: Batch size used (default: current batch size)
+
+        Returns:
+            Batch size to use next
+        """
+        if not self.enabled or work <= 0 or elapsed <= 0:
+            return self.batch_size
+
+        size = batch_size or self.batch_size
+        self._sample_rss()
+
+        # First call includes model warm-up (kernel compilation, caches)
+        if not self._warmed_up:
+            self._warmed_up = True
+            return self.batch_size
+
+        throughput = work / elapsed
+        previous = self._throughput.get(size)
+        self._throughput[size] = throughput if previous is None else (previous + throughput) / 2
+
+        if self._under_memory_pressure():
+            # Maybe another job's spike: shrink for now, but neither cap
+            # probing nor persist the smaller size
+            self._converged = True
+            self._pressured = True
+            self._set(self._backoff_size(size), "memory headroom below "
+                      f"{self.memory_headroom:.0%}", transient=True)
+            return self.batch_size
+        if self._pressured:
+            self._pressured = False
+            self._set(self._learned_size, "memory pressure cleared", transient=True)
+            return self.batch_size
+
+        # Short batches (tail, token-budget trims) are measured at their
+        # real size but do not move the probe
+        if self._converged or size != self.batch_size:
+            return self.batch_size
+
+        if self._previous_size is not None:
+            baseline = self._throughput[self._previous_size]
+            if self._throughput[size] < baseline * (1 + self.min_gain):
+                self._settle("diminishing returns")
+                return self.batch_size
+
+        next_size = min(self._ceiling, max(size + 1, int(size * self.growth_factor)))
+        if next_size <= size:
+            self._settle("reached upper bound")
+            return self.batch_size
+
+        self._previous_size = size
+        self._set(next_size, f"{throughput:.1f} units/s at batch {size}")
+        return self.batch_size
+
+    def on_failure(self, error: Optional[BaseException] = None) -> int:
+        """
+        Back off after an out-of-memory batch.
+
+        The failed size becomes a ceiling so probing never returns to it.
+        Callers check should_back_off() first; other errors must not
+        shrink the (persisted) batch size.
+
+        Returns:
+            Batch size to retry with
+        """
+        if not self.enabled:
+            return self.batch_size
+
+        failed = self.batch_size
+        self._ceiling = min(self._ceiling, max(self.min_batch_size, failed - 1))
+        self._converged = True
+        self._set(self._backoff_size(failed), f"failure: {error}" if error else "failure")
+        return self.batch_size
+
+    def run(
+        self,
+        fn: Callable[[int], Any],
+        work: float,
+        on_retry: Optional[Callable[[], None]] = None
+    ) -> Any:
+        """
+        Call ``fn(batch_size)``, record its throughput and back off on OOM.
+
+        Args:
+            fn: Callable taking the batch size to use
+            work: Work done by one call (audio seconds or tokens)
+            on_retry: Optional cleanup before retrying (e.g. cache flush)
+
+        Returns:
+            Result of ``fn``
+
+        Raises:
+            Exception: Whatever ``fn`` raised if it was not an OOM, or once
+                no smaller batch is left
+        """
+        while True:
+            size = self.batch_size
+            start = time.time()
+            try:
+                result = fn(size)
+            except Exception as e:
+                if not self.should_back_off(e):
+                    raise
+                self.on_failure(e)
+                if on_retry:
+                    on_retry()
+                continue
+            self.record(work, time.time() - start, size)
+            return result
+
+    def save(self) -> bool:
+        """
+        Persist the learned optimum to the hardware cache.
+
+        Only written when probing or back-off actually changed something,
+        so converged runs do not rewrite the file every time.
+
+        Returns:
+            True if the cache was updated
+        """
+        if not self.enabled or not self._changed:
+            return False
+
+        entry = {
+            'batch_size': self._learned_size,
+            'device': self.device,
+            'throughput': round(self._throughput.get(self._learned_size, 0.0), 3),
+            'peak_rss_mb': round(self._peak_rss / (1024 * 1024), 1),
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+
+        try:
+            # Locked so concurrent jobs on this host keep each other's keys
+            with _cache_lock(self.cache_file):
+                cache = _read_cache(self.cache_file)
+                cache.setdefault(CACHE_SECTION, {})[self.key] = entry
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=self.cache_file.parent, prefix=f".{self.cache_file.name}.", suffix='.tmp'
+                )
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(cache, f, indent=2)
+                    os.replace(tmp_path, self.cache_file)
+                except BaseException:
+                    Path(tmp_path).unlink(missing_ok=True)
+                    raise
+        except OSError as e:
+            self.logger.warning(f"Could not persist batch size for {self.key}: {e}")
+            return False
+
+        self._changed = False
+        self.logger.info(f"  💾 Learned batch size {self._learned_size} saved for {self.key}")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Controller state for logs/manifests"""
+        return {
+            'batch_size': self.batch_size,
+            'learned': self.learned,
+            'converged': self._converged,
+            'throughput': {str(k): round(v, 3) for k, v in sorted(self._throughput.items())},
+            'peak_rss_mb': round(self._peak_rss / (1024 * 1024), 1)
+        }
+
+    # ─────────────────────────────────────────────────────────────────────
+    # Internals
+    # ─────────────────────────────────────────────────────────────────────
+
+    def _clamp(self, size: int) -> int:
+        return max(self.min_batch_size, min(int(size), self.max_batch_size))
+
+    def _backoff_size(self, size: int) -> int:
+        smaller = int(size * self.BACKOFF_FACTOR)
+        if smaller >= size:
+            smaller = size - 1
+        return max(self.min_batch_size, min(smaller, self._ceiling))
+
+    def _set(self, size: int, reason: str, transient: bool = False) -> None:
+        size = self._clamp(min(size, self._ceiling))
+        if size != self.batch_size:
+            self.logger.info(f"  📐 Batch size {self.batch_size} → {size} ({reason})")
+            self.batch_size = size
+        if not transient and size != self._learned_size:
+            self._learned_size = size
+            self._changed = True
+
+    def _settle(self, reason: str) -> None:
+        self._converged = True
+        candidates = {k: v for k, v in self._throughput.items() if k <= self._ceiling}
+        if candidates:
+            # _set marks the size changed (and worth saving) only if it moved
+            self._set(max(candidates, key=candidates.get), reason)
+
+    def _sample_rss(self) -> None:
+        try:
+            import psutil
+            self._peak_rss = max(self._peak_rss, psutil.Process().memory_info().rss)
+        except Exception:
+            pass
+
+    def _under_memory_pressure(self) -> bool:
+        """True if accelerator memory (cuda/mps) or else host RAM is below the headroom"""
+        if self.device in ('cuda', 'mps'):
+            # Only query torch if the model already imported it; batches
+            # live in device memory, so host RAM is not the limit here
+            torch = sys.modules.get('torch')
+            if torch is None:
+                return False
+            try:
+                if self.device == 'cuda' and torch.cuda.is_available():
+                    free, total = torch.cuda.mem_get_info()
+                    return total > 0 and free / total < self.memory_headroom
+                if self.device == 'mps' and hasattr(torch.mps, 'recommended_max_memory'):
+                    limit = torch.mps.recommended_max_memory()
+                    used = torch.mps.driver_allocated_memory()
+                    return limit > 0 and 1 - used / limit < self.memory_headroom
+            except Exception:
+                pass
+            return False
+
+        try:
+            import psutil
+            mem = psutil.virtual_memory()
+            return bool(mem.total) and mem.available / mem.total < self.memory_headroom
+        except Exception:
+            return False
@@ -351,7 +351,52 @@ class MediaCacheManager:
             
         except (IOError, OSError):
             return False
-    
+
+    # ========== Song Map Cache (pre-ASR song detection) ==========
+
+    def get_song_map(self, media_id: str, params_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached song map.
+
+        Args:
+            media_id: Media identifier
+            params_hash: Hash of detector version, parameters and clip range
+
+        Returns:
+            Song map dict if found, None otherwise
+        """
+        song_file = self._get_media_cache_dir(media_id) / 'songs' / f'{params_hash}.json'
+        if not song_file.exists():
+            return None
+
+        try:
+            with open(song_file) as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+
+    def store_song_map(self, media_id: str, params_hash: str, song_map: Dict[str, Any]) -> bool:
+        """
+        Store a song map in cache.
+
+        Args:
+            media_id: Media identifier
+            params_hash: Hash of detector version, parameters and clip range
+            song_map: Song map to store
+
+        Returns:
+            True if stored successfully
+        """
+        songs_dir = self._get_media_cache_dir(media_id) / 'songs'
+        songs_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with open(songs_dir / f'{params_hash}.json', 'w') as f:
+                json.dump(song_map, f, indent=2, ensure_ascii=False)
+            return True
+        except (IOError, OSError):
+            return False
+
     # ========== Cache Management ==========
     
     def get_cache_size(self, media_id: Optional[str] = None) -> int:
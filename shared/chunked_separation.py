@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Chunked, resumable Demucs source separation
+
+Handles:
+- Splitting the demuxed audio into overlapping segments
+- Separating segments across N worker processes (one model per worker),
+  or in-process on a single GPU/MPS device
+- Checkpointing every separated segment, so a crash or interrupt resumes
+  from the last finished segment instead of starting over
+- Passing non-speech segments through without running the model
+  (speech regions from an earlier VAD run, else the demux loudness envelope)
+- Selective plans (plan_selective_segments) that separate only the
+  windows flagged by shared/music_score.py and keep the original elsewhere
+- Linear cross-fade across segment overlaps when assembling
+  vocals.wav / accompaniment.wav (16 kHz mono, same format as demux)
+
+Module: shared/chunked_separation.py
+"""
+
+# Standard library
+import json
+import os
+import shutil
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Third-party
+import numpy as np
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+CHECKPOINT_DIR = "segments"
+PLAN_FILE = "plan.json"
+
+# Quality preset → Demucs model
+QUALITY_MODELS = {
+    'quality': 'htdemucs',
+    'balanced': 'htdemucs',
+    'fast': 'mdx_extra_q',
+}
+
+# Envelope level (dBFS) below which a second counts as silence
+SILENCE_THRESHOLD_DB = -45.0
+
+# Per-process model state (set by _init_worker)
+_MODEL: Any = None
+_DEVICE: str = 'cpu'
+
+
+def plan_segments(
+    num_samples: int,
+    sample_rate: int = SAMPLE_RATE,
+    segment_seconds: float = 120.0,
+    overlap_seconds: float = 2.0
+) -> List[Tuple[int, int]]:
+    """
+    Split a signal into overlapping [start, end) sample ranges.
+
+    Consecutive segments overlap by ``overlap_seconds``; a short final
+    remainder is folded into the previous segment.
+
+    Args:
+        num_samples: Signal length in samples
+        sample_rate: Sample rate
+        segment_seconds: Nominal segment length
+        overlap_seconds: Overlap between consecutive segments
+
+    Returns:
+        List of (start, end) sample ranges covering the signal
+    """
+    length = max(1, int(segment_seconds * sample_rate))
+    overlap = min(int(overlap_seconds * sample_rate), length // 2)
+    stride = length - overlap
+    if num_samples <= length:
+        return [(0, num_samples)]
+
+    segments = []
+    start = 0
+    while start + length < num_samples:
+        segments.append((start, start + length))
+        start += stride
+    # Remainder shorter than the overlap would be a pure cross-fade: merge it
+    if num_samples - start <= overlap:
+        segments[-1] = (segments[-1][0], num_samples)
+    else:
+        segments.append((start, num_samples))
+    return segments
+
+
+def plan_selective_segments(
+    num_samples: int,
+    window_flags: Sequence[bool],
+    window_seconds: float,
+    sample_rate: int = SAMPLE_RATE,
+    segment_seconds: float = 120.0,
+    overlap_seconds: float = 2.0
+) -> Tuple[List[Tuple[int, int]], List[bool]]:
+    """
+    Segment plan that follows a per-window separate/keep mask.
+
+    Each run of equal flags is segmented on its own (so no segment mixes
+    separated and original audio), and every run after the first starts
+    ``overlap_seconds`` early so its boundary is cross-faded like any
+    other segment boundary.
+
+    Args:
+        num_samples: Signal length in samples
+        window_flags: Per-window True = separate
+        window_seconds: Window length the flags refer to
+        sample_rate: Sample rate
+        segment_seconds: Maximum segment length
+        overlap_seconds: Overlap between consecutive segments
+
+    Returns:
+        (segments, flags) with one flag per segment
+    """
+    step = int(window_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    runs: List[Tuple[bool, int, int]] = []
+    for i, flag in enumerate(window_flags):
+        start, end = i * step, min((i + 1) * step, num_samples)
+        if start >= num_samples:
+            break
+        if runs and runs[-1][0] == bool(flag):
+            runs[-1] = (runs[-1][0], runs[-1][1], end)
+        else:
+            runs.append((bool(flag), start, end))
+    if not runs:
+        segments = plan_segments(num_samples, sample_rate, segment_seconds, overlap_seconds)
+        return segments, [True] * len(segments)
+    # Flags shorter than the audio: extend the last run to the end
+    runs[-1] = (runs[-1][0], runs[-1][1], num_samples)
+
+    segments: List[Tuple[int, int]] = []
+    flags: List[bool] = []
+    for flag, start, end in runs:
+        if segments:
+            start = max(segments[-1][0] + 1, start - overlap)
+        for seg_start, seg_end in plan_segments(end - start, sample_rate, segment_seconds, overlap_seconds):
+            segments.append((start + seg_start, start + seg_end))
+            flags.append(flag)
+    return segments, flags
+
+
+def speech_flags(
+    segments: Sequence[Tuple[int, int]],
+    speech_regions: Optional[Sequence[Tuple[float, float]]],
+    sample_rate: int = SAMPLE_RATE
+) -> List[bool]:
+    """
+    Whether each segment overlaps any speech region.
+
+    Args:
+        segments: (start, end) sample ranges
+        speech_regions: (start, end) seconds, or None when unknown
+        sample_rate: Sample rate
+
+    Returns:
+        One flag per segment (all True when speech_regions is None)
+    """
+    if speech_regions is None:
+        return [True] * len(segments)
+    flags = []
+    for start, end in segments:
+        s, e = start / sample_rate, end / sample_rate
+        flags.append(any(rs < e and re > s for rs, re in speech_regions))
+    return flags
+
+
+def regions_from_envelope(
+    envelope_db: Sequence[float],
+    hop_seconds: float,
+    threshold_db: float = SILENCE_THRESHOLD_DB
+) -> List[Tuple[float, float]]:
+    """Contiguous above-threshold runs of a loudness envelope, in seconds"""
+    regions: List[Tuple[float, float]] = []
+    start = None
+    for i, level in enumerate(envelope_db):
+        if level > threshold_db and start is None:
+            start = i
+        elif level <= threshold_db and start is not None:
+            regions.append((start * hop_seconds, i * hop_seconds))
+            start = None
+    if start is not None:
+        regions.append((start * hop_seconds, len(envelope_db) * hop_seconds))
+    return regions
+
+
+def load_speech_regions(job_dir: Path, input_audio: Path) -> Tuple[Optional[List[Tuple[float, float]]], str]:
+    """
+    Best available speech map before separation runs.
+
+    Uses speech_segments.json from a previous VAD run of this job if one
+    exists, otherwise the demux loudness envelope (silence only).
+
+    Args:
+        job_dir: Job directory
+        input_audio: Demuxed audio.wav
+
+    Returns:
+        (regions in seconds or None, source label)
+    """
+    from shared.stage_order import get_stage_dir
+
+    vad_file = Path(get_stage_dir("pyannote_vad", str(job_dir))) / "speech_segments.json"
+    if vad_file.exists():
+        try:
+            with open(vad_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            segments = data.get("segments", data) if isinstance(data, dict) else data
+            return [(float(s["start"]), float(s["end"])) for s in segments], "vad"
+        except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable VAD output {vad_file}: {e}")
+
+    from shared.demux_analysis import load_analysis
+    analysis = load_analysis(input_audio)
+    if analysis and analysis.get("envelope", {}).get("rms_dbfs"):
+        envelope = analysis["envelope"]
+        return regions_from_envelope(envelope["rms_dbfs"], envelope["hop_seconds"]), "energy"
+
+    return None, "none"
+
+
+def resolve_workers(workers: int, device: str) -> int:
+    """Worker processes to use (0 = auto; accelerators get one in-process worker)"""
+    if device != 'cpu':
+        return 1
+    if workers and workers > 0:
+        return workers
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+def detect_device() -> str:
+    """Best torch device for Demucs (cuda > mps > cpu)"""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return 'cuda'
+        if getattr(torch.backends, 'mps', None) and torch.backends.mps.is_available():
+            return 'mps'
+    except ImportError:
+        pass
+    return 'cpu'
+
+
+def _init_worker(model_name: str, device: str, threads: int) -> None:
+    """Load the Demucs model once per worker process"""
+    global _MODEL, _DEVICE
+    import torch
+    from demucs.pretrained import get_model
+
+    if threads > 0:
+        torch.set_num_threads(threads)
+    _MODEL = get_model(model_name)
+    _MODEL.eval()
+    _DEVICE = device
+
+
+def _separate_array(mix: np.ndarray) -> np.ndarray:
+    """
+    Separate a 16 kHz mono segment with the worker's model.
+
+    Args:
+        mix: float32 samples
+
+    Returns:
+        (2, len(mix)) float32 array: vocals, accompaniment
+    """
+    import torch
+    from demucs.apply import apply_model
+    from demucs.audio import convert_audio
+
+    model = _MODEL
+    wav = convert_audio(torch.from_numpy(mix)[None], SAMPLE_RATE, model.samplerate, model.audio_channels)
+    # Same normalization as the demucs CLI
+    ref = wav.mean(0)
+    mean, std = ref.mean(), ref.std() + 1e-8
+    with torch.no_grad():
+        sources = apply_model(
+            model, ((wav - mean) / std)[None], device=_DEVICE,
+            split=True, overlap=0.25, progress=False
+        )[0]
+    sources = sources * std + mean
+
+    vocals = sources[model.sources.index('vocals')]
+    accompaniment = sources.sum(0) - vocals
+    stems = []
+    for stem in (vocals, accompaniment):
+        out = convert_audio(stem.cpu(), model.samplerate, SAMPLE_RATE, 1)[0].numpy()
+        if len(out) < len(mix):
+            out = np.pad(out, (0, len(mix) - len(out)))
+        stems.append(out[:len(mix)])
+    return np.stack(stems).astype(np.float32)
+
+
+def _checkpoint_path(work_dir: Path, index: int) -> Path:
+    return work_dir / f"seg_{index:05d}.npy"
+
+
+def _save_checkpoint(path: Path, stems: np.ndarray) -> None:
+    """Atomically save separated stems as int16 (half the size of float32)"""
+    tmp = path.with_name(path.stem + ".tmp.npy")
+    np.save(tmp, (np.clip(stems, -1.0, 1.0) * 32767).astype(np.int16))
+    os.replace(tmp, path)
+
+
+def _load_checkpoint(path: Path) -> np.ndarray:
+    return np.load(path).astype(np.float32) / 32767.0
+
+
+def _separate_segment(input_audio: str, start: int, end: int, out_path: str) -> str:
+    """Worker task: separate one segment and checkpoint it"""
+    from shared.audio_utils import PCMReader
+
+    with PCMReader(input_audio, SAMPLE_RATE) as reader:
+        mix = np.empty(end - start, dtype=np.float32)
+        reader.read_samples(start, end, mix)
+    _save_checkpoint(Path(out_path), _separate_array(mix))
+    return out_path
+
+
+class ChunkedSeparator:
+    """
+    Segment-parallel, checkpointed two-stem separation.
+
+    Example:
+        >>> separator = ChunkedSeparator(audio, stage_dir / "segments", "htdemucs", workers=4)
+        >>> separator.run(stage_dir / "vocals.wav", stage_dir / "accompaniment.wav")
+    """
+
+    def __init__(
+        self,
+        input_audio: Path,
+        work_dir: Path,
+        model_name: str,
+        segment_seconds: float = 120.0,
+        overlap_seconds: float = 2.0,
+        workers: int = 0,
+        device: Optional[str] = None,
+        speech_regions: Optional[Sequence[Tuple[float, float]]] = None,
+        segments: Optional[List[Tuple[int, int]]] = None,
+        selected: Optional[List[bool]] = None,
+        logger_instance: Optional[Any] = None
+    ):
+        """
+        Args:
+            input_audio: 16 kHz demuxed audio
+            work_dir: Checkpoint directory
+            model_name: Demucs model name
+            segment_seconds: Segment length (uniform plan)
+            overlap_seconds: Cross-faded overlap between segments
+            workers: Worker processes (0 = auto)
+            device: Torch device (auto-detected if None)
+            speech_regions: Speech (start, end) seconds; segments without
+                speech are passed through
+            segments: Precomputed plan (e.g. plan_selective_segments)
+            selected: Per-segment flags for ``segments``; False passes through
+            logger_instance: Optional logger
+        """
+        from shared.audio_utils import PCMReader
+
+        self.input_audio = Path(input_audio)
+        self.work_dir = Path(work_dir)
+        self.model_name = model_name
+        self.segment_seconds = segment_seconds
+        self.overlap_seconds = overlap_seconds
+        self.device = device or detect_device()
+        self.workers = resolve_workers(workers, self.device)
+        self.logger = logger_instance or logger
+
+        with PCMReader(self.input_audio, SAMPLE_RATE) as reader:
+            self.num_samples = reader.num_samples
+        if segments is None:
+            self.segments = plan_segments(self.num_samples, SAMPLE_RATE, segment_seconds, overlap_seconds)
+            selected = [True] * len(self.segments)
+        else:
+            self.segments = list(segments)
+            selected = list(selected) if selected is not None else [True] * len(self.segments)
+        speech = speech_flags(self.segments, speech_regions, SAMPLE_RATE)
+        self.separate = [a and b for a, b in zip(selected, speech)]
+        self.stats: Dict[str, Any] = {}
+
+    def _plan_signature(self) -> Dict[str, Any]:
+        stat = self.input_audio.stat()
+        return {
+            'input': {'size_bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+            'model': self.model_name,
+            'sample_rate': SAMPLE_RATE,
+            'segments': [list(s) for s in self.segments],
+            'separate': self.separate,
+        }
+
+    def _prepare_work_dir(self) -> None:
+        """Keep checkpoints only if they belong to the same input and plan"""
+        plan_file = self.work_dir / PLAN_FILE
+        signature = self._plan_signature()
+        if plan_file.exists():
+            try:
+                with open(plan_file, 'r', encoding='utf-8') as f:
+                    if json.load(f) == signature:
+                        return
+            except (OSError, json.JSONDecodeError):
+                pass
+            self.logger.info("  Segment plan changed, discarding old checkpoints")
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        with open(plan_file, 'w', encoding='utf-8') as f:
+            json.dump(signature, f)
+
+    def pending(self) -> List[int]:
+        """Segment indices without a checkpoint"""
+        return [i for i in range(len(self.segments)) if not _checkpoint_path(self.work_dir, i).exists()]
+
+    def _pass_through(self, indices: List[int]) -> None:
+        """Checkpoint non-speech segments as vocals=mix, accompaniment=0"""
+        from shared.audio_utils import PCMReader
+
+        with PCMReader(self.input_audio, SAMPLE_RATE) as reader:
+            for i in indices:
+                start, end = self.segments[i]
+                mix = np.empty(end - start, dtype=np.float32)
+                reader.read_samples(start, end, mix)
+                _save_checkpoint(_checkpoint_path(self.work_dir, i), np.stack([mix, np.zeros_like(mix)]))
+
+    def _separate(self, indices: List[int]) -> None:
+        """Run the model over the given segments"""
+        tasks = [
+            (str(self.input_audio), *self.segments[i], str(_checkpoint_path(self.work_dir, i)))
+            for i in indices
+        ]
+        total = len(tasks)
+        if self.workers <= 1:
+            if _MODEL is None:
+                _init_worker(self.model_name, self.device, 0)
+            for done, task in enumerate(tasks, 1):
+                _separate_segment(*task)
+                self.logger.info(f"  Segment {done}/{total} separated")
+            return
+
+        import multiprocessing
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_name, self.device, threads)
+        ) as pool:
+            futures = [pool.submit(_separate_segment, *task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                self.logger.info(f"  Segment {done}/{total} separated")
+
+    def assemble(self, vocals_out: Path, accompaniment_out: Optional[Path] = None) -> None:
+        """
+        Stitch checkpoints into 16 kHz mono WAVs, cross-fading overlaps.
+
+        Each segment commits the samples up to the next segment's start;
+        the remainder (the overlap) is blended into the next segment's head.
+        """
+        outputs = [vocals_out] + ([accompaniment_out] if accompaniment_out else [])
+        writers = []
+        for path in outputs:
+            w = wave.open(str(path), 'wb')
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(SAMPLE_RATE)
+            writers.append(w)
+
+        try:
+            tail: Optional[np.ndarray] = None
+            for i, (start, end) in enumerate(self.segments):
+                stems = _load_checkpoint(_checkpoint_path(self.work_dir, i))[:len(writers)]
+                if tail is not None and tail.shape[1]:
+                    n = min(tail.shape[1], stems.shape[1])
+                    fade = np.linspace(0.0, 1.0, n, dtype=np.float32)
+                    stems[:, :n] = tail[:, :n] * (1.0 - fade) + stems[:, :n] * fade
+                next_start = self.segments[i + 1][0] if i + 1 < len(self.segments) else end
+                keep = next_start - start
+                for w, stem in zip(writers, stems[:, :keep]):
+                    w.writeframesraw((np.clip(stem, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+                tail = stems[:, keep:]
+        finally:
+            for w in writers:
+                w.close()
+
+    def run(self, vocals_out: Path, accompaniment_out: Optional[Path] = None, keep_checkpoints: bool = False) -> Path:
+        """
+        Separate (resuming from checkpoints) and assemble the outputs.
+
+        Args:
+            vocals_out: Destination vocals WAV
+            accompaniment_out: Optional destination accompaniment WAV
+            keep_checkpoints: Keep segment checkpoints after success
+
+        Returns:
+            Path to the vocals WAV
+        """
+        started = time.time()
+        self._prepare_work_dir()
+        pending = self.pending()
+        resumed = len(self.segments) - len(pending)
+        skip = [i for i in pending if not self.separate[i]]
+        run = [i for i in pending if self.separate[i]]
+
+        self.logger.info(
+            f"  Segments: {len(self.segments)} "
+            f"({resumed} checkpointed, {len(skip)} passed through, {len(run)} to separate) "
+            f"on {self.device} x{self.workers}"
+        )
+        if skip:
+            self._pass_through(skip)
+        if run:
+            self._separate(run)
+
+        self.assemble(vocals_out, accompaniment_out)
+        if not keep_checkpoints:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+        self.stats = {
+            'segments': len(self.segments),
+            'resumed': resumed,
+            'passed_through': sum(1 for flag in self.separate if not flag),
+            'separated': len(run),
+            'workers': self.workers,
+            'device': self.device,
+            'seconds': round(time.time() - started, 2),
+        }
+        return Path(vocals_out)
+
+
+__all__ = [
+    'QUALITY_MODELS',
+    'ChunkedSeparator',
+    'plan_segments',
+    'plan_selective_segments',
+    'speech_flags',
+    'regions_from_envelope',
+    'load_speech_regions',
+    'resolve_workers',
+    'detect_device',
+]
@@ -3,300 +3,24 @@ Shared configuration loader for all pipeline containers.
 Reads configuration from .env file and provides typed access.
 
 Implements config caching to reduce disk I/O (Phase 3 Optimization).
+
+PipelineConfig lives in shared/pipeline_config.py and is imported on
+first use, so CLIs that only need Config/get_setting() never pay for
+pydantic.
 """
 # Standard library
 import os
 import json
 from pathlib import Path
-from typing import Optional, Any, Type, Dict
-
-# Try to import pydantic_settings, fall back to simple implementation if not available
-try:
-    from pydantic_settings import BaseSettings
-    from pydantic import Field, field_validator
-    PYDANTIC_AVAILABLE = True
-except ImportError:
-    PYDANTIC_AVAILABLE = False
-    # Provide dummy implementations
-    class BaseSettings:
-        """Fallback BaseSettings when pydantic not available."""
-        pass
-    
-    def Field(*args: Any, **kwargs: Any) -> None:
-        """Dummy Field implementation for when pydantic not available."""
-        return None
-    
-    def field_validator(*args: Any, **kwargs: Any) -> Any:
-        """Dummy field_validator implementation for when pydantic not available."""
-        def decorator(func: Any) -> Any:
-            """Pass-through decorator."""
-            return func
-        return decorator
+from typing import Optional, Any, Dict
 
 
-class PipelineConfig(BaseSettings):
-    """Pipeline configuration with validation."""
-    
-    # Job Configuration
-    job_id: str = Field(default="", env="JOB_ID")
-    user_id: int = Field(default=1, env="USER_ID")
-    title: Optional[str] = Field(default=None, env="TITLE")
-    year: Optional[int] = Field(default=None, env="YEAR")
-    
-    # Workflow Configuration
-    workflow_mode: str = Field(default="subtitle-gen", env="WORKFLOW_MODE")
-    source_language: Optional[str] = Field(default=None, env="SOURCE_LANGUAGE")
-    target_language: Optional[str] = Field(default=None, env="TARGET_LANGUAGE")
-    
-    # Media Processing Configuration
-    media_processing_mode: str = Field(default="full", env="MEDIA_PROCESSING_MODE")
-    media_start_time: Optional[str] = Field(default=None, env="MEDIA_START_TIME")
-    media_end_time: Optional[str] = Field(default=None, env="MEDIA_END_TIME")
-    
-    @field_validator('title', mode='before')
-    @classmethod
-    def empty_str_to_none_title(cls: Type['PipelineConfig'], v: Any) -> Optional[str]:
-        """Convert empty string to None for optional title."""
-        if v == '' or v is None:
-            return None
-        return v
-    
-    @field_validator('year', mode='before')
-    @classmethod
-    def empty_str_to_none_year(cls: Type['PipelineConfig'], v: Any) -> Optional[int]:
-        """Convert empty string to None for optional year."""
-        if v == '' or v is None:
-            return None
-        return int(v)
-    
-    @field_validator('media_start_time', 'media_end_time', mode='before')
-    @classmethod
-    def empty_str_to_none_time(cls: Type['PipelineConfig'], v: Any) -> Optional[str]:
-        """Convert empty string to None for optional time values."""
-        if v == '' or v is None:
-            return None
-        return v
-    
-    # Docker Registry
-    docker_registry: str = Field(default="rajiup", env="DOCKER_REGISTRY")
-    docker_tag: str = Field(default="latest", env="DOCKER_TAG")
-    
-    # Paths
-    in_root: str = Field(default="", env="IN_ROOT")  # Path to input media in job directory
-    output_root: str = Field(default="./out", env="OUTPUT_ROOT")
-    log_root: str = Field(default="./logs", env="LOG_ROOT")
-    temp_root: str = Field(default="./temp", env="TEMP_ROOT")
-    
-    # Logging
-    log_level: str = Field(default="info", env="LOG_LEVEL")
-    log_format: str = Field(default="json", env="LOG_FORMAT")
-    log_to_console: bool = Field(default=True, env="LOG_TO_CONSOLE")
-    log_to_file: bool = Field(default=True, env="LOG_TO_FILE")
-    
-    # Secrets
-    secrets_path: str = Field(default="./config/secrets.json", env="SECRETS_PATH")
-    tmdb_api_key: str = Field(default="", env="TMDB_API_KEY")
-    hf_token: str = Field(default="", env="HF_TOKEN")
-    
-    # Pipeline Steps
-    step_demux: bool = Field(default=True, env="STEP_DEMUX")
-    step_tmdb_metadata: bool = Field(default=True, env="STEP_TMDB_METADATA")
-    step_pre_asr_ner: bool = Field(default=True, env="STEP_PRE_ASR_NER")
-    step_vad_silero: bool = Field(default=True, env="STEP_VAD_SILERO")
-    step_silero_vad: bool = Field(default=True, env="STEP_SILERO_VAD")
-    step_vad_pyannote: bool = Field(default=True, env="STEP_VAD_PYANNOTE")
-    step_pyannote_vad: bool = Field(default=True, env="STEP_PYANNOTE_VAD")
-    step_diarization: bool = Field(default=True, env="STEP_DIARIZATION")
-    step_whisperx: bool = Field(default=True, env="STEP_WHISPERX")
-    step_post_asr_ner: bool = Field(default=True, env="STEP_POST_ASR_NER")
-    step_subtitle_gen: bool = Field(default=True, env="STEP_SUBTITLE_GEN")
-    step_mux: bool = Field(default=True, env="STEP_MUX")
-    
-    # FFmpeg Demux
-    audio_sample_rate: int = Field(default=16000, env="AUDIO_SAMPLE_RATE")
-    audio_channels: int = Field(default=1, env="AUDIO_CHANNELS")
-    audio_format: str = Field(default="wav", env="AUDIO_FORMAT")
-    audio_codec: str = Field(default="pcm_s16le", env="AUDIO_CODEC")
-    
-    # TMDB
-    tmdb_enabled: bool = Field(default=True, env="TMDB_ENABLED")
-    tmdb_language: str = Field(default="en-US", env="TMDB_LANGUAGE")
-    tmdb_infer_from_filename: bool = Field(default=True, env="TMDB_INFER_FROM_FILENAME")
-    
-    # Pre-ASR NER
-    pre_ner_enabled: bool = Field(default=True, env="PRE_NER_ENABLED")
-    pre_ner_model: str = Field(default="en_core_web_trf", env="PRE_NER_MODEL")
-    pre_ner_confidence_threshold: float = Field(default=0.0, env="PRE_NER_CONFIDENCE")
-    pre_ner_entity_types: str = Field(default="PERSON,ORG,GPE,LOC,FAC", env="PRE_NER_ENTITY_TYPES")
-    
-    # Bias Injection
-    bias_enabled: bool = Field(default=True, env="BIAS_ENABLED")
-    bias_window_seconds: int = Field(default=45, env="BIAS_WINDOW_SECONDS")
-    bias_stride_seconds: int = Field(default=15, env="BIAS_STRIDE_SECONDS")
-    bias_topk: int = Field(default=10, env="BIAS_TOPK")
-    bias_min_confidence: float = Field(default=0.6, env="BIAS_MIN_CONFIDENCE")
-    
-    # Song Bias Injection (Stage 7)
-    song_bias_enabled: bool = Field(default=True, env="SONG_BIAS_ENABLED")
-    song_bias_fuzzy_threshold: float = Field(default=0.80, env="SONG_BIAS_FUZZY_THRESHOLD")
-    
-    # Soundtrack Enrichment (Stage 2 - TMDB)
-    use_musicbrainz: bool = Field(default=True, env="USE_MUSICBRAINZ")
-    cache_musicbrainz: bool = Field(default=True, env="CACHE_MUSICBRAINZ")
-    
-    # Whisper/WhisperX - Basic parameters
-    whisper_model: str = Field(default="large-v3", env="WHISPER_MODEL")
-    whisper_compute_type: str = Field(default="int8", env="WHISPER_COMPUTE_TYPE")
-    whisper_batch_size: int = Field(default=16, env="WHISPER_BATCH_SIZE")
-    whisper_language: str = Field(default="hi", env="WHISPER_LANGUAGE")
-    whisper_task: str = Field(default="translate", env="WHISPER_TASK")
-    
-    # Whisper/WhisperX - Advanced transcription parameters
-    whisper_temperature: str = Field(default="0.0,0.2,0.4,0.6,0.8,1.0", env="WHISPER_TEMPERATURE")
-    whisper_beam_size: int = Field(default=5, env="WHISPER_BEAM_SIZE")
-    whisper_best_of: int = Field(default=5, env="WHISPER_BEST_OF")
-    whisper_patience: float = Field(default=1.0, env="WHISPER_PATIENCE")
-    whisper_length_penalty: float = Field(default=1.0, env="WHISPER_LENGTH_PENALTY")
-    whisper_no_speech_threshold: float = Field(default=0.6, env="WHISPER_NO_SPEECH_THRESHOLD")
-    whisper_logprob_threshold: float = Field(default=-1.0, env="WHISPER_LOGPROB_THRESHOLD")
-    whisper_compression_ratio_threshold: float = Field(default=2.4, env="WHISPER_COMPRESSION_RATIO_THRESHOLD")
-    whisper_condition_on_previous_text: bool = Field(default=True, env="WHISPER_CONDITION_ON_PREVIOUS_TEXT")
-    whisper_initial_prompt: str = Field(default="", env="WHISPER_INITIAL_PROMPT")
-    
-    # WhisperX specific
-    whisperx_device: str = Field(default="auto", env="WHISPERX_DEVICE")  # auto, cpu, cuda, mps
-    whisperx_backend: str = Field(default="auto", env="WHISPERX_BACKEND")  # auto, whisperx, mlx, ctranslate2
-    whisperx_align_extend: float = Field(default=2.0, env="WHISPERX_ALIGN_EXTEND")
-    whisperx_align_from_prev: bool = Field(default=True, env="WHISPERX_ALIGN_FROM_PREV")
-    
-    # Languages (support both naming conventions)
-    src_lang: str = Field(default="hi", env="SRC_LANG")
-    tgt_lang: str = Field(default="en", env="TGT_LANG")
-    source_lang: str = Field(default="hi", env="SOURCE_LANG")
-    target_lang: str = Field(default="en", env="TARGET_LANG")
-    
-    # Silero VAD
-    silero_threshold: float = Field(default=0.6, env="SILERO_THRESHOLD")
-    silero_min_speech_duration_ms: int = Field(default=250, env="SILERO_MIN_SPEECH_DURATION_MS")
-    silero_min_silence_duration_ms: int = Field(default=300, env="SILERO_MIN_SILENCE_DURATION_MS")
-    silero_merge_gap_sec: float = Field(default=0.35, env="SILERO_MERGE_GAP_SEC")
-    
-    # PyAnnote VAD
-    pyannote_onset: float = Field(default=0.5, env="PYANNOTE_ONSET")
-    pyannote_offset: float = Field(default=0.5, env="PYANNOTE_OFFSET")
-    pyannote_min_duration_on: float = Field(default=0.0, env="PYANNOTE_MIN_DURATION_ON")
-    pyannote_min_duration_off: float = Field(default=0.0, env="PYANNOTE_MIN_DURATION_OFF")
-    pyannote_device: str = Field(default="auto", env="PYANNOTE_DEVICE")  # auto, cpu, cuda, mps
-    pyannote_window_pad: float = Field(default=0.25, env="PYANNOTE_WINDOW_PAD")
-    pyannote_merge_gap: float = Field(default=0.2, env="PYANNOTE_MERGE_GAP")
-    
-    # Diarization
-    diarization_min_speakers: int = Field(default=1, env="DIARIZATION_MIN_SPEAKERS")
-    diarization_max_speakers: int = Field(default=10, env="DIARIZATION_MAX_SPEAKERS")
-    diarization_model: str = Field(default="pyannote/speaker-diarization-3.1", env="DIARIZATION_MODEL")
-    diarization_device: str = Field(default="auto", env="DIARIZATION_DEVICE")  # auto, cpu, cuda, mps
-    diarization_method: str = Field(default="pyannote", env="DIARIZATION_METHOD")
-    speaker_map: str = Field(default="", env="SPEAKER_MAP")
-    
-    # Subtitle generation
-    subtitle_format: str = Field(default="srt", env="SUBTITLE_FORMAT")
-    subtitle_max_line_length: int = Field(default=42, env="SUBTITLE_MAX_LINE_LENGTH")
-    subtitle_max_lines: int = Field(default=2, env="SUBTITLE_MAX_LINES")
-    subtitle_include_speaker_labels: bool = Field(default=True, env="SUBTITLE_INCLUDE_SPEAKER_LABELS")
-    subtitle_speaker_format: str = Field(default="[{speaker}]", env="SUBTITLE_SPEAKER_FORMAT")
-    subtitle_word_level_timestamps: bool = Field(default=False, env="SUBTITLE_WORD_LEVEL_TIMESTAMPS")
-    subtitle_max_duration: float = Field(default=7.0, env="SUBTITLE_MAX_DURATION")
-    subtitle_min_duration: float = Field(default=1.0, env="SUBTITLE_MIN_DURATION")
-    subtitle_merge_short: bool = Field(default=True, env="SUBTITLE_MERGE_SHORT")
-    
-    # ========================================================================
-    # Glossary System Configuration
-    # ========================================================================
-    
-    # Glossary Builder Configuration (Stage 3)
-    glossary_enable: bool = Field(default=True, env="GLOSSARY_ENABLE")
-    glossary_seed_sources: str = Field(default="asr,tmdb,master", env="GLOSSARY_SEED_SOURCES")
-    glossary_min_conf: float = Field(default=0.55, env="GLOSSARY_MIN_CONF")
-    glossary_master: str = Field(default="glossary/hinglish_master.tsv", env="GLOSSARY_MASTER")
-    glossary_prompts_dir: str = Field(default="glossary/prompts", env="GLOSSARY_PROMPTS_DIR")
-    glossary_cache_dir: str = Field(default="glossary/cache", env="GLOSSARY_CACHE_DIR")
-    glossary_cache_enabled: bool = Field(default=True, env="GLOSSARY_CACHE_ENABLED")
-    glossary_cache_ttl_days: int = Field(default=30, env="GLOSSARY_CACHE_TTL_DAYS")
-    glossary_learning_enabled: bool = Field(default=False, env="GLOSSARY_LEARNING_ENABLED")
-    glossary_auto_learn: bool = Field(default=True, env="GLOSSARY_AUTO_LEARN")
-    glossary_min_occurrences: int = Field(default=2, env="GLOSSARY_MIN_OCCURRENCES")
-    glossary_confidence_threshold: int = Field(default=3, env="GLOSSARY_CONFIDENCE_THRESHOLD")
-    
-    # Legacy Glossary Configuration (for subtitle-gen stage)
-    glossary_enabled: bool = Field(default=True, env="GLOSSARY_ENABLED")
-    glossary_path: str = Field(default="glossary/hinglish_master.tsv", env="GLOSSARY_PATH")
-    glossary_strategy: str = Field(default="adaptive", env="GLOSSARY_STRATEGY")
-    film_prompt_path: str = Field(default="", env="FILM_PROMPT_PATH")
-    frequency_data_path: str = Field(default="glossary/learned/term_frequency.json", env="FREQUENCY_DATA_PATH")
-    
-    # CPS (Characters Per Second) enforcement
-    cps_target: float = Field(default=15.0, env="CPS_TARGET")
-    cps_hard_cap: float = Field(default=17.0, env="CPS_HARD_CAP")
-    cps_enforcement: bool = Field(default=True, env="CPS_ENFORCEMENT")
-    
-    # Bollywood Enhancements
-    second_pass_enabled: bool = Field(default=True, env="SECOND_PASS_ENABLED")
-    second_pass_backend: str = Field(default="nllb", env="SECOND_PASS_BACKEND")
-    lyric_detect_enabled: bool = Field(default=True, env="LYRIC_DETECT_ENABLED")
-    lyric_threshold: float = Field(default=0.5, env="LYRIC_THRESHOLD")
-    lyric_style: str = Field(default="lyric", env="LYRIC_STYLE")
-    lyric_min_duration: float = Field(default=30.0, env="LYRIC_MIN_DURATION")
-    
-    # Post-ASR NER
-    post_ner_model: str = Field(default="en_core_web_trf", env="POST_NER_MODEL")
-    post_ner_entity_correction: bool = Field(default=True, env="POST_NER_ENTITY_CORRECTION")
-    post_ner_tmdb_matching: bool = Field(default=True, env="POST_NER_TMDB_MATCHING")
-    post_ner_confidence_threshold: float = Field(default=0.8, env="POST_NER_CONFIDENCE_THRESHOLD")
-    post_ner_device: str = Field(default="cpu", env="POST_NER_DEVICE")
-    
-    # FFmpeg Mux
-    mux_subtitle_codec: str = Field(default="mov_text", env="MUX_SUBTITLE_CODEC")
-    mux_subtitle_language: str = Field(default="eng", env="MUX_SUBTITLE_LANGUAGE")
-    mux_subtitle_title: str = Field(default="English", env="MUX_SUBTITLE_TITLE")
-    mux_copy_video: bool = Field(default=True, env="MUX_COPY_VIDEO")
-    mux_copy_audio: bool = Field(default=True, env="MUX_COPY_AUDIO")
-    mux_container_format: str = Field(default="mp4", env="MUX_CONTAINER_FORMAT")
-    
-    # Devices
-    device: str = Field(default="cpu", env="DEVICE")  # Global device setting
-    device_whisperx: str = Field(default="cpu", env="DEVICE_WHISPERX")
-    device_diarization: str = Field(default="cpu", env="DEVICE_DIARIZATION")
-    device_vad: str = Field(default="cpu", env="DEVICE_VAD")
-    device_ner: str = Field(default="cpu", env="DEVICE_NER")
-    
-    # Docker
-    docker_memory_limit: str = Field(default="10g", env="DOCKER_MEMORY_LIMIT")
-    docker_cpu_limit: int = Field(default=4, env="DOCKER_CPU_LIMIT")
-    
-    # Advanced
-    enable_chunking: bool = Field(default=False, env="ENABLE_CHUNKING")
-    chunk_duration_minutes: int = Field(default=30, env="CHUNK_DURATION_MINUTES")
-    cleanup_temp_files: bool = Field(default=True, env="CLEANUP_TEMP_FILES")
-    keep_intermediate_files: bool = Field(default=False, env="KEEP_INTERMEDIATE_FILES")
-    max_retries: int = Field(default=3, env="MAX_RETRIES")
-    
-    class Config:
-        env_file = "/app/config/.env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
-        extra = "ignore"  # Ignore extra fields from .env
-    
-    def load_secrets(self) -> dict:
-        """Load secrets from JSON file."""
-        secrets_file = Path(self.secrets_path)
-        if secrets_file.exists():
-            with open(secrets_file, 'r') as f:
-                return json.load(f)
-        return {}
-    
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get config value by key."""
-        return getattr(self, key.lower(), default)
+def __getattr__(name: str) -> Any:
+    """Resolve PipelineConfig / PYDANTIC_AVAILABLE lazily (pydantic import)."""
+    if name in ("PipelineConfig", "PYDANTIC_AVAILABLE"):
+        from shared import pipeline_config
+        return getattr(pipeline_config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Config cache for performance optimization (Phase 3)
@@ -320,12 +44,24 @@ def load_config(env_file: Optional[str] = None, force_reload: bool = False) -> A
     # Generate cache key
     cache_key = env_file if env_file else os.getenv('CONFIG_PATH', 'default')
     
+    # Inside a pipeline run (and without an explicit env_file) settings
+    # come from the job config snapshot, shared with config_loader
+    snapshot = None
+    if env_file is None:
+        from shared.job_config import active_job_config
+        snapshot = active_job_config()
+        if snapshot is not None:
+            cache_key = f"job:{snapshot.job_dir}"
+    
     # Return cached config if available and not forcing reload
     if not force_reload and cache_key in _CONFIG_CACHE:
         return _CONFIG_CACHE[cache_key]
     
     # Load from disk
-    if not PYDANTIC_AVAILABLE:
+    from shared.pipeline_config import PYDANTIC_AVAILABLE, PipelineConfig
+    if snapshot is not None and PYDANTIC_AVAILABLE:
+        config = _pipeline_config_from_snapshot(snapshot)
+    elif not PYDANTIC_AVAILABLE:
         # Fallback to simple Config when pydantic_settings not available
         # Path is already imported at module level (line 7)
         project_root = Path(__file__).parent.parent
@@ -339,7 +75,8 @@ def load_config(env_file: Optional[str] = None, force_reload: bool = False) -> A
             config = PipelineConfig(_env_file=env_file)
         else:
             config = PipelineConfig()
-        
+    
+    if PYDANTIC_AVAILABLE:
         # Load secrets and merge into config
         secrets = config.load_secrets()
         if secrets:
@@ -359,6 +96,37 @@ def load_config(env_file: Optional[str] = None, force_reload: bool = False) -> A
     return config
 
 
+def _pipeline_config_from_snapshot(snapshot: Any) -> Any:
+    """
+    Build PipelineConfig from a job config snapshot (no .env parsing)
+    
+    Values that fail field validation are dropped so the field keeps its
+    default, as one bad line in a .env file would otherwise do.
+    
+    Args:
+        snapshot: JobConfigSnapshot
+        
+    Returns:
+        PipelineConfig
+    """
+    from pydantic import ValidationError
+    from shared.pipeline_config import PipelineConfig
+    
+    fields = PipelineConfig.model_fields
+    values = {key.lower(): value for key, value in snapshot.settings.items()
+              if value != "" and key.lower() in fields}
+    # Every field is passed, so pydantic-settings does not fill the rest
+    # from plain shell variables the snapshot deliberately ignored
+    defaults = {name: info.get_default(call_default_factory=True) for name, info in fields.items()
+                if not info.is_required()}
+    try:
+        return PipelineConfig(_env_file=None, **dict(defaults, **values))
+    except ValidationError as e:
+        invalid = {err["loc"][0] for err in e.errors() if err.get("loc")}
+        return PipelineConfig(_env_file=None, **dict(defaults, **{k: v for k, v in values.items()
+                                                                   if k not in invalid}))
+
+
 def clear_config_cache() -> None:
     """
     Clear the config cache.
@@ -367,6 +135,74 @@ def clear_config_cache() -> None:
     """
     global _CONFIG_CACHE
     _CONFIG_CACHE.clear()
+    _ENV_FILE_CACHE.clear()
+    _ENV_CONFIG_CACHE.clear()
+    from shared.job_config import clear_job_config_cache
+    clear_job_config_cache()
+
+
+# Parsed KEY=value files and Config instances, one parse per process
+_ENV_FILE_CACHE: Dict[str, Dict[str, str]] = {}
+_ENV_CONFIG_CACHE: Dict[str, 'Config'] = {}
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """Parse a KEY=value file once per process (same rules as Config)."""
+    if path not in _ENV_FILE_CACHE:
+        values: Dict[str, str] = {}
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#') or '=' not in line:
+                        continue
+                    key, value = line.split('=', 1)
+                    values[key.strip().upper()] = value.split('#')[0].strip().strip('"').strip("'")
+        except OSError:
+            pass
+        _ENV_FILE_CACHE[path] = values
+    return _ENV_FILE_CACHE[path]
+
+
+def get_setting(key: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Look up one setting without building PipelineConfig.
+    
+    Same precedence as load_config(): environment variable, then the
+    CONFIG_PATH env file, then the default. Cheap enough for hot paths
+    such as logger construction.
+    
+    Args:
+        key: Setting name (e.g., 'LOG_LEVEL')
+        default: Value when unset or empty
+    
+    Returns:
+        Setting value as a string, or default
+    """
+    value = os.getenv(key)
+    if value is None:
+        config_path = os.getenv('CONFIG_PATH')
+        if config_path:
+            value = _read_env_file(config_path).get(key.upper())
+    return value if value else default
+
+
+def load_env_config(project_root: Optional[Path] = None, force_reload: bool = False) -> 'Config':
+    """
+    Cached Config for config/.env.pipeline (parsed once per process).
+    
+    Args:
+        project_root: Project root (default: this repository)
+        force_reload: Re-read the file
+    
+    Returns:
+        Shared Config instance
+    """
+    root = Path(project_root) if project_root else Path(__file__).parent.parent
+    key = str(root.resolve())
+    if force_reload or key not in _ENV_CONFIG_CACHE:
+        _ENV_CONFIG_CACHE[key] = Config(root)
+    return _ENV_CONFIG_CACHE[key]
 
 
 class Config:
@@ -31,12 +31,14 @@ _CONFIG_CACHE: Dict[str, 'Config'] = {}
 class Config:
     """Configuration container for whisperx-app"""
 
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(self, project_root: Optional[Path] = None, values: Optional[Dict[str, str]] = None):
         """
         Initialize configuration.
         
         Args:
             project_root: Path to project root directory. If None, auto-detects.
+            values: Already-resolved raw settings (job config snapshot)
+                instead of reading .env.pipeline
         """
         if project_root is None:
             # Default: go up one level from scripts/ to project root
@@ -50,7 +52,10 @@ class Config:
         self._env: Dict[str, Any] = {}
         self._secrets: Dict[str, str] = {}
 
-        self._load_env()
+        if values is None:
+            self._load_env()
+        else:
+            self._set_env(values)
         self._load_secrets()
 
     def _load_env(self) -> None:
@@ -59,9 +64,10 @@ class Config:
             raise FileNotFoundError(f"Config file not found: {self.env_file}")
 
         # Load all values as strings first
-        raw_env = dotenv_values(str(self.env_file))
+        self._set_env(dotenv_values(str(self.env_file)))
 
-        # Convert types
+    def _set_env(self, raw_env: Dict[str, Optional[str]]) -> None:
+        """Convert raw string values to bool/int/float"""
         for key, value in raw_env.items():
             if value is None or value == "":
                 self._env[key] = None
@@ -278,6 +284,26 @@ class Config:
         """Get subtitle_min_duration configuration value."""
         return self.get("SUBTITLE_MIN_DURATION", 1.0)
 
+    @property
+    def subtitle_max_duration(self) -> float:
+        """Get subtitle_max_duration configuration value."""
+        return self.get("SUBTITLE_MAX_DURATION", 7.0)
+
+    @property
+    def subtitle_reflow_enabled(self) -> bool:
+        """Get subtitle_reflow_enabled configuration value."""
+        return self.get("SUBTITLE_REFLOW_ENABLED", True)
+
+    @property
+    def cps_hard_cap(self) -> float:
+        """Get cps_hard_cap configuration value."""
+        return self.get("CPS_HARD_CAP", 17.0)
+
+    @property
+    def cps_enforcement(self) -> bool:
+        """Get cps_enforcement configuration value."""
+        return self.get("CPS_ENFORCEMENT", True)
+
     # Phase 4: Translation Protection and Validation
     @property
     def translation_glossary_protection(self) -> bool:
@@ -413,15 +439,28 @@ def load_config(project_root: Optional[Path] = None, force_reload: bool = False)
         >>> logger.info(config.hf_token)
         'hf_...'
     """
-    # Generate cache key
-    cache_key = str(project_root) if project_root else 'default'
+    # Generate cache key (resolved root, so load_config() and
+    # load_config(PROJECT_ROOT) share one parse per process)
+    if project_root is None:
+        project_root = Path(__file__).parent.parent
+    cache_key = str(Path(project_root).resolve())
+    
+    # Inside a pipeline run, settings come from the job config snapshot
+    # (same resolution as shared.config.load_config)
+    from shared.job_config import active_job_config
+    snapshot = active_job_config()
+    if snapshot is not None:
+        cache_key = f"{cache_key}|{snapshot.job_dir}"
     
     # Return cached config if available and not forcing reload
     if not force_reload and cache_key in _CONFIG_CACHE:
         return _CONFIG_CACHE[cache_key]
     
     # Load from disk
-    config = Config(project_root)
+    if snapshot is not None:
+        config = Config(project_root, values=dict(snapshot.settings))
+    else:
+        config = Config(project_root)
     
     # Cache for future use
     _CONFIG_CACHE[cache_key] = config
@@ -437,3 +476,5 @@ def clear_config_cache() -> None:
     """
     global _CONFIG_CACHE
     _CONFIG_CACHE.clear()
+    from shared.job_config import clear_job_config_cache
+    clear_job_config_cache()
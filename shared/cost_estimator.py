@@ -113,6 +113,12 @@ class CostEstimator:
         Returns:
             Duration in seconds
         """
+        # Demuxed audio carries its duration in the demux analysis
+        from shared.demux_analysis import load_analysis
+        analysis = load_analysis(audio_path)
+        if analysis:
+            return float(analysis['duration'])
+        
         try:
             # Try WAV file first (most common for processing)
             with wave.open(str(audio_path), 'rb') as wav:
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Single-decode demux with in-flight audio analysis
+
+Handles:
+- Decoding the input media once (ffmpeg → 16 kHz mono s16le on a pipe)
+- Writing audio.wav from that stream
+- Computing, from the same samples, everything later consumers used to
+  re-derive by decoding/probing the media again:
+  duration, PCM content hash, loudness (RMS/peak) and RMS envelope,
+  the ML feature vector (SNR, speech ratio, spectral complexity) and the
+  spectral/energy fingerprint used by the similarity optimizer
+- Persisting the result as audio_analysis.json next to audio.wav and
+  loading it back (validated against the WAV's size/mtime)
+
+Consumers (ml_features, AudioFingerprint, cost_estimator,
+similarity_optimizer) call load_analysis() first and only fall back to
+their own decode when no valid analysis exists.
+
+Module: shared/demux_analysis.py
+"""
+
+# Standard library
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Third-party
+import numpy as np
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+ANALYSIS_FILENAME = "audio_analysis.json"
+ANALYSIS_VERSION = 1
+SAMPLE_RATE = 16000
+ENVELOPE_HOP_SECONDS = 1.0
+FEATURE_SECONDS = 30.0
+ENERGY_PROFILE_BINS = 10
+READ_BLOCK_SECONDS = 10.0
+
+_SILENCE_DB = -120.0
+
+
+def _to_db(rms: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """Linear amplitude (full scale = 1.0) to dBFS, floored at -120 dB"""
+    return np.maximum(20.0 * np.log10(np.maximum(rms, 1e-6)), _SILENCE_DB)
+
+
+def _frame(samples: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """Strided (n_frames, frame_length) view over samples (no copy)"""
+    if len(samples) < frame_length:
+        samples = np.pad(samples, (0, frame_length - len(samples)))
+    view = np.lib.stride_tricks.sliding_window_view(samples, frame_length)
+    return view[::hop_length]
+
+
+def compute_features(samples: np.ndarray, sr: int = SAMPLE_RATE) -> Dict[str, float]:
+    """
+    NumPy port of the MediaFeatureExtractor metrics on an in-memory excerpt.
+
+    Same definitions as shared/ml_features.py (25 ms/10 ms RMS frames for
+    SNR and speech ratio; centroid/bandwidth/rolloff for complexity), plus
+    the spectral summary the similarity fingerprint stores.
+
+    Args:
+        samples: Mono float32 samples in [-1, 1]
+        sr: Sample rate
+
+    Returns:
+        Dict with snr, speech_ratio, complexity and spectral_* keys
+    """
+    features = {
+        'snr': 15.0,
+        'speech_ratio': 0.8,
+        'complexity': 0.5,
+        'spectral_centroid_mean': 0.0,
+        'spectral_centroid_std': 0.0,
+        'spectral_rolloff_mean': 0.0,
+        'zero_crossing_rate': 0.0,
+    }
+    if len(samples) < int(sr * 0.025):
+        return features
+
+    # Frame RMS → SNR and speech ratio
+    rms = np.sqrt(np.mean(_frame(samples, int(sr * 0.025), int(sr * 0.010)) ** 2, axis=1))
+    threshold = np.percentile(rms, 25)
+    signal, noise = rms[rms > threshold], rms[rms <= threshold]
+    if len(signal) and len(noise):
+        noise_power = np.mean(noise ** 2)
+        if noise_power == 0:
+            features['snr'] = 30.0
+        else:
+            snr = 10 * np.log10(np.mean(signal ** 2) / noise_power)
+            features['snr'] = float(np.clip(snr, 0, 40))
+    speech = np.sum(rms > np.percentile(rms, 30)) / len(rms)
+    features['speech_ratio'] = float(np.clip(speech, 0.3, 1.0))
+
+    # Magnitude spectrogram → centroid, bandwidth, rolloff
+    n_fft, hop = 2048, 512
+    frames = _frame(samples, n_fft, hop) * np.hanning(n_fft).astype(np.float32)
+    mag = np.abs(np.fft.rfft(frames, axis=1))
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sr)
+    total = mag.sum(axis=1) + 1e-10
+    centroid = (mag @ freqs) / total
+    bandwidth = np.sqrt((mag * (freqs[None, :] - centroid[:, None]) ** 2).sum(axis=1) / total)
+    cumulative = np.cumsum(mag, axis=1)
+    rolloff = freqs[np.argmax(cumulative >= 0.85 * cumulative[:, -1:], axis=1)]
+
+    complexity = (
+        0.4 * np.std(centroid) / (np.mean(centroid) + 1e-6) +
+        0.3 * np.mean(bandwidth) / (sr / 2) +
+        0.3 * np.std(rolloff) / (np.mean(rolloff) + 1e-6)
+    )
+    features['complexity'] = float(np.clip(complexity, 0, 1))
+    features['spectral_centroid_mean'] = float(np.mean(centroid))
+    features['spectral_centroid_std'] = float(np.std(centroid))
+    features['spectral_rolloff_mean'] = float(np.mean(rolloff))
+
+    signs = np.signbit(samples)
+    features['zero_crossing_rate'] = float(np.mean(signs[1:] != signs[:-1]))
+    return features
+
+
+class AudioAnalyzer:
+    """
+    Incremental analysis over a stream of int16 PCM blocks.
+
+    Keeps O(1) state per envelope hop plus the first FEATURE_SECONDS of
+    samples (for the spectral features), so peak memory is independent of
+    media duration.
+
+    Example:
+        >>> analyzer = AudioAnalyzer()
+        >>> for block in blocks:
+        ...     analyzer.update(block)
+        >>> analysis = analyzer.result()
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        envelope_hop: float = ENVELOPE_HOP_SECONDS,
+        feature_seconds: float = FEATURE_SECONDS
+    ):
+        self.sample_rate = sample_rate
+        self.envelope_hop = envelope_hop
+        self._hop_samples = max(1, int(round(envelope_hop * sample_rate)))
+        self._feature_samples = int(feature_seconds * sample_rate)
+        self._head: List[np.ndarray] = []
+        self._head_len = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._envelope: List[float] = []
+        self._sha = hashlib.sha256()
+        self.num_samples = 0
+        self._sum_squares = 0.0
+        self._peak = 0.0
+
+    def update(self, block: Union[bytes, np.ndarray]) -> None:
+        """
+        Feed the next block of little-endian int16 mono PCM.
+
+        Args:
+            block: Raw s16le bytes or an int16 array
+        """
+        pcm = np.frombuffer(block, dtype='<i2') if isinstance(block, (bytes, bytearray)) else block
+        if len(pcm) == 0:
+            return
+        self._sha.update(pcm.astype('<i2', copy=False).tobytes())
+        samples = pcm.astype(np.float32) / 32768.0
+
+        self.num_samples += len(samples)
+        self._sum_squares += float(np.dot(samples, samples))
+        self._peak = max(self._peak, float(np.max(np.abs(samples))))
+
+        if self._head_len < self._feature_samples:
+            take = samples[:self._feature_samples - self._head_len]
+            self._head.append(take)
+            self._head_len += len(take)
+
+        if len(self._pending):
+            samples = np.concatenate([self._pending, samples])
+        full = len(samples) // self._hop_samples * self._hop_samples
+        if full:
+            hops = samples[:full].reshape(-1, self._hop_samples)
+            self._envelope.extend(np.sqrt(np.mean(hops ** 2, axis=1)).tolist())
+        self._pending = samples[full:]
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Finish the stream and build the analysis record.
+
+        Returns:
+            Dict with duration, pcm_sha256, loudness, envelope, features
+            and energy_profile
+        """
+        envelope = list(self._envelope)
+        if len(self._pending):
+            envelope.append(float(np.sqrt(np.mean(self._pending ** 2))))
+        envelope_arr = np.asarray(envelope, dtype=np.float64)
+
+        head = np.concatenate(self._head) if self._head else np.zeros(0, dtype=np.float32)
+        features = compute_features(head, self.sample_rate)
+        duration = self.num_samples / self.sample_rate
+        rms = np.sqrt(self._sum_squares / self.num_samples) if self.num_samples else 0.0
+
+        return {
+            'duration': round(duration, 3),
+            'sample_rate': self.sample_rate,
+            'channels': 1,
+            'num_samples': self.num_samples,
+            'pcm_sha256': self._sha.hexdigest(),
+            'loudness': {
+                'rms_dbfs': round(float(_to_db(rms)), 2),
+                'peak_dbfs': round(float(_to_db(self._peak)), 2),
+                'envelope_p10_dbfs': round(float(_to_db(np.percentile(envelope_arr, 10))), 2) if len(envelope) else _SILENCE_DB,
+                'envelope_p90_dbfs': round(float(_to_db(np.percentile(envelope_arr, 90))), 2) if len(envelope) else _SILENCE_DB,
+            },
+            'envelope': {
+                'hop_seconds': self.envelope_hop,
+                'rms_dbfs': [round(float(v), 1) for v in _to_db(envelope_arr)] if len(envelope) else [],
+            },
+            'features': {
+                'duration': round(duration, 3),
+                'snr': round(features['snr'], 3),
+                'speech_ratio': round(features['speech_ratio'], 4),
+                'complexity': round(features['complexity'], 4),
+                'sample_rate': self.sample_rate,
+                'channels': 1,
+            },
+            'spectral_features': {
+                key: round(features[key], 4) for key in (
+                    'spectral_centroid_mean', 'spectral_centroid_std',
+                    'spectral_rolloff_mean', 'zero_crossing_rate'
+                )
+            },
+            'energy_profile': _energy_profile(envelope_arr),
+        }
+
+
+def _energy_profile(envelope: np.ndarray, bins: int = ENERGY_PROFILE_BINS) -> List[float]:
+    """Mean RMS in `bins` equal time slices, normalized to the loudest slice"""
+    if len(envelope) == 0:
+        return [0.0] * bins
+    profile = np.array([chunk.mean() if len(chunk) else 0.0 for chunk in np.array_split(envelope, bins)])
+    peak = profile.max()
+    if peak > 0:
+        profile = profile / peak
+    return [round(float(v), 4) for v in profile]
+
+
+def demux_audio(
+    input_media: Path,
+    audio_output: Path,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    quiet: bool = True,
+    env: Optional[Dict[str, str]] = None,
+    media_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Extract 16 kHz mono PCM and analyze it in a single decode.
+
+    ffmpeg writes raw s16le to a pipe; each block is written to
+    audio.wav and fed to AudioAnalyzer. The analysis is saved as
+    audio_analysis.json next to the WAV.
+
+    Args:
+        input_media: Source media file
+        audio_output: Destination WAV path
+        start_time: Optional clip start (ffmpeg time syntax)
+        end_time: Optional clip end (ffmpeg time syntax)
+        quiet: Pass -loglevel error to ffmpeg
+        env: Environment for the ffmpeg process
+        media_id: Precomputed media ID (computed via compute_media_id if None)
+
+    Returns:
+        Analysis dict (as written to audio_analysis.json)
+
+    Raises:
+        subprocess.CalledProcessError: If ffmpeg fails (stderr attached as text)
+    """
+    input_media = Path(input_media)
+    audio_output = Path(audio_output)
+
+    cmd = ["ffmpeg", "-y", "-nostdin"]
+    if quiet:
+        cmd.extend(["-loglevel", "error"])
+    if start_time:
+        cmd.extend(["-ss", str(start_time)])
+    cmd.extend(["-i", str(input_media)])
+    if end_time:
+        cmd.extend(["-to", str(end_time)])
+    cmd.extend([
+        "-vn",
+        "-acodec", "pcm_s16le",
+        "-ar", str(SAMPLE_RATE),
+        "-ac", "1",
+        "-f", "s16le",
+        "pipe:1"
+    ])
+
+    logger.debug(f"Running ffmpeg: {' '.join(cmd)}")
+    analyzer = AudioAnalyzer()
+    block_bytes = int(READ_BLOCK_SECONDS * SAMPLE_RATE) * 2
+    started = time.time()
+
+    # stderr goes to a temp file: ffmpeg progress output can exceed the
+    # pipe buffer and would otherwise stall the stdout reader
+    with tempfile.TemporaryFile() as stderr_file:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, env=env)
+        try:
+            with wave.open(str(audio_output), 'wb') as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(SAMPLE_RATE)
+                while True:
+                    block = proc.stdout.read(block_bytes)
+                    if not block:
+                        break
+                    wav.writeframesraw(block)
+                    analyzer.update(block)
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode('utf-8', errors='replace')
+            audio_output.unlink(missing_ok=True)
+            raise subprocess.CalledProcessError(returncode, cmd, output="", stderr=stderr)
+
+    analysis = analyzer.result()
+    if analysis['num_samples'] == 0:
+        audio_output.unlink(missing_ok=True)
+        raise subprocess.CalledProcessError(
+            1, cmd, output="", stderr="Output file does not contain any stream (no audio decoded)"
+        )
+
+    if media_id is None:
+        try:
+            from shared.media_identity import compute_media_id
+            media_id = compute_media_id(input_media)
+        except Exception as e:
+            logger.warning(f"Could not compute media ID: {e}")
+
+    stat = audio_output.stat()
+    analysis.update({
+        'version': ANALYSIS_VERSION,
+        'media_id': media_id,
+        'input_media': str(input_media),
+        'clip': {'start_time': start_time or None, 'end_time': end_time or None},
+        'audio': {
+            'path': audio_output.name,
+            'size_bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        },
+        'decode_seconds': round(time.time() - started, 3),
+    })
+    save_analysis(analysis, audio_output)
+    return analysis
+
+
+def analysis_path(audio_path: Path) -> Path:
+    """Location of the analysis record for a demuxed WAV"""
+    return Path(audio_path).parent / ANALYSIS_FILENAME
+
+
+def save_analysis(analysis: Dict[str, Any], audio_path: Path) -> Path:
+    """Atomically write audio_analysis.json next to the WAV"""
+    path = analysis_path(audio_path)
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(analysis, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def load_analysis(audio_path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Load the demux analysis for a WAV, if present and still valid.
+
+    The record is only returned when the WAV's size and mtime match what
+    was recorded at demux time, so a replaced/re-extracted audio.wav never
+    reuses stale numbers.
+
+    Args:
+        audio_path: Path to the demuxed audio.wav
+
+    Returns:
+        Analysis dict, or None
+    """
+    audio_path = Path(audio_path)
+    path = analysis_path(audio_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            analysis = json.load(f)
+        stat = audio_path.stat()
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    audio = analysis.get('audio', {})
+    if (analysis.get('version') != ANALYSIS_VERSION
+            or audio.get('path') != audio_path.name
+            or audio.get('size_bytes') != stat.st_size
+            or audio.get('mtime_ns') != stat.st_mtime_ns):
+        return None
+    return analysis
+
+
+def manifest_summary(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact view of the analysis for the stage manifest (no envelope)"""
+    return {
+        'analysis_file': ANALYSIS_FILENAME,
+        'media_id': analysis.get('media_id'),
+        'duration': analysis.get('duration'),
+        'sample_rate': analysis.get('sample_rate'),
+        'pcm_sha256': analysis.get('pcm_sha256'),
+        'loudness': analysis.get('loudness'),
+        'features': analysis.get('features'),
+    }
+
+
+__all__ = [
+    'ANALYSIS_FILENAME',
+    'AudioAnalyzer',
+    'compute_features',
+    'demux_audio',
+    'analysis_path',
+    'save_analysis',
+    'load_analysis',
+    'manifest_summary',
+]
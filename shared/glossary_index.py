@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Glossary Index - precompiled phrase matcher for glossary application
+
+Merges the glossary sources into one priority-resolved table and compiles it
+into a token trie over normalized (NFC + casefolded) forms, so that applying
+the glossary to a segment is a single left-to-right scan with
+leftmost-longest phrase matching ("Aamir Khan" wins over "Aamir").
+
+The compiled trie is serialized to disk as JSON keyed by a hash of the
+merged glossary content, so unchanged glossaries are never recompiled.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import hashlib
+import json
+import os
+import re
+import string
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Local
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+INDEX_VERSION = 1
+
+# Glossary sources from lowest to highest priority
+SOURCES = ('learned', 'master', 'tmdb', 'film')
+
+DEFAULT_INDEX_DIR = Path.home() / '.cp-whisperx' / 'cache' / 'glossary_index'
+
+# Payload key inside trie nodes (tokens are never empty)
+_LEAF = ''
+
+_PUNCT = re.escape(string.punctuation.replace("'", '') + '“”‘’«»…–—।॥¿¡')
+# A token is a run of non-space, non-punctuation characters (combining marks
+# included, so Devanagari words stay whole), with inner apostrophes allowed.
+_TOKEN_RE = re.compile(rf"[^\s{_PUNCT}']+(?:['’][^\s{_PUNCT}']+)*")
+# What may separate two tokens of one phrase
+_JOINER_RE = re.compile(r"\s+|\s*-\s*")
+
+
+def normalize_token(token: str) -> str:
+    """Normalized lookup form of a single token."""
+    return unicodedata.normalize('NFC', token).casefold()
+
+
+def normalize_phrase(phrase: str) -> Tuple[str, ...]:
+    """
+    Normalized token tuple of a glossary phrase
+
+    Args:
+        phrase: Source term, e.g. "Aamir Khan"
+
+    Returns:
+        Tuple of normalized tokens, e.g. ('aamir', 'khan')
+    """
+    return tuple(normalize_token(m.group()) for m in _TOKEN_RE.finditer(phrase))
+
+
+def merge_sources(sources: Dict[str, Dict[str, str]]) -> Dict[Tuple[str, ...], Tuple[str, str]]:
+    """
+    Merge resolved glossary sources by priority
+
+    Args:
+        sources: Source name (see SOURCES) -> {term: translation}
+
+    Returns:
+        Normalized phrase -> (translation, source name); higher priority
+        sources override lower ones, first spelling wins within a source
+    """
+    merged: Dict[Tuple[str, ...], Tuple[str, str]] = {}
+    for name in SOURCES:
+        seen = set()
+        for term, translation in sources.get(name, {}).items():
+            key = normalize_phrase(term)
+            if not key or not translation or key in seen:
+                continue
+            seen.add(key)
+            merged[key] = (translation, name)
+    return merged
+
+
+def content_hash(entries: Dict[Tuple[str, ...], Tuple[str, str]]) -> str:
+    """Stable hash of merged glossary entries (and the index format)."""
+    payload = json.dumps(
+        [INDEX_VERSION, sorted([list(k), v[0], v[1]] for k, v in entries.items())],
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GlossaryIndex:
+    """
+    Compiled glossary phrase index
+
+    Usage:
+        index = GlossaryIndex.load_or_build({
+            'master': {'yaar': 'dude'},
+            'tmdb': {'Aamir Khan': 'Aamir Khan', 'Rancho': 'Rancho'},
+        })
+        text, hits = index.apply("Hey yaar, where is Rancho?")
+        texts, hits = index.apply_bulk(segment_texts)
+    """
+
+    def __init__(self, trie: Dict, digest: str, terms: int, max_tokens: int):
+        """
+        Initialize from a compiled trie (use build() or load())
+
+        Args:
+            trie: Nested token dict; leaf payload is [translation, source]
+            digest: Content hash of the merged glossary
+            terms: Number of phrases in the trie
+            max_tokens: Longest phrase length in tokens
+        """
+        self.trie = trie
+        self.digest = digest
+        self.terms = terms
+        self.max_tokens = max_tokens
+
+    def __len__(self) -> int:
+        return self.terms
+
+    @classmethod
+    def build(cls, sources: Dict[str, Dict[str, str]]) -> 'GlossaryIndex':
+        """
+        Compile resolved glossary sources into an index
+
+        Args:
+            sources: Source name -> {term: translation}
+
+        Returns:
+            Compiled GlossaryIndex
+        """
+        return cls._compile(merge_sources(sources))
+
+    @classmethod
+    def _compile(cls, entries: Dict[Tuple[str, ...], Tuple[str, str]]) -> 'GlossaryIndex':
+        trie: Dict = {}
+        for key, (translation, source) in entries.items():
+            node = trie
+            for token in key:
+                node = node.setdefault(token, {})
+            node[_LEAF] = [translation, source]
+        max_tokens = max((len(k) for k in entries), default=0)
+        return cls(trie, content_hash(entries), len(entries), max_tokens)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        sources: Dict[str, Dict[str, str]],
+        index_dir: Optional[Path] = None
+    ) -> 'GlossaryIndex':
+        """
+        Load the compiled index for these sources from disk, compiling and
+        saving it on a miss
+
+        Args:
+            sources: Source name -> {term: translation}
+            index_dir: Directory of serialized indexes (default: user cache)
+
+        Returns:
+            Compiled GlossaryIndex
+        """
+        entries = merge_sources(sources)
+        digest = content_hash(entries)
+        path = Path(index_dir or DEFAULT_INDEX_DIR) / f"{digest[:32]}.json"
+
+        index = cls.load(path, digest)
+        if index is not None:
+            logger.debug(f"Loaded glossary index {path.name} ({index.terms} terms)")
+            return index
+
+        index = cls._compile(entries)
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"Could not cache glossary index: {e}")
+        return index
+
+    @classmethod
+    def load(cls, path: Path, digest: Optional[str] = None) -> Optional['GlossaryIndex']:
+        """
+        Load a serialized index
+
+        Args:
+            path: Index file
+            digest: Expected content hash (None to accept any)
+
+        Returns:
+            GlossaryIndex, or None if missing, stale or unreadable
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        if digest is not None and data.get('hash') != digest:
+            return None
+        return cls(data['trie'], data['hash'], data['terms'], data['max_tokens'])
+
+    def save(self, path: Path) -> None:
+        """Serialize the index atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'hash': self.digest,
+                'terms': self.terms,
+                'max_tokens': self.max_tokens,
+                'trie': self.trie,
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def scan(self, text: str) -> Tuple[List[Tuple[int, int, str, str]], int]:
+        """
+        Find leftmost-longest glossary phrases in text
+
+        Args:
+            text: Input text
+
+        Returns:
+            (matches, unmatched) where matches are (start, end, translation,
+            source) character spans and unmatched counts tokens not covered
+        """
+        tokens = list(_TOKEN_RE.finditer(text))
+        count = len(tokens)
+        if not count or not self.trie:
+            return [], count
+
+        keys = [normalize_token(m.group()) for m in tokens]
+        # joinable[i]: tokens i and i+1 may belong to one phrase
+        joinable = [
+            _JOINER_RE.fullmatch(text, tokens[i].end(), tokens[i + 1].start()) is not None
+            for i in range(count - 1)
+        ]
+
+        matches = []
+        unmatched = 0
+        root = self.trie
+        i = 0
+        while i < count:
+            node = root.get(keys[i])
+            best = None
+            j = i
+            while node is not None:
+                if _LEAF in node:
+                    best = (j, node[_LEAF])
+                if j + 1 >= count or not joinable[j]:
+                    break
+                j += 1
+                node = node.get(keys[j])
+            if best is None:
+                unmatched += 1
+                i += 1
+                continue
+            last, (translation, source) = best
+            matches.append((tokens[i].start(), tokens[last].end(), translation, source))
+            i = last + 1
+        return matches, unmatched
+
+    def apply(self, text: str) -> Tuple[str, Counter]:
+        """
+        Replace glossary phrases in text, keeping surrounding punctuation
+        and spacing
+
+        Args:
+            text: Input text
+
+        Returns:
+            (new_text, hits) where hits counts matches per source plus
+            'misses' for unmatched tokens
+        """
+        matches, unmatched = self.scan(text)
+        hits = Counter({'misses': unmatched}) if unmatched else Counter()
+        if not matches:
+            return text, hits
+
+        parts = []
+        pos = 0
+        for start, end, translation, source in matches:
+            parts.append(text[pos:start])
+            # Keep sentence-initial capitals ("Yaar," -> "Dude,")
+            if text[start].isupper() and translation[:1].islower():
+                translation = translation[0].upper() + translation[1:]
+            parts.append(translation)
+            pos = end
+            hits[source] += 1
+        parts.append(text[pos:])
+        return ''.join(parts), hits
+
+    def apply_bulk(self, texts: Iterable[str]) -> Tuple[List[str], Counter]:
+        """
+        Apply the glossary to many texts
+
+        Args:
+            texts: Input texts (e.g. all segment texts of a job)
+
+        Returns:
+            (new_texts, hits) with hits summed over all texts
+        """
+        results = []
+        total: Counter = Counter()
+        for text in texts:
+            new_text, hits = self.apply(text)
+            results.append(new_text)
+            total.update(hits)
+        return results, total
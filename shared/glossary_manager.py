@@ -74,7 +74,8 @@ class UnifiedGlossaryManager:
         enable_cache: bool = True,
         enable_learning: bool = False,
         strategy: str = 'cascade',
-        logger: Optional[logging.Logger] = None
+        logger: Optional[logging.Logger] = None,
+        index_dir: Optional[Path] = None
     ):
         """
         Initialize unified glossary manager
@@ -88,6 +89,8 @@ class UnifiedGlossaryManager:
             enable_learning: Enable frequency-based learning
             strategy: Term selection strategy (cascade|frequency|context|ml)
             logger: Optional logger instance
+            index_dir: Directory for compiled glossary indexes
+                (default: ~/.cp-whisperx/cache/glossary_index)
         """
         self.project_root = Path(project_root)
         self.film_title = film_title
@@ -107,6 +110,10 @@ class UnifiedGlossaryManager:
         # Statistics
         self.stats = defaultdict(int)
         
+        # Compiled phrase index (built lazily on first apply)
+        self.index_dir = index_dir
+        self._index = None
+        
         # Cache manager
         if enable_cache:
             from shared.glossary_cache import GlossaryCache
@@ -433,6 +440,48 @@ class UnifiedGlossaryManager:
         else:
             return translations[0]
     
+    def get_index(self) -> Optional['GlossaryIndex']:
+        """
+        Get the compiled phrase index (built or loaded from disk on first use)
+        
+        Returns:
+            GlossaryIndex over all sources, or None if glossary not loaded
+        """
+        if not self.loaded:
+            return None
+        
+        if self._index is None:
+            from shared.glossary_index import GlossaryIndex
+            
+            def resolve(glossary: Dict[str, List[str]]) -> Dict[str, str]:
+                return {
+                    term: self._select_best_translation(term, translations, None, self.strategy)
+                    for term, translations in glossary.items()
+                }
+            
+            sources = {
+                'film': resolve(self.film_specific),
+                'tmdb': resolve(self.tmdb_glossary),
+                'master': resolve(self.master_glossary),
+                'learned': {
+                    term: max(freqs.items(), key=lambda x: x[1])[0]
+                    for term, freqs in self.learned_terms.items() if freqs
+                },
+            }
+            self._index = GlossaryIndex.load_or_build(sources, self.index_dir)
+            self.logger.debug(
+                f"Glossary index ready: {len(self._index)} terms, "
+                f"phrases up to {self._index.max_tokens} words"
+            )
+        
+        return self._index
+    
+    def _record_hits(self, hits: Dict[str, int]) -> None:
+        """Fold per-source match counts from the index into stats"""
+        for source, count in hits.items():
+            key = source if source == 'misses' else f"{source}_hits"
+            self.stats[key] += count
+    
     def apply_to_text(
         self,
         text: str,
@@ -441,6 +490,9 @@ class UnifiedGlossaryManager:
         """
         Apply glossary to text
         
+        Matches whole words and multi-word phrases case-insensitively,
+        longest match first, keeping punctuation and spacing.
+        
         Args:
             text: Input text
             context: Optional context hint
@@ -452,27 +504,42 @@ class UnifiedGlossaryManager:
             self.logger.warning("Glossary not loaded")
             return text
         
-        # Simple word-by-word replacement
-        words = text.split()
-        result = []
+        result, hits = self.get_index().apply(text)
+        self._record_hits(hits)
+        return result
+    
+    def apply_to_segments(
+        self,
+        segments: List[Dict[str, Any]],
+        context: Optional[str] = None,
+        key: str = 'text'
+    ) -> int:
+        """
+        Apply glossary to all segments in place
         
-        for word in words:
-            # Strip punctuation for lookup
-            clean_word = word.strip('.,!?;:"\'"()[]{}')
-            translation = self.get_term(clean_word, context)
+        Args:
+            segments: Segment dicts
+            context: Optional context hint
+            key: Segment field holding the text
             
-            if translation:
-                # Preserve punctuation
-                if word != clean_word:
-                    prefix = word[:len(word) - len(word.lstrip('.,!?;:"\'"()[]{}'))]
-                    suffix = word[len(word.rstrip('.,!?;:"\'"()[]{}')):]
-                    result.append(f"{prefix}{translation}{suffix}")
-                else:
-                    result.append(translation)
-            else:
-                result.append(word)
-        
-        return ' '.join(result)
+        Returns:
+            Number of segments changed
+        """
+        if not self.loaded:
+            self.logger.warning("Glossary not loaded")
+            return 0
+        
+        targets = [seg for seg in segments if isinstance(seg.get(key), str)]
+        texts = [seg[key] for seg in targets]
+        results, hits = self.get_index().apply_bulk(texts)
+        self._record_hits(hits)
+        
+        changed = 0
+        for seg, old, new in zip(targets, texts, results):
+            if new != old:
+                seg[key] = new
+                changed += 1
+        return changed
     
     def track_usage(
         self,
@@ -497,6 +564,9 @@ class UnifiedGlossaryManager:
         if translation not in self.learned_terms[source_term]:
             self.learned_terms[source_term][translation] = 0.0
         
+        # Learned frequencies feed the compiled index
+        self._index = None
+        
         # Increment frequency
         if success:
             self.learned_terms[source_term][translation] += 1.0
@@ -275,20 +275,36 @@ def detect_gpu_with_torch() -> Tuple[str, Optional[str], Optional[float], Option
         return 'cpu', None, None, None, None
 
 
-def calculate_optimal_batch_size(gpu_type: str, gpu_memory_gb: float, whisper_model: str) -> int:
+def calculate_optimal_batch_size(
+    gpu_type: str,
+    gpu_memory_gb: float,
+    whisper_model: str,
+    compute_type: Optional[str] = None
+) -> int:
     """
     Calculate optimal batch size based on GPU memory and model size.
     
     Phase 3 Enhancement: Smart batch size calculation
     
+    If the adaptive batch controller (shared/batch_controller.py) has
+    already measured an optimum for this host, model and compute type,
+    that value is returned; the static table below is only the seed.
+    
     Args:
         gpu_type: 'cuda', 'mps', or 'cpu'
         gpu_memory_gb: Available GPU memory in GB
         whisper_model: Whisper model name ('base', 'medium', 'large-v3')
+        compute_type: Compute type (e.g. 'int8'), enables the learned lookup
     
     Returns:
         Optimal batch size
     """
+    if compute_type:
+        from shared.batch_controller import get_learned_batch_size
+        learned = get_learned_batch_size(whisper_model, compute_type)
+        if learned is not None:
+            return learned
+    
     if gpu_type == 'cpu':
         return 1
     
@@ -429,7 +445,9 @@ def calculate_optimal_settings(hw_info: Dict) -> Dict:
             settings['estimated_speedup'] = '6-8x vs CPU'
         
         # Smart Batch Size Calculation
-        settings['batch_size'] = calculate_optimal_batch_size(gpu_type, gpu_memory_gb, settings['whisper_model'])
+        settings['batch_size'] = calculate_optimal_batch_size(
+            gpu_type, gpu_memory_gb, settings['whisper_model'], settings.get('compute_type')
+        )
         settings['batch_size_reason'] = f'Auto-calculated for {gpu_memory_gb}GB VRAM + {settings["whisper_model"]} model'
     
     # ========================================================================
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Job Config - one resolved, immutable configuration snapshot per job
+
+The orchestrator resolves every setting once at job start, in order:
+
+    defaults   PipelineConfig field defaults (shared/pipeline_config.py)
+    system     config/.env.pipeline
+    job        the job's .<job_id>.env (written by prepare-job) and job.json
+    env        CPWHISPERX_<KEY> environment variables, for any key set by
+               an earlier layer or declared by PipelineConfig
+
+and writes the result next to job.json as job.resolved.json, exported to
+stage processes as PIPELINE_JOB_CONFIG. Stages then load one small JSON
+file instead of re-parsing .env.pipeline, the job .env and job.json, and
+both shared.config.load_config() and shared.config_loader.load_config()
+are built from the same snapshot, so the two loaders cannot disagree.
+
+    from shared.job_config import load_job_config
+    job_config = load_job_config(stage_io.output_base)
+    threshold = job_config.param("vad", "threshold", "PYANNOTE_VAD_THRESHOLD", 0.5, float)
+
+Plain shell variables (DEVICE, LOG_LEVEL, USER_ID, TITLE, ...) are not
+read: only the prefixed form overrides a job, plus the per-stage values
+run-pipeline exports to stage processes (STAGE_ENV_KEYS).
+
+job.json sections keep their AD-006 priority over flat settings; an
+explicitly set environment variable wins over both.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+# Local
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+SCHEMA_VERSION = 1
+SNAPSHOT_FILE = "job.resolved.json"
+JOB_CONFIG_ENV = "PIPELINE_JOB_CONFIG"
+LAYERS = ("default", "system", "job", "env")
+
+# Environment override of a setting: CPWHISPERX_WHISPER_BATCH_SIZE=4
+SETTING_ENV_PREFIX = "CPWHISPERX_"
+# Plain variables run-pipeline sets for each stage process (see with_env)
+STAGE_ENV_KEYS = ("LOG_LEVEL", "DEBUG_MODE", "PYANNOTE_DEVICE")
+
+# Inline comment on an unquoted value (python-dotenv: whitespace before #)
+_INLINE_COMMENT = re.compile(r"\s+#.*$")
+
+_TRUE = ("true", "yes", "1", "on")
+_FALSE = ("false", "no", "0", "off")
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only view of parsed JSON (dicts become mappingproxy, lists tuples)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Plain JSON-serializable copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def read_env_file(path: Path) -> Dict[str, str]:
+    """
+    Parse a KEY=value file (.env.pipeline, job .env)
+
+    Args:
+        path: File to read
+
+    Quoted values are taken verbatim between the quotes; an unquoted
+    value ends at an inline " #" comment, so a "#" inside a value (tokens,
+    URL fragments) is kept.
+
+    Returns:
+        Raw string values (empty when the file is missing)
+    """
+    values: Dict[str, str] = {}
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                value = value.strip()
+                quote = value[:1]
+                if quote in ('"', "'") and value.find(quote, 1) > 0:
+                    value = value[1:value.find(quote, 1)]
+                elif value.startswith('#'):
+                    value = ""
+                else:
+                    value = _INLINE_COMMENT.sub("", value)
+                values[key.strip()] = value
+    except OSError:
+        pass
+    return values
+
+
+def pipeline_defaults() -> Dict[str, str]:
+    """PipelineConfig field defaults as KEY -> string (empty without pydantic)."""
+    from shared.pipeline_config import PYDANTIC_AVAILABLE, PipelineConfig
+    if not PYDANTIC_AVAILABLE:
+        return {}
+    defaults = {}
+    # pydantic-settings matches .env keys to field names case-insensitively
+    for name, info in PipelineConfig.model_fields.items():
+        if info.default is None or not isinstance(info.default, (str, int, float, bool)):
+            continue
+        defaults[name.upper()] = str(info.default).lower() if isinstance(info.default, bool) else str(info.default)
+    return defaults
+
+
+def known_settings() -> frozenset:
+    """Every PipelineConfig field as a KEY (empty without pydantic)."""
+    from shared.pipeline_config import PYDANTIC_AVAILABLE, PipelineConfig
+    if not PYDANTIC_AVAILABLE:
+        return frozenset()
+    return frozenset(name.upper() for name in PipelineConfig.model_fields)
+
+
+def _env_overrides(environ: Mapping[str, str], keys, plain=()) -> Dict[str, str]:
+    """Environment values for keys: CPWHISPERX_<KEY>, or KEY itself for plain keys."""
+    overrides = {}
+    for key in keys:
+        if SETTING_ENV_PREFIX + key in environ:
+            overrides[key] = environ[SETTING_ENV_PREFIX + key]
+        elif key in plain and key in environ:
+            overrides[key] = environ[key]
+    return overrides
+
+
+def _fingerprint(paths) -> Dict[str, Any]:
+    inputs = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            inputs[str(path)] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            inputs[str(path)] = None
+    return inputs
+
+
+@dataclass(frozen=True)
+class JobConfigSnapshot:
+    """Resolved settings plus job.json for one job (read-only)."""
+
+    job_dir: str
+    settings: Mapping[str, str]
+    sources: Mapping[str, str]
+    job: Mapping[str, Any]
+    inputs: Mapping[str, Any] = field(default_factory=dict)
+    created: float = 0.0
+
+    # ------------------------------------------------------------------
+    # Build / persist
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def resolve(
+        cls,
+        job_dir: Path,
+        project_root: Optional[Path] = None,
+        environ: Optional[Mapping[str, str]] = None,
+        defaults: Optional[Mapping[str, str]] = None
+    ) -> 'JobConfigSnapshot':
+        """
+        Resolve defaults -> system -> job -> env for a job
+
+        Args:
+            job_dir: Job directory (contains job.json)
+            project_root: Project root (default: this repository)
+            environ: Environment (default: os.environ)
+            defaults: Default layer (default: PipelineConfig field defaults)
+
+        Returns:
+            New snapshot
+        """
+        job_dir = Path(job_dir)
+        project_root = Path(project_root) if project_root else Path(__file__).parent.parent
+        environ = os.environ if environ is None else environ
+
+        job_json = job_dir / "job.json"
+        try:
+            with open(job_json, encoding='utf-8') as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            job = {}
+        system_file = project_root / "config" / ".env.pipeline"
+        job_env_file = job_dir / f".{job.get('job_id', '')}.env"
+
+        settings: Dict[str, str] = {}
+        sources: Dict[str, str] = {}
+        layers = (
+            ("default", pipeline_defaults() if defaults is None else defaults),
+            ("system", read_env_file(system_file)),
+            ("job", read_env_file(job_env_file)),
+        )
+        for layer, values in layers:
+            for key, value in values.items():
+                settings[key] = value
+                sources[key] = layer
+        for key, value in _env_overrides(environ, sorted(set(settings) | known_settings())).items():
+            settings[key] = value
+            sources[key] = "env"
+
+        return cls(
+            job_dir=str(job_dir),
+            settings=MappingProxyType(settings),
+            sources=MappingProxyType(sources),
+            job=_freeze(job),
+            inputs=MappingProxyType(_fingerprint((system_file, job_env_file, job_json))),
+            created=time.time(),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form."""
+        return {
+            "version": SCHEMA_VERSION,
+            "job_dir": self.job_dir,
+            "created": self.created,
+            "inputs": dict(self.inputs),
+            "settings": dict(self.settings),
+            "sources": dict(self.sources),
+            "job": _thaw(self.job),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'JobConfigSnapshot':
+        """Rebuild from to_dict() output."""
+        return cls(
+            job_dir=data.get("job_dir", ""),
+            settings=MappingProxyType(dict(data.get("settings", {}))),
+            sources=MappingProxyType(dict(data.get("sources", {}))),
+            job=_freeze(data.get("job", {})),
+            inputs=MappingProxyType(dict(data.get("inputs", {}))),
+            created=data.get("created", 0.0),
+        )
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """
+        Write the snapshot atomically
+
+        Args:
+            path: Target (default: <job_dir>/job.resolved.json)
+
+        Returns:
+            Written path
+        """
+        path = Path(path) if path else Path(self.job_dir) / SNAPSHOT_FILE
+        fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=1, sort_keys=True)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['JobConfigSnapshot']:
+        """Load a saved snapshot (None if missing, unreadable or another schema)."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != SCHEMA_VERSION:
+            return None
+        return cls.from_dict(data)
+
+    def is_stale(self) -> bool:
+        """True if .env.pipeline, the job .env or job.json changed since resolve()."""
+        return dict(self.inputs) != _fingerprint(self.inputs.keys())
+
+    def with_env(self, environ: Optional[Mapping[str, str]] = None) -> 'JobConfigSnapshot':
+        """
+        Re-apply the env layer for this process
+
+        CPWHISPERX_<KEY> variables override as in resolve(). Stage
+        processes also get per-stage values from the orchestrator under
+        their plain names (STAGE_ENV_KEYS), which override too.
+
+        Args:
+            environ: Environment (default: os.environ)
+
+        Returns:
+            self if nothing differs, else a new snapshot
+        """
+        environ = os.environ if environ is None else environ
+        overrides = _env_overrides(environ, set(self.settings) | known_settings(), STAGE_ENV_KEYS)
+        changed = {key: value for key, value in overrides.items() if value != self.settings.get(key)}
+        if not changed:
+            return self
+        settings = dict(self.settings, **changed)
+        sources = dict(self.sources, **{key: "env" for key in changed})
+        return JobConfigSnapshot(self.job_dir, MappingProxyType(settings), MappingProxyType(sources),
+                                 self.job, self.inputs, self.created)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Raw string setting (default when unset or empty)."""
+        value = self.settings.get(key)
+        return value if value not in (None, "") else default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Boolean setting (true/yes/1/on)."""
+        value = self.get(key)
+        if value is None:
+            return default
+        value = str(value).strip().lower()
+        if value in _TRUE:
+            return True
+        if value in _FALSE:
+            return False
+        return default
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        """Integer setting (default when not a number)."""
+        try:
+            return int(float(self.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        """Float setting (default when not a number)."""
+        try:
+            return float(self.get(key, default))
+        except (TypeError, ValueError):
+            return default
+
+    def section(self, name: str) -> Mapping[str, Any]:
+        """job.json section (empty mapping when absent)."""
+        value = self.job.get(name)
+        return value if isinstance(value, Mapping) else MappingProxyType({})
+
+    def param(
+        self,
+        section: str,
+        name: str,
+        key: Optional[str] = None,
+        default: Any = None,
+        cast: Callable[[Any], Any] = str
+    ) -> Any:
+        """
+        One parameter with the job's precedence applied
+
+        An explicit environment variable wins, then job.json
+        section[name] (AD-006), then the flat setting, then default.
+
+        Args:
+            section: job.json section ("vad", "mux", ...)
+            name: Field within the section
+            key: Flat setting name (e.g. PYANNOTE_VAD_THRESHOLD)
+            default: Fallback value
+            cast: Conversion for the chosen value (bool understands "true"/"false")
+
+        Returns:
+            Resolved value
+        """
+        if key and self.sources.get(key) == "env" and self.get(key) is not None:
+            value = self.get(key)
+        else:
+            value = self.section(section).get(name)
+            if value is None and key:
+                value = self.get(key)
+        if value is None:
+            return default
+        if cast is bool and isinstance(value, str):
+            return value.strip().lower() in _TRUE
+        try:
+            return cast(value)
+        except (TypeError, ValueError):
+            return default
+
+
+# One snapshot per process
+_SNAPSHOTS: Dict[str, JobConfigSnapshot] = {}
+
+
+def snapshot_path(job_dir: Path) -> Path:
+    """Snapshot file of a job directory."""
+    return Path(job_dir) / SNAPSHOT_FILE
+
+
+def load_job_config(job_dir: Optional[Path] = None, refresh: bool = False) -> JobConfigSnapshot:
+    """
+    The job's snapshot for this process
+
+    Reads PIPELINE_JOB_CONFIG (or <job_dir>/job.resolved.json) once; when it
+    is missing or its inputs changed, resolves from the files instead.
+
+    Args:
+        job_dir: Job directory (default: from PIPELINE_JOB_CONFIG, then OUTPUT_DIR)
+        refresh: Ignore the per-process cache
+
+    Returns:
+        Snapshot with this process's environment applied
+    """
+    env_path = os.environ.get(JOB_CONFIG_ENV)
+    if job_dir is not None:
+        path = snapshot_path(job_dir)
+    elif env_path:
+        path = Path(env_path)
+    else:
+        path = snapshot_path(Path(os.environ.get("OUTPUT_DIR", ".")))
+    key = str(path)
+
+    if refresh or key not in _SNAPSHOTS:
+        snapshot = JobConfigSnapshot.load(path)
+        if snapshot is None or snapshot.is_stale():
+            logger.debug(f"Job config snapshot {'stale' if snapshot else 'missing'}: {path}; resolving")
+            snapshot = JobConfigSnapshot.resolve(path.parent)
+        _SNAPSHOTS[key] = snapshot.with_env()
+    return _SNAPSHOTS[key]
+
+
+def active_job_config() -> Optional[JobConfigSnapshot]:
+    """Snapshot exported by the orchestrator, or None outside a pipeline run."""
+    path = os.environ.get(JOB_CONFIG_ENV)
+    if not path or not Path(path).exists():
+        return None
+    return load_job_config()
+
+
+def clear_job_config_cache() -> None:
+    """Forget loaded snapshots (tests, long-lived processes)."""
+    _SNAPSHOTS.clear()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Job Events - append-only structured event stream per job
+
+Every job has job_dir/events.jsonl: one JSON object per line, only ever
+appended, written by the orchestrator and by the stage processes it starts.
+tools/pipeline-status.py tails these files across jobs for live progress
+and ETAs without parsing log lines.
+
+Event fields (all events):
+    v        schema version
+    ts       Unix time (float)
+    job_id   job ID
+    pid      writing process
+    event    job_start | job_end | plan | stage_start | stage_end |
+             stage_skipped | media | progress | heartbeat | cache |
+             throughput | <runner events>
+    stage    stage name (when inside a stage)
+
+progress events add: done/total/unit (chunks, windows, batches),
+audio_seconds/total_audio_seconds, elapsed, rtf (processing seconds per
+audio second) and eta_seconds.
+cache events add cache/hits/misses; throughput events add kind, model,
+tokens and seconds (see shared/metrics_exporter.py).
+
+The orchestrator exports PIPELINE_EVENTS (stream path) and PIPELINE_STAGE
+(current stage) so code deep inside a stage can report without a handle:
+
+    from shared.job_events import ProgressReporter
+    progress = ProgressReporter(total=len(blocks), unit="block",
+                                total_audio_seconds=duration)
+    for start, end in blocks:
+        ...
+        progress.update(audio_seconds=end)
+
+Outside a pipeline run (no PIPELINE_EVENTS) every call is a no-op.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Local
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+SCHEMA_VERSION = 1
+EVENTS_FILE = "events.jsonl"
+EVENTS_ENV = "PIPELINE_EVENTS"
+STAGE_ENV = "PIPELINE_STAGE"
+JOB_ENV = "PIPELINE_JOB_ID"
+
+# Progress events closer together than this are coalesced
+DEFAULT_PROGRESS_INTERVAL = 2.0
+DEFAULT_HEARTBEAT_INTERVAL = 60.0
+
+
+def events_path(job_dir: Path) -> Path:
+    """Event stream of a job directory."""
+    return Path(job_dir) / EVENTS_FILE
+
+
+class EventStream:
+    """
+    Appender for one job's events.jsonl
+
+    Each event is a single O_APPEND write, so lines from concurrent
+    processes of the same job never interleave.
+    """
+
+    def __init__(self, path: Path, job_id: Optional[str] = None):
+        """
+        Initialize event stream.
+
+        Args:
+            path: events.jsonl path
+            job_id: Job ID stamped on every event
+        """
+        self.path = Path(path)
+        self.job_id = job_id
+
+    def emit(self, event: str, stage: Optional[str] = None, **fields: Any) -> Dict[str, Any]:
+        """
+        Append one event
+
+        Args:
+            event: Event type
+            stage: Stage name (default: PIPELINE_STAGE)
+            **fields: Event payload (JSON-serializable)
+
+        Returns:
+            The written record
+        """
+        record: Dict[str, Any] = {
+            "v": SCHEMA_VERSION,
+            "ts": round(time.time(), 3),
+            "job_id": self.job_id,
+            "pid": os.getpid(),
+            "event": event,
+        }
+        stage = stage or os.environ.get(STAGE_ENV)
+        if stage:
+            record["stage"] = stage
+        record.update(fields)
+
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Could not write event to {self.path}: {e}")
+        return record
+
+
+def current_stream() -> Optional[EventStream]:
+    """Stream exported by the orchestrator, or None outside a pipeline run."""
+    path = os.environ.get(EVENTS_ENV)
+    if not path:
+        return None
+    return EventStream(Path(path), os.environ.get(JOB_ENV))
+
+
+def emit(event: str, stage: Optional[str] = None, **fields: Any) -> Optional[Dict[str, Any]]:
+    """
+    Append an event to the current job's stream (no-op outside a run)
+
+    Args:
+        event: Event type
+        stage: Stage name (default: PIPELINE_STAGE)
+        **fields: Event payload
+
+    Returns:
+        The written record, or None
+    """
+    stream = current_stream()
+    if stream is None:
+        return None
+    return stream.emit(event, stage, **fields)
+
+
+def read_events(path: Path, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read complete events appended after a byte offset
+
+    A trailing partial line (being written right now) is left for the
+    next call.
+
+    Args:
+        path: events.jsonl path
+        offset: Byte offset from a previous call
+
+    Returns:
+        (events, new offset)
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except OSError:
+        return [], offset
+
+    end = data.rfind(b"\n") + 1
+    events = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    return events, offset + end
+
+
+class ProgressReporter:
+    """
+    Stage-side progress with real-time factor and ETA
+
+    RTF is wall seconds spent per second of audio processed (lower is
+    faster); with audio positions the ETA is remaining audio x RTF,
+    otherwise it extrapolates from completed units.
+    """
+
+    def __init__(
+        self,
+        total: Optional[int] = None,
+        unit: str = "chunk",
+        total_audio_seconds: Optional[float] = None,
+        stage: Optional[str] = None,
+        min_interval: float = DEFAULT_PROGRESS_INTERVAL
+    ):
+        """
+        Initialize progress reporter.
+
+        Args:
+            total: Total units (chunks, windows, batches), if known
+            unit: Unit name
+            total_audio_seconds: Audio to process, if known
+            stage: Stage name (default: PIPELINE_STAGE)
+            min_interval: Minimum seconds between progress events
+        """
+        self.total = total
+        self.unit = unit
+        self.total_audio_seconds = total_audio_seconds
+        self.stage = stage
+        self.min_interval = min_interval
+        self.started = time.time()
+        self.done = 0
+        self.audio_seconds = 0.0
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current progress fields."""
+        elapsed = time.time() - self.started
+        fields: Dict[str, Any] = {"elapsed": round(elapsed, 2), "done": self.done, "unit": self.unit}
+        if self.total is not None:
+            fields["total"] = self.total
+        eta = None
+        if self.audio_seconds > 0:
+            rtf = elapsed / self.audio_seconds
+            fields["audio_seconds"] = round(self.audio_seconds, 2)
+            fields["rtf"] = round(rtf, 4)
+            if self.total_audio_seconds:
+                eta = max(0.0, self.total_audio_seconds - self.audio_seconds) * rtf
+        elif self.done and self.total:
+            eta = elapsed / self.done * max(0, self.total - self.done)
+        if self.total_audio_seconds:
+            fields["total_audio_seconds"] = round(self.total_audio_seconds, 2)
+        if eta is not None:
+            fields["eta_seconds"] = round(eta, 1)
+        return fields
+
+    def update(
+        self,
+        done: Optional[int] = None,
+        audio_seconds: Optional[float] = None,
+        force: bool = False,
+        **fields: Any
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record progress and emit a (throttled) progress event
+
+        Args:
+            done: Units completed so far (default: one more)
+            audio_seconds: Audio processed so far (position on the timeline)
+            force: Emit even within min_interval
+            **fields: Extra payload
+
+        Returns:
+            Emitted record, or None if throttled / not in a run
+        """
+        with self._lock:
+            self.done = self.done + 1 if done is None else done
+            if audio_seconds is not None:
+                self.audio_seconds = audio_seconds
+            now = time.time()
+            finished = self.total is not None and self.done >= self.total
+            if not (force or finished) and now - self._last_emit < self.min_interval:
+                return None
+            self._last_emit = now
+            payload = self.snapshot()
+        payload.update(fields)
+        return emit("progress", self.stage, **payload)
+
+    def heartbeat(self) -> Optional[Dict[str, Any]]:
+        """Emit a heartbeat with the current progress (liveness signal)."""
+        with self._lock:
+            payload = self.snapshot()
+        return emit("heartbeat", self.stage, **payload)
+
+
+@contextmanager
+def heartbeat(
+    log,
+    message: str = "Still working",
+    interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+    reporter: Optional[ProgressReporter] = None
+) -> Iterator[ProgressReporter]:
+    """
+    Log and emit a heartbeat every interval while a long call runs
+
+    Args:
+        log: Logger for the human-readable line
+        message: Log prefix ("Still transcribing...")
+        interval: Seconds between heartbeats
+        reporter: Progress to report (default: a new unit-less reporter)
+
+    Yields:
+        The progress reporter
+    """
+    reporter = reporter or ProgressReporter()
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(interval):
+            minutes = (time.time() - reporter.started) / 60
+            log.info(f"  ⏱️  {message} {minutes:.1f} minutes elapsed")
+            reporter.heartbeat()
+
+    thread = threading.Thread(target=beat, name="progress-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield reporter
+    finally:
+        stop.set()
+        thread.join(timeout=1.0)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Log Index - incremental SQLite index over JSON-lines job logs
+
+Every text log written through shared.logger has a <log>.jsonl sidecar
+(99_pipeline_*.log.jsonl in the job root, stage.log.jsonl in each stage
+directory). LogIndex ingests only the bytes appended since the previous
+run (per-file offsets), so refreshing an index of thousands of jobs costs
+a directory walk plus the new lines, and every report is a SQL query:
+
+    index = LogIndex(Path("out/.log_index.db"))
+    index.ingest([Path("out")])
+    index.error_classes(limit=5)
+
+Indexed per record: job_id, stage, level, ts, duration, error_class,
+logger, msg.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Local
+from shared.logger import JSONL_SUFFIX, get_logger
+logger = get_logger(__name__)
+
+SCHEMA_VERSION = 1
+LOG_SUFFIX = ".log" + JSONL_SUFFIX
+_STAGE_DIR_RE = re.compile(r"^\d+_(.+)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_dir TEXT PRIMARY KEY,
+    job_id TEXT,
+    workflow TEXT,
+    errors INTEGER NOT NULL DEFAULT 0,
+    warnings INTEGER NOT NULL DEFAULT 0,
+    last_ts REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    job_dir TEXT NOT NULL,
+    stage TEXT,
+    inode INTEGER,
+    offset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL,
+    job_id TEXT,
+    stage TEXT,
+    level TEXT,
+    ts REAL,
+    duration REAL,
+    error_class TEXT,
+    logger TEXT,
+    msg TEXT
+);
+CREATE INDEX IF NOT EXISTS records_level ON records(level, ts);
+CREATE INDEX IF NOT EXISTS records_job ON records(job_id);
+CREATE INDEX IF NOT EXISTS records_stage ON records(stage, duration);
+CREATE INDEX IF NOT EXISTS records_error ON records(error_class);
+CREATE INDEX IF NOT EXISTS records_file ON records(file_id);
+CREATE INDEX IF NOT EXISTS jobs_last_ts ON jobs(last_ts);
+"""
+
+
+def iter_job_dirs(root: Path) -> Iterator[Path]:
+    """
+    Job directories (containing job.json) under root
+
+    Does not descend into a job directory's stage folders.
+
+    Args:
+        root: Output root or a single job directory
+
+    Yields:
+        Job directories
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        if "job.json" in filenames:
+            dirnames[:] = []
+            yield Path(dirpath)
+        else:
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+
+
+def _job_log_files(job_dir: Path) -> List[Tuple[str, Optional[str]]]:
+    """JSON-lines logs of a job: (path, stage from the directory name)."""
+    files: List[Tuple[str, Optional[str]]] = []
+    subdirs = []
+    with os.scandir(job_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(LOG_SUFFIX):
+                files.append((entry.path, None))
+            elif entry.is_dir(follow_symlinks=False) and not entry.name.startswith("."):
+                subdirs.append(entry)
+    for subdir in subdirs:
+        match = _STAGE_DIR_RE.match(subdir.name)
+        stage = match.group(1) if match else subdir.name
+        try:
+            with os.scandir(subdir.path) as entries:
+                files.extend((entry.path, stage) for entry in entries if entry.name.endswith(LOG_SUFFIX))
+        except OSError:
+            continue
+    return files
+
+
+class LogIndex:
+    """Incremental SQLite index of JSON-lines logs."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (or create) an index.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            # Derived data: rebuild from the logs rather than migrate
+            self.conn.executescript(
+                "DROP TABLE IF EXISTS records; DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS jobs;"
+            )
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def ingest(self, roots: List[Path]) -> Dict[str, int]:
+        """
+        Index lines appended since the last ingest
+
+        Args:
+            roots: Output roots or job directories
+
+        Returns:
+            Counts: files scanned, files read, records added
+        """
+        started = time.time()
+        known_jobs = {row["job_dir"]: row["job_id"] for row in self.conn.execute("SELECT job_dir, job_id FROM jobs")}
+        files = {row["path"]: row for row in self.conn.execute("SELECT * FROM files")}
+        stats = {"files": 0, "read": 0, "records": 0}
+
+        with self.conn:
+            for root in roots:
+                for job_dir in iter_job_dirs(Path(root)):
+                    key = str(job_dir)
+                    if key not in known_jobs:
+                        known_jobs[key] = self._add_job(job_dir)
+                    for path, stage in _job_log_files(job_dir):
+                        stats["files"] += 1
+                        added = self._ingest_file(path, stage, key, known_jobs[key], files.get(path))
+                        if added is not None:
+                            stats["read"] += 1
+                            stats["records"] += added
+
+        logger.debug(f"Log index: {stats} in {time.time() - started:.2f}s")
+        return stats
+
+    def _add_job(self, job_dir: Path) -> Optional[str]:
+        try:
+            with open(job_dir / "job.json", encoding="utf-8") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            job = {}
+        job_id = job.get("job_id") or job_dir.name
+        self.conn.execute(
+            "INSERT OR REPLACE INTO jobs (job_dir, job_id, workflow) VALUES (?, ?, ?)",
+            (str(job_dir), job_id, job.get("workflow"))
+        )
+        return job_id
+
+    def _ingest_file(self, path: str, stage: Optional[str], job_dir: str,
+                     job_id: Optional[str], row: Optional[sqlite3.Row]) -> Optional[int]:
+        """Read new complete lines of one file; None when unchanged."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        if row is None:
+            cursor = self.conn.execute(
+                "INSERT INTO files (path, job_dir, stage, inode, offset) VALUES (?, ?, ?, ?, 0)",
+                (path, job_dir, stage, st.st_ino)
+            )
+            file_id, offset = cursor.lastrowid, 0
+        else:
+            file_id, offset = row["id"], row["offset"]
+            if st.st_ino != row["inode"] or st.st_size < offset:
+                # Rotated or truncated: re-read from the start
+                self.conn.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+                self._recount(job_dir)
+                offset = 0
+            elif st.st_size == offset:
+                return None
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # leave a partial trailing line for next time
+
+        rows = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(record, dict):
+                continue
+            rows.append((
+                file_id,
+                record.get("job_id") or job_id,
+                record.get("stage") or stage,
+                record.get("level"),
+                record.get("ts"),
+                record.get("duration"),
+                record.get("error_class"),
+                record.get("logger"),
+                record.get("msg"),
+            ))
+        if rows:
+            levels = [r[3] for r in rows]
+            self.conn.execute(
+                "UPDATE jobs SET errors = errors + ?, warnings = warnings + ?,"
+                " last_ts = MAX(COALESCE(last_ts, 0), ?) WHERE job_dir = ?",
+                (sum(level in ("ERROR", "CRITICAL") for level in levels),
+                 levels.count("WARNING"),
+                 max((r[4] for r in rows if isinstance(r[4], (int, float))), default=0),
+                 job_dir)
+            )
+            self.conn.executemany(
+                "INSERT INTO records (file_id, job_id, stage, level, ts, duration, error_class, logger, msg)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        self.conn.execute("UPDATE files SET offset = ?, inode = ? WHERE id = ?",
+                          (offset + end, st.st_ino, file_id))
+        return len(rows)
+
+    def _recount(self, job_dir: str) -> None:
+        """Recompute a job's counters from its remaining records."""
+        self.conn.execute(
+            "UPDATE jobs SET"
+            " errors = (SELECT COUNT(*) FROM records r JOIN files f ON r.file_id = f.id"
+            "           WHERE f.job_dir = jobs.job_dir AND r.level IN ('ERROR', 'CRITICAL')),"
+            " warnings = (SELECT COUNT(*) FROM records r JOIN files f ON r.file_id = f.id"
+            "             WHERE f.job_dir = jobs.job_dir AND r.level = 'WARNING'),"
+            " last_ts = (SELECT MAX(r.ts) FROM records r JOIN files f ON r.file_id = f.id"
+            "            WHERE f.job_dir = jobs.job_dir)"
+            " WHERE job_dir = ?",
+            (job_dir,)
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _since(since: Optional[float], column: str = "ts") -> Tuple[str, Tuple]:
+        return (f" AND {column} >= ?", (since,)) if since else ("", ())
+
+    def level_counts(self, since: Optional[float] = None) -> Dict[str, int]:
+        """Records per level."""
+        where, params = self._since(since)
+        rows = self.conn.execute(
+            f"SELECT level, COUNT(*) AS n FROM records WHERE 1=1{where} GROUP BY level", params
+        )
+        return {row["level"]: row["n"] for row in rows}
+
+    def error_classes(self, limit: int = 10, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Most frequent error classes with the number of affected jobs."""
+        where, params = self._since(since)
+        rows = self.conn.execute(
+            "SELECT error_class, COUNT(*) AS count, COUNT(DISTINCT job_id) AS jobs, MAX(ts) AS last_seen"
+            f" FROM records WHERE error_class IS NOT NULL{where}"
+            " GROUP BY error_class ORDER BY count DESC LIMIT ?",
+            params + (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def stage_durations(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Stage runs with a logged duration: count, mean and max seconds."""
+        where, params = self._since(since)
+        rows = self.conn.execute(
+            "SELECT stage, COUNT(*) AS runs, AVG(duration) AS mean, MAX(duration) AS max"
+            f" FROM records WHERE duration IS NOT NULL AND stage IS NOT NULL{where}"
+            " GROUP BY stage ORDER BY mean DESC",
+            params
+        )
+        return [dict(row) for row in rows]
+
+    def recent(self, level: str = "ERROR", limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest records at level or above (ERROR includes CRITICAL)."""
+        levels = {"WARNING": ("WARNING", "ERROR", "CRITICAL"), "ERROR": ("ERROR", "CRITICAL")}.get(level, (level,))
+        marks = ",".join("?" * len(levels))
+        rows = self.conn.execute(
+            "SELECT job_id, stage, level, ts, error_class, msg FROM records"
+            f" WHERE level IN ({marks}) ORDER BY ts DESC LIMIT ?",
+            levels + (limit,)
+        )
+        return [dict(row) for row in rows]
+
+    def job_summaries(self, limit: int = 10, job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-job error/warning counts and logged stages, newest first."""
+        where, params = ("WHERE job_id = ?", (job_id,)) if job_id else ("WHERE last_ts IS NOT NULL", ())
+        jobs = self.conn.execute(
+            f"SELECT job_id, workflow, job_dir, errors, warnings FROM jobs {where}"
+            " ORDER BY last_ts DESC LIMIT ?",
+            params + (limit,)
+        ).fetchall()
+
+        summaries = []
+        for job in jobs:
+            summary = dict(job)
+            files = self.conn.execute("SELECT id, stage FROM files WHERE job_dir = ?", (job["job_dir"],)).fetchall()
+            stages = {row["stage"] for row in files if row["stage"]}
+            stages.update(
+                row[0] for row in self.conn.execute(
+                    "SELECT DISTINCT stage FROM records WHERE job_id = ? AND stage IS NOT NULL", (job["job_id"],)
+                )
+            )
+            summary["stages"] = sorted(stages)
+            summary["stages_completed"] = len(stages)
+            summary["log_files"] = len(files)
+            summaries.append(summary)
+        return summaries
@@ -6,15 +6,21 @@ This is the SINGLE SOURCE OF TRUTH for all logging in cp-whisperx-app.
 Use this module for all Python scripts, Docker containers, and pipeline stages.
 """
 # Standard library
+import json
 import logging
 import sys
 import os
+import re
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
-# Third-party
-from pythonjsonlogger import jsonlogger
+
+# JSON-lines sidecar: every text log file gets <name>.log.jsonl next to it
+# with one record per line, indexed by shared/log_index.py.
+JSONL_SUFFIX = ".jsonl"
+LOG_JSONL_ENV = "LOG_JSONL"
+_ERROR_CLASS_RE = re.compile(r"\b([A-Z][A-Za-z0-9_]*(?:Error|Exception|Interrupt|Exit))\b")
 
 
 # Stage order mapping for log file prefixes
@@ -53,6 +59,85 @@ STAGE_ORDER = {
 }
 
 
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per record for the .log.jsonl sidecar
+
+    Fields: ts, level, logger, msg, plus job_id/stage (from the record's
+    extra or PIPELINE_JOB_ID/PIPELINE_STAGE), duration (extra) and
+    error_class (exception type, or an *Error/*Exception name in the
+    message of ERROR records).
+    """
+
+    def __init__(self, stage: Optional[str] = None):
+        super().__init__()
+        self.stage = stage
+
+    def format(self, record: logging.LogRecord) -> str:
+        from shared.job_events import JOB_ENV, STAGE_ENV
+
+        data: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        job_id = getattr(record, "job_id", None) or os.environ.get(JOB_ENV)
+        stage = getattr(record, "stage", None) or self.stage or os.environ.get(STAGE_ENV)
+        if job_id:
+            data["job_id"] = job_id
+        if stage:
+            data["stage"] = stage
+        duration = getattr(record, "duration", None)
+        if duration is not None:
+            data["duration"] = round(float(duration), 3)
+
+        error_class = getattr(record, "error_class", None)
+        if record.exc_info and record.exc_info[0] is not None:
+            error_class = error_class or record.exc_info[0].__name__
+            data["exc"] = self.formatException(record.exc_info)
+        elif not error_class and record.levelno >= logging.ERROR:
+            match = _ERROR_CLASS_RE.search(data["msg"])
+            if match:
+                error_class = match.group(1)
+        if error_class:
+            data["error_class"] = error_class
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def jsonl_enabled() -> bool:
+    """Whether JSON-lines sidecars are written (LOG_JSONL, default true)."""
+    return os.environ.get(LOG_JSONL_ENV, "true").strip().lower() not in ("false", "0", "no", "off")
+
+
+def add_jsonl_handler(
+    logger: logging.Logger,
+    log_file: Path,
+    stage: Optional[str] = None,
+    level: int = logging.DEBUG
+) -> Optional[logging.Handler]:
+    """
+    Mirror a logger into log_file + ".jsonl"
+
+    Args:
+        logger: Logger to attach to
+        log_file: Text log the sidecar sits next to
+        stage: Stage stamped on records (default: PIPELINE_STAGE)
+        level: Minimum level
+
+    Returns:
+        The handler, or None when disabled (LOG_JSONL=false)
+    """
+    if not jsonl_enabled():
+        return None
+    log_file = Path(log_file)
+    handler = logging.FileHandler(log_file.with_name(log_file.name + JSONL_SUFFIX), mode='a', encoding='utf-8')
+    handler.setFormatter(JsonLinesFormatter(stage))
+    handler.setLevel(level)
+    logger.addHandler(handler)
+    return handler
+
+
 def get_stage_log_filename(stage_name: str, timestamp: Optional[str] = None) -> str:
     """
     Generate a stage-prefixed log filename.
@@ -132,6 +217,7 @@ def setup_logger(
     
     # Create formatters
     if log_format == "json":
+        from pythonjsonlogger import jsonlogger  # only JSON-format loggers need it
         formatter = jsonlogger.JsonFormatter(
             "%(asctime)s %(name)s %(levelname)s %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
@@ -181,6 +267,8 @@ def setup_logger(
         file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')  # Append mode with UTF-8
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
+        if log_format != "json":
+            add_jsonl_handler(logger, log_file)
     
     return logger
 
@@ -218,14 +306,11 @@ class PipelineLogger:
         self.module_name = module_name
         
         # Try to load log level from config/environment if not explicitly set
+        # (get_setting reads the env / CONFIG_PATH file once per process
+        # without building the pydantic PipelineConfig)
+        from shared.config import get_setting
         if log_level == "INFO":
-            try:
-                from shared.config import load_config
-                config = load_config()
-                if hasattr(config, 'log_level') and config.log_level:
-                    log_level = config.log_level.upper()
-            except:
-                pass
+            log_level = get_setting("LOG_LEVEL", "info").upper()
         
         if log_file:
             # Use specific log file
@@ -240,13 +325,7 @@ class PipelineLogger:
             )
         else:
             # Load log directory from config if available
-            try:
-                from shared.config import load_config
-                config = load_config()
-                log_dir = config.log_root
-            except:
-                # Fallback to default if config loading fails
-                log_dir = "/app/logs"
+            log_dir = get_setting("LOG_ROOT", "./logs")
             
             self.logger = setup_logger(
                 module_name,
@@ -257,25 +336,25 @@ class PipelineLogger:
                 log_dir=log_dir
             )
     
-    def debug(self, msg: str) -> None:
+    def debug(self, msg: str, extra: Optional[Dict[str, Any]] = None) -> None:
         """Log debug message."""
-        self.logger.debug(msg)
+        self.logger.debug(msg, extra=extra)
     
-    def info(self, msg: str) -> None:
-        """Log info message."""
-        self.logger.info(msg)
+    def info(self, msg: str, extra: Optional[Dict[str, Any]] = None) -> None:
+        """Log info message (extra: stage/duration/error_class for the JSON-lines log)."""
+        self.logger.info(msg, extra=extra)
     
-    def warning(self, msg: str) -> None:
+    def warning(self, msg: str, extra: Optional[Dict[str, Any]] = None) -> None:
         """Log warning message."""
-        self.logger.warning(msg)
+        self.logger.warning(msg, extra=extra)
     
-    def error(self, msg: str, exc_info: bool = False) -> None:
+    def error(self, msg: str, exc_info: bool = False, extra: Optional[Dict[str, Any]] = None) -> None:
         """Log error message."""
-        self.logger.error(msg, exc_info=exc_info)
+        self.logger.error(msg, exc_info=exc_info, extra=extra)
     
-    def critical(self, msg: str) -> None:
+    def critical(self, msg: str, extra: Optional[Dict[str, Any]] = None) -> None:
         """Log critical message."""
-        self.logger.critical(msg)
+        self.logger.critical(msg, extra=extra)
 
 
 def setup_dual_logger(
@@ -341,6 +420,7 @@ def setup_dual_logger(
     stage_handler.setFormatter(detailed_formatter)
     stage_handler.setLevel(logging.DEBUG)  # Capture everything
     logger.addHandler(stage_handler)
+    add_jsonl_handler(logger, stage_log_file, stage=stage_name)
     
     # Handler 2: Main pipeline log (INFO and above only)
     # Phase 3 Optimization: Create handler with buffered file stream
@@ -12,21 +12,56 @@ This enables:
 - Resume capability after failures
 - Audit trail of pipeline execution
 - Easy debugging and monitoring
+
+All writers (stage processes, the orchestrator) go through
+ManifestWriter: under an exclusive lock on manifest.json.lock each
+writer re-reads the file, merges only the fields it owns and replaces
+the file atomically (temp file + os.replace), so concurrent stages
+cannot clobber each other and readers never see a partial file.
+Non-boundary updates are debounced (MANIFEST_FLUSH_INTERVAL).
 """
 
 # Standard library
+import atexit
 import json
+import os
 import sys
+import tempfile
+import threading
+import time
+import weakref
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from contextlib import contextmanager
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; writes stay atomic
+    fcntl = None
+
 # Local
 from shared.logger import get_logger
 logger = get_logger(__name__)
 
+# Seconds a debounced save may wait before it is written
+MANIFEST_FLUSH_INTERVAL = 2.0
+
+# Writers with possibly pending saves, flushed at exit (without keeping them alive)
+_LIVE_WRITERS: "weakref.WeakSet[ManifestWriter]" = weakref.WeakSet()
+
+
+def _flush_live_writers() -> None:
+    for writer in list(_LIVE_WRITERS):
+        try:
+            writer.flush()
+        except Exception as e:
+            logger.warning(f"Manifest flush at exit failed for {writer.path}: {e}")
+
+
+atexit.register(_flush_live_writers)
+
 
 class PathEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle Path objects."""
@@ -36,6 +71,143 @@ class PathEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2) -> None:
+    """
+    Write JSON to a temp file in the same directory, then os.replace it
+    
+    Args:
+        path: Target file
+        data: JSON-serializable data (Path values become strings)
+        indent: JSON indent
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent, cls=PathEncoder)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def manifest_lock(path: Path):
+    """
+    Exclusive advisory lock for read-modify-write of a manifest
+    
+    Args:
+        path: Manifest file (the lock is <path>.lock next to it)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f"{path.name}.lock"), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_manifest_file(path: Path) -> Dict[str, Any]:
+    """Current manifest on disk ({} if missing or unreadable)."""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Unreadable manifest {path}: {e}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class ManifestWriter:
+    """
+    Debounced, atomic, lock-protected writes of one manifest file.
+    
+    The owner passes merge(on_disk) -> data, which applies the owner's
+    fields to the manifest as it currently is on disk. A debounced
+    flush calls merge on a timer thread, so the owner changes the state
+    merge reads under writer.lock, and merge must not rebind it.
+    
+    Example:
+        writer = ManifestWriter(job_dir / "manifest.json", merge)
+        with writer.lock:
+            state["status"] = "running"
+        writer.save()            # debounced
+        writer.save(force=True)  # stage boundary: written now
+    """
+    
+    def __init__(self, path: Path, merge: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 interval: float = MANIFEST_FLUSH_INTERVAL) -> None:
+        """
+        Initialize writer.
+        
+        Args:
+            path: Manifest file
+            merge: Applies the owner's state to the on-disk manifest
+            interval: Debounce interval in seconds (0 = write every save)
+        """
+        self.path = Path(path)
+        self.merge = merge
+        self.interval = interval
+        self.dirty = False
+        self.writes = 0
+        self._last_flush = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self.lock = threading.RLock()
+        _LIVE_WRITERS.add(self)
+    
+    def save(self, force: bool = False) -> bool:
+        """
+        Request a write.
+        
+        Args:
+            force: Write now (stage boundaries, final status)
+            
+        Returns:
+            True if the manifest was written by this call
+        """
+        with self.lock:
+            self.dirty = True
+            wait = self.interval - (time.monotonic() - self._last_flush)
+            if force or wait <= 0:
+                return self.flush()
+            if self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+            return False
+    
+    def flush(self) -> bool:
+        """
+        Write pending changes (merge with the file under the lock).
+        
+        Returns:
+            True if something was written
+        """
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.dirty:
+                return False
+            with manifest_lock(self.path):
+                data = self.merge(read_manifest_file(self.path))
+                write_json_atomic(self.path, data)
+            self.dirty = False
+            self.writes += 1
+            self._last_flush = time.monotonic()
+            return True
+
+
 class StageManifest:
     """
     Manifest manager for individual pipeline stages.
@@ -74,18 +246,34 @@ class StageManifest:
         self.outputs = {}
         self.metadata = {}
         self.input_files = []
+        self.resources = {}
         self.error = None
         self.status = "running"
         
         # Load existing manifest or create new
+        self._writer = ManifestWriter(self.manifest_file, self._merge, interval=0)
+        self._record: Optional[Dict[str, Any]] = None
         self.data = self._load_or_create()
     
     def _load_or_create(self) -> Dict[str, Any]:
         """Load existing manifest or create new structure."""
-        if self.manifest_file.exists():
-            with open(self.manifest_file, 'r') as f:
-                data = json.load(f)
-        else:
+        return self._normalize(read_manifest_file(self.manifest_file))
+    
+    def _normalize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """In-memory form: job info applied, stages as a dict by name."""
+        data = self._with_defaults(data)
+        if isinstance(data["stages"], list):
+            # Convert array format to dict format for compatibility
+            stages_dict = {}
+            for stage in data["stages"]:
+                if isinstance(stage, dict) and "name" in stage:
+                    stages_dict[stage["name"]] = stage
+            data = dict(data, stages=stages_dict)
+        return data
+    
+    def _with_defaults(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create the manifest structure if missing and apply job info."""
+        if not data:
             data = {
                 "version": "1.0.0",
                 "created_at": datetime.now().isoformat(),
@@ -110,16 +298,9 @@ class StageManifest:
         if self.job_env_file:
             data["job_env_file"] = self.job_env_file
         
-        # Ensure stages dict exists and convert from array if needed
-        if "stages" not in data:
+        # Ensure stages exist (the orchestrator's list format is kept on disk)
+        if not isinstance(data.get("stages"), (dict, list)):
             data["stages"] = {}
-        elif isinstance(data["stages"], list):
-            # Convert array format to dict format for compatibility
-            stages_dict = {}
-            for stage in data["stages"]:
-                if isinstance(stage, dict) and "name" in stage:
-                    stages_dict[stage["name"]] = stage
-            data["stages"] = stages_dict
         
         # Ensure pipeline structure exists
         if "pipeline" not in data:
@@ -175,6 +356,15 @@ class StageManifest:
         """Add stage-specific metadata."""
         self.metadata[key] = value
     
+    def set_resources(self, **resources: Any) -> None:
+        """
+        Record resource usage (CPU, memory, I/O, accelerator, phase times).
+        
+        Args:
+            **resources: Resource measurements, merged into earlier ones
+        """
+        self.resources.update(resources)
+    
     def add_intermediate(self, file_path: Path, retained: bool = False, reason: str = "") -> None:
         """
         Track intermediate/cache file in manifest.
@@ -264,6 +454,9 @@ class StageManifest:
         """
         Save manifest to disk.
         
+        Only this stage's record and the pipeline stage lists are merged
+        into the file as it is on disk, so other writers are preserved.
+        
         Args:
             status: Override status (success, failed, skipped)
         """
@@ -296,39 +489,59 @@ class StageManifest:
             "metadata": self.metadata
         }
         
+        if self.resources:
+            stage_data["resources"] = self.resources
+        
         if self.error:
             stage_data["error"] = self.error
         
         if hasattr(self, 'warnings') and self.warnings:
             stage_data["warnings"] = self.warnings
         
-        # Update manifest
-        self.data["stages"][self.stage_name] = stage_data
-        self.data["pipeline"]["current_stage"] = None
+        # Stage start/end are boundaries: write now
+        self._record = stage_data
+        self._writer.save(force=True)
+        
+        if self.logger:
+            self.logger.info(f"Manifest updated: {self.manifest_file}")
+    
+    def _merge(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply this stage's record to the manifest as it is on disk."""
+        data = self._with_defaults(data)
+        
+        # Update manifest (list entries are the orchestrator's; update in place)
+        stages = data["stages"]
+        if isinstance(stages, list):
+            for entry in stages:
+                if isinstance(entry, dict) and entry.get("name") == self.stage_name:
+                    entry.update(self._record)
+                    break
+            else:
+                stages.append({"name": self.stage_name, **self._record})
+        else:
+            stages[self.stage_name] = self._record
+        pipeline = data["pipeline"]
+        pipeline["current_stage"] = None
+        pipeline.setdefault("completed_stages", [])
+        pipeline.setdefault("failed_stages", [])
         
         # Update pipeline status
         if self.status == "success":
-            if self.stage_name not in self.data["pipeline"]["completed_stages"]:
-                self.data["pipeline"]["completed_stages"].append(self.stage_name)
+            if self.stage_name not in pipeline["completed_stages"]:
+                pipeline["completed_stages"].append(self.stage_name)
         elif self.status == "failed":
-            if self.stage_name not in self.data["pipeline"]["failed_stages"]:
-                self.data["pipeline"]["failed_stages"].append(self.stage_name)
+            if self.stage_name not in pipeline["failed_stages"]:
+                pipeline["failed_stages"].append(self.stage_name)
         
         # Update overall pipeline status
-        if self.data["pipeline"]["failed_stages"]:
-            self.data["pipeline"]["status"] = "failed"
-        elif len(self.data["pipeline"]["completed_stages"]) == 10:  # All stages
-            self.data["pipeline"]["status"] = "completed"
-        
-        self.data["updated_at"] = datetime.now().isoformat()
+        if pipeline["failed_stages"]:
+            pipeline["status"] = "failed"
+        elif len(pipeline["completed_stages"]) == 10:  # All stages
+            pipeline["status"] = "completed"
         
-        # Write to disk
-        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.manifest_file, 'w') as f:
-            json.dump(self.data, f, indent=2, cls=PathEncoder)
-        
-        if self.logger:
-            self.logger.info(f"Manifest updated: {self.manifest_file}")
+        data["updated_at"] = datetime.now().isoformat()
+        self.data = self._normalize(dict(data))
+        return data
     
     def __enter__(self) -> 'StageManifest':
         """Context manager entry - mark stage as running."""
@@ -370,12 +583,13 @@ class PipelineManifest:
         self.user_id = user_id
         self.job_env_file = str(job_env_file) if job_env_file else None
         self.data = self._load_or_create()
+        self._writer = ManifestWriter(self.manifest_file, self._merge)
     
     def _load_or_create(self) -> Dict[str, Any]:
         """Load existing manifest or create new."""
-        if self.manifest_file.exists():
-            with open(self.manifest_file, 'r') as f:
-                return json.load(f)
+        data = read_manifest_file(self.manifest_file)
+        if data:
+            return data
         else:
             return {
                 "version": "1.0.0",
@@ -398,34 +612,37 @@ class PipelineManifest:
     
     def set_input(self, input_file: str, title: str, year: Optional[int], job_id: Optional[str] = None) -> None:
         """Set input file information."""
-        self.data["input"] = {
-            "file": input_file,
-            "title": title,
-            "year": year
-        }
-        if job_id:
-            self.data["job_id"] = job_id
+        with self._writer.lock:
+            self.data["input"] = {
+                "file": input_file,
+                "title": title,
+                "year": year
+            }
+            if job_id:
+                self.data["job_id"] = job_id
         self.save()
     
     def set_output_dir(self, output_dir: str) -> None:
         """Set output directory."""
-        self.data["output_dir"] = output_dir
+        with self._writer.lock:
+            self.data["output_dir"] = output_dir
         self.save()
     
     def set_pipeline_step(self, stage_name: str, success: bool, **kwargs: Any) -> None:
         """Record a pipeline step."""
-        if stage_name not in self.data["stages"]:
-            self.data["stages"][stage_name] = {}
-        
-        self.data["stages"][stage_name].update(kwargs)
-        self.data["stages"][stage_name]["success"] = success
-        
-        if success and kwargs.get("completed", False):
-            if stage_name not in self.data["pipeline"]["completed_stages"]:
-                self.data["pipeline"]["completed_stages"].append(stage_name)
-        elif not success:
-            if stage_name not in self.data["pipeline"]["failed_stages"]:
-                self.data["pipeline"]["failed_stages"].append(stage_name)
+        with self._writer.lock:
+            if stage_name not in self.data["stages"]:
+                self.data["stages"][stage_name] = {}
+            
+            self.data["stages"][stage_name].update(kwargs)
+            self.data["stages"][stage_name]["success"] = success
+            
+            if success and kwargs.get("completed", False):
+                if stage_name not in self.data["pipeline"]["completed_stages"]:
+                    self.data["pipeline"]["completed_stages"].append(stage_name)
+            elif not success:
+                if stage_name not in self.data["pipeline"]["failed_stages"]:
+                    self.data["pipeline"]["failed_stages"].append(stage_name)
         
         self.save()
     
@@ -445,18 +662,34 @@ class PipelineManifest:
         end_time = datetime.now()
         duration = (end_time - self.start_time).total_seconds()
         
-        self.data["pipeline"]["status"] = status
-        self.data["pipeline"]["current_stage"] = None
-        self.data["timing"]["completed_at"] = end_time.isoformat()
-        self.data["timing"]["total_seconds"] = duration
+        with self._writer.lock:
+            self.data["pipeline"]["status"] = status
+            self.data["pipeline"]["current_stage"] = None
+            self.data["timing"]["completed_at"] = end_time.isoformat()
+            self.data["timing"]["total_seconds"] = duration
         
-        self.save()
+        self.save(force=True)
+    
+    def save(self, force: bool = False) -> None:
+        """
+        Save manifest to disk (debounced unless forced).
+        
+        Args:
+            force: Write now instead of within MANIFEST_FLUSH_INTERVAL
+        """
+        self._writer.save(force=force)
+    
+    def flush(self) -> None:
+        """Write any debounced changes now."""
+        self._writer.flush()
     
-    def save(self) -> None:
-        """Save manifest to disk."""
-        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.manifest_file, 'w') as f:
-            json.dump(self.data, f, indent=2)
+    def _merge(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Overlay this manifest on the file, keeping stage records written by others."""
+        stages = data.get("stages")
+        merged = dict(data, **self.data)
+        if isinstance(stages, dict) and isinstance(self.data.get("stages"), dict):
+            merged["stages"] = {**stages, **self.data["stages"]}
+        return merged
 
 
 # Alias for compatibility with existing code
@@ -10,9 +10,18 @@ from pathlib import Path
 import hashlib
 import subprocess
 import json
-from typing import Optional
+import os
+from typing import Dict, Optional, Tuple
 import tempfile
 
+# media_id per (path, size, mtime_ns, sample_duration): the cache lookup,
+# demux and similarity stages all ask for the same ID within one run
+_MEDIA_ID_CACHE: Dict[Tuple[str, int, int, int], str] = {}
+
+# On-disk cache next to the media (.<name>.media_id.json), so later jobs
+# on the same file skip the three ffmpeg sample decodes
+MEDIA_ID_SIDECAR_SUFFIX = ".media_id.json"
+
 
 def compute_media_id(media_path: Path, sample_duration: int = 30) -> str:
     """
@@ -45,6 +54,9 @@ def compute_media_id(media_path: Path, sample_duration: int = 30) -> str:
         - Samples from beginning, middle, and end of media
         - Uses raw PCM audio data (format-independent)
         - Cached results valid indefinitely for same content
+        - Memoized per process and in a sidecar next to the media, both
+          keyed by (path, size, mtime), so repeated calls for the same
+          file do not decode it again
     """
     media_path = Path(media_path).resolve()
     
@@ -55,6 +67,58 @@ def compute_media_id(media_path: Path, sample_duration: int = 30) -> str:
     if not media_path.is_file():
         raise RuntimeError(f"Path is not a file: {media_path}")
     
+    stat = media_path.stat()
+    cache_key = (str(media_path), stat.st_size, stat.st_mtime_ns, sample_duration)
+    cached = _MEDIA_ID_CACHE.get(cache_key) or _read_media_id_sidecar(media_path, cache_key)
+    if cached:
+        _MEDIA_ID_CACHE[cache_key] = cached
+        return cached
+    
+    media_id = _compute_media_id(media_path, sample_duration)
+    _MEDIA_ID_CACHE[cache_key] = media_id
+    _write_media_id_sidecar(media_path, cache_key, media_id)
+    return media_id
+
+
+def media_id_sidecar_path(media_path: Path) -> Path:
+    """Sidecar file caching the media ID of a media file"""
+    media_path = Path(media_path)
+    return media_path.with_name(f".{media_path.name}{MEDIA_ID_SIDECAR_SUFFIX}")
+
+
+def _read_media_id_sidecar(media_path: Path, cache_key: Tuple[str, int, int, int]) -> Optional[str]:
+    """Cached media ID if the sidecar matches the file's path, size and mtime"""
+    try:
+        with open(media_id_sidecar_path(media_path), 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('key') != list(cache_key):
+        return None
+    media_id = data.get('media_id')
+    return media_id if isinstance(media_id, str) and len(media_id) == 64 else None
+
+
+def _write_media_id_sidecar(media_path: Path, cache_key: Tuple[str, int, int, int], media_id: str) -> None:
+    """Best effort: media directories may be read-only"""
+    sidecar = media_id_sidecar_path(media_path)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=str(sidecar.parent), prefix=f"{sidecar.name}.", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': list(cache_key), 'media_id': media_id}, f)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _compute_media_id(media_path: Path, sample_duration: int) -> str:
+    """Hash beginning/middle/end audio samples (see compute_media_id)"""
     # Get media duration
     duration = _get_media_duration(media_path)
     
@@ -236,5 +300,6 @@ def verify_media_id_stability(media_path: Path, iterations: int = 3) -> bool:
     Example:
         >>> assert verify_media_id_stability(Path("movie.mp4"))
     """
-    ids = [compute_media_id(media_path) for _ in range(iterations)]
+    media_path = Path(media_path).resolve()
+    ids = [_compute_media_id(media_path, 30) for _ in range(iterations)]
     return len(set(ids)) == 1  # All IDs should be identical
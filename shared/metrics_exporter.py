@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Metrics Exporter - Prometheus text-format metrics for a pipeline fleet
+
+Aggregates capacity-planning metrics from data the pipeline already keeps:
+
+- Job manifests (manifest.json): job status, queue depth, stage runs,
+  failures, stage duration histograms and CPU seconds
+- Job event streams (events.jsonl, see shared/job_events.py): media length,
+  translation throughput and cache lookups (baseline, translation, TMDB)
+- Job .env: ASR backend/model for real-time factor histograms
+- CostTracker ledger: API tokens, calls and cost per service/model
+- BaselineCacheOrchestrator.get_cache_info(): cache size and media count
+
+No client library is needed: MetricsRegistry renders the Prometheus text
+exposition format (0.0.4). Serve it with tools/metrics-exporter.py
+(textfile for node_exporter, or a local /metrics endpoint).
+
+Jobs are re-parsed only when their files change, so repeated scrapes of a
+large output tree stay cheap. Per-job sums (stage runs, CPU seconds, cache
+lookups, API usage) are gauges over the jobs currently on disk and the
+current month's ledger, not counters: they drop when jobs are cleaned up
+or the month rolls over.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import json
+import math
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Local
+from shared.job_events import EVENTS_FILE, read_events
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+METRIC_PREFIX = "cpwhisperx"
+
+DURATION_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+
+# get_cache_info() walks the whole baseline cache
+CACHE_INFO_TTL = 300.0
+
+# Stage manifests use "success"; the orchestrator uses "completed"
+_STATUS_ALIASES = {"success": "completed", "error": "failed"}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: Any) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(round(float(value), 6))
+
+
+@dataclass
+class MetricFamily:
+    """One metric name with its samples per label set."""
+
+    name: str
+    kind: str
+    help: str
+    buckets: Tuple[float, ...] = ()
+    values: Dict[Labels, float] = field(default_factory=dict)
+    histograms: Dict[Labels, List[float]] = field(default_factory=dict)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        if self.kind != "histogram":
+            for labels, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+            return lines
+        for labels, observations in sorted(self.histograms.items()):
+            for bound in self.buckets:
+                count = sum(1 for v in observations if v <= bound)
+                lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {len(observations)}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(sum(observations))}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {len(observations)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms rendered as Prometheus text."""
+
+    def __init__(self, prefix: str = METRIC_PREFIX):
+        """
+        Initialize registry.
+
+        Args:
+            prefix: Prefix for every metric name
+        """
+        self.prefix = prefix
+        self.families: Dict[str, MetricFamily] = {}
+
+    def _family(self, name: str, kind: str, help_text: str, buckets: Tuple[float, ...] = ()) -> MetricFamily:
+        full = f"{self.prefix}_{name}"
+        family = self.families.get(full)
+        if family is None:
+            family = self.families[full] = MetricFamily(full, kind, help_text, tuple(buckets))
+        return family
+
+    def inc(self, name: str, help_text: str, amount: float = 1.0, **labels: Any) -> None:
+        """Add to a counter."""
+        family = self._family(name, "counter", help_text)
+        key = _labels(**labels)
+        family.values[key] = family.values.get(key, 0.0) + amount
+
+    def set(self, name: str, help_text: str, value: float, **labels: Any) -> None:
+        """Set a gauge."""
+        self._family(name, "gauge", help_text).values[_labels(**labels)] = value
+
+    def add(self, name: str, help_text: str, amount: float = 1.0, **labels: Any) -> None:
+        """Add to a gauge (a sum that may drop between scrapes)."""
+        family = self._family(name, "gauge", help_text)
+        key = _labels(**labels)
+        family.values[key] = family.values.get(key, 0.0) + amount
+
+    def observe(self, name: str, help_text: str, value: float,
+                buckets: Tuple[float, ...] = DURATION_BUCKETS, **labels: Any) -> None:
+        """Add an observation to a histogram."""
+        family = self._family(name, "histogram", help_text, buckets)
+        family.histograms.setdefault(_labels(**labels), []).append(value)
+
+    def render(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        for name in sorted(self.families):
+            lines.extend(self.families[name].render())
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# JOB DATA
+# ============================================================================
+
+@dataclass
+class JobMetrics:
+    """Metrics-relevant facts of one job."""
+
+    status: str = "unknown"
+    workflow: Optional[str] = None
+    media_seconds: Optional[float] = None
+    asr_backend: Optional[str] = None
+    asr_model: Optional[str] = None
+    # (stage, status, duration_seconds, cpu_seconds)
+    stages: List[Tuple[str, str, Optional[float], Optional[float]]] = field(default_factory=list)
+    # (cache, hits, misses)
+    cache: List[Tuple[str, int, int]] = field(default_factory=list)
+    # (model, tokens, seconds)
+    translation: List[Tuple[str, int, float]] = field(default_factory=list)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _read_env(path: Path) -> Dict[str, str]:
+    values = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    values[key.strip()] = value.strip()
+    except OSError:
+        pass
+    return values
+
+
+def _stage_entries(manifest: Dict[str, Any]) -> Iterable[Tuple[str, Dict[str, Any]]]:
+    """Stages of a manifest in either the list or the dict format."""
+    stages = manifest.get("stages") or {}
+    if isinstance(stages, dict):
+        return stages.items()
+    return ((s.get("name"), s) for s in stages if isinstance(s, dict) and s.get("name"))
+
+
+def load_job(job_dir: Path) -> Optional[JobMetrics]:
+    """
+    Collect the metrics-relevant facts of a job directory
+
+    Args:
+        job_dir: Job directory (contains manifest.json)
+
+    Returns:
+        JobMetrics, or None if the directory is not a job
+    """
+    manifest = _read_json(job_dir / "manifest.json")
+    if manifest is None:
+        return None
+    job = JobMetrics(
+        status=_STATUS_ALIASES.get(manifest.get("status"), manifest.get("status") or "unknown"),
+        workflow=manifest.get("workflow"),
+    )
+
+    for name, stage in _stage_entries(manifest):
+        status = stage.get("status")
+        status = _STATUS_ALIASES.get(status, status)
+        if status not in ("completed", "failed", "skipped"):
+            continue
+        resources = stage.get("resources") or {}
+        job.stages.append((name, status, stage.get("duration_seconds"), resources.get("cpu_seconds")))
+
+    events, _ = read_events(job_dir / EVENTS_FILE)
+    for event in events:
+        kind = event.get("event")
+        if kind == "media" and event.get("media_seconds"):
+            job.media_seconds = float(event["media_seconds"])
+        elif kind == "cache" and event.get("cache"):
+            job.cache.append((event["cache"], int(event.get("hits", 0)), int(event.get("misses", 0))))
+        elif kind == "throughput" and event.get("kind") == "translation":
+            job.translation.append((
+                str(event.get("model", "unknown")),
+                int(event.get("tokens", 0)),
+                float(event.get("seconds", 0.0)),
+            ))
+
+    if job.media_seconds is None:
+        analysis = _read_json(job_dir / "01_demux" / "audio_analysis.json")
+        if analysis and analysis.get("duration"):
+            job.media_seconds = float(analysis["duration"])
+
+    job_id = manifest.get("job_id")
+    env = _read_env(job_dir / f".{job_id}.env") if job_id else {}
+    job.asr_backend = env.get("WHISPER_BACKEND")
+    job.asr_model = env.get("WHISPER_MODEL")
+    return job
+
+
+class MetricsCollector:
+    """
+    Build the metrics of an output tree
+
+    Job directories are found by their manifest.json; parsed jobs are
+    cached by the modification times of their files.
+    """
+
+    def __init__(self, output_roots: List[Path], cost_storage_path: Optional[Path] = None,
+                 cache_info: bool = True, cache_info_ttl: float = CACHE_INFO_TTL):
+        """
+        Initialize collector.
+
+        Args:
+            output_roots: Job output roots (e.g. out/)
+            cost_storage_path: CostTracker ledger directory (default: CostTracker's)
+            cache_info: Include BaselineCacheOrchestrator.get_cache_info()
+            cache_info_ttl: Seconds to reuse the last cache info
+        """
+        self.output_roots = [Path(p) for p in output_roots]
+        self.cost_storage_path = cost_storage_path
+        self.cache_info = cache_info
+        self.cache_info_ttl = cache_info_ttl
+        self._jobs: Dict[Path, Tuple[Tuple[float, ...], Optional[JobMetrics]]] = {}
+        self._cache_info: Optional[Tuple[float, Dict[str, Any]]] = None
+
+    def _job_dirs(self) -> List[Path]:
+        dirs = []
+        for root in self.output_roots:
+            if (root / "manifest.json").exists():
+                dirs.append(root)
+            elif root.is_dir():
+                dirs.extend(p.parent for p in root.rglob("manifest.json") if (p.parent / "job.json").exists())
+        return sorted(set(dirs))
+
+    def _job(self, job_dir: Path) -> Optional[JobMetrics]:
+        stamps = []
+        for name in ("manifest.json", EVENTS_FILE):
+            try:
+                stamps.append((job_dir / name).stat().st_mtime)
+            except OSError:
+                stamps.append(0.0)
+        key = tuple(stamps)
+        cached = self._jobs.get(job_dir)
+        if cached is None or cached[0] != key:
+            cached = (key, load_job(job_dir))
+            self._jobs[job_dir] = cached
+        return cached[1]
+
+    def collect(self) -> MetricsRegistry:
+        """
+        Collect all metrics
+
+        Returns:
+            Filled registry
+        """
+        registry = MetricsRegistry()
+        jobs = [job for job in (self._job(d) for d in self._job_dirs()) if job is not None]
+        self._collect_jobs(registry, jobs)
+        self._collect_costs(registry)
+        if self.cache_info:
+            self._collect_cache_info(registry)
+        return registry
+
+    def _collect_jobs(self, registry: MetricsRegistry, jobs: List[JobMetrics]) -> None:
+        by_status: Dict[str, int] = {}
+        cache_totals: Dict[str, List[int]] = {}
+        for job in jobs:
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+
+            for stage, status, duration, cpu in job.stages:
+                registry.add("stage_runs", "Stage runs by final status (jobs on disk)", stage=stage, status=status)
+                if status == "failed":
+                    registry.add("stage_failures", "Failed stage runs (jobs on disk)", stage=stage)
+                if duration is not None and status == "completed":
+                    registry.observe("stage_duration_seconds", "Wall time of completed stages",
+                                     float(duration), stage=stage)
+                    if job.media_seconds:
+                        registry.observe("stage_rtf", "Stage wall seconds per media second",
+                                         float(duration) / job.media_seconds, buckets=RTF_BUCKETS, stage=stage)
+                if cpu is not None:
+                    registry.add("stage_cpu_seconds", "CPU seconds used by stages (jobs on disk)", float(cpu), stage=stage)
+                if stage == "asr" and status == "completed" and duration and job.media_seconds:
+                    registry.observe(
+                        "asr_rtf", "ASR real-time factor (wall seconds per audio second)",
+                        float(duration) / job.media_seconds, buckets=RTF_BUCKETS,
+                        backend=job.asr_backend or "unknown", model=job.asr_model or "unknown"
+                    )
+
+            if job.media_seconds and job.status == "completed":
+                registry.add("media_seconds", "Media seconds of completed jobs on disk", job.media_seconds)
+
+            for cache, hits, misses in job.cache:
+                registry.add("cache_requests", "Cache lookups (jobs on disk)", hits, cache=cache, result="hit")
+                registry.add("cache_requests", "Cache lookups (jobs on disk)", misses, cache=cache, result="miss")
+                totals = cache_totals.setdefault(cache, [0, 0])
+                totals[0] += hits
+                totals[1] += misses
+
+            for model, tokens, seconds in job.translation:
+                registry.add("translation_tokens", "Tokens translated (jobs on disk)", tokens, model=model)
+                registry.add("translation_seconds", "Seconds spent generating translations (jobs on disk)",
+                             seconds, model=model)
+                if seconds > 0:
+                    registry.observe("translation_tokens_per_second", "Translation throughput per stage run",
+                                     tokens / seconds, buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+                                     model=model)
+
+        for status in ("prepared", "running", "completed", "failed"):
+            by_status.setdefault(status, 0)
+        for status, count in by_status.items():
+            registry.set("jobs", "Jobs by status", count, status=status)
+        registry.set("queue_depth", "Prepared jobs waiting to run", by_status["prepared"])
+        for cache, (hits, misses) in cache_totals.items():
+            if hits + misses:
+                registry.set("cache_hit_ratio", "Cache hit ratio over all jobs", hits / (hits + misses), cache=cache)
+
+    def _collect_costs(self, registry: MetricsRegistry) -> None:
+        """API usage from the CostTracker ledger of the current month."""
+        from shared.cost_tracker import CostTracker
+        try:
+            tracker = CostTracker(cost_storage_path=self.cost_storage_path)
+        except OSError as e:
+            logger.debug(f"Cost ledger unavailable: {e}")
+            return
+        ledger = _read_json(tracker.monthly_log_file) or {}
+        for entry in ledger.get("entries", []):
+            labels = {"service": entry.get("service"), "model": entry.get("model")}
+            registry.add("api_calls", "Logged model calls (CostTracker, current month)", **labels)
+            registry.add("api_cost_usd", "Model cost in USD (CostTracker, current month)",
+                         float(entry.get("cost_usd", 0.0)), **labels)
+            registry.add("api_tokens", "Model tokens (CostTracker, current month)",
+                         int(entry.get("tokens_input", 0)), direction="input", **labels)
+            registry.add("api_tokens", "Model tokens (CostTracker, current month)",
+                         int(entry.get("tokens_output", 0)), direction="output", **labels)
+
+    def _collect_cache_info(self, registry: MetricsRegistry) -> None:
+        """Baseline cache size from BaselineCacheOrchestrator.get_cache_info()."""
+        now = time.monotonic()
+        if self._cache_info is not None and now - self._cache_info[0] < self.cache_info_ttl:
+            info = self._cache_info[1]
+        else:
+            try:
+                from shared.baseline_cache_orchestrator import BaselineCacheOrchestrator
+                root = self.output_roots[0] if self.output_roots else Path(".")
+                info = BaselineCacheOrchestrator(root).get_cache_info()
+            except Exception as e:
+                logger.debug(f"Cache info unavailable: {e}")
+                return
+            self._cache_info = (now, info)
+        if "total_size_bytes" in info:
+            registry.set("baseline_cache_size_bytes", "Baseline cache size", info["total_size_bytes"])
+        if "cached_media_count" in info:
+            registry.set("baseline_cache_media", "Media with cached baselines", info["cached_media_count"])
+
+
+def write_textfile(path: Path, text: str) -> None:
+    """
+    Atomically replace a textfile-collector file
+
+    Args:
+        path: Output .prom file
+        text: Metrics text
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
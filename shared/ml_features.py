@@ -96,6 +96,16 @@ class MediaFeatureExtractor:
                 'channels': audio_info.get('channels', 1)
             })
         
+        # Reuse the single-decode analysis written by the demux stage
+        from shared.demux_analysis import load_analysis
+        analysis = load_analysis(audio_path)
+        if analysis:
+            features.update(analysis.get('features', {}))
+            self.logger.info(f"Features from demux analysis: duration={features['duration']:.1f}s, "
+                           f"SNR={features['snr']:.1f}dB, "
+                           f"speech_ratio={features['speech_ratio']:.2f}")
+            return features
+        
         # Compute advanced features
         try:
             # Import librosa for audio analysis
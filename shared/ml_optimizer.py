@@ -100,21 +100,36 @@ class AudioFingerprint:
         Returns:
             AudioFingerprint instance
         """
-        import librosa
+        from shared.demux_analysis import load_analysis
         
         logger.info(f"📊 Extracting audio fingerprint from {audio_file.name}")
         
         # Get file size
         file_size_mb = audio_file.stat().st_size / (1024 * 1024)
         
-        # Load audio metadata (fast)
-        try:
-            duration = librosa.get_duration(path=str(audio_file))
-            sr = librosa.get_samplerate(path=str(audio_file))
-        except Exception as e:
-            logger.warning(f"Failed to extract audio metadata: {e}")
-            duration = 0.0
-            sr = 16000
+        # Estimate SNR and complexity (simplified)
+        # In production, this would analyze audio samples
+        snr_estimate = 20.0  # Default: reasonable quality
+        complexity_score = 0.5  # Default: medium complexity
+        
+        # Prefer the demux analysis (same decode that produced the WAV)
+        analysis = load_analysis(audio_file)
+        if analysis:
+            features = analysis.get('features', {})
+            duration = float(analysis['duration'])
+            sr = int(analysis.get('sample_rate', 16000))
+            snr_estimate = features.get('snr', snr_estimate)
+            complexity_score = features.get('complexity', complexity_score)
+        else:
+            # Load audio metadata (fast)
+            try:
+                import librosa
+                duration = librosa.get_duration(path=str(audio_file))
+                sr = librosa.get_samplerate(path=str(audio_file))
+            except Exception as e:
+                logger.warning(f"Failed to extract audio metadata: {e}")
+                duration = 0.0
+                sr = 16000
         
         # Try to load VAD manifest for speaker count
         speaker_count = 0
@@ -132,11 +147,6 @@ class AudioFingerprint:
             except Exception as e:
                 logger.debug(f"Could not load VAD manifest: {e}")
         
-        # Estimate SNR and complexity (simplified)
-        # In production, this would analyze audio samples
-        snr_estimate = 20.0  # Default: reasonable quality
-        complexity_score = 0.5  # Default: medium complexity
-        
         # Try to detect language from job config
         language = "auto"
         try:
@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Subtitle muxing without re-encoding
+
+Handles:
+- One ffmpeg invocation for every requested container (MP4 and MKV are
+  written from a single read of the source)
+- Keyframe-aligned stream-copy clipping: the cut starts at the last video
+  keyframe at or before the requested start (input seek, no decode) and
+  subtitle inputs are shifted by the difference so they stay in sync
+- A fast path that adds or replaces subtitle tracks on an existing muxed
+  file (ours or one muxed elsewhere) instead of re-reading the source
+- mux_state.json next to the outputs (source fingerprint, clip, track
+  hashes) so a re-run with unchanged inputs is skipped and a re-run with
+  changed subtitles only takes the fast path
+
+Module: shared/mux_engine.py
+"""
+
+# Standard library
+import hashlib
+import json
+import os
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+MUX_STATE_FILENAME = "mux_state.json"
+MUX_STATE_VERSION = 1
+REMUX_MODES = ('auto', 'always')
+
+# How far back to look for a keyframe before the clip start (seconds)
+KEYFRAME_LOOKBACK = 30.0
+
+# 2-letter codes → ISO 639-2 (3-letter) for player compatibility
+ISO639_2 = {
+    "hi": "hin", "en": "eng", "gu": "guj", "ta": "tam", "te": "tel",
+    "bn": "ben", "mr": "mar", "kn": "kan", "ml": "mal", "pa": "pan",
+    "ur": "urd", "as": "asm", "or": "ori", "ne": "nep", "sd": "snd",
+    "si": "sin", "sa": "san", "es": "spa", "ru": "rus", "zh": "chi",
+    "ar": "ara", "fr": "fra", "de": "deu", "pt": "por",
+}
+
+# ISO 639-2 → display name for track titles
+LANGUAGE_NAMES = {
+    "hin": "Hindi", "eng": "English", "guj": "Gujarati", "tam": "Tamil",
+    "tel": "Telugu", "ben": "Bengali", "mar": "Marathi", "kan": "Kannada",
+    "mal": "Malayalam", "pan": "Punjabi", "urd": "Urdu", "asm": "Assamese",
+    "ori": "Odia", "nep": "Nepali", "snd": "Sindhi", "sin": "Sinhala",
+    "san": "Sanskrit", "spa": "Spanish", "rus": "Russian", "chi": "Chinese",
+    "ara": "Arabic", "fra": "French", "deu": "German", "por": "Portuguese",
+}
+
+# Source extension → output container (AVI and unknown formats go to MKV)
+CONTAINERS = {'.mp4': 'mp4', '.m4v': 'mp4', '.mov': 'mp4', '.mkv': 'mkv', '.webm': 'mkv'}
+_MUXERS = {'mp4': 'mp4', 'mkv': 'matroska'}
+_MKV_SUBTITLE_CODECS = {'.srt': 'srt', '.ass': 'ass', '.ssa': 'ass', '.vtt': 'webvtt'}
+
+
+@dataclass(frozen=True)
+class SubtitleTrack:
+    """A subtitle file to mux as one track."""
+
+    path: Path
+    language: str
+    title: Optional[str] = None
+
+    @property
+    def iso(self) -> str:
+        return ISO639_2.get(self.language, self.language)
+
+    @property
+    def label(self) -> str:
+        return self.title or LANGUAGE_NAMES.get(self.iso, self.language.upper())
+
+    def fingerprint(self) -> str:
+        return hashlib.sha256(Path(self.path).read_bytes()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class ClipPlan:
+    """Requested clip and the keyframe the stream copy actually starts at."""
+
+    start: float
+    end: Optional[float]
+    keyframe: float
+
+    @property
+    def offset(self) -> float:
+        """Shift applied to subtitles (they are timed from `start`)"""
+        return self.start - self.keyframe
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.keyframe
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Seconds from "HH:MM:SS(.mmm)", "MM:SS" or a number.
+
+    Args:
+        value: Timestamp (empty/None means not set)
+
+    Returns:
+        Seconds, or None
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    seconds = 0.0
+    for part in str(value).strip().replace(',', '.').split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def output_container(source: Path) -> str:
+    """Container for a source file ('mp4' or 'mkv')"""
+    return CONTAINERS.get(Path(source).suffix.lower(), 'mkv')
+
+
+def subtitle_codec(container: str, subtitle_path: Path) -> str:
+    """ffmpeg subtitle encoder for a track in a container"""
+    if container == 'mp4':
+        return 'mov_text'
+    return _MKV_SUBTITLE_CODECS.get(Path(subtitle_path).suffix.lower(), 'srt')
+
+
+def _run(cmd: List[str], what: str) -> subprocess.CompletedProcess:
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{what} failed ({result.returncode}): {result.stderr.strip()[-500:]}")
+    return result
+
+
+def probe_subtitle_languages(media: Path) -> List[str]:
+    """Language tag of each subtitle stream in a file ('und' if missing)"""
+    result = _run([
+        "ffprobe", "-v", "error", "-select_streams", "s",
+        "-show_entries", "stream=index:stream_tags=language",
+        "-of", "json", str(media)
+    ], "ffprobe")
+    streams = json.loads(result.stdout or "{}").get("streams", [])
+    return [s.get("tags", {}).get("language", "und") for s in streams]
+
+
+def keyframe_at_or_before(media: Path, seconds: float, lookback: float = KEYFRAME_LOOKBACK) -> float:
+    """
+    Time of the last video keyframe at or before `seconds`.
+
+    Only the packets in [seconds - lookback, seconds] are read.
+
+    Args:
+        media: Video file
+        seconds: Target time
+        lookback: Window searched before the target
+
+    Returns:
+        Keyframe time (the target itself if none is found)
+    """
+    if seconds <= 0:
+        return 0.0
+    low = max(seconds - lookback, 0.0)
+    result = _run([
+        "ffprobe", "-v", "error", "-select_streams", "v:0", "-skip_frame", "nokey",
+        "-show_entries", "frame=best_effort_timestamp_time", "-of", "csv=p=0",
+        "-read_intervals", f"{low:.3f}%{seconds + 0.001:.3f}", str(media)
+    ], "ffprobe")
+    times = []
+    for line in result.stdout.splitlines():
+        try:
+            times.append(float(line.strip().strip(',')))
+        except ValueError:
+            continue
+    before = [t for t in times if t <= seconds + 1e-3]
+    return max(before) if before else seconds
+
+
+def plan_clip(media: Path, start: Any, end: Any) -> Optional[ClipPlan]:
+    """
+    Keyframe-aligned clip for a start/end pair.
+
+    Args:
+        media: Source video
+        start: Clip start (timestamp or seconds; empty for 0)
+        end: Clip end (timestamp or seconds; empty for end of file)
+
+    Returns:
+        ClipPlan, or None when neither bound is set
+    """
+    start_s = parse_timestamp(start)
+    end_s = parse_timestamp(end)
+    if start_s is None and end_s is None:
+        return None
+    start_s = start_s or 0.0
+    return ClipPlan(start=start_s, end=end_s, keyframe=keyframe_at_or_before(media, start_s))
+
+
+def partial_path(output: Path) -> Path:
+    """Temporary name an output is written under before the final rename"""
+    return output.with_name(f".{output.name}.partial")
+
+
+def build_mux_command(
+    base: Path,
+    tracks: Sequence[SubtitleTrack],
+    outputs: Sequence[Tuple[Path, str]],
+    clip: Optional[ClipPlan] = None,
+    keep_subtitles: Sequence[int] = (),
+    subtitle_offset: Optional[float] = None,
+    loglevel: str = "error"
+) -> List[str]:
+    """
+    ffmpeg command writing every output from one read of `base`.
+
+    Video and audio are stream-copied; subtitle streams of `base` listed
+    in `keep_subtitles` are kept, all others are dropped, then `tracks`
+    are added in order (the first added track is the default).
+
+    Args:
+        base: Source media, or an already-muxed file for the fast path
+        tracks: Subtitle tracks to add
+        outputs: (path, container) pairs; written to partial_path(path)
+        clip: Keyframe-aligned clip (None for the whole file)
+        keep_subtitles: Indices of subtitle streams in `base` to keep
+        subtitle_offset: Shift for the added tracks (default: clip.offset)
+        loglevel: ffmpeg log level
+
+    Returns:
+        Command argument list
+    """
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-loglevel", loglevel]
+    if clip and clip.keyframe > 0:
+        # Input seek: jumps to the keyframe without decoding anything
+        cmd.extend(["-ss", f"{clip.keyframe:.3f}"])
+    cmd.extend(["-i", str(base)])
+    if subtitle_offset is None:
+        subtitle_offset = clip.offset if clip else 0.0
+    for track in tracks:
+        if subtitle_offset > 0:
+            cmd.extend(["-itsoffset", f"{subtitle_offset:.3f}"])
+        cmd.extend(["-i", str(track.path)])
+
+    for output, container in outputs:
+        cmd.extend(["-map", "0:v?", "-map", "0:a?"])
+        for index in keep_subtitles:
+            cmd.extend(["-map", f"0:s:{index}"])
+        for i in range(len(tracks)):
+            cmd.extend(["-map", f"{i + 1}:0"])
+        cmd.extend(["-c", "copy"])
+
+        # Kept tracks are copied, except into MP4 which only takes mov_text
+        if container == 'mp4':
+            for k in range(len(keep_subtitles)):
+                cmd.extend([f"-c:s:{k}", "mov_text"])
+        for i, track in enumerate(tracks):
+            s = len(keep_subtitles) + i
+            cmd.extend([
+                f"-c:s:{s}", subtitle_codec(container, track.path),
+                f"-metadata:s:s:{s}", f"language={track.iso}",
+                f"-metadata:s:s:{s}", f"title={track.label}",
+                f"-disposition:s:{s}", "default" if s == 0 else "0",
+            ])
+
+        if clip and clip.duration is not None:
+            cmd.extend(["-t", f"{clip.duration:.3f}"])
+        if clip:
+            cmd.extend(["-avoid_negative_ts", "make_zero"])
+        cmd.extend(["-f", _MUXERS[container], str(partial_path(output))])
+    return cmd
+
+
+def _run_and_commit(cmd: List[str], outputs: Sequence[Tuple[Path, str]]) -> None:
+    for output, _ in outputs:
+        output.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        _run(cmd, "ffmpeg mux")
+    except Exception:
+        for output, _ in outputs:
+            partial_path(output).unlink(missing_ok=True)
+        raise
+    for output, _ in outputs:
+        os.replace(partial_path(output), output)
+
+
+def source_fingerprint(source: Path) -> Dict[str, Any]:
+    """Cheap identity of a source file (path, size, mtime)"""
+    stat = Path(source).stat()
+    return {'path': str(Path(source).resolve()), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+
+def load_mux_state(directory: Path) -> Dict[str, Any]:
+    """mux_state.json from a mux output directory ({} if absent or stale)"""
+    path = Path(directory) / MUX_STATE_FILENAME
+    try:
+        state = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+    return state if state.get('version') == MUX_STATE_VERSION else {}
+
+
+def save_mux_state(directory: Path, state: Dict[str, Any]) -> Path:
+    """Write mux_state.json atomically"""
+    path = Path(directory) / MUX_STATE_FILENAME
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def plan_remux(
+    state: Dict[str, Any],
+    source: Dict[str, Any],
+    clip: Optional[ClipPlan],
+    outputs: Sequence[Tuple[Path, str]],
+    track_hashes: Dict[str, str],
+    remux: str = 'auto'
+) -> str:
+    """
+    What a mux run has to do.
+
+    Args:
+        state: Previous mux_state.json ({} if none)
+        source: source_fingerprint() of the current source
+        clip: Current clip plan
+        outputs: Requested (path, container) pairs
+        track_hashes: "<index>:<language>" → subtitle file hash
+        remux: 'auto' or 'always' (always rebuild from the source)
+
+    Returns:
+        'skip' (nothing changed), 'attach' (only subtitles changed: work
+        from an existing output) or 'full' (read the source)
+    """
+    if remux == 'always' or not state:
+        return 'full'
+    same_video = (
+        state.get('source') == source
+        and state.get('clip') == (asdict(clip) if clip else None)
+    )
+    if not same_video:
+        return 'full'
+    previous = set(state.get('outputs', {}))
+    if not any(output.name in previous and output.exists() for output, _ in outputs):
+        return 'full'
+    all_present = all(output.name in previous and output.exists() for output, _ in outputs)
+    if all_present and state.get('tracks') == track_hashes:
+        return 'skip'
+    return 'attach'
+
+
+def attach_subtitles(
+    media: Path,
+    tracks: Sequence[SubtitleTrack],
+    outputs: Optional[Sequence[Tuple[Path, str]]] = None,
+    replace: bool = True,
+    loglevel: str = "error"
+) -> Dict[str, Any]:
+    """
+    Add or replace subtitle tracks on an already-muxed file.
+
+    Video and audio are stream-copied from `media` (never from the
+    original source). Existing subtitle streams in a language being added
+    are replaced when `replace` is set; the rest are kept.
+
+    Args:
+        media: Muxed file to start from
+        tracks: Subtitle tracks to add
+        outputs: (path, container) pairs (default: rewrite `media` in place)
+        replace: Drop existing tracks in the languages being added
+        loglevel: ffmpeg log level
+
+    Returns:
+        {"kept": [...languages], "added": [...languages]}
+    """
+    media = Path(media)
+    outputs = list(outputs or [(media, output_container(media))])
+    existing = probe_subtitle_languages(media)
+    new_languages = {track.iso for track in tracks}
+    keep = [i for i, lang in enumerate(existing) if not (replace and lang in new_languages)]
+    # Outputs go to partial files first, so `media` itself can be a target
+    _run_and_commit(build_mux_command(media, tracks, outputs, keep_subtitles=keep, loglevel=loglevel), outputs)
+    return {'kept': [existing[i] for i in keep], 'added': [track.iso for track in tracks]}
+
+
+def mux_job(
+    source: Path,
+    tracks: Sequence[SubtitleTrack],
+    outputs: Sequence[Tuple[Path, str]],
+    clip: Optional[ClipPlan] = None,
+    remux: str = 'auto',
+    loglevel: str = "error",
+    logger_instance=None
+) -> Dict[str, Any]:
+    """
+    Mux subtitle tracks into every requested container, doing the least work.
+
+    Args:
+        source: Original media
+        tracks: Subtitle tracks (first is the default track)
+        outputs: (path, container) pairs, all in one directory
+        clip: Keyframe-aligned clip, or None
+        remux: 'auto' (skip/fast path when possible) or 'always'
+        loglevel: ffmpeg log level
+        logger_instance: Logger (default: module logger)
+
+    Returns:
+        {"mode": "skip"|"attach"|"full", "outputs": [...], "clip": ..., "seconds": ...}
+    """
+    log = logger_instance or logger
+    if remux not in REMUX_MODES:
+        log.warning(f"Unknown remux mode '{remux}', using 'auto'")
+        remux = 'auto'
+    outputs = [(Path(path), container) for path, container in outputs]
+    directory = outputs[0][0].parent
+    directory.mkdir(parents=True, exist_ok=True)
+
+    fingerprint = source_fingerprint(source)
+    # Keyed by position too: two tracks may share a language (e.g. full + forced)
+    track_hashes = {f"{index}:{track.iso}": track.fingerprint() for index, track in enumerate(tracks)}
+    state = load_mux_state(directory)
+    mode = plan_remux(state, fingerprint, clip, outputs, track_hashes, remux)
+    started = time.time()
+
+    if mode == 'skip':
+        log.info("Mux inputs unchanged, keeping existing outputs")
+    elif mode == 'attach':
+        previous = state.get('outputs', {})
+        existing = [path for path, _ in outputs if path.name in previous and path.exists()]
+        # Prefer MKV as the base: it holds every subtitle codec
+        base = sorted(existing, key=lambda p: output_container(p) != 'mkv')[0]
+        log.info(f"Video unchanged, updating subtitle tracks from {base.name} (no source read)")
+        # All of our tracks are re-added, so none of the old ones are kept;
+        # the base is already cut at the keyframe but subtitles still need
+        # the clip offset
+        cmd = build_mux_command(base, tracks, outputs, subtitle_offset=clip.offset if clip else 0.0,
+                                loglevel=loglevel)
+        _run_and_commit(cmd, outputs)
+    else:
+        if clip:
+            log.info(f"Clip {clip.start:.3f}s-{clip.end if clip.end is not None else 'end'} "
+                     f"(stream copy from keyframe at {clip.keyframe:.3f}s)")
+        log.info(f"Muxing {len(tracks)} subtitle track(s) into {', '.join(c for _, c in outputs)} in one pass")
+        _run_and_commit(build_mux_command(source, tracks, outputs, clip=clip, loglevel=loglevel), outputs)
+
+    save_mux_state(directory, {
+        'version': MUX_STATE_VERSION,
+        'source': fingerprint,
+        'clip': asdict(clip) if clip else None,
+        'tracks': track_hashes,
+        'outputs': {path.name: {'container': container} for path, container in outputs},
+    })
+    return {
+        'mode': mode,
+        'outputs': [str(path) for path, _ in outputs],
+        'clip': asdict(clip) if clip else None,
+        'seconds': round(time.time() - started, 2),
+    }
+
+
+__all__ = [
+    'ISO639_2',
+    'LANGUAGE_NAMES',
+    'SubtitleTrack',
+    'ClipPlan',
+    'parse_timestamp',
+    'output_container',
+    'subtitle_codec',
+    'keyframe_at_or_before',
+    'plan_clip',
+    'build_mux_command',
+    'plan_remux',
+    'attach_subtitles',
+    'mux_job',
+    'load_mux_state',
+]
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Stage Profiling - per-job hot-path profiling hooks
+
+Enabled per job through the "profiling" section of job.json:
+
+    "profiling": {
+        "enabled": true,
+        "stages": ["asr", "*translation*"],   # fnmatch patterns, [] = all
+        "mode": "cprofile",                    # cprofile | sampling
+        "interval_ms": 10,                     # sampling interval
+        "tracemalloc_top": 25,                 # 0 = off
+        "tracemalloc_frames": 1
+    }
+
+The orchestrator profiles its own in-process part of a selected stage and
+exports the settings to the stage subprocesses (PIPELINE_PROFILE); each
+stage's StageIO starts a StageProfiler on creation and stops it in
+finalize(), or at exit if the stage raises or exits before that. Output
+lands in the stage directory:
+
+    <label>.prof               cProfile stats (pstats / snakeviz)
+    <label>.collapsed          collapsed stacks, py-spy raw format
+                               (flamegraph.pl / speedscope)
+    <label>.tracemalloc.json   top-N allocation sites
+
+Sampling uses py-spy when installed (attached to the stage process),
+otherwise a stdlib sampler over sys._current_frames(). Aggregate across
+jobs with tools/aggregate-profiles.py.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import atexit
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Local
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+PROFILE_ENV = "PIPELINE_PROFILE"
+MODES = ("cprofile", "sampling")
+DEFAULT_INTERVAL_MS = 10.0
+
+
+def _as_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return bool(value)
+
+
+def _as_list(value: Any) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(str(v).strip() for v in (value or ()) if str(v).strip())
+
+
+@dataclass(frozen=True)
+class ProfilingSettings:
+    """Which stages to profile and how."""
+
+    enabled: bool = False
+    stages: Tuple[str, ...] = field(default_factory=tuple)
+    mode: str = "cprofile"
+    interval_ms: float = DEFAULT_INTERVAL_MS
+    tracemalloc_top: int = 0
+    tracemalloc_frames: int = 1
+
+    @classmethod
+    def from_job(
+        cls,
+        job_config: Optional[Dict[str, Any]] = None,
+        env_config: Optional[Dict[str, str]] = None
+    ) -> 'ProfilingSettings':
+        """
+        Build settings from job.json's "profiling" section over PROFILING_* env
+
+        Args:
+            job_config: Parsed job.json
+            env_config: Job .env values
+
+        Returns:
+            ProfilingSettings (AD-006: job.json wins)
+        """
+        env = env_config or {}
+        section = dict((job_config or {}).get("profiling") or {})
+        mode = str(section.get("mode", env.get("PROFILING_MODE", "cprofile"))).lower()
+        if mode not in MODES:
+            logger.warning(f"Unknown profiling mode '{mode}', using cprofile")
+            mode = "cprofile"
+        try:
+            return cls(
+                enabled=_as_bool(section.get("enabled", env.get("PROFILING_ENABLED", False))),
+                stages=_as_list(section.get("stages", env.get("PROFILING_STAGES", ""))),
+                mode=mode,
+                interval_ms=float(section.get("interval_ms", env.get("PROFILING_INTERVAL_MS", DEFAULT_INTERVAL_MS))),
+                tracemalloc_top=int(section.get("tracemalloc_top", env.get("PROFILING_TRACEMALLOC_TOP", 0))),
+                tracemalloc_frames=int(section.get("tracemalloc_frames", 1)),
+            )
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid profiling settings ({e}), profiling disabled")
+            return cls()
+
+    @classmethod
+    def from_env(cls, environ: Optional[Dict[str, str]] = None) -> Optional['ProfilingSettings']:
+        """Settings exported by the orchestrator, or None if not profiling."""
+        raw = (environ if environ is not None else os.environ).get(PROFILE_ENV)
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            data["stages"] = tuple(data.get("stages", ()))
+            return cls(**data)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid {PROFILE_ENV}: {e}")
+            return None
+
+    def to_env(self) -> str:
+        """Serialized form for PIPELINE_PROFILE."""
+        data = asdict(self)
+        data["stages"] = list(self.stages)
+        return json.dumps(data)
+
+    def profiles(self, stage_name: str) -> bool:
+        """Whether a stage is selected for profiling."""
+        if not self.enabled:
+            return False
+        if not self.stages or "all" in self.stages:
+            return True
+        return any(fnmatch(stage_name, pattern) for pattern in self.stages)
+
+
+class StackSampler:
+    """
+    Stdlib sampling profiler writing py-spy compatible collapsed stacks
+
+    A daemon thread snapshots every other thread's Python stack every
+    interval; identical stacks are counted.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_MS / 1000.0):
+        """
+        Initialize sampler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                    frame = frame.f_back
+                frames.append(f"thread {names.get(ident, ident)}")
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write(self, path: Path) -> None:
+        """Write collapsed stacks ("frame;frame;frame count" per line)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _start_py_spy(output: Path, interval_ms: float) -> Optional[subprocess.Popen]:
+    """Attach py-spy to this process, or None if unavailable/not permitted."""
+    exe = shutil.which("py-spy")
+    if not exe:
+        return None
+    rate = max(1, int(round(1000.0 / interval_ms)))
+    cmd = [exe, "record", "--pid", str(os.getpid()), "--format", "raw",
+           "--rate", str(rate), "--output", str(output), "--nonblocking"]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    except OSError:
+        return None
+    try:
+        # Attaching fails fast without ptrace permission
+        _, err = proc.communicate(timeout=0.5)
+        logger.warning(f"py-spy could not attach ({err.strip()[:200]}), using stdlib sampler")
+        return None
+    except subprocess.TimeoutExpired:
+        return proc
+
+
+class StageProfiler:
+    """
+    Profile the current process between start() and stop()
+
+    Usage:
+        profiler = StageProfiler(settings, stage_dir, "profile_asr")
+        profiler.start()
+        ...
+        files = profiler.stop()   # {"cprofile": ".../profile_asr.prof", ...}
+    """
+
+    def __init__(self, settings: ProfilingSettings, output_dir: Path, label: str):
+        """
+        Initialize profiler.
+
+        Args:
+            settings: Profiling settings
+            output_dir: Directory for profile files (the stage directory)
+            label: File name stem
+        """
+        self.settings = settings
+        self.output_dir = Path(output_dir)
+        self.label = label
+        self.files: Dict[str, str] = {}
+        self._profile = None
+        self._sampler: Optional[StackSampler] = None
+        self._py_spy: Optional[subprocess.Popen] = None
+        self._tracing = False
+        self._started = False
+
+    def _path(self, suffix: str) -> Path:
+        return self.output_dir / f"{self.label}{suffix}"
+
+    def start(self) -> None:
+        """Start profiling (and allocation tracing if requested)."""
+        if self._started:
+            return
+        self._started = True
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        if self.settings.tracemalloc_top > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(max(1, self.settings.tracemalloc_frames))
+            self._tracing = True
+
+        if self.settings.mode == "sampling":
+            self._py_spy = _start_py_spy(self._path(".collapsed"), self.settings.interval_ms)
+            if self._py_spy is None:
+                self._sampler = StackSampler(self.settings.interval_ms / 1000.0)
+                self._sampler.start()
+        else:
+            import cProfile
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler is active in this process (e.g. nested StageIO)
+                logger.debug("cProfile already active, not nesting")
+                self._profile = None
+
+    def stop(self) -> Dict[str, str]:
+        """
+        Stop profiling and write the profile files
+
+        Returns:
+            Kind -> written file path
+        """
+        if not self._started:
+            return self.files
+        self._started = False
+
+        if self._profile is not None:
+            self._profile.disable()
+            path = self._path(".prof")
+            self._profile.dump_stats(str(path))
+            self.files["cprofile"] = str(path)
+            self._profile = None
+
+        if self._py_spy is not None:
+            self._py_spy.send_signal(signal.SIGINT)
+            try:
+                self._py_spy.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self._py_spy.kill()
+            self._py_spy = None
+            if self._path(".collapsed").exists():
+                self.files["collapsed"] = str(self._path(".collapsed"))
+
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler.write(self._path(".collapsed"))
+            self.files["collapsed"] = str(self._path(".collapsed"))
+            self._sampler = None
+
+        if self._tracing:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._tracing = False
+            path = self._path(".tracemalloc.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(allocation_top(snapshot, self.settings.tracemalloc_top), f, indent=2)
+            self.files["tracemalloc"] = str(path)
+
+        for kind, path in self.files.items():
+            logger.info(f"Profile ({kind}): {path}")
+        return self.files
+
+
+def allocation_top(snapshot: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    """
+    Top allocation sites of a tracemalloc snapshot
+
+    Args:
+        snapshot: tracemalloc snapshot
+        limit: Number of sites
+
+    Returns:
+        [{"site": "file:line", "size_kb": ..., "count": ...}, ...]
+    """
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+    top = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        top.append({
+            "site": f"{frame.filename}:{frame.lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        })
+    return top
+
+
+def stage_profiler(stage_name: str, stage_dir: Path) -> Optional[StageProfiler]:
+    """
+    Profiler for a stage process, if the orchestrator requested one
+
+    Args:
+        stage_name: Stage name (used in the file name)
+        stage_dir: Stage directory for the output
+
+    Returns:
+        Started StageProfiler, or None when not profiling
+    """
+    settings = ProfilingSettings.from_env()
+    if settings is None:
+        return None
+    profiler = StageProfiler(settings, stage_dir, f"profile_{stage_name}_{os.getpid()}")
+    profiler.start()
+    # Stages that raise or exit before StageIO.finalize() still write a
+    # profile (stop() is a no-op once finalize() has stopped it)
+    atexit.register(profiler.stop)
+    return profiler
+
+
+@contextmanager
+def profiled_stage(
+    settings: ProfilingSettings,
+    stage_name: str,
+    stage_dir: Path,
+    label: Optional[str] = None
+) -> Iterator[Optional[StageProfiler]]:
+    """
+    Profile a block in this process and export settings to subprocesses
+
+    While the block runs, PIPELINE_PROFILE is set so stage scripts started
+    from it profile themselves (see StageIO).
+
+    Args:
+        settings: Job profiling settings
+        stage_name: Stage being run
+        stage_dir: Stage directory for the output
+        label: File name stem (default: orchestrator_<stage>)
+    """
+    if not settings.profiles(stage_name):
+        yield None
+        return
+
+    profiler = StageProfiler(settings, stage_dir, label or f"orchestrator_{stage_name}")
+    previous = os.environ.get(PROFILE_ENV)
+    os.environ[PROFILE_ENV] = settings.to_env()
+    profiler.start()
+    started = time.perf_counter()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if previous is None:
+            os.environ.pop(PROFILE_ENV, None)
+        else:
+            os.environ[PROFILE_ENV] = previous
+        logger.debug(f"Profiled stage {stage_name} for {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Resource Monitor - per-stage CPU, memory, I/O and accelerator telemetry
+
+Two views of a stage's resource use:
+
+- Orchestrator view: ResourceMonitor samples the current process and its
+  whole child process tree (the stage subprocesses) in a background thread,
+  recording CPU seconds, peak tree RSS, read/write bytes and, with NVML,
+  accelerator memory of the tree's processes.
+- Stage view: inside a stage process, ResourceMonitor(interval=None) takes
+  start/stop snapshots only, and phase_timer() splits wall time into model
+  load and compute.
+
+psutil and pynvml are optional; without psutil, CPU and peak RSS come from
+resource.getrusage() (CPU of reaped children is exact either way).
+ru_maxrss is a lifetime peak, so it only counts towards a monitor's
+peak_rss_mb if it grew while that monitor ran; the lifetime value is
+reported separately as lifetime_peak_rss_mb.
+
+Usage:
+    with ResourceMonitor() as monitor:
+        subprocess.run(cmd)
+    resources = monitor.result
+    # {'wall_seconds': 12.1, 'cpu_seconds': 40.2, 'peak_rss_mb': 2310.5, ...}
+
+    @phase_timer("model_load")
+    def load_model(self): ...
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Local
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+DEFAULT_SAMPLE_INTERVAL = 0.5
+
+MODEL_LOAD_PHASE = "model_load"
+
+_phases: Dict[str, float] = defaultdict(float)
+_phase_lock = threading.Lock()
+
+
+@contextmanager
+def phase_timer(name: str) -> Iterator[None]:
+    """
+    Accumulate wall time spent in a named phase of this process
+
+    Usable as a context manager or a decorator. Phases are process-wide so
+    model loaders deep inside a stage need no handle on its StageIO;
+    StageIO resets them when a stage starts.
+
+    Args:
+        name: Phase name (e.g. "model_load")
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _phase_lock:
+            _phases[name] += elapsed
+
+
+def phase_times() -> Dict[str, float]:
+    """Wall seconds per phase recorded in this process so far."""
+    with _phase_lock:
+        return {name: round(seconds, 3) for name, seconds in _phases.items()}
+
+
+def reset_phases() -> None:
+    """Forget recorded phase times."""
+    with _phase_lock:
+        _phases.clear()
+
+
+def _rusage() -> Optional[Dict[str, float]]:
+    """CPU seconds and peak RSS (MB) of this process and reaped children."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss_unit = 1.0 if sys.platform == 'darwin' else 1024.0
+    return {
+        'self_user': self_usage.ru_utime,
+        'self_system': self_usage.ru_stime,
+        'child_user': child_usage.ru_utime,
+        'child_system': child_usage.ru_stime,
+        'self_maxrss_mb': self_usage.ru_maxrss * rss_unit / 1e6,
+        'child_maxrss_mb': child_usage.ru_maxrss * rss_unit / 1e6,
+    }
+
+
+def _torch_peak_mb() -> Optional[float]:
+    """Peak accelerator memory allocated by torch in this process, if loaded."""
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return None
+    try:
+        if torch.cuda.is_available() and torch.cuda.is_initialized():
+            return torch.cuda.max_memory_allocated() / 1e6
+        mps = getattr(torch, 'mps', None)
+        if mps is not None and torch.backends.mps.is_available():
+            # MPS has no peak counter; report what the driver holds now
+            return mps.driver_allocated_memory() / 1e6
+    except Exception:
+        return None
+    return None
+
+
+class _NvmlProbe:
+    """Accelerator memory per PID via NVML (NVIDIA only, optional)."""
+
+    def __init__(self):
+        self.handles = []
+        try:
+            import pynvml
+            pynvml.nvmlInit()
+            self.nvml = pynvml
+            self.handles = [
+                pynvml.nvmlDeviceGetHandleByIndex(i)
+                for i in range(pynvml.nvmlDeviceGetCount())
+            ]
+        except Exception:
+            self.handles = []
+
+    def used_mb(self, pids) -> Optional[float]:
+        if not self.handles:
+            return None
+        total = 0
+        for handle in self.handles:
+            try:
+                procs = self.nvml.nvmlDeviceGetComputeRunningProcesses(handle)
+            except Exception:
+                continue
+            total += sum(p.usedGpuMemory or 0 for p in procs if p.pid in pids)
+        return total / 1e6
+
+
+class ResourceMonitor:
+    """
+    Measure resources used by this process and its descendants
+
+    With an interval, a daemon thread samples the process tree (psutil) for
+    peak RSS, I/O bytes and accelerator memory; CPU seconds are exact deltas
+    of this process plus its reaped children. With interval=None only
+    start/stop snapshots are taken.
+    """
+
+    def __init__(self, interval: Optional[float] = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initialize resource monitor
+
+        Args:
+            interval: Sampling interval in seconds (None: snapshots only)
+        """
+        self.interval = interval
+        self.result: Dict[str, Any] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._root = None
+        self._nvml = None
+        # (pid, create_time) -> (read_bytes, write_bytes) first/last seen;
+        # processes started after start() count from (0, 0)
+        self._baseline = True
+        self._io_first: Dict[Tuple[int, float], Tuple[int, int]] = {}
+        self._io_last: Dict[Tuple[int, float], Tuple[int, int]] = {}
+        self._peak_rss = 0
+        self._peak_gpu: Optional[float] = None
+        self._samples = 0
+
+    def __enter__(self) -> 'ResourceMonitor':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.stop()
+        return False
+
+    def start(self) -> None:
+        """Take the start snapshot and begin sampling."""
+        self._start_wall = time.perf_counter()
+        self._start_usage = _rusage()
+        try:
+            import psutil
+            self._root = psutil.Process(os.getpid())
+        except Exception:
+            self._root = None
+
+        if self._root is not None:
+            self._sample()
+            self._baseline = False
+            if self.interval:
+                self._nvml = _NvmlProbe()
+                self._thread = threading.Thread(
+                    target=self._run, name="resource-monitor", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        """Record RSS, I/O and accelerator memory of the process tree."""
+        try:
+            procs = [self._root]
+            if self.interval:
+                procs += self._root.children(recursive=True)
+        except Exception:
+            return
+
+        rss = 0
+        pids = set()
+        with self._lock:
+            for proc in procs:
+                try:
+                    with proc.oneshot():
+                        key = (proc.pid, proc.create_time())
+                        rss += proc.memory_info().rss
+                        pids.add(proc.pid)
+                        io = proc.io_counters()  # unavailable on macOS
+                except Exception:
+                    continue
+                counters = (io.read_bytes, io.write_bytes)
+                if key not in self._io_first:
+                    self._io_first[key] = counters if self._baseline else (0, 0)
+                self._io_last[key] = counters
+            self._peak_rss = max(self._peak_rss, rss)
+            self._samples += 1
+
+        if self._nvml is not None:
+            gpu = self._nvml.used_mb(pids)
+            if gpu is not None:
+                self._peak_gpu = max(self._peak_gpu or 0.0, gpu)
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stop sampling and compute the result
+
+        Returns:
+            Resource dict (also kept in self.result)
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._root is not None:
+            self._sample()
+
+        wall = time.perf_counter() - self._start_wall
+        result: Dict[str, Any] = {'wall_seconds': round(wall, 3)}
+
+        end_usage = _rusage()
+        if end_usage and self._start_usage:
+            delta = {k: end_usage[k] - self._start_usage[k] for k in end_usage}
+            user = delta['self_user'] + delta['child_user']
+            system = delta['self_system'] + delta['child_system']
+            result.update({
+                'cpu_user_seconds': round(user, 3),
+                'cpu_system_seconds': round(system, 3),
+                'cpu_seconds': round(user + system, 3),
+                'cpu_utilization': round((user + system) / wall, 2) if wall > 0 else 0.0,
+            })
+            # ru_maxrss never goes down: a peak reached before start() (e.g.
+            # an earlier stage's child) must not be charged to this monitor
+            lifetime_mb = max(end_usage['self_maxrss_mb'], end_usage['child_maxrss_mb'])
+            result['lifetime_peak_rss_mb'] = round(lifetime_mb, 1)
+            grown = [end_usage[k] for k in ('self_maxrss_mb', 'child_maxrss_mb')
+                     if end_usage[k] > self._start_usage[k]]
+            if grown and not (self.interval and self._samples):
+                result['peak_rss_mb'] = round(max(grown), 1)
+
+        if self._samples:
+            with self._lock:
+                read = sum(self._io_last[k][0] - self._io_first[k][0] for k in self._io_last)
+                write = sum(self._io_last[k][1] - self._io_first[k][1] for k in self._io_last)
+                tree_peak = self._peak_rss / 1e6
+            # Sampling the tree: its summed RSS is the per-stage peak
+            result['peak_rss_mb'] = round(max(result.get('peak_rss_mb', 0.0), tree_peak), 1)
+            if self._io_last:
+                result['read_bytes'] = read
+                result['write_bytes'] = write
+            result['samples'] = self._samples
+
+        gpu = self._peak_gpu
+        torch_peak = _torch_peak_mb()
+        if torch_peak is not None:
+            gpu = max(gpu or 0.0, torch_peak)
+        if gpu is not None:
+            result['gpu_peak_mb'] = round(gpu, 1)
+
+        result['sampler'] = 'psutil' if self._samples else ('rusage' if end_usage else 'wall')
+        self.result = result
+        return result
+
+
+def with_phases(resources: Dict[str, Any], phases: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Add phase times and the model load / compute split to a resource dict
+
+    Args:
+        resources: Result of ResourceMonitor.stop()
+        phases: Phase wall seconds (default: phase_times() of this process)
+
+    Returns:
+        New dict with 'phases', 'model_load_seconds' and 'compute_seconds'
+    """
+    phases = phase_times() if phases is None else phases
+    merged = dict(resources)
+    if phases:
+        merged['phases'] = dict(phases)
+    model_load = phases.get(MODEL_LOAD_PHASE, 0.0)
+    merged['model_load_seconds'] = round(model_load, 3)
+    if 'wall_seconds' in merged:
+        merged['compute_seconds'] = round(max(0.0, merged['wall_seconds'] - model_load), 3)
+    return merged
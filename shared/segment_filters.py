@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Transcript segment filters (hallucinations, lyrics)
+
+Handles:
+- Per-segment rules compiled once into a single alternation regex with
+  one named group per rule, so a segment costs one regex call
+- Word repetition statistics via collections.Counter
+- Cross-segment rules evaluated in the same pass:
+  * repeated_line: the same line in N+ consecutive segments (ASR loop);
+    the first occurrence is kept, the rest are flagged
+  * chorus: a line recurring N+ times within a short span with other
+    lines between (verse/chorus structure)
+  * song_audio: segment mostly inside a song interval found in the audio
+    before ASR (shared/song_detection.py)
+- Per-rule hit counts for stage manifests
+
+Used by 08_lyrics_detection and 09_hallucination_removal.
+
+Module: shared/segment_filters.py
+"""
+
+# Standard library
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Rule name → pattern (matched against lowercased, stripped text)
+HALLUCINATION_RULES: Dict[str, str] = {
+    'thanks_for_watching': r'thanks for watching|thank you for watching',
+    'subscribe': r'subscribe|like and subscribe|please subscribe',
+    'dont_forget': r'don\'t forget to',
+    'website': r'visit our website|www\.|http',
+    'annotation': r'\[music\]|\[applause\]|\[laughter\]|\[.*\]$',
+}
+
+LYRICS_PHRASES: Tuple[str, ...] = (
+    'la la la',
+    'na na na',
+    'ho ho ho',
+    'sha la la',
+    'doo doo doo',
+    'oh oh oh',
+    'yeah yeah yeah',
+)
+
+DEFAULT_LOOP_THRESHOLD = 3
+DEFAULT_CHORUS_REPEATS = 3
+# Segments within which chorus lines must recur
+CHORUS_SPAN = 12
+# Fraction of a segment inside a detected song that makes it lyrics
+SONG_OVERLAP = 0.5
+
+_HALLUCINATION_RE = re.compile(
+    '|'.join(f'(?P<{name}>^(?:{pattern}))' for name, pattern in HALLUCINATION_RULES.items())
+)
+_LYRICS_RE = re.compile('|'.join(re.escape(phrase) for phrase in LYRICS_PHRASES))
+_NORMALIZE_RE = re.compile(r'[^\w\s]+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_line(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace (line identity)"""
+    return _SPACE_RE.sub(' ', _NORMALIZE_RE.sub(' ', text.lower())).strip()
+
+
+def hallucination_rule(text: str) -> Optional[str]:
+    """
+    First per-segment hallucination rule a text triggers.
+
+    Args:
+        text: Segment text
+
+    Returns:
+        Rule name, or None if the text looks legitimate
+    """
+    text_lower = (text or '').lower().strip()
+    if not text_lower:
+        return 'empty'
+
+    match = _HALLUCINATION_RE.match(text_lower)
+    if match:
+        return match.lastgroup
+
+    # Very short segments (often artifacts)
+    if len(text_lower) < 3:
+        return 'too_short'
+
+    # Excessive repetition (one word is 60%+ of 5+ words)
+    words = text_lower.split()
+    if len(words) >= 5 and Counter(words).most_common(1)[0][1] >= len(words) * 0.6:
+        return 'word_repetition'
+
+    return None
+
+
+def lyrics_rule(text: str) -> Optional[str]:
+    """
+    First per-segment lyrics rule a text triggers.
+
+    Args:
+        text: Segment text
+
+    Returns:
+        Rule name, or None if the text does not look like lyrics
+    """
+    text_lower = (text or '').lower()
+    if _LYRICS_RE.search(text_lower):
+        return 'lyrics_phrase'
+
+    # Any word 3+ times in a short segment
+    words = text_lower.split()
+    if len(words) > 3 and Counter(words).most_common(1)[0][1] >= 3:
+        return 'word_repetition'
+
+    return None
+
+
+def _line_runs(lines: Sequence[str]) -> List[Tuple[int, int]]:
+    """[start, end) runs of identical non-empty consecutive lines"""
+    runs = []
+    start = 0
+    for i in range(1, len(lines) + 1):
+        if i == len(lines) or lines[i] != lines[start]:
+            if lines[start]:
+                runs.append((start, i))
+            start = i
+    return runs
+
+
+def classify_hallucinations(
+    segments: Sequence[Dict[str, Any]],
+    loop_threshold: int = DEFAULT_LOOP_THRESHOLD,
+    skip_lyrics: bool = True
+) -> Tuple[List[Optional[str]], Counter]:
+    """
+    Hallucination rule per segment, in one pass over the transcript.
+
+    Args:
+        segments: Segments with "text" (and optionally "is_lyrics")
+        loop_threshold: Consecutive identical lines that make a loop
+        skip_lyrics: Never flag segments marked is_lyrics
+
+    Returns:
+        (rule name or None per segment, hit count per rule)
+    """
+    reasons = [hallucination_rule(seg.get('text', '')) for seg in segments]
+
+    if loop_threshold > 1:
+        lines = [normalize_line(seg.get('text', '')) for seg in segments]
+        for start, end in _line_runs(lines):
+            if end - start >= loop_threshold:
+                for i in range(start + 1, end):
+                    reasons[i] = reasons[i] or 'repeated_line'
+
+    if skip_lyrics:
+        reasons = [None if seg.get('is_lyrics') else reason for seg, reason in zip(segments, reasons)]
+    return reasons, Counter(reason for reason in reasons if reason)
+
+
+def classify_lyrics(
+    segments: Sequence[Dict[str, Any]],
+    chorus_repeats: int = DEFAULT_CHORUS_REPEATS,
+    span: int = CHORUS_SPAN,
+    songs: Optional[Sequence[Dict[str, Any]]] = None
+) -> Tuple[List[Optional[str]], Counter]:
+    """
+    Lyrics rule per segment, in one pass over the transcript.
+
+    Args:
+        segments: Segments with "text"
+        chorus_repeats: Recurrences of a line within `span` segments that
+            make it a chorus (0 disables the rule)
+        span: Window (in segments) the recurrences must fall in
+        songs: Song intervals ({"start", "end"}) from the audio song map
+
+    Returns:
+        (rule name or None per segment, hit count per rule)
+    """
+    reasons = [lyrics_rule(seg.get('text', '')) for seg in segments]
+
+    if chorus_repeats > 1:
+        lines = [normalize_line(seg.get('text', '')) for seg in segments]
+        positions: Dict[str, List[int]] = {}
+        for i, line in enumerate(lines):
+            # Single words ("yes", "okay") recur in any dialogue
+            if ' ' in line:
+                positions.setdefault(line, []).append(i)
+
+        for line, idx in positions.items():
+            if len(idx) < chorus_repeats:
+                continue
+            for k in range(len(idx) - chorus_repeats + 1):
+                group = idx[k:k + chorus_repeats]
+                # Consecutive-only repeats are loops (hallucination), not a chorus
+                if group[-1] - group[0] < span and group[-1] - group[0] >= chorus_repeats:
+                    for i in group:
+                        reasons[i] = reasons[i] or 'chorus'
+
+    if songs:
+        from shared.song_detection import overlap_ratio
+        for i, seg in enumerate(segments):
+            if reasons[i] is None and 'start' in seg and 'end' in seg:
+                if overlap_ratio(float(seg['start']), float(seg['end']), songs) >= SONG_OVERLAP:
+                    reasons[i] = 'song_audio'
+
+    return reasons, Counter(reason for reason in reasons if reason)
+
+
+__all__ = [
+    'HALLUCINATION_RULES',
+    'LYRICS_PHRASES',
+    'DEFAULT_LOOP_THRESHOLD',
+    'DEFAULT_CHORUS_REPEATS',
+    'normalize_line',
+    'hallucination_rule',
+    'lyrics_rule',
+    'classify_hallucinations',
+    'classify_lyrics',
+]
@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+Segment Store - columnar transcript sidecars for stage handoff
+
+Transcripts (segments.json, segments_aligned.json, transcript_cleaned.json,
+segments_translated_*.json) stay JSON for people and external tools, but
+save_segments() also writes a columnar copy next to each file
+(segments.json -> segments.npz):
+
+    seg_start, seg_end      float64 per segment
+    seg_text, seg_extra     UTF-8 string tables (blob + offsets); extra
+                            holds any other keys as JSON
+    seg_words               word offset range per segment (n + 1)
+    word_start, word_end,
+    word_score              float64 per word
+    word_text, word_extra   string tables
+    seg_flags, word_flags   which keys were present (and which numbers
+                            were ints)
+    meta                    layout, top-level keys, JSON fingerprint
+
+load_segments() uses the sidecar when it matches the JSON next to it
+(mtime and size recorded at write time) and otherwise parses the JSON,
+so a JSON file rewritten by anything else is always honoured. Segments
+come back as LazySegment mappings: timing, text and extra keys decode on
+first access and the word dicts of a segment only when "words" is read,
+so stages that never look at words never build them.
+
+LazySegment is a MutableMapping, not a dict: isinstance(seg, dict) is
+False and json.dump() needs default=json_default (save_segments() does
+this). Callers that need plain dicts use load_segments(path, lazy=False).
+The JSON files themselves are unchanged: indented, plain JSON.
+
+Times are float64 and integer values are flagged, so a JSON -> store ->
+JSON round trip is exact (ints beyond float64 precision go to extra).
+Disable with SEGMENT_STORE_NPZ=false.
+
+Compliance: DEVELOPMENT_STANDARDS.md
+"""
+
+# Standard library
+import json
+import os
+import tempfile
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Third-party: numpy is imported inside the functions that use it, so
+# importing this module does not load it.
+
+# Local
+from shared.logger import get_logger
+logger = get_logger(__name__)
+
+FORMAT_VERSION = 2
+SIDECAR_SUFFIX = ".npz"
+SEGMENT_STORE_KEY = "SEGMENT_STORE_NPZ"
+
+# seg_flags / word_flags bits
+HAS_START = 1
+HAS_END = 2
+HAS_SCORE = 4
+HAS_TEXT = 8
+HAS_EXTRA = 16
+HAS_WORDS = 32
+INT_START = 64
+INT_END = 128
+INT_SCORE = 256
+
+PathLike = Union[str, Path]
+
+__all__ = [
+    "LazySegment",
+    "SegmentStore",
+    "copy_segments",
+    "json_default",
+    "load_segments",
+    "save_segments",
+    "sidecar_path",
+    "store_enabled",
+]
+
+
+def sidecar_path(json_path: PathLike) -> Path:
+    """Columnar sidecar of a transcript JSON file."""
+    return Path(json_path).with_suffix(SIDECAR_SUFFIX)
+
+
+def store_enabled() -> bool:
+    """SEGMENT_STORE_NPZ from the job config snapshot, env or CONFIG_PATH (default: true)."""
+    from shared.job_config import active_job_config
+    snapshot = active_job_config()
+    if snapshot is not None:
+        return snapshot.get_bool(SEGMENT_STORE_KEY, True)
+    from shared.config import get_setting
+    return get_setting(SEGMENT_STORE_KEY, "true").strip().lower() in ("true", "yes", "1", "on")
+
+
+_NUMBER_TYPES = frozenset((int, float))
+_WORD_NUMBERS = {"start": HAS_START, "end": HAS_END, "score": HAS_SCORE}
+_INT_FLAGS = {HAS_START: INT_START, HAS_END: INT_END, HAS_SCORE: INT_SCORE}
+# Larger ints do not survive float64
+_MAX_EXACT_INT = 2 ** 53
+
+
+def _is_number(value: Any) -> bool:
+    if type(value) is int:
+        return -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT
+    return type(value) in _NUMBER_TYPES
+
+
+def _number(value: float, is_int: int) -> Union[int, float]:
+    return int(value) if is_int else value
+
+
+@contextmanager
+def _atomic_open(path: Path, mode: str) -> Iterator[IO]:
+    """Write to a unique temp file next to path, then replace path."""
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _fingerprint(path: Path) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class _StringTable:
+    """Read side of a UTF-8 blob + offsets column."""
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob: bytes, offsets: Any):
+        self.blob = blob
+        self.offsets = offsets
+
+    def get(self, i: int) -> str:
+        return self.blob[int(self.offsets[i]):int(self.offsets[i + 1])].decode("utf-8")
+
+    def range(self, lo: int, hi: int) -> List[str]:
+        offsets = self.offsets[lo:hi + 1].tolist()
+        blob = self.blob
+        return [blob[offsets[k]:offsets[k + 1]].decode("utf-8") for k in range(hi - lo)]
+
+    def raw_range(self, lo: int, hi: int) -> Tuple[bytes, List[int]]:
+        offsets = self.offsets[lo:hi + 1].tolist()
+        lengths = [offsets[k + 1] - offsets[k] for k in range(hi - lo)]
+        return self.blob[offsets[0]:offsets[-1]], lengths
+
+
+class _StringColumn:
+    """Write side of a string table (bytes pieces + lengths)."""
+
+    __slots__ = ("pieces", "lengths", "pending")
+
+    def __init__(self):
+        self.pieces: List[bytes] = []
+        self.lengths: List[int] = []
+        self.pending: List[str] = []
+
+    def _flush(self) -> None:
+        if self.pending:
+            encoded = [text.encode("utf-8") for text in self.pending]
+            self.pieces.extend(encoded)
+            self.lengths.extend(map(len, encoded))
+            self.pending = []
+
+    def extend_raw(self, data: bytes, lengths: List[int]) -> None:
+        self._flush()
+        self.pieces.append(data)
+        self.lengths.extend(lengths)
+
+    def arrays(self, np) -> Tuple[Any, Any]:
+        self._flush()
+        offsets = np.zeros(len(self.lengths) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, out=offsets[1:])
+        return np.frombuffer(b"".join(self.pieces), dtype=np.uint8), offsets
+
+
+class SegmentStore:
+    """Columnar segments loaded from (or built for) one sidecar file."""
+
+    def __init__(self, arrays: Dict[str, Any], meta: Dict[str, Any]):
+        self.arrays = arrays
+        self.meta = meta
+        # Segment-level columns are small; keep them as Python lists
+        self._seg_start = arrays["seg_start"].tolist()
+        self._seg_end = arrays["seg_end"].tolist()
+        self._seg_flags = arrays["seg_flags"].tolist()
+        self._seg_words = arrays["seg_words"].tolist()
+        self._seg_text = _StringTable(arrays["seg_text"].tobytes(), arrays["seg_text_offsets"])
+        self._seg_extra = _StringTable(arrays["seg_extra"].tobytes(), arrays["seg_extra_offsets"])
+        # Word columns stay arrays and are sliced per segment
+        self._word_text = _StringTable(arrays["word_text"].tobytes(), arrays["word_text_offsets"])
+        self._word_extra = _StringTable(arrays["word_extra"].tobytes(), arrays["word_extra_offsets"])
+
+    def __len__(self) -> int:
+        return len(self._seg_flags)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.arrays["word_flags"])
+
+    # ------------------------------------------------------------------
+    # Build / persist
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_segments(cls, segments: Sequence[Mapping], meta: Optional[Dict[str, Any]] = None) -> 'SegmentStore':
+        """
+        Build columns from segment mappings
+
+        LazySegments whose words were never read are copied column to
+        column without building word dicts.
+
+        Args:
+            segments: Segment dicts (or LazySegments)
+            meta: Extra header values (layout, top-level keys)
+
+        Returns:
+            SegmentStore
+        """
+        import numpy as np
+
+        seg_start, seg_end, seg_flags, seg_words = [], [], [], [0]
+        seg_text, seg_extra = _StringColumn(), _StringColumn()
+        word_start, word_end, word_score, word_flags = [], [], [], []
+        word_text, word_extra = _StringColumn(), _StringColumn()
+        nan = float("nan")
+
+        for seg in segments:
+            if not isinstance(seg, Mapping):
+                raise TypeError(f"segment is {type(seg).__name__}, not a mapping")
+            lazy_words = isinstance(seg, LazySegment) and seg._words_pending()
+            flags = 0
+            extra = {}
+            for key, value in seg.items() if not lazy_words else seg._items_without_words():
+                if key in ("start", "end") and _is_number(value):
+                    bit = HAS_START if key == "start" else HAS_END
+                    flags |= bit | (_INT_FLAGS[bit] if type(value) is int else 0)
+                elif key == "text" and isinstance(value, str):
+                    flags |= HAS_TEXT
+                elif key == "words" and type(value) is list and all(type(w) is dict for w in value):
+                    flags |= HAS_WORDS
+                else:
+                    extra[key] = value
+            seg_start.append(seg["start"] if flags & HAS_START else nan)
+            seg_end.append(seg["end"] if flags & HAS_END else nan)
+            seg_text.pending.append(seg["text"] if flags & HAS_TEXT else "")
+            if extra:
+                flags |= HAS_EXTRA
+                seg_extra.pending.append(json.dumps(extra, ensure_ascii=False, default=json_default))
+            else:
+                seg_extra.pending.append("")
+
+            if lazy_words:
+                store, lo, hi = seg._store, *seg._store._word_range(seg._index)
+                flags |= HAS_WORDS
+                a = store.arrays
+                word_start.extend(a["word_start"][lo:hi].tolist())
+                word_end.extend(a["word_end"][lo:hi].tolist())
+                word_score.extend(a["word_score"][lo:hi].tolist())
+                word_flags.extend(a["word_flags"][lo:hi].tolist())
+                word_text.extend_raw(*store._word_text.raw_range(lo, hi))
+                word_extra.extend_raw(*store._word_extra.raw_range(lo, hi))
+            elif flags & HAS_WORDS:
+                for word in seg["words"]:
+                    wflags = 0
+                    wextra = None
+                    for key, value in word.items():
+                        if key in _WORD_NUMBERS and _is_number(value):
+                            bit = _WORD_NUMBERS[key]
+                            wflags |= bit | (_INT_FLAGS[bit] if type(value) is int else 0)
+                        elif key == "word" and type(value) is str:
+                            wflags |= HAS_TEXT
+                        else:
+                            if wextra is None:
+                                wextra = {}
+                            wextra[key] = value
+                    word_start.append(word["start"] if wflags & HAS_START else nan)
+                    word_end.append(word["end"] if wflags & HAS_END else nan)
+                    word_score.append(word["score"] if wflags & HAS_SCORE else nan)
+                    word_text.pending.append(word["word"] if wflags & HAS_TEXT else "")
+                    if wextra:
+                        wflags |= HAS_EXTRA
+                        word_extra.pending.append(json.dumps(wextra, ensure_ascii=False, default=json_default))
+                    else:
+                        word_extra.pending.append("")
+                    word_flags.append(wflags)
+            seg_flags.append(flags)
+            seg_words.append(len(word_flags))
+
+        arrays = {
+            "seg_start": np.asarray(seg_start, dtype=np.float64),
+            "seg_end": np.asarray(seg_end, dtype=np.float64),
+            "seg_flags": np.asarray(seg_flags, dtype=np.uint16),
+            "seg_words": np.asarray(seg_words, dtype=np.int64),
+            "word_start": np.asarray(word_start, dtype=np.float64),
+            "word_end": np.asarray(word_end, dtype=np.float64),
+            "word_score": np.asarray(word_score, dtype=np.float64),
+            "word_flags": np.asarray(word_flags, dtype=np.uint16),
+        }
+        for name, column in (("seg_text", seg_text), ("seg_extra", seg_extra),
+                             ("word_text", word_text), ("word_extra", word_extra)):
+            arrays[name], arrays[f"{name}_offsets"] = column.arrays(np)
+        return cls(arrays, dict(meta or {}, version=FORMAT_VERSION))
+
+    def save(self, path: PathLike) -> Path:
+        """
+        Write the store atomically (uncompressed NPZ)
+
+        Args:
+            path: Target .npz file
+
+        Returns:
+            Written path
+        """
+        import numpy as np
+
+        path = Path(path)
+        meta = json.dumps(self.meta, ensure_ascii=False, default=json_default).encode("utf-8")
+        with _atomic_open(path, "wb") as f:
+            np.savez(f, meta=np.frombuffer(meta, dtype=np.uint8), **self.arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike) -> Optional['SegmentStore']:
+        """Load a sidecar (None if missing, unreadable or another format version)."""
+        try:
+            import numpy as np
+            with np.load(str(path), allow_pickle=False) as npz:
+                arrays = {name: npz[name] for name in npz.files}
+            meta = json.loads(arrays.pop("meta").tobytes().decode("utf-8"))
+        except (ImportError, OSError, ValueError, KeyError):
+            return None
+        if meta.get("version") != FORMAT_VERSION:
+            return None
+        return cls(arrays, meta)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def _word_range(self, i: int) -> Tuple[int, int]:
+        return self._seg_words[i], self._seg_words[i + 1]
+
+    def has_words(self, i: int) -> bool:
+        return bool(self._seg_flags[i] & HAS_WORDS)
+
+    def fields(self, i: int) -> Dict[str, Any]:
+        """Segment i without "words"."""
+        flags = self._seg_flags[i]
+        fields: Dict[str, Any] = {}
+        if flags & HAS_START:
+            fields["start"] = _number(self._seg_start[i], flags & INT_START)
+        if flags & HAS_END:
+            fields["end"] = _number(self._seg_end[i], flags & INT_END)
+        if flags & HAS_TEXT:
+            fields["text"] = self._seg_text.get(i)
+        if flags & HAS_EXTRA:
+            fields.update(json.loads(self._seg_extra.get(i)))
+        return fields
+
+    def words(self, i: int) -> List[Dict[str, Any]]:
+        """Word dicts of segment i."""
+        lo, hi = self._word_range(i)
+        if lo == hi:
+            return []
+        a = self.arrays
+        starts = a["word_start"][lo:hi].tolist()
+        ends = a["word_end"][lo:hi].tolist()
+        scores = a["word_score"][lo:hi].tolist()
+        flags = a["word_flags"][lo:hi].tolist()
+        texts = self._word_text.range(lo, hi)
+        words = []
+        for k in range(hi - lo):
+            f = flags[k]
+            word: Dict[str, Any] = {}
+            if f & HAS_TEXT:
+                word["word"] = texts[k]
+            if f & HAS_START:
+                word["start"] = _number(starts[k], f & INT_START)
+            if f & HAS_END:
+                word["end"] = _number(ends[k], f & INT_END)
+            if f & HAS_SCORE:
+                word["score"] = _number(scores[k], f & INT_SCORE)
+            if f & HAS_EXTRA:
+                word.update(json.loads(self._word_extra.get(lo + k)))
+            words.append(word)
+        return words
+
+    def segment(self, i: int) -> Dict[str, Any]:
+        """Segment i as a plain dict."""
+        fields = self.fields(i)
+        if self.has_words(i):
+            fields["words"] = self.words(i)
+        return fields
+
+    def segments(self, lazy: bool = True) -> List[Any]:
+        """All segments (LazySegment views, or plain dicts)."""
+        if lazy:
+            return [LazySegment(self, i) for i in range(len(self))]
+        return [self.segment(i) for i in range(len(self))]
+
+
+_UNREAD = object()
+
+
+class LazySegment(MutableMapping):
+    """
+    Dict-like view of one stored segment
+
+    Reads decode from the store on first use; writes go to a private
+    dict, so mutating a segment never touches the store. Use dict(seg)
+    or seg.copy() for a plain dict (json.dump needs json_default or
+    save_segments()).
+    """
+
+    __slots__ = ("_store", "_index", "_fields", "_words")
+
+    def __init__(self, store: SegmentStore, index: int):
+        self._store = store
+        self._index = index
+        self._fields: Optional[Dict[str, Any]] = None
+        self._words: Any = _UNREAD
+
+    def _words_pending(self) -> bool:
+        return self._words is _UNREAD and self._store.has_words(self._index)
+
+    def _get_fields(self) -> Dict[str, Any]:
+        if self._fields is None:
+            self._fields = self._store.fields(self._index)
+        return self._fields
+
+    def _load_words(self) -> Dict[str, Any]:
+        fields = self._get_fields()
+        if self._words is _UNREAD:
+            if self._store.has_words(self._index):
+                fields["words"] = self._store.words(self._index)
+            self._words = None
+        return fields
+
+    def _items_without_words(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self._get_fields().items())
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "words":
+            return self._load_words()[key]
+        return self._get_fields()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        fields = self._load_words() if key == "words" else self._get_fields()
+        fields[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        fields = self._load_words() if key == "words" else self._get_fields()
+        del fields[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key == "words" and self._words_pending():
+            return True
+        return key in self._get_fields()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load_words())
+
+    def __len__(self) -> int:
+        return len(self._get_fields()) + (1 if self._words_pending() else 0)
+
+    def copy(self) -> Dict[str, Any]:
+        """Shallow plain-dict copy (like dict.copy)."""
+        return dict(self._load_words())
+
+    def __repr__(self) -> str:
+        return f"LazySegment({self.copy()!r})"
+
+
+def json_default(obj: Any) -> Any:
+    """
+    json.dump default= hook for LazySegment
+
+    Example:
+        json.dump(load_segments(path), f, default=json_default)
+    """
+    if isinstance(obj, LazySegment):
+        return obj.copy()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _split(data: Any) -> Tuple[Optional[Sequence], Dict[str, Any]]:
+    """(segments, header) for a list or {"segments": [...], ...} transcript."""
+    if isinstance(data, list):
+        return data, {"layout": "list"}
+    if isinstance(data, Mapping) and isinstance(data.get("segments"), list):
+        keys = list(data.keys())
+        top = {k: v for k, v in data.items() if k != "segments"}
+        return data["segments"], {"layout": "dict", "keys": keys, "top": top}
+    return None, {}
+
+
+def save_segments(
+    path: PathLike,
+    data: Any,
+    indent: Optional[int] = None,
+    sidecar: Optional[bool] = None
+) -> Path:
+    """
+    Write a transcript as JSON plus its columnar sidecar
+
+    Args:
+        path: JSON file
+        data: Segment list or {"segments": [...], ...}
+        indent: JSON indent (default: 2, for people and external tools)
+        sidecar: Write the .npz (default: SEGMENT_STORE_NPZ)
+
+    Returns:
+        JSON path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    segments, header = _split(data)
+    write_sidecar = segments is not None and (store_enabled() if sidecar is None else sidecar)
+    if indent is None:
+        indent = 2
+
+    with _atomic_open(path, "w") as f:
+        f.write(json.dumps(data, indent=indent, ensure_ascii=False, default=json_default))
+
+    npz = sidecar_path(path)
+    if not write_sidecar:
+        if npz.exists():
+            npz.unlink()
+        return path
+    try:
+        header["source"] = _fingerprint(path)
+        SegmentStore.from_segments(segments, header).save(npz)
+    except (ImportError, TypeError, ValueError) as e:
+        logger.debug(f"No segment sidecar for {path.name}: {e}")
+        if npz.exists():
+            npz.unlink()
+    return path
+
+
+def load_segments(path: PathLike, lazy: bool = True) -> Any:
+    """
+    Read a transcript written by save_segments() (or any transcript JSON)
+
+    Args:
+        path: JSON file
+        lazy: Return LazySegment views; False returns plain dicts (words
+            included) that isinstance(seg, dict) and json.dump() accept
+
+    Returns:
+        Same layout as the JSON: a segment list or a dict with "segments"
+    """
+    path = Path(path)
+    npz = sidecar_path(path)
+    if npz.exists():
+        store = SegmentStore.load(npz)
+        json_fp = _fingerprint(path)
+        if store is not None and (json_fp is None or store.meta.get("source") == json_fp):
+            segments = store.segments(lazy=lazy)
+            if store.meta.get("layout") == "list":
+                return segments
+            top = store.meta.get("top", {})
+            return {key: segments if key == "segments" else top[key]
+                    for key in store.meta.get("keys", ["segments"])}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def copy_segments(src: PathLike, dst: PathLike) -> Path:
+    """
+    Copy a transcript and its sidecar without decoding either
+
+    Args:
+        src: Source JSON
+        dst: Target JSON
+
+    Returns:
+        Target path
+    """
+    import shutil
+
+    src, dst = Path(src), Path(dst)
+    shutil.copyfile(src, dst)
+    src_npz, dst_npz = sidecar_path(src), sidecar_path(dst)
+    store = SegmentStore.load(src_npz) if src_npz.exists() else None
+    if store is not None and store.meta.get("source") == _fingerprint(src):
+        store.meta["source"] = _fingerprint(dst)
+        store.save(dst_npz)
+    elif dst_npz.exists():
+        dst_npz.unlink()
+    return dst
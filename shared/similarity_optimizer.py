@@ -35,6 +35,13 @@ from shared.media_identity import compute_media_id, _get_media_duration
 
 logger = get_logger(__name__)
 
+# Fingerprint definition version. 2: audio_hash is the demux analysis'
+# pcm_sha256 and duration is the (clipped) decoded duration; 1 was a
+# hash of raw file bytes with placeholder spectral/energy features.
+# Fingerprints of different versions are never compared.
+FINGERPRINT_VERSION = 2
+LEGACY_FINGERPRINT_VERSION = 1
+
 
 @dataclass
 class MediaFingerprint:
@@ -49,6 +56,7 @@ class MediaFingerprint:
         energy_profile: Energy distribution across time
         language: Detected language
         created_at: ISO timestamp
+        version: Fingerprint definition (FINGERPRINT_VERSION)
     """
     media_id: str
     duration: float
@@ -57,6 +65,7 @@ class MediaFingerprint:
     energy_profile: List[float]
     language: str
     created_at: str
+    version: int = LEGACY_FINGERPRINT_VERSION
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -183,6 +192,10 @@ class SimilarityOptimizer:
                         self.fingerprints[media_id] = MediaFingerprint.from_dict(fp_data)
                 
                 logger.info(f"📚 Loaded {len(self.fingerprints)} media fingerprints")
+                legacy = sum(1 for fp in self.fingerprints.values() if fp.version != FINGERPRINT_VERSION)
+                if legacy:
+                    logger.info(f"   {legacy} fingerprints predate version {FINGERPRINT_VERSION}; "
+                                f"they are replaced when that media is processed again")
             
             # Load decisions
             decisions_file = self.cache_dir / "decisions.json"
@@ -245,19 +258,34 @@ class SimilarityOptimizer:
         """
         logger.info(f"🔍 Computing fingerprint for: {media_path.name}")
         
-        # Get basic media info
-        media_id = compute_media_id(media_path)
-        duration = _get_media_duration(media_path) or 0.0
-        
-        # Compute audio hash (simplified - would use librosa in production)
-        # For now, use file-based hash
-        audio_hash = self._compute_audio_hash(audio_path or media_path)
-        
-        # Extract spectral features (simplified)
-        spectral_features = self._extract_spectral_features(audio_path or media_path)
-        
-        # Extract energy profile
-        energy_profile = self._extract_energy_profile(audio_path or media_path)
+        # The demux stage already decoded the audio once; reuse its analysis
+        analysis = None
+        if audio_path is not None:
+            from shared.demux_analysis import load_analysis
+            analysis = load_analysis(audio_path)
+        
+        version = LEGACY_FINGERPRINT_VERSION
+        if analysis:
+            version = FINGERPRINT_VERSION
+            media_id = analysis.get('media_id') or compute_media_id(media_path)
+            duration = float(analysis['duration'])
+            audio_hash = analysis['pcm_sha256']
+            spectral_features = dict(analysis['spectral_features'])
+            energy_profile = list(analysis['energy_profile'])
+        else:
+            # Get basic media info
+            media_id = compute_media_id(media_path)
+            duration = _get_media_duration(media_path) or 0.0
+            
+            # Compute audio hash (simplified - would use librosa in production)
+            # For now, use file-based hash
+            audio_hash = self._compute_audio_hash(audio_path or media_path)
+            
+            # Extract spectral features (simplified)
+            spectral_features = self._extract_spectral_features(audio_path or media_path)
+            
+            # Extract energy profile
+            energy_profile = self._extract_energy_profile(audio_path or media_path)
         
         # Create fingerprint
         fingerprint = MediaFingerprint(
@@ -267,7 +295,8 @@ class SimilarityOptimizer:
             spectral_features=spectral_features,
             energy_profile=energy_profile,
             language="auto",  # Will be updated after detection
-            created_at=datetime.now().isoformat()
+            created_at=datetime.now().isoformat(),
+            version=version
         )
         
         # Store fingerprint
@@ -362,6 +391,10 @@ class SimilarityOptimizer:
             if media_id == target_fingerprint.media_id:
                 continue
             
+            # Hashes/durations of different definitions are not comparable
+            if ref_fingerprint.version != target_fingerprint.version:
+                continue
+            
             # Compute similarity
             similarity = self._compute_similarity(ref_fingerprint, target_fingerprint)
             
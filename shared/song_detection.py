@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Audio-domain song detection before ASR
+
+Handles:
+- Per-window song likelihood from vectorized cues over the demuxed PCM:
+  * harmonic/tonal content (shared/music_score.py)
+  * beat stability: autocorrelation peak of the low-band (kick/bass)
+    spectral-flux onset envelope in the 60-180 BPM range
+  Background score under dialogue is tonal but rarely carries a steady
+  beat, so the beat scales the tonal score rather than adding to it
+- Smoothing window scores and extracting song intervals (songs run for
+  minutes; short music stings are ignored)
+- Optional matching of intervals to soundtrack tracks by duration
+  (config/bollywood_soundtracks.json / MusicBrainz "length")
+- Caching the song map per media_id (MediaCacheManager), so reruns and
+  other jobs over the same media skip detection
+
+Output (song_map.json next to the demuxed audio):
+    {"version", "media_id", "params", "window_seconds", "window_scores",
+     "songs": [{"start", "end", "duration", "confidence", "track"}]}
+
+Module: shared/song_detection.py
+"""
+
+# Standard library
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Third-party
+import numpy as np
+
+# Local
+from shared.logger import get_logger
+from shared.music_score import window_music_features
+
+logger = get_logger(__name__)
+
+SONG_MAP_FILENAME = "song_map.json"
+SONG_MAP_VERSION = 1
+SAMPLE_RATE = 16000
+WINDOW_SECONDS = 5.0
+DEFAULT_THRESHOLD = 0.55
+DEFAULT_MIN_SONG_SECONDS = 45.0
+DEFAULT_MERGE_GAP_SECONDS = 10.0
+# Relative duration difference accepted when matching a soundtrack track
+DURATION_TOLERANCE = 0.15
+
+_N_FFT = 1024
+_HOP = 256
+_BPM_RANGE = (60.0, 180.0)
+# Kick drum / bass band (speech has little onset energy here)
+_BEAT_BAND_HZ = 150.0
+# Beat strength range mapped to [0, 1] (speech ≈ 0.35, steady beat ≈ 0.5+)
+_BEAT_FLOOR = 0.35
+_BEAT_SPAN = 0.3
+
+
+def beat_strength(samples: np.ndarray, sr: int = SAMPLE_RATE) -> float:
+    """
+    Periodicity of the onset envelope in the musical tempo range.
+
+    Args:
+        samples: Mono float32 samples (one window)
+        sr: Sample rate
+
+    Returns:
+        Normalized autocorrelation peak (0-1)
+    """
+    if len(samples) < _N_FFT * 4 or np.max(np.abs(samples)) < 1e-4:
+        return 0.0
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, _N_FFT)[::_HOP]
+    low = np.fft.rfftfreq(_N_FFT, 1.0 / sr) <= _BEAT_BAND_HZ
+    spectrum = np.log1p(np.abs(np.fft.rfft(frames * np.hanning(_N_FFT).astype(np.float32), axis=1))[:, low])
+    onset = np.maximum(np.diff(spectrum, axis=0), 0.0).sum(axis=1)
+    onset = onset - onset.mean()
+    if not np.any(onset):
+        return 0.0
+
+    n = len(onset)
+    spectrum = np.fft.rfft(onset, 2 * n)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+    if autocorr[0] <= 0:
+        return 0.0
+    autocorr /= autocorr[0]
+
+    fps = sr / _HOP
+    lo = int(fps * 60.0 / _BPM_RANGE[1])
+    hi = min(int(fps * 60.0 / _BPM_RANGE[0]), n - 1)
+    if hi <= lo:
+        return 0.0
+    return float(np.clip(autocorr[lo:hi + 1].max(), 0.0, 1.0))
+
+
+def window_song_score(samples: np.ndarray, sr: int = SAMPLE_RATE) -> float:
+    """Song likelihood (0-1) for one window: tonal content scaled by beat"""
+    music = window_music_features(samples, sr)['score']
+    if music == 0.0:
+        return 0.0
+    beat = np.clip((beat_strength(samples, sr) - _BEAT_FLOOR) / _BEAT_SPAN, 0.0, 1.0)
+    return float(music * (0.4 + 0.6 * beat))
+
+
+def score_windows(
+    audio_path: Union[str, Path],
+    window_seconds: float = WINDOW_SECONDS
+) -> List[float]:
+    """
+    Song score per window, streaming the WAV through PCMReader.
+
+    Args:
+        audio_path: 16 kHz audio (demux output)
+        window_seconds: Window length
+
+    Returns:
+        One score per window
+    """
+    from shared.audio_utils import PCMReader
+
+    with PCMReader(audio_path, SAMPLE_RATE) as reader:
+        step = int(window_seconds * SAMPLE_RATE)
+        buffer = np.empty(step, dtype=np.float32)
+        return [
+            window_song_score(reader.read_samples(start, start + step, buffer), SAMPLE_RATE)
+            for start in range(0, reader.num_samples, step)
+        ]
+
+
+def song_intervals(
+    scores: Sequence[float],
+    window_seconds: float = WINDOW_SECONDS,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_song_seconds: float = DEFAULT_MIN_SONG_SECONDS,
+    merge_gap_seconds: float = DEFAULT_MERGE_GAP_SECONDS
+) -> List[Dict[str, float]]:
+    """
+    Song intervals from window scores.
+
+    Scores are median-smoothed over three windows; runs above threshold
+    closer than merge_gap_seconds are joined, and runs shorter than
+    min_song_seconds dropped.
+
+    Returns:
+        [{"start", "end", "duration", "confidence"}] in seconds
+    """
+    values = np.asarray(scores, dtype=np.float64)
+    if values.size == 0:
+        return []
+    if values.size >= 3:
+        padded = np.pad(values, 1, mode='edge')
+        values = np.median(np.lib.stride_tricks.sliding_window_view(padded, 3), axis=1)
+
+    hits = np.concatenate([[False], values >= threshold, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(hits))
+    runs: List[List[int]] = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if runs and (start - runs[-1][1]) * window_seconds <= merge_gap_seconds:
+            runs[-1][1] = end
+        else:
+            runs.append([start, end])
+
+    total = len(scores) * window_seconds
+    songs = []
+    for start, end in runs:
+        if (end - start) * window_seconds < min_song_seconds:
+            continue
+        start_s, end_s = start * window_seconds, min(end * window_seconds, total)
+        songs.append({
+            'start': round(start_s, 3),
+            'end': round(end_s, 3),
+            'duration': round(end_s - start_s, 3),
+            'confidence': round(float(values[start:end].mean()), 3),
+        })
+    return songs
+
+
+def _track_seconds(track: Dict[str, Any]) -> Optional[float]:
+    """Track duration in seconds ('duration' in s, or MusicBrainz 'length' in ms)"""
+    if track.get('duration'):
+        return float(track['duration'])
+    if track.get('length'):
+        return float(track['length']) / 1000.0
+    return None
+
+
+def load_soundtrack(title: Optional[str], year: Optional[Any], db_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Soundtrack tracks for a film from the local database.
+
+    Args:
+        title: Film title
+        year: Release year
+        db_path: Database (default: config/bollywood_soundtracks.json)
+
+    Returns:
+        Track dicts (empty if the film is unknown)
+    """
+    if not title:
+        return []
+    if db_path is None:
+        db_path = Path(__file__).parent.parent / "config" / "bollywood_soundtracks.json"
+    try:
+        with open(db_path, 'r', encoding='utf-8') as f:
+            db = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+    entry = db.get(f"{title} ({year})") if year else None
+    if entry is None:
+        wanted = title.lower().strip()
+        entry = next(
+            (v for k, v in db.items()
+             if k != '_template' and isinstance(v, dict) and str(v.get('title', '')).lower() == wanted
+             and (not year or str(v.get('year')) == str(year))),
+            None
+        )
+    return list(entry.get('tracks', [])) if entry else []
+
+
+def match_soundtrack(
+    songs: List[Dict[str, Any]],
+    tracks: Sequence[Dict[str, Any]],
+    tolerance: float = DURATION_TOLERANCE
+) -> int:
+    """
+    Label song intervals with the soundtrack track of closest duration.
+
+    Each track is used at most once; pairs are taken closest-first and
+    only within `tolerance` (relative). Songs without a match keep
+    track=None. Films often trim songs, so a miss is expected.
+
+    Returns:
+        Number of songs matched
+    """
+    candidates: List[Tuple[float, int, int]] = []
+    for ti, track in enumerate(tracks):
+        seconds = _track_seconds(track)
+        if not seconds:
+            continue
+        for si, song in enumerate(songs):
+            diff = abs(song['duration'] - seconds) / seconds
+            if diff <= tolerance:
+                candidates.append((diff, si, ti))
+
+    used_songs, used_tracks = set(), set()
+    for _, si, ti in sorted(candidates):
+        if si in used_songs or ti in used_tracks:
+            continue
+        track = tracks[ti]
+        songs[si]['track'] = {k: track.get(k) for k in ('title', 'artist', 'composer') if track.get(k)}
+        used_songs.add(si)
+        used_tracks.add(ti)
+    for song in songs:
+        song.setdefault('track', None)
+    return len(used_songs)
+
+
+def song_map_path(audio_path: Union[str, Path]) -> Path:
+    """Where the song map of a demuxed audio file lives"""
+    return Path(audio_path).with_name(SONG_MAP_FILENAME)
+
+
+def load_song_map(job_dir: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Song map written by the demux stage of a job.
+
+    Args:
+        job_dir: Job directory
+
+    Returns:
+        Song map dict, or None if detection did not run
+    """
+    from shared.stage_order import get_stage_dir
+
+    path = Path(get_stage_dir("demux", str(job_dir))) / SONG_MAP_FILENAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if data.get('version') == SONG_MAP_VERSION else None
+
+
+def _params_hash(params: Dict[str, Any]) -> str:
+    payload = json.dumps({'version': SONG_MAP_VERSION, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def detect_song_map(
+    audio_path: Union[str, Path],
+    media_id: Optional[str] = None,
+    clip: Optional[Dict[str, Any]] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_song_seconds: float = DEFAULT_MIN_SONG_SECONDS,
+    soundtrack: Optional[Sequence[Dict[str, Any]]] = None,
+    cache_manager: Any = None,
+    window_seconds: float = WINDOW_SECONDS
+) -> Dict[str, Any]:
+    """
+    Detect songs in demuxed audio (or reuse the media's cached song map)
+    and write song_map.json next to the audio.
+
+    Args:
+        audio_path: 16 kHz demuxed audio.wav
+        media_id: Media identifier (enables the per-media cache)
+        clip: Clip range the audio was cut with (part of the cache key)
+        threshold: Window song score threshold
+        min_song_seconds: Shortest interval reported as a song
+        soundtrack: Tracks to match by duration (optional)
+        cache_manager: MediaCacheManager (default: created when media_id is set)
+        window_seconds: Analysis window length
+
+    Returns:
+        Song map dict (with "cached": True when served from cache)
+    """
+    params = {
+        'clip': clip or {},
+        'threshold': threshold,
+        'min_song_seconds': min_song_seconds,
+        'window_seconds': window_seconds,
+    }
+    params_hash = _params_hash(params)
+    if media_id and cache_manager is None:
+        from shared.cache_manager import MediaCacheManager
+        cache_manager = MediaCacheManager()
+
+    song_map = None
+    if media_id:
+        song_map = cache_manager.get_song_map(media_id, params_hash)
+        if song_map is not None:
+            song_map['cached'] = True
+
+    if song_map is None:
+        started = time.time()
+        scores = score_windows(audio_path, window_seconds)
+        song_map = {
+            'version': SONG_MAP_VERSION,
+            'media_id': media_id,
+            'params': params,
+            'window_seconds': window_seconds,
+            'window_scores': [round(s, 3) for s in scores],
+            'songs': song_intervals(scores, window_seconds, threshold, min_song_seconds),
+            'detect_seconds': round(time.time() - started, 3),
+        }
+        if media_id:
+            cache_manager.store_song_map(media_id, params_hash, song_map)
+        song_map['cached'] = False
+
+    # Soundtrack labels depend on job metadata, not the audio: never cached
+    for song in song_map['songs']:
+        song['track'] = None
+    song_map['matched_tracks'] = match_soundtrack(song_map['songs'], soundtrack or [])
+
+    output = song_map_path(audio_path)
+    tmp = output.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(song_map, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, output)
+    return song_map
+
+
+def overlap_ratio(start: float, end: float, songs: Sequence[Dict[str, Any]]) -> float:
+    """Fraction of [start, end) covered by song intervals"""
+    if end <= start:
+        return 0.0
+    covered = sum(max(0.0, min(end, s['end']) - max(start, s['start'])) for s in songs)
+    return min(1.0, covered / (end - start))
+
+
+__all__ = [
+    'SONG_MAP_FILENAME',
+    'DEFAULT_THRESHOLD',
+    'DEFAULT_MIN_SONG_SECONDS',
+    'beat_strength',
+    'window_song_score',
+    'score_windows',
+    'song_intervals',
+    'load_soundtrack',
+    'match_soundtrack',
+    'song_map_path',
+    'load_song_map',
+    'detect_song_map',
+    'overlap_ratio',
+]
@@ -14,6 +14,8 @@ from datetime import datetime
 # Local
 from shared.stage_order import get_stage_number, get_stage_dir, STAGE_NUMBERS
 from shared.manifest import StageManifest
+from shared.resource_monitor import ResourceMonitor, reset_phases, with_phases
+from shared.profiling import stage_profiler
 from shared.logger import get_logger
 logger = get_logger(__name__)
 
@@ -92,6 +94,16 @@ class StageIO:
             # Load existing manifest if resuming
             if self.manifest_path.exists():
                 self.manifest.load(self.manifest_path)
+        
+        # In-process resource snapshot (the orchestrator samples the process tree)
+        self.resources_path = self.stage_dir / "resources.json"
+        # Phase times are process-wide; start this stage's from zero
+        reset_phases()
+        self.resource_monitor = ResourceMonitor(interval=None)
+        self.resource_monitor.start()
+        
+        # Profiling requested by the orchestrator (job.json "profiling")
+        self.profiler = stage_profiler(stage_name, self.stage_dir)
     
     def get_stage_logger(self, log_level: str = "INFO") -> logging.Logger:
         """
@@ -189,6 +201,40 @@ class StageIO:
         if self.manifest:
             self.manifest.set_resources(**resources)
     
+    def record_resources(self) -> Dict[str, Any]:
+        """
+        Record this stage process's resource usage.
+        
+        Stores CPU seconds, peak RSS, I/O bytes, accelerator memory and the
+        model load / compute split (see shared.resource_monitor.phase_timer)
+        in the manifest and in resources.json, where the orchestrator merges
+        them into the pipeline manifest.
+        
+        Returns:
+            Resource dictionary
+        """
+        resources = with_phases(self.resource_monitor.stop())
+        self.set_resources(**resources)
+        try:
+            self.resources_path.write_text(json.dumps(resources, indent=2))
+        except OSError as e:
+            logger.warning(f"Could not write {self.resources_path}: {e}")
+        return resources
+    
+    def record_profiles(self) -> Dict[str, str]:
+        """
+        Stop the stage profiler and note its files in the manifest.
+        
+        Returns:
+            Profile kind -> file path (empty when not profiling)
+        """
+        if self.profiler is None:
+            return {}
+        files = self.profiler.stop()
+        if self.manifest and files:
+            self.manifest.add_metadata("profiling", files)
+        return files
+    
     def finalize(self, status: str = "success", save_manifest: bool = True, **kwargs: Any) -> None:
         """
         Finalize stage execution.
@@ -198,10 +244,15 @@ class StageIO:
             save_manifest: Whether to save manifest to disk
             **kwargs: Additional metadata for manifest
         """
+        self.record_profiles()
+        self.record_resources()
         if self.manifest:
-            self.manifest.finalize(status, **kwargs)
             if save_manifest:
-                self.manifest.save(self.manifest_path)
+                self.manifest.finalize(status, **kwargs)  # one atomic write
+            else:
+                for key, value in kwargs.items():
+                    self.manifest.add_metadata(key, value)
+                self.manifest.status = status
     
     def get_input_path(self, filename: str, from_stage: Optional[str] = None) -> Path:
         """
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Windowed, bounded-memory voice activity detection
+
+Handles:
+- Reading the audio in fixed, overlapping windows through PCMReader, so
+  peak memory depends on the window length rather than media duration
+- Running windows in-process or across N worker processes (one detector
+  per worker)
+- Three detectors behind one interface:
+  * pyannote: pyannote/voice-activity-detection on each window's waveform
+  * silero: Silero VAD (torch hub), fast on CPU-only hosts; opt-in, or
+    picked by 'auto' only when pyannote is missing and the hub copy is
+    already cached (no download at run time)
+  * energy: vectorized NumPy band-energy detector, no model at all
+- Stitching windows at the middle of each overlap and merging close
+  segments into the speech_segments.json schema
+
+Module: shared/streaming_vad.py
+"""
+
+# Standard library
+import importlib.util
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Third-party
+import numpy as np
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+SAMPLE_RATE = 16000
+BACKENDS = ('auto', 'pyannote', 'silero', 'energy')
+DEFAULT_WINDOW_SECONDS = 300.0
+DEFAULT_OVERLAP_SECONDS = 5.0
+DEFAULT_MERGE_GAP = 0.2
+
+# Energy detector framing and floors
+_FRAME_SECONDS = 0.03
+_SPEECH_BAND = (300.0, 3400.0)
+_SILENCE_FLOOR_DB = -60.0
+_MIN_DYNAMIC_DB = 6.0
+
+Region = Tuple[float, float]
+Detector = Callable[[np.ndarray], List[Region]]
+
+# Per-process detector and the (backend, device, threshold) it was built for
+_DETECTOR: Optional[Detector] = None
+_DETECTOR_KEY: Optional[Tuple[str, str, float]] = None
+
+# torch.hub checkout created by torch.hub.load('snakers4/silero-vad')
+_SILERO_HUB_DIR = 'snakers4_silero-vad_master'
+
+
+def _runs(flags: np.ndarray) -> List[Tuple[int, int]]:
+    """[start, end) index pairs of True runs"""
+    padded = np.concatenate([[False], flags, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def energy_speech_regions(
+    samples: np.ndarray,
+    sr: int = SAMPLE_RATE,
+    threshold: float = 0.5,
+    min_speech_seconds: float = 0.25,
+    min_silence_seconds: float = 0.1
+) -> List[Region]:
+    """
+    Speech regions from speech-band frame energy.
+
+    The decision level sits `threshold` of the way between the window's
+    noise floor (10th percentile) and its speech level (95th percentile),
+    never closer than 6 dB to the floor nor below -60 dBFS.
+
+    Args:
+        samples: Mono float32 samples
+        sr: Sample rate
+        threshold: 0-1, higher = stricter
+        min_speech_seconds: Drop shorter speech runs
+        min_silence_seconds: Close shorter gaps
+
+    Returns:
+        (start, end) pairs in seconds, relative to the window
+    """
+    frame = int(_FRAME_SECONDS * sr)
+    num_frames = len(samples) // frame
+    if num_frames == 0:
+        return []
+
+    frames = samples[:num_frames * frame].reshape(num_frames, frame)
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame).astype(np.float32), axis=1)) ** 2
+    freqs = np.fft.rfftfreq(frame, 1.0 / sr)
+    band = power[:, (freqs >= _SPEECH_BAND[0]) & (freqs <= _SPEECH_BAND[1])].mean(axis=1)
+    # Normalize so a full-scale sine in the band reads ≈ 0 dBFS
+    level_db = 10 * np.log10(band / (frame * frame / 16.0) + 1e-12)
+
+    floor, peak = np.percentile(level_db, [10, 95])
+    decision = floor + threshold * (peak - floor)
+    decision = max(decision, floor + _MIN_DYNAMIC_DB, _SILENCE_FLOOR_DB)
+    flags = level_db > decision
+
+    # Close short gaps, then drop short bursts
+    for start, end in _runs(~flags):
+        if start > 0 and end < num_frames and (end - start) * _FRAME_SECONDS < min_silence_seconds:
+            flags[start:end] = True
+    return [
+        (start * _FRAME_SECONDS, end * _FRAME_SECONDS)
+        for start, end in _runs(flags)
+        if (end - start) * _FRAME_SECONDS >= min_speech_seconds
+    ]
+
+
+def silero_cached() -> bool:
+    """True if the Silero hub checkout exists locally (found without importing torch)"""
+    torch_home = os.environ.get('TORCH_HOME') or os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'torch'
+    )
+    return os.path.isdir(os.path.join(torch_home, 'hub', _SILERO_HUB_DIR))
+
+
+def resolve_backend(backend: str, device: str) -> str:
+    """
+    Concrete detector for a requested backend on this host.
+
+    'auto' keeps pyannote whenever it is importable. Without it, Silero
+    is used only if its hub checkout is already cached, else the energy
+    detector; explicitly configured backends are honoured.
+    """
+    has_torch = importlib.util.find_spec('torch') is not None
+    if backend == 'auto':
+        if has_torch and importlib.util.find_spec('pyannote') is not None:
+            return 'pyannote'
+        backend = 'silero' if silero_cached() else 'energy'
+    if backend == 'silero' and not has_torch:
+        logger.warning("Silero VAD needs torch; using the energy detector")
+        return 'energy'
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown VAD backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+    return backend
+
+
+def create_detector(
+    backend: str,
+    device: str = 'cpu',
+    threshold: float = 0.5,
+    hf_token: Optional[str] = None
+) -> Detector:
+    """
+    Build a window detector: float32 samples → relative (start, end) seconds.
+
+    Args:
+        backend: pyannote | silero | energy (already resolved)
+        device: cpu | cuda | mps
+        threshold: Speech threshold (pyannote onset/offset, silero
+            probability, energy level)
+        hf_token: HuggingFace token for the gated pyannote model
+
+    Returns:
+        Detector callable
+    """
+    if backend == 'energy':
+        return lambda samples: energy_speech_regions(samples, SAMPLE_RATE, threshold)
+
+    import torch
+
+    if backend == 'silero':
+        model, utils = torch.hub.load(
+            repo_or_dir='snakers4/silero-vad',
+            model='silero_vad',
+            force_reload=False,
+            trust_repo=True
+        )
+        get_speech_timestamps = utils[0]
+
+        def silero(samples: np.ndarray) -> List[Region]:
+            stamps = get_speech_timestamps(
+                torch.from_numpy(samples), model,
+                threshold=threshold, sampling_rate=SAMPLE_RATE
+            )
+            return [(s['start'] / SAMPLE_RATE, s['end'] / SAMPLE_RATE) for s in stamps]
+
+        return silero
+
+    from pyannote.audio import Pipeline
+
+    if hf_token:
+        pipeline = Pipeline.from_pretrained("pyannote/voice-activity-detection", use_auth_token=hf_token)
+    else:
+        pipeline = Pipeline.from_pretrained("pyannote/voice-activity-detection")
+    try:
+        params = dict(pipeline.parameters(instantiated=True))
+        params.update(onset=threshold, offset=threshold)
+        pipeline.instantiate(params)
+    except Exception as e:
+        logger.warning(f"Could not apply threshold {threshold} to PyAnnote VAD, using its defaults: {e}")
+    if device in ('cuda', 'mps'):
+        try:
+            pipeline.to(torch.device(device))
+        except Exception as e:
+            logger.warning(f"Could not use {device} for PyAnnote, falling back to CPU: {e}")
+
+    def pyannote(samples: np.ndarray) -> List[Region]:
+        result = pipeline({"waveform": torch.from_numpy(samples)[None], "sample_rate": SAMPLE_RATE})
+        return [(float(s.start), float(s.end)) for s in result.get_timeline().support()]
+
+    return pyannote
+
+
+def plan_windows(
+    num_samples: int,
+    sr: int = SAMPLE_RATE,
+    window_seconds: float = DEFAULT_WINDOW_SECONDS,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS
+) -> List[Tuple[int, int, float, float]]:
+    """
+    Overlapping read windows and the span each one is authoritative for.
+
+    Neighbouring windows hand over at the middle of their overlap, so a
+    segment cut by one window edge is still seen whole by the other.
+
+    Returns:
+        (start_sample, end_sample, keep_from_seconds, keep_to_seconds) per window
+    """
+    window = max(1, int(window_seconds * sr))
+    overlap = min(int(overlap_seconds * sr), window // 2)
+    step = window - overlap
+    starts = list(range(0, max(num_samples - overlap, 1), step))
+
+    windows = []
+    for i, start in enumerate(starts):
+        end = min(start + window, num_samples)
+        keep_from = (start + overlap / 2) / sr if i > 0 else 0.0
+        keep_to = (end - overlap / 2) / sr if i < len(starts) - 1 else num_samples / sr
+        windows.append((start, end, keep_from, keep_to))
+    return windows
+
+
+def merge_segments(
+    regions: Sequence[Region],
+    merge_gap: float = DEFAULT_MERGE_GAP
+) -> List[Dict[str, float]]:
+    """
+    Merge speech regions separated by at most `merge_gap` seconds.
+
+    Returns:
+        speech_segments.json entries: {"start", "end", "duration"}
+    """
+    segments: List[Dict[str, float]] = []
+    for start, end in sorted(regions):
+        if segments and start - segments[-1]["end"] <= max(merge_gap, 0.0):
+            segments[-1]["end"] = max(segments[-1]["end"], float(end))
+        else:
+            segments.append({"start": float(start), "end": float(end)})
+    for seg in segments:
+        seg["duration"] = seg["end"] - seg["start"]
+    return segments
+
+
+def save_speech_segments(segments: List[Dict[str, float]], output_json: Path) -> None:
+    """Atomically write {"segments": [...]} (the schema the pipeline expects)"""
+    output_json = Path(output_json)
+    output_json.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output_json.with_suffix(output_json.suffix + ".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({"segments": segments}, f, indent=2)
+    os.replace(tmp, output_json)
+
+
+def _get_detector(backend: str, device: str, threshold: float, hf_token: Optional[str]) -> Detector:
+    """This process's detector, rebuilt when backend/device/threshold change"""
+    global _DETECTOR, _DETECTOR_KEY
+    key = (backend, device, float(threshold))
+    if _DETECTOR is None or _DETECTOR_KEY != key:
+        _DETECTOR = create_detector(backend, device, threshold, hf_token)
+        _DETECTOR_KEY = key
+    return _DETECTOR
+
+
+def _init_worker(backend: str, device: str, threshold: float, hf_token: Optional[str], threads: int) -> None:
+    """Build the detector once per worker process"""
+    if threads > 0 and backend != 'energy':
+        import torch
+        torch.set_num_threads(threads)
+    _get_detector(backend, device, threshold, hf_token)
+
+
+def _detect_window(
+    audio_path: str,
+    start: int,
+    end: int,
+    keep_from: float,
+    keep_to: float,
+    buffer: Optional[np.ndarray] = None
+) -> List[Region]:
+    """Worker task: detect one window, return absolute regions clipped to its span"""
+    from shared.audio_utils import PCMReader
+
+    with PCMReader(audio_path, SAMPLE_RATE) as reader:
+        samples = reader.read_samples(start, end, buffer[:end - start] if buffer is not None else None)
+    offset = start / SAMPLE_RATE
+    regions = []
+    for rel_start, rel_end in _DETECTOR(samples):
+        s, e = max(rel_start + offset, keep_from), min(rel_end + offset, keep_to)
+        if e > s:
+            regions.append((s, e))
+    return regions
+
+
+class StreamingVAD:
+    """
+    Window-by-window VAD over a 16 kHz WAV.
+
+    Example:
+        >>> vad = StreamingVAD(backend='silero', workers=4)
+        >>> segments = vad.run(audio, stage_dir / "speech_segments.json", merge_gap=0.2)
+    """
+
+    def __init__(
+        self,
+        backend: str = 'auto',
+        device: str = 'cpu',
+        threshold: float = 0.5,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+        overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+        workers: int = 1,
+        hf_token: Optional[str] = None,
+        logger_instance: Any = None
+    ):
+        """
+        Args:
+            backend: auto | pyannote | silero | energy
+            device: cpu | cuda | mps
+            threshold: Speech threshold (0-1, all backends)
+            window_seconds: Audio read and processed per window
+            overlap_seconds: Overlap between neighbouring windows
+            workers: Worker processes (0 = auto; accelerators use one in-process)
+            hf_token: HuggingFace token for pyannote
+            logger_instance: Logger (default: module logger)
+        """
+        from shared.chunked_separation import resolve_workers
+
+        self.logger = logger_instance or logger
+        self.device = device
+        self.backend = resolve_backend(backend, device)
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        # The energy detector is cheaper than a process pool
+        self.workers = 1 if self.backend == 'energy' else resolve_workers(workers, device)
+        self.hf_token = hf_token
+        self.stats: Dict[str, Any] = {}
+
+    def detect(self, audio_path: Union[str, Path]) -> List[Region]:
+        """
+        Speech regions over the whole file, in seconds.
+
+        Args:
+            audio_path: 16 kHz audio (demux or separation output)
+
+        Returns:
+            Sorted, window-stitched (start, end) pairs (not yet merged)
+        """
+        from shared.audio_utils import PCMReader
+
+        with PCMReader(audio_path, SAMPLE_RATE) as reader:
+            num_samples = reader.num_samples
+        windows = plan_windows(num_samples, SAMPLE_RATE, self.window_seconds, self.overlap_seconds)
+        tasks = [(str(audio_path), *window) for window in windows]
+        started = time.time()
+
+        regions: List[Region] = []
+        if self.workers <= 1:
+            _get_detector(self.backend, self.device, self.threshold, self.hf_token)
+            buffer = np.empty(max((end - start for start, end, _, _ in windows), default=0), dtype=np.float32)
+            for done, task in enumerate(tasks, 1):
+                regions.extend(_detect_window(*task, buffer=buffer))
+                self.logger.info(f"  Window {done}/{len(tasks)} processed")
+        else:
+            import multiprocessing
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.backend, self.device, self.threshold, self.hf_token, threads)
+            ) as pool:
+                for done, window_regions in enumerate(pool.map(_detect_window, *zip(*tasks)), 1):
+                    regions.extend(window_regions)
+                    self.logger.info(f"  Window {done}/{len(tasks)} processed")
+
+        self.stats = {
+            'backend': self.backend,
+            'windows': len(windows),
+            'workers': self.workers,
+            'audio_seconds': round(num_samples / SAMPLE_RATE, 3),
+            'seconds': round(time.time() - started, 3),
+        }
+        return sorted(regions)
+
+    def run(
+        self,
+        audio_path: Union[str, Path],
+        output_json: Union[str, Path],
+        merge_gap: float = DEFAULT_MERGE_GAP
+    ) -> List[Dict[str, float]]:
+        """
+        Detect, merge and write speech_segments.json.
+
+        Returns:
+            The merged segments
+        """
+        regions = self.detect(audio_path)
+        segments = merge_segments(regions, merge_gap)
+        save_speech_segments(segments, Path(output_json))
+        self.stats.update({
+            'raw_segments': len(regions),
+            'segments': len(segments),
+            'speech_seconds': round(sum(s['duration'] for s in segments), 3),
+            'merge_gap': merge_gap,
+        })
+        return segments
+
+
+__all__ = [
+    'BACKENDS',
+    'DEFAULT_WINDOW_SECONDS',
+    'DEFAULT_OVERLAP_SECONDS',
+    'DEFAULT_MERGE_GAP',
+    'energy_speech_regions',
+    'silero_cached',
+    'resolve_backend',
+    'create_detector',
+    'plan_windows',
+    'merge_segments',
+    'save_speech_segments',
+    'StreamingVAD',
+]
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Subtitle reading and writing (SRT, WebVTT, ASS)
+
+Handles:
+- Timestamp formatting from integer milliseconds (no float drift)
+- SRT, VTT and ASS rendered from one pass over a segment list, each file
+  written with a single buffered write and an atomic rename
+- Streaming writer for very long or many-track jobs: cues go straight
+  to buffered files instead of being held in memory
+- SRT parsing with one compiled regex over the whole file
+
+Segments are dicts with "start", "end" (seconds) and "text". Segments
+marked "removed" or with empty text are skipped and cues are numbered
+sequentially.
+
+Module: shared/subtitle_io.py
+"""
+
+# Standard library
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+FORMATS: Tuple[str, ...] = ('srt', 'vtt', 'ass')
+
+# Write buffer for streamed tracks
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+ASS_HEADER = """[Script Info]
+Title: {title}
+ScriptType: v4.00+
+WrapStyle: 0
+ScaledBorderAndShadow: yes
+PlayResX: 384
+PlayResY: 288
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,20,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,2,1,2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+_SRT_CUE_RE = re.compile(
+    r'^[ \t]*(\d+)[ \t]*\n'
+    r'[ \t]*(\d+):(\d{2}):(\d{2})[,.](\d{1,3})[ \t]*-->[ \t]*(\d+):(\d{2}):(\d{2})[,.](\d{1,3})[^\n]*\n'
+    r'([^\n].*?)(?=\n[ \t]*\n|\s*\Z)',
+    re.M | re.S
+)
+
+Cue = Tuple[float, float, str]
+PathLike = Union[str, Path]
+
+
+def _millis(seconds: Any) -> int:
+    return max(int(round(float(seconds or 0) * 1000)), 0)
+
+
+def format_timestamp(seconds: float, fmt: str = 'srt') -> str:
+    """
+    Format seconds as a subtitle timestamp.
+
+    Args:
+        seconds: Time in seconds
+        fmt: 'srt' (HH:MM:SS,mmm), 'vtt' (HH:MM:SS.mmm) or 'ass' (H:MM:SS.cc)
+
+    Returns:
+        Formatted timestamp string
+    """
+    if fmt == 'ass':
+        centis = (_millis(seconds) + 5) // 10
+        hours, rem = divmod(centis, 360000)
+        minutes, rem = divmod(rem, 6000)
+        secs, centis = divmod(rem, 100)
+        return f"{hours:d}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+    hours, rem = divmod(_millis(seconds), 3600000)
+    minutes, rem = divmod(rem, 60000)
+    secs, millis = divmod(rem, 1000)
+    sep = '.' if fmt == 'vtt' else ','
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{sep}{millis:03d}"
+
+
+def iter_cues(segments: Iterable[Dict[str, Any]], skip_removed: bool = True) -> Iterator[Cue]:
+    """
+    (start, end, text) for every segment that becomes a subtitle.
+
+    Args:
+        segments: Segment dicts
+        skip_removed: Skip segments marked "removed"
+
+    Returns:
+        Iterator of cues
+    """
+    for segment in segments:
+        if skip_removed and segment.get('removed', False):
+            continue
+        text = (segment.get('text') or '').strip()
+        if not text:
+            continue
+        start = segment.get('start', 0) or 0
+        end = segment.get('end', start)
+        yield start, end, text
+
+
+def format_header(fmt: str, title: str = '') -> str:
+    """File header for a subtitle format ('' for SRT)"""
+    if fmt == 'vtt':
+        return "WEBVTT\n\n"
+    if fmt == 'ass':
+        return ASS_HEADER.format(title=title or 'Subtitles')
+    return ''
+
+
+def format_cue(index: int, start: float, end: float, text: str, fmt: str = 'srt') -> str:
+    """
+    One cue as text in the given format.
+
+    Args:
+        index: 1-based cue number
+        start: Start time in seconds
+        end: End time in seconds
+        text: Cue text (may contain newlines)
+        fmt: 'srt', 'vtt' or 'ass'
+
+    Returns:
+        Cue block including its trailing separator
+    """
+    if fmt == 'ass':
+        text = text.replace('\r', '').replace('\n', '\\N')
+        return f"Dialogue: 0,{format_timestamp(start, 'ass')},{format_timestamp(end, 'ass')},Default,,0,0,0,,{text}\n"
+    return f"{index}\n{format_timestamp(start, fmt)} --> {format_timestamp(end, fmt)}\n{text}\n\n"
+
+
+def format_for_path(path: PathLike) -> str:
+    """Subtitle format from a file suffix (.srt, .vtt, .ass)"""
+    fmt = Path(path).suffix.lower().lstrip('.')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported subtitle format: {path} (expected one of {', '.join(FORMATS)})")
+    return fmt
+
+
+def render(segments: Iterable[Dict[str, Any]], fmt: str = 'srt', title: str = '') -> str:
+    """
+    Whole subtitle file as one string.
+
+    Args:
+        segments: Segment dicts
+        fmt: 'srt', 'vtt' or 'ass'
+        title: ASS script title
+
+    Returns:
+        File contents
+    """
+    parts = [format_header(fmt, title)]
+    parts.extend(format_cue(i, start, end, text, fmt) for i, (start, end, text) in enumerate(iter_cues(segments), 1))
+    return ''.join(parts)
+
+
+def _atomic_write_text(path: Path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_subtitles(
+    segments: Iterable[Dict[str, Any]],
+    *paths: PathLike,
+    title: str = '',
+    skip_removed: bool = True
+) -> int:
+    """
+    Write one segment list to several subtitle files in one pass.
+
+    The format of each file follows its suffix. Every file is built in
+    memory and written with a single write, then renamed into place.
+
+    Args:
+        segments: Segment dicts
+        *paths: Output files (.srt, .vtt, .ass)
+        title: ASS script title
+        skip_removed: Skip segments marked "removed"
+
+    Returns:
+        Number of cues written per file
+    """
+    targets = [(Path(path), format_for_path(path)) for path in paths]
+    parts: List[List[str]] = [[format_header(fmt, title)] for _, fmt in targets]
+
+    count = 0
+    for count, (start, end, text) in enumerate(iter_cues(segments, skip_removed), 1):
+        for buf, (_, fmt) in zip(parts, targets):
+            buf.append(format_cue(count, start, end, text, fmt))
+
+    for buf, (path, _) in zip(parts, targets):
+        _atomic_write_text(path, ''.join(buf))
+    return count
+
+
+class SubtitleStreamWriter:
+    """
+    Incremental writer for one or more subtitle files.
+
+    Cues are appended to buffered temporary files as segments arrive and
+    the files are renamed into place on close, so a track never has to be
+    held in memory. Leaving the context with an exception discards them.
+
+    Usage:
+        with SubtitleStreamWriter(out / "movie.en.srt", out / "movie.en.vtt") as writer:
+            for batch in batches:
+                writer.write_many(batch)
+    """
+
+    def __init__(self, *paths: PathLike, title: str = '', skip_removed: bool = True,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.paths = [Path(path) for path in paths]
+        self.formats = [format_for_path(path) for path in self.paths]
+        self.skip_removed = skip_removed
+        self.count = 0
+        self._files = []
+        for path, fmt in zip(self.paths, self.formats):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = open(path.with_name(f".{path.name}.tmp"), 'w', encoding='utf-8',
+                     newline='\n', buffering=buffer_size)
+            f.write(format_header(fmt, title))
+            self._files.append(f)
+
+    def write(self, segment: Dict[str, Any]) -> bool:
+        """Append one segment; returns False if it was skipped"""
+        for start, end, text in iter_cues((segment,), self.skip_removed):
+            self.count += 1
+            for f, fmt in zip(self._files, self.formats):
+                f.write(format_cue(self.count, start, end, text, fmt))
+            return True
+        return False
+
+    def write_many(self, segments: Iterable[Dict[str, Any]]) -> int:
+        """Append segments; returns how many became cues"""
+        before = self.count
+        for segment in segments:
+            self.write(segment)
+        return self.count - before
+
+    def close(self, commit: bool = True) -> None:
+        """Flush and move files into place (or discard them)"""
+        for f, path in zip(self._files, self.paths):
+            f.close()
+            if commit:
+                os.replace(f.name, path)
+            else:
+                Path(f.name).unlink(missing_ok=True)
+        self._files = []
+
+    def __enter__(self) -> 'SubtitleStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(commit=exc_type is None)
+
+
+def _cue_seconds(h: str, m: str, s: str, ms: str) -> float:
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms.ljust(3, '0')) / 1000
+
+
+def iter_srt(source: Union[Path, str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse SRT content lazily.
+
+    Args:
+        source: Path to an SRT file, or SRT text as a string
+
+    Returns:
+        Iterator of {"index", "start", "end", "text"} dicts; malformed
+        blocks are skipped
+    """
+    if isinstance(source, Path):
+        source = source.read_text(encoding='utf-8-sig')
+    text = source.lstrip('\ufeff').replace('\r\n', '\n').replace('\r', '\n')
+
+    for match in _SRT_CUE_RE.finditer(text):
+        groups = match.groups()
+        yield {
+            'index': int(groups[0]),
+            'start': _cue_seconds(*groups[1:5]),
+            'end': _cue_seconds(*groups[5:9]),
+            'text': groups[9].strip(),
+        }
+
+
+def parse_srt(source: Union[Path, str]) -> List[Dict[str, Any]]:
+    """
+    Parse SRT content into a list of cues.
+
+    Args:
+        source: Path to an SRT file, or SRT text as a string
+
+    Returns:
+        List of {"index", "start", "end", "text"} dicts
+    """
+    return list(iter_srt(source))
+
+
+__all__ = [
+    'FORMATS',
+    'format_timestamp',
+    'format_header',
+    'format_cue',
+    'format_for_path',
+    'iter_cues',
+    'render',
+    'write_subtitles',
+    'SubtitleStreamWriter',
+    'iter_srt',
+    'parse_srt',
+]
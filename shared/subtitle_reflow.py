@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Subtitle reflow (splitting, merging, timing and line breaking)
+
+Handles:
+- Flattening segments into NumPy word arrays (start, end, width, segment,
+  speaker); word timestamps are used when they match the segment text,
+  otherwise times are spread over the segment by visible width
+- Packing words into cues that respect max characters, max duration,
+  merge gap and speaker changes, preferring sentence and clause ends;
+  short neighbouring segments merge, long ones split
+- Vectorized timing fixes over the cue arrays: extend cues to the minimum
+  duration and to the CPS cap without running into the next cue
+- Dynamic-programming line breaker (balanced lines, punctuation-aware),
+  linear in words because a line holds a bounded number of them
+- Visible width that ignores combining marks (Devanagari matras, etc.)
+  and splits CJK text into characters, so all languages share one path
+
+Limits come from shared/config_loader (SUBTITLE_*, SEGMENT_MERGE_*, CPS_*)
+and the job.json "subtitle" section.
+
+Module: shared/subtitle_reflow.py
+"""
+
+# Standard library
+import unicodedata
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Third-party: numpy is imported inside the functions that use it, so
+# importing this module (run-pipeline startup) does not load it.
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Gap kept between a cue that is extended and the next one (2 frames @ 24fps)
+MIN_GAP_SECONDS = 0.083
+# Cost of breaking a line (or cue) after a word without punctuation
+BREAK_PENALTY = 150.0
+
+_SENTENCE_END = ('.', '?', '!', '।', '॥', '。', '？', '！', '…')
+_CLAUSE_END = (',', ';', ':', '،', '、', '，', '-', '–', '—')
+_INVISIBLE = {'Mn', 'Me', 'Cf'}
+
+
+@dataclass(frozen=True)
+class ReflowSettings:
+    """Subtitle layout and timing limits."""
+
+    enabled: bool = True
+    merge: bool = True
+    max_line_length: int = 42
+    max_lines: int = 2
+    min_duration: float = 1.0
+    max_duration: float = 7.0
+    max_gap: float = 1.5
+    max_cps: float = 17.0
+    enforce_cps: bool = True
+
+    @property
+    def max_chars(self) -> int:
+        return self.max_line_length * self.max_lines
+
+    @classmethod
+    def from_config(cls, config: Any = None, overrides: Optional[Dict[str, Any]] = None) -> 'ReflowSettings':
+        """
+        Settings from shared/config_loader with job.json overrides (AD-006).
+
+        Args:
+            config: config_loader.Config (default: cached load_config())
+            overrides: job.json "subtitle" section (field names; "reflow"
+                toggles the engine)
+
+        Returns:
+            ReflowSettings
+        """
+        if config is None:
+            from shared.config_loader import load_config
+            try:
+                config = load_config()
+            except FileNotFoundError as e:
+                logger.warning(f"Config not loaded ({e}); using default subtitle limits")
+
+        values = asdict(cls()) if config is None else {
+            'enabled': config.subtitle_reflow_enabled,
+            'merge': config.segment_merging_enabled and config.get("SUBTITLE_MERGE_SHORT", True),
+            'max_line_length': config.subtitle_max_line_length,
+            'max_lines': config.subtitle_max_lines,
+            'min_duration': config.subtitle_min_duration,
+            'max_duration': min(config.subtitle_max_duration, config.segment_merge_max_duration),
+            'max_gap': config.segment_merge_max_gap,
+            'max_cps': config.cps_hard_cap,
+            'enforce_cps': config.cps_enforcement,
+        }
+        for key, value in (overrides or {}).items():
+            key = 'enabled' if key == 'reflow' else key
+            if key in values and value is not None:
+                values[key] = value
+        # .env values arrive as int/float/bool; job.json may hold strings
+        for key, default in asdict(cls()).items():
+            if isinstance(default, bool) and isinstance(values[key], str):
+                values[key] = values[key].lower() == 'true'
+            else:
+                values[key] = type(default)(values[key])
+        return cls(**values)
+
+
+def _is_wide(ch: str) -> bool:
+    return unicodedata.east_asian_width(ch) in ('W', 'F')
+
+
+def visible_width(text: str) -> int:
+    """Display width: combining marks and format chars are 0, wide (CJK) chars 2"""
+    return sum(
+        0 if unicodedata.category(ch) in _INVISIBLE else 2 if _is_wide(ch) else 1
+        for ch in text
+    )
+
+
+def tokenize(text: str) -> List[Tuple[str, str]]:
+    """
+    Split text into (joiner, token) pairs.
+
+    Space-separated scripts split on whitespace; runs of wide (CJK)
+    characters become one token per character with an empty joiner.
+
+    Args:
+        text: Segment text
+
+    Returns:
+        List of (text before the token, token)
+    """
+    tokens: List[Tuple[str, str]] = []
+    for word in text.split():
+        if not any(_is_wide(ch) for ch in word):
+            tokens.append((' ', word))
+            continue
+        joiner = ' '
+        buf = ''
+        for ch in word:
+            if _is_wide(ch) and not unicodedata.category(ch).startswith('P'):
+                if buf:
+                    tokens.append((joiner, buf))
+                    joiner = ''
+                buf = ch
+            else:
+                buf += ch
+        if buf:
+            tokens.append((joiner, buf))
+    return tokens
+
+
+def break_lines(tokens: Sequence[Tuple[str, str]], max_line_length: int = 42, max_lines: int = 2) -> List[str]:
+    """
+    Break a cue into balanced lines with dynamic programming.
+
+    Minimizes the sum of squared slack per line plus a penalty for
+    breaking after a word with no punctuation. Each line holds a bounded
+    number of tokens, so the work is linear in the number of tokens.
+
+    Args:
+        tokens: (joiner, token) pairs from tokenize()
+        max_line_length: Characters per line
+        max_lines: Lines per cue (exceeded only if the text cannot fit)
+
+    Returns:
+        Lines of text
+    """
+    n = len(tokens)
+    if n == 0:
+        return []
+    widths = [visible_width(tok) for _, tok in tokens]
+    joins = [0] + [len(joiner) for joiner, _ in tokens[1:]]
+    prefix = [0]
+    for w, j in zip(widths, joins):
+        prefix.append(prefix[-1] + w + j)
+
+    def line_width(i: int, j: int) -> int:
+        return prefix[j] - prefix[i] - joins[i]
+
+    if line_width(0, n) <= max_line_length:
+        return [''.join(tok if k == 0 else joiner + tok for k, (joiner, tok) in enumerate(tokens))]
+
+    def penalty(j: int) -> float:
+        last = tokens[j - 1][1]
+        if last.endswith(_SENTENCE_END):
+            return 0.0
+        if last.endswith(_CLAUSE_END):
+            return BREAK_PENALTY / 4
+        return BREAK_PENALTY
+
+    lines_allowed = max_lines
+    total = line_width(0, n)
+    while True:
+        inf = float('inf')
+        cost = [[inf] * (n + 1) for _ in range(lines_allowed + 1)]
+        back = [[0] * (n + 1) for _ in range(lines_allowed + 1)]
+        cost[0][0] = 0.0
+        for k in range(1, lines_allowed + 1):
+            for j in range(1, n + 1):
+                i = j - 1
+                while i >= 0:
+                    width = line_width(i, j)
+                    if width > max_line_length and i < j - 1:
+                        break
+                    if cost[k - 1][i] < inf:
+                        slack = max_line_length - width
+                        # An over-long single token is allowed, at a price
+                        c = cost[k - 1][i] + (slack * slack if slack >= 0 else 1e6 * -slack)
+                        if j < n:
+                            c += penalty(j)
+                        if c < cost[k][j]:
+                            cost[k][j] = c
+                            back[k][j] = i
+                    i -= 1
+        best_k = min(range(1, lines_allowed + 1), key=lambda k: cost[k][n])
+        if cost[best_k][n] < inf:
+            break
+        # Too much text for max_lines: allow as many lines as it needs
+        lines_allowed = max(lines_allowed + 1, -(-total // max_line_length) + 1)
+
+    lines = []
+    j = n
+    for k in range(best_k, 0, -1):
+        i = back[k][j]
+        lines.append(''.join(tok if m == i else joiner + tok for m, (joiner, tok) in enumerate(tokens[i:j], i)))
+        j = i
+    return lines[::-1]
+
+
+def _segment_words(segment: Dict[str, Any]) -> Optional[List[Tuple[str, float, float]]]:
+    """Word timestamps if they cover the segment text, else None"""
+    words = segment.get('words')
+    if not words:
+        return None
+    text = ''.join((segment.get('text') or '').split())
+    joined = ''.join(''.join(str(w.get('word', '')).split()) for w in words)
+    if not joined or joined != text:
+        return None
+    return [(str(w.get('word', '')).strip(), w.get('start'), w.get('end')) for w in words]
+
+
+def flatten_words(segments: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Word arrays for a list of segments.
+
+    Args:
+        segments: Segments with start, end, text and optional words/speaker
+
+    Returns:
+        Dict with "tokens" (joiner, token) and NumPy arrays "start", "end",
+        "width", "segment", "speaker" (index into "speakers")
+    """
+    import numpy as np
+    tokens: List[Tuple[str, str]] = []
+    starts: List[float] = []
+    ends: List[float] = []
+    seg_ids: List[int] = []
+    speakers: List[Any] = []
+    speaker_ids: List[int] = []
+
+    for s, segment in enumerate(segments):
+        if segment.get('removed'):
+            continue
+        text = (segment.get('text') or '').strip()
+        if not text:
+            continue
+        seg_start = float(segment.get('start', 0) or 0)
+        seg_end = max(float(segment.get('end', seg_start) or seg_start), seg_start)
+        speaker = segment.get('speaker')
+        if speaker not in speakers:
+            speakers.append(speaker)
+        speaker_id = speakers.index(speaker)
+
+        timed = _segment_words(segment)
+        if timed:
+            # Characters split out of one timed word share its span
+            spans = [(joined, start, end) for word, start, end in timed for joined in tokenize(word)]
+            seg_tokens = [token for token, _, _ in spans]
+            w_start = np.array([np.nan if t is None else float(t) for _, t, _ in spans])
+            w_end = np.array([np.nan if t is None else float(t) for _, _, t in spans])
+        else:
+            seg_tokens = tokenize(text)
+            w_start = np.full(len(seg_tokens), np.nan)
+            w_end = np.full(len(seg_tokens), np.nan)
+
+        # Missing timestamps: proportional to cumulative width
+        widths = np.array([visible_width(tok) + 1 for _, tok in seg_tokens], dtype=float)
+        edges = seg_start + (seg_end - seg_start) * np.concatenate(([0.0], np.cumsum(widths))) / widths.sum()
+        w_start = np.where(np.isnan(w_start), edges[:-1], w_start)
+        w_end = np.where(np.isnan(w_end), edges[1:], w_end)
+        w_end = np.maximum(w_end, w_start)
+
+        tokens.extend(seg_tokens)
+        starts.extend(w_start.tolist())
+        ends.extend(w_end.tolist())
+        seg_ids.extend([s] * len(seg_tokens))
+        speaker_ids.extend([speaker_id] * len(seg_tokens))
+
+    return {
+        'tokens': tokens,
+        'start': np.asarray(starts, dtype=float),
+        'end': np.asarray(ends, dtype=float),
+        'width': np.asarray([visible_width(tok) for _, tok in tokens], dtype=int),
+        'joiner': np.asarray([len(joiner) for joiner, _ in tokens], dtype=int),
+        'segment': np.asarray(seg_ids, dtype=int),
+        'speaker': np.asarray(speaker_ids, dtype=int),
+        'speakers': speakers,
+    }
+
+
+def _pack(words: Dict[str, Any], settings: ReflowSettings) -> List[Tuple[int, int]]:
+    """[start, end) word ranges for each cue"""
+    import numpy as np
+    n = len(words['tokens'])
+    if n == 0:
+        return []
+    start, end, width, joiner = words['start'], words['end'], words['width'], words['joiner']
+
+    # Hard breaks before word i (vectorized)
+    hard = np.zeros(n, dtype=bool)
+    hard[1:] = (start[1:] - end[:-1] > settings.max_gap) | (words['speaker'][1:] != words['speaker'][:-1])
+    if not settings.merge:
+        hard[1:] |= words['segment'][1:] != words['segment'][:-1]
+
+    sentence_end = np.array([tok.endswith(_SENTENCE_END) for _, tok in words['tokens']])
+    clause_end = np.array([tok.endswith(_CLAUSE_END) for _, tok in words['tokens']])
+
+    cues = []
+    first = 0
+    while first < n:
+        chars = width[first]
+        i = first + 1
+        while i < n and not hard[i]:
+            # Keep sentences apart once the cue is long enough to read
+            if sentence_end[i - 1] and end[i - 1] - start[first] >= settings.min_duration:
+                break
+            add = width[i] + joiner[i]
+            if chars + add > settings.max_chars or end[i] - start[first] > settings.max_duration:
+                # Limit hit mid-sentence: back off to a clause end in the
+                # second half of the cue if there is one
+                for k in range(i - 1, first + (i - first) // 2, -1):
+                    if clause_end[k - 1] or sentence_end[k - 1]:
+                        i = k
+                        break
+                break
+            chars += add
+            i += 1
+        cues.append((first, i))
+        first = i
+    return cues
+
+
+def reflow_segments(
+    segments: Sequence[Dict[str, Any]],
+    settings: Optional[ReflowSettings] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Reflow segments into readable subtitle cues.
+
+    Args:
+        segments: Transcript or translation segments
+        settings: Limits (default: from config)
+
+    Returns:
+        (cue segments with start, end, text, speaker; stats)
+    """
+    import numpy as np
+    settings = settings or ReflowSettings.from_config()
+    source = [seg for seg in segments if not seg.get('removed') and (seg.get('text') or '').strip()]
+    stats: Dict[str, Any] = {'input_segments': len(source), 'cues': 0}
+    if not settings.enabled or not source:
+        stats['cues'] = len(source)
+        return [dict(seg) for seg in source], stats
+
+    words = flatten_words(source)
+    ranges: List[Tuple[int, int]] = []
+    layouts: List[List[str]] = []
+    pending = _pack(words, settings)[::-1]
+    while pending:
+        a, b = pending.pop()
+        lines = break_lines(words['tokens'][a:b], settings.max_line_length, settings.max_lines)
+        if len(lines) > settings.max_lines and b - a > 1:
+            # Fits max_chars but not the lines: cut after the last line that fits
+            cut = a + sum(len(tokenize(line)) for line in lines[:settings.max_lines])
+            cut = min(max(cut, a + 1), b - 1)
+            pending.extend([(cut, b), (a, cut)])
+            continue
+        ranges.append((a, b))
+        layouts.append(lines)
+    if not ranges:
+        return [], stats
+
+    first = np.array([a for a, _ in ranges])
+    last = np.array([b - 1 for _, b in ranges])
+    cue_start = words['start'][first]
+    cue_end = np.maximum(words['end'][last], cue_start)
+    width = np.add.reduceat(words['width'] + words['joiner'], first) - words['joiner'][first]
+
+    # Vectorized timing: reach min duration and the CPS cap, but never
+    # overlap the next cue or exceed the max duration
+    need = np.full(len(ranges), settings.min_duration)
+    if settings.enforce_cps and settings.max_cps > 0:
+        need = np.maximum(need, width / settings.max_cps)
+    need = np.minimum(need, settings.max_duration)
+    limit = np.append(cue_start[1:] - MIN_GAP_SECONDS, np.inf)
+    target = np.minimum(cue_start + need, limit)
+    new_end = np.maximum(cue_end, target)
+    duration = new_end - cue_start
+    cps = np.divide(width, duration, out=np.zeros_like(duration), where=duration > 0)
+
+    cues = []
+    for c, (a, b) in enumerate(ranges):
+        cue = {
+            'start': round(float(cue_start[c]), 3),
+            'end': round(float(new_end[c]), 3),
+            'text': '\n'.join(layouts[c]),
+        }
+        speaker = words['speakers'][words['speaker'][a]]
+        if speaker is not None:
+            cue['speaker'] = speaker
+        cues.append(cue)
+
+    # Distinct (segment, cue) pairs tell merges from splits
+    cue_of_word = np.repeat(np.arange(len(ranges)), last - first + 1)
+    pairs = np.unique(np.stack([words['segment'], cue_of_word], axis=1), axis=0)
+    segments_per_cue = np.bincount(pairs[:, 1], minlength=len(ranges))
+    _, cues_per_segment = np.unique(pairs[:, 0], return_counts=True)
+    line_counts = [cue['text'].count('\n') + 1 for cue in cues]
+    stats.update({
+        'cues': len(cues),
+        'merged_cues': int(np.count_nonzero(segments_per_cue > 1)),
+        'split_segments': int(np.count_nonzero(cues_per_segment > 1)),
+        'extended_cues': int(np.count_nonzero(new_end > cue_end + 1e-6)),
+        'cps_violations': int(np.count_nonzero(cps > settings.max_cps)) if settings.enforce_cps else 0,
+        'line_overflows': sum(1 for k in line_counts if k > settings.max_lines),
+        'max_cps': round(float(cps.max()), 2),
+    })
+    return cues, stats
+
+
+__all__ = [
+    'ReflowSettings',
+    'visible_width',
+    'tokenize',
+    'break_lines',
+    'flatten_words',
+    'reflow_segments',
+]
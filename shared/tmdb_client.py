@@ -24,6 +24,7 @@ from cachetools import TTLCache
 
 # Local
 from shared.logger import get_logger
+from shared.job_events import emit as emit_event
 logger = get_logger(__name__)
 
 
@@ -86,7 +87,9 @@ class TMDBClient:
         if cache_key in self._cache:
             if self.logger:
                 self.logger.debug(f"Using cached search result for: {title}")
+            emit_event("cache", cache="tmdb", hits=1, misses=0)
             return self._cache[cache_key]
+        emit_event("cache", cache="tmdb", hits=0, misses=1)
         
         try:
             if self.logger:
@@ -155,7 +158,9 @@ class TMDBClient:
         if cache_key in self._cache:
             if self.logger:
                 self.logger.debug(f"Using cached metadata for movie ID: {movie_id}")
+            emit_event("cache", cache="tmdb", hits=1, misses=0)
             return self._cache[cache_key]
+        emit_event("cache", cache="tmdb", hits=0, misses=1)
         
         try:
             if self.logger:
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Deduplicated, length-bucketed batching for seq2seq translation
+
+Handles:
+- Collapsing identical (whitespace-normalized) inputs to one translation
+- Ordering unique inputs by token length so each batch pads to a similar
+  length instead of to the one long line that happened to land in it
+- Sizing each batch by a padded-token budget (plus a sentence cap)
+- Scattering translations back to the original positions
+
+Subtitle tracks repeat short lines constantly ("हाँ", "चलो", "क्या?"),
+so deduplication alone removes a large share of the decoder work.
+
+Module: shared/translation_batching.py
+"""
+
+# Standard library
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Normalize a line for deduplication (strip + collapse whitespace)"""
+    return " ".join((text or "").split())
+
+
+@dataclass
+class DedupedTexts:
+    """
+    Unique inputs plus the mapping back to the original positions.
+
+    Attributes:
+        unique: Unique normalized non-empty texts, in first-seen order
+        positions: For each original text, its index in ``unique`` (None if empty)
+    """
+    unique: List[str] = field(default_factory=list)
+    positions: List[Optional[int]] = field(default_factory=list)
+
+    @property
+    def duplicates(self) -> int:
+        """Number of inputs served by an earlier identical input"""
+        return sum(1 for p in self.positions if p is not None) - len(self.unique)
+
+    def scatter(self, translations: List[str], originals: List[str]) -> List[str]:
+        """
+        Map translations of ``unique`` back to every original position.
+
+        Empty inputs keep their original text.
+        """
+        return [
+            originals[i] if pos is None else translations[pos]
+            for i, pos in enumerate(self.positions)
+        ]
+
+
+def dedupe_texts(texts: List[str]) -> DedupedTexts:
+    """
+    Deduplicate texts by their normalized form.
+
+    Args:
+        texts: Input texts (may contain empties and repeats)
+
+    Returns:
+        DedupedTexts with unique inputs and original-position mapping
+    """
+    result = DedupedTexts()
+    index: Dict[str, int] = {}
+    for text in texts:
+        key = normalize_text(text)
+        if not key:
+            result.positions.append(None)
+            continue
+        pos = index.get(key)
+        if pos is None:
+            pos = index[key] = len(result.unique)
+            result.unique.append(key)
+        result.positions.append(pos)
+    return result
+
+
+def length_sorted_order(lengths: List[int]) -> List[int]:
+    """Indices ordered by descending length (longest batches first, so
+    memory failures surface on the first batch rather than the last)"""
+    return sorted(range(len(lengths)), key=lambda i: -lengths[i])
+
+
+def token_budget_batch_size(longest: int, max_batch_tokens: int, max_batch_size: int) -> int:
+    """
+    Number of sentences that fit a padded-token budget.
+
+    With inputs sorted by descending length, the first sentence of a batch
+    is its longest, so ``count * longest`` is the padded batch size.
+
+    Args:
+        longest: Token length of the batch's longest sentence
+        max_batch_tokens: Padded-token budget per batch
+        max_batch_size: Upper bound on sentences per batch
+
+    Returns:
+        Batch size (at least 1)
+    """
+    return max(1, min(max_batch_size, max_batch_tokens // max(longest, 1)))
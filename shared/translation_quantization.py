@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+CPU int8 inference for the translation models (IndicTrans2, NLLB)
+
+Handles:
+- Resolving the per-job TRANSLATION_COMPUTE_TYPE (float32 | int8)
+- CTranslate2 int8 conversion, done once and cached under .cache/ct2
+  next to the HuggingFace cache (NLLB/M2M100 architectures)
+- PyTorch dynamic int8 quantization of nn.Linear layers as the fallback
+  (IndicTrans2's custom architecture, or CTranslate2 not installed)
+- A parity check of the int8 path against fp32 on a fixed reference set
+  per language pair; results are cached per model, language pair and
+  compute type so later jobs skip the fp32 run (failures are re-checked
+  after PARITY_FAILURE_TTL or when the model changes)
+
+The CTranslate2 model is wrapped so it exposes the same ``generate()``
+call the translators already make on the HF model, so neither translator
+needs a second code path for decoding.
+
+Module: shared/translation_quantization.py
+"""
+
+# Standard library
+import difflib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Local
+from shared.logger import get_logger
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+COMPUTE_TYPES = ('float32', 'int8')
+DEFAULT_COMPUTE_TYPE = 'float32'
+PARITY_THRESHOLD = 0.85
+PARITY_SAMPLES = 8
+# A failed check disables int8; retry it after a week in case it was noise
+PARITY_FAILURE_TTL = 7 * 24 * 3600
+
+# Built-in parity references by source language (FLORES-200 codes). Other
+# source languages freeze the first job's sentences as the pair's set.
+PARITY_REFERENCE_TEXTS: Dict[str, List[str]] = {
+    'eng_Latn': [
+        "Where are you going this evening?",
+        "I have not seen my brother for three years.",
+        "The train was late because of the heavy rain.",
+        "Please close the door before you leave.",
+        "We will meet at the old temple tomorrow morning.",
+        "Nobody believed what she said about the money.",
+        "My mother cooks the best food in the whole village.",
+        "If you tell the truth, I will help you.",
+    ],
+    'hin_Deva': [
+        "आज शाम तुम कहाँ जा रहे हो?",
+        "मैंने तीन साल से अपने भाई को नहीं देखा।",
+        "भारी बारिश की वजह से ट्रेन देर से आई।",
+        "जाने से पहले दरवाज़ा बंद कर देना।",
+        "हम कल सुबह पुराने मंदिर पर मिलेंगे।",
+        "पैसों के बारे में उसकी बात पर किसी ने यक़ीन नहीं किया।",
+        "मेरी माँ पूरे गाँव में सबसे अच्छा खाना बनाती है।",
+        "अगर तुम सच बताओगे तो मैं तुम्हारी मदद करूँगा।",
+    ],
+}
+
+
+def resolve_compute_type(compute_type: Optional[str], device: str) -> str:
+    """
+    Resolve the requested translation compute type for a device.
+
+    int8 is a CPU optimization; on MPS/CUDA the fp32 (or fp16) HF path is
+    already faster, so int8 requests fall back to float32 there.
+
+    Args:
+        compute_type: Requested compute type (None/'' means default)
+        device: Device the translator runs on
+
+    Returns:
+        'int8' or 'float32'
+    """
+    requested = (compute_type or DEFAULT_COMPUTE_TYPE).strip().lower()
+    if requested not in COMPUTE_TYPES:
+        logger.warning(f"Unknown translation compute type '{compute_type}', using {DEFAULT_COMPUTE_TYPE}")
+        return DEFAULT_COMPUTE_TYPE
+    if requested == 'int8' and device != 'cpu':
+        logger.info(f"int8 translation is CPU-only; using float32 on {device}")
+        return DEFAULT_COMPUTE_TYPE
+    return requested
+
+
+def get_quantized_cache_dir(model_name: str) -> Path:
+    """
+    Get the cache directory for converted/quantized artifacts of a model.
+
+    Lives next to the HuggingFace cache (``.cache/ct2`` by default,
+    ``CT2_HOME`` overrides).
+    """
+    root = os.environ.get('CT2_HOME')
+    if not root:
+        hf_home = os.environ.get('HF_HOME')
+        base = Path(hf_home).parent if hf_home else PROJECT_ROOT / '.cache'
+        root = base / 'ct2'
+    return Path(root) / f"{model_name.replace('/', '--')}-int8"
+
+
+class CT2GenerateAdapter:
+    """
+    Wraps a CTranslate2 Translator behind the HF ``model.generate()`` call.
+
+    Accepts the tokenizer output the translators already build
+    (``input_ids``/``attention_mask`` tensors) and returns a padded
+    LongTensor of output ids, so ``tokenizer.batch_decode`` works as-is.
+    """
+
+    def __init__(self, translator: Any, tokenizer: Any):
+        self.translator = translator
+        self.tokenizer = tokenizer
+        self.dtype = 'int8'
+
+    def generate(
+        self,
+        input_ids: Any,
+        attention_mask: Optional[Any] = None,
+        forced_bos_token_id: Optional[int] = None,
+        num_beams: int = 4,
+        max_length: Optional[int] = None,
+        max_new_tokens: Optional[int] = None,
+        **_: Any
+    ) -> Any:
+        """Translate a batch; mirrors the subset of HF generate() used here"""
+        import torch
+
+        sources = []
+        for row, ids in enumerate(input_ids.tolist()):
+            if attention_mask is not None:
+                ids = [i for i, m in zip(ids, attention_mask[row].tolist()) if m]
+            sources.append(self.tokenizer.convert_ids_to_tokens(ids))
+
+        target_prefix = None
+        if forced_bos_token_id is not None:
+            bos = self.tokenizer.convert_ids_to_tokens(forced_bos_token_id)
+            target_prefix = [[bos]] * len(sources)
+
+        results = self.translator.translate_batch(
+            sources,
+            target_prefix=target_prefix,
+            beam_size=num_beams,
+            max_decoding_length=max_new_tokens or max_length or 256
+        )
+
+        outputs = [self.tokenizer.convert_tokens_to_ids(r.hypotheses[0]) for r in results]
+        pad_id = self.tokenizer.pad_token_id or 0
+        width = max((len(o) for o in outputs), default=0)
+        return torch.tensor([o + [pad_id] * (width - len(o)) for o in outputs], dtype=torch.long)
+
+    def to(self, *_: Any, **__: Any) -> 'CT2GenerateAdapter':
+        return self
+
+    def eval(self) -> 'CT2GenerateAdapter':
+        return self
+
+
+def _load_ct2(
+    model_name: str,
+    tokenizer: Any,
+    cache_dir: Path,
+    trust_remote_code: bool,
+    logger_instance: Any
+) -> Optional[CT2GenerateAdapter]:
+    """Load (converting once if needed) a CTranslate2 int8 model"""
+    try:
+        import ctranslate2
+    except ImportError:
+        return None
+
+    model_dir = cache_dir / 'ctranslate2'
+    if not (model_dir / 'model.bin').exists():
+        logger_instance.info(f"  Converting {model_name} to CTranslate2 int8 (one-time)...")
+        tmp_dir = cache_dir / 'ctranslate2.tmp'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        try:
+            converter = ctranslate2.converters.TransformersConverter(
+                model_name, trust_remote_code=trust_remote_code
+            )
+            converter.convert(str(tmp_dir), quantization='int8')
+            shutil.rmtree(model_dir, ignore_errors=True)
+            os.replace(tmp_dir, model_dir)
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            logger_instance.info(f"  CTranslate2 conversion not available for {model_name}: {e}")
+            return None
+
+    translator = ctranslate2.Translator(
+        str(model_dir), device='cpu', compute_type='int8',
+        intra_threads=os.cpu_count() or 0
+    )
+    return CT2GenerateAdapter(translator, tokenizer)
+
+
+def quantize_dynamic_int8(model: Any) -> Any:
+    """Dynamic int8 quantization of all nn.Linear layers (CPU only)"""
+    import torch
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_int8_model(
+    model_name: str,
+    tokenizer: Any,
+    load_fp32: Callable[[], Any],
+    trust_remote_code: bool = False,
+    allow_ct2: bool = True,
+    logger_instance: Optional[Any] = None
+) -> Tuple[Any, str]:
+    """
+    Load the int8 variant of a translation model.
+
+    Tries CTranslate2 first (converted once and cached), then dynamic
+    quantization of the fp32 model.
+
+    Args:
+        model_name: HF model name
+        tokenizer: Loaded HF tokenizer
+        load_fp32: Callable returning the fp32 HF model (only called if needed)
+        trust_remote_code: Passed to the converter
+        allow_ct2: Try CTranslate2 (False for models whose tokenizer cannot
+            map output ids through the source vocabulary, e.g. IndicTrans2)
+        logger_instance: Optional logger
+
+    Returns:
+        (model, backend) where backend is 'ctranslate2' or 'torch-dynamic'
+    """
+    log = logger_instance or logger
+    cache_dir = get_quantized_cache_dir(model_name)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    adapter = _load_ct2(model_name, tokenizer, cache_dir, trust_remote_code, log) if allow_ct2 else None
+    if adapter is not None:
+        log.info("  ✓ Using CTranslate2 int8 model")
+        return adapter, 'ctranslate2'
+
+    model = quantize_dynamic_int8(load_fp32())
+    model.eval()
+    log.info("  ✓ Using PyTorch dynamic int8 quantization")
+    return model, 'torch-dynamic'
+
+
+def _similarity(a: str, b: str) -> float:
+    """Character-level similarity in [0, 1] (1.0 for identical output)"""
+    if a == b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def _pair(source_lang: Optional[str], target_lang: Optional[str]) -> str:
+    return f"{source_lang or 'any'}-{target_lang or 'any'}"
+
+
+def get_parity_file(
+    model_name: str,
+    backend: str,
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+    compute_type: str = 'int8'
+) -> Path:
+    """Cached parity result of a (model, backend, compute type, language pair)"""
+    name = f"parity_{backend}_{compute_type}_{_pair(source_lang, target_lang)}.json"
+    return get_quantized_cache_dir(model_name) / name
+
+
+def _model_signature(model_name: str, backend: str) -> Optional[str]:
+    """Identity of the weights the check ran on (changes when the model does)"""
+    try:
+        if backend == 'ctranslate2':
+            st = (get_quantized_cache_dir(model_name) / 'ctranslate2' / 'model.bin').stat()
+            return f"{st.st_mtime_ns}:{st.st_size}"
+        hub = os.environ.get('HF_HUB_CACHE')
+        if not hub:
+            hf_home = os.environ.get('HF_HOME')
+            hub = Path(hf_home) / 'hub' if hf_home else Path.home() / '.cache' / 'huggingface' / 'hub'
+        ref = Path(hub) / f"models--{model_name.replace('/', '--')}" / 'refs' / 'main'
+        return ref.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+
+
+def _reference_set(
+    model_name: str,
+    source_lang: Optional[str],
+    target_lang: Optional[str],
+    job_texts: List[str]
+) -> List[str]:
+    """Fixed parity sentences for a language pair (built-in, or frozen on first use)"""
+    if source_lang in PARITY_REFERENCE_TEXTS:
+        return PARITY_REFERENCE_TEXTS[source_lang][:PARITY_SAMPLES]
+
+    reference_file = get_quantized_cache_dir(model_name) / f"reference_{_pair(source_lang, target_lang)}.json"
+    try:
+        with open(reference_file, 'r', encoding='utf-8') as f:
+            texts = json.load(f)
+        if isinstance(texts, list) and texts:
+            return texts[:PARITY_SAMPLES]
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    texts = [t for t in job_texts if t and t.strip()][:PARITY_SAMPLES]
+    if texts:
+        try:
+            reference_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(reference_file, 'w', encoding='utf-8') as f:
+                json.dump(texts, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning(f"  Could not store parity reference set: {e}")
+    return texts
+
+
+def check_parity(
+    model_name: str,
+    backend: str,
+    reference_texts: List[str],
+    translate_fp32: Callable[[List[str]], List[str]],
+    translate_int8: Callable[[List[str]], List[str]],
+    threshold: float = PARITY_THRESHOLD,
+    logger_instance: Optional[Any] = None,
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+    compute_type: str = 'int8'
+) -> Dict[str, Any]:
+    """
+    Compare int8 output against fp32 on a fixed reference set.
+
+    The reference set is PARITY_REFERENCE_TEXTS for the source language,
+    else the first job's sentences, frozen for the language pair. The
+    result is cached per (model, backend, compute type, language pair),
+    so the fp32 reference run happens once, not once per job. A passed
+    result holds until the model changes; a failed one is also re-checked
+    after PARITY_FAILURE_TTL.
+
+    Args:
+        model_name: HF model name
+        backend: 'ctranslate2' or 'torch-dynamic'
+        reference_texts: Job sentences (used only if the pair has no fixed set)
+        translate_fp32: Translates a list with the fp32 model
+        translate_int8: Translates a list with the int8 model
+        threshold: Minimum mean similarity to accept int8
+        logger_instance: Optional logger
+        source_lang: Source language code of the translator
+        target_lang: Target language code of the translator
+        compute_type: Quantized compute type being checked
+
+    Returns:
+        Dict with 'passed', 'score', 'samples', 'backend', 'checked_at'
+    """
+    log = logger_instance or logger
+    parity_file = get_parity_file(model_name, backend, source_lang, target_lang, compute_type)
+    signature = _model_signature(model_name, backend)
+
+    cached = cached_parity(model_name, backend, source_lang, target_lang, compute_type)
+    if (cached and cached.get('threshold') == threshold and cached.get('model_signature') == signature
+            and (cached.get('passed') or time.time() - cached.get('checked_ts', 0) < PARITY_FAILURE_TTL)):
+        return cached
+
+    texts = _reference_set(model_name, source_lang, target_lang, reference_texts)
+    if not texts:
+        return {'passed': True, 'score': None, 'samples': 0, 'backend': backend}
+
+    log.info(f"  Checking int8 parity against fp32 on {len(texts)} reference sentences...")
+    reference = translate_fp32(texts)
+    candidate = translate_int8(texts)
+    scores = [_similarity(r.strip(), c.strip()) for r, c in zip(reference, candidate)]
+    score = sum(scores) / len(scores)
+
+    result = {
+        'passed': score >= threshold,
+        'score': round(score, 4),
+        'threshold': threshold,
+        'samples': len(texts),
+        'backend': backend,
+        'compute_type': compute_type,
+        'language_pair': _pair(source_lang, target_lang),
+        'model_signature': signature,
+        'checked_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'checked_ts': time.time()
+    }
+    try:
+        parity_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(parity_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    except OSError as e:
+        log.warning(f"  Could not cache parity result: {e}")
+
+    if result['passed']:
+        log.info(f"  ✓ int8 parity {score:.3f} ≥ {threshold}")
+    else:
+        log.warning(f"  ⚠️  int8 parity {score:.3f} < {threshold}, falling back to float32")
+    return result
+
+
+def cached_parity(
+    model_name: str,
+    backend: str,
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+    compute_type: str = 'int8'
+) -> Optional[Dict[str, Any]]:
+    """Get a previously cached parity result, or None"""
+    parity_file = get_parity_file(model_name, backend, source_lang, target_lang, compute_type)
+    try:
+        with open(parity_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,136 @@
+"""
+Unit tests for the per-media ASR context (language ID + bias prompt reuse).
+"""
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from whisperx_module.asr_context import (
+    MediaASRContext,
+    load_speech_regions,
+    select_probe_regions,
+)
+
+
+class FakeBackend:
+    """Backend stub counting detector and tokenizer calls."""
+
+    def __init__(self, language="hi"):
+        self.language = language
+        self.detect_calls = 0
+        self.encode_calls = 0
+
+    def detect_language(self, audio):
+        self.detect_calls += 1
+        return self.language
+
+    def encode_prompt(self, text):
+        self.encode_calls += 1
+        return list(range(len(text.split(","))))
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    """Write 60s of 16 kHz noise to a wav file."""
+    sf = pytest.importorskip("soundfile")
+    path = tmp_path / "audio.wav"
+    sf.write(str(path), np.random.default_rng(0).normal(0, 0.1, 16000 * 60).astype(np.float32), 16000)
+    return path
+
+
+class TestProbeRegions:
+    """Test probe region selection."""
+
+    def test_longest_region_per_part(self):
+        regions = [(0, 3), (5, 20), (31, 33), (35, 50), (70, 90)]
+        probes = select_probe_regions(regions, max_regions=3)
+        assert probes == [(5, 20), (35, 50), (70, 90)]
+
+    def test_probes_capped_to_probe_length(self):
+        probes = select_probe_regions([(10, 200)], probe_seconds=30)
+        assert probes == [(10, 40)]
+
+    def test_fallback_without_vad(self):
+        probes = select_probe_regions([], duration=600, max_regions=3, probe_seconds=30)
+        assert len(probes) == 3
+        assert all(end - start == 30 for start, end in probes)
+
+    def test_no_regions_no_duration(self):
+        assert select_probe_regions([], duration=None) == []
+
+    def test_load_speech_regions(self, tmp_path):
+        vad_file = tmp_path / "speech_segments.json"
+        vad_file.write_text(json.dumps({"segments": [
+            {"start": 1.0, "end": 4.0}, {"start": 5.0, "end": 5.0}, {"bad": 1}
+        ]}))
+        assert load_speech_regions(vad_file) == [(1.0, 4.0)]
+        assert load_speech_regions(tmp_path / "missing.json") == []
+
+
+class TestLanguageResolution:
+    """Test one-time language identification."""
+
+    def test_explicit_language_untouched(self, audio_file):
+        backend = FakeBackend()
+        context = MediaASRContext(str(audio_file), duration=60.0)
+        assert context.resolve_language(backend, "en") == "en"
+        assert backend.detect_calls == 0
+
+    def test_detects_once_per_media(self, audio_file):
+        backend = FakeBackend("hi")
+        context = MediaASRContext(str(audio_file), speech_regions=[(0, 10), (25, 35), (45, 55)])
+        assert context.resolve_language(backend, "auto") == "hi"
+        calls = backend.detect_calls
+        assert calls == 3
+        # Every later window reuses the cached result
+        for _ in range(10):
+            assert context.resolve_language(backend, "auto") == "hi"
+        assert backend.detect_calls == calls
+
+    def test_backend_without_detector_keeps_auto(self, audio_file):
+        context = MediaASRContext(str(audio_file), duration=60.0)
+        assert context.resolve_language(SimpleNamespace(), "auto") == "auto"
+
+
+class TestBiasPrompts:
+    """Test bias prompt construction and reuse."""
+
+    def test_identical_windows_share_prompt(self):
+        backend = FakeBackend()
+        context = MediaASRContext("audio.wav")
+        windows = [SimpleNamespace(bias_terms=["Jai", "Veeru"]) for _ in range(20)]
+        prompts = [context.window_prompt(w, backend) for w in windows]
+        assert all(p is prompts[0] for p in prompts)
+        assert prompts[0].text == "Jai, Veeru"
+        assert prompts[0].tokens == (0, 1)
+        assert backend.encode_calls == 1
+        assert context.stats()["distinct_prompts"] == 1
+
+    def test_accepts_generator_windows(self):
+        context = MediaASRContext("audio.wav")
+        prompt = context.window_prompt(SimpleNamespace(terms=["Basanti"]))
+        assert prompt.text == "Basanti"
+        assert prompt.tokens is None
+
+    def test_global_prompt_dedupes_in_order(self):
+        context = MediaASRContext("audio.wav")
+        windows = [SimpleNamespace(bias_terms=["A", "B"]), SimpleNamespace(bias_terms=["B", "C"])]
+        assert context.global_prompt(windows).terms == ("A", "B", "C")
+
+    def test_empty_terms_no_prompt(self):
+        context = MediaASRContext("audio.wav")
+        assert context.window_prompt(SimpleNamespace(bias_terms=[])) is None
+        assert context.global_prompt(None) is None
+
+    def test_prompt_trimmed_to_token_budget(self):
+        context = MediaASRContext("audio.wav", max_prompt_tokens=5)
+        prompt = context.get_prompt([f"term{i}" for i in range(20)], FakeBackend())
+        assert len(prompt.tokens) <= 5
+        assert prompt.terms == tuple(f"term{i}" for i in range(len(prompt.terms)))
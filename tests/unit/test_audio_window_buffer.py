@@ -0,0 +1,130 @@
+"""
+Unit tests for bounded-memory audio reads (PCMReader, AudioWindowBuffer)
+and long-media block planning.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from shared.audio_utils import PCMReader, AudioWindowBuffer
+from whisperx_module.asr_context import plan_stream_blocks
+
+sf = pytest.importorskip("soundfile")
+
+SR = 16000
+
+
+@pytest.fixture
+def pcm_wav(tmp_path):
+    """Write 100s of 16 kHz mono PCM16 (the demux output format)."""
+    samples = np.random.default_rng(0).uniform(-0.5, 0.5, SR * 100).astype(np.float32)
+    path = tmp_path / "audio.wav"
+    sf.write(str(path), samples, SR, subtype="PCM_16")
+    expected, _ = sf.read(str(path), dtype="float32")
+    return path, expected
+
+
+class TestPCMReader:
+    """Test memory-mapped windowed reads."""
+
+    def test_memory_mapped_read_matches_decode(self, pcm_wav):
+        path, expected = pcm_wav
+        with PCMReader(path) as reader:
+            assert reader.memory_mapped
+            assert reader.duration == pytest.approx(100.0)
+            np.testing.assert_allclose(reader.read(12.5, 20.0), expected[200000:320000], atol=1e-6)
+
+    def test_read_clamped_to_file_end(self, pcm_wav):
+        path, _ = pcm_wav
+        with PCMReader(path) as reader:
+            assert len(reader.read(99.0, 150.0)) == SR
+
+    def test_stereo_downmixed(self, tmp_path):
+        stereo = np.stack([np.full(SR, 0.5), np.full(SR, -0.25)], axis=1).astype(np.float32)
+        path = tmp_path / "stereo.wav"
+        sf.write(str(path), stereo, SR, subtype="FLOAT")
+        with PCMReader(path) as reader:
+            assert reader.memory_mapped
+            np.testing.assert_allclose(reader.read(0, 1), 0.125, atol=1e-6)
+
+    def test_non_wav_falls_back_to_decoder(self, tmp_path):
+        samples = np.linspace(-0.5, 0.5, SR * 3).astype(np.float32)
+        path = tmp_path / "audio.flac"
+        sf.write(str(path), samples, SR)
+        with PCMReader(path) as reader:
+            assert not reader.memory_mapped
+            assert len(reader.read(1.0, 2.0)) == SR
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            PCMReader(tmp_path / "missing.wav")
+
+
+class TestAudioWindowBuffer:
+    """Test the fixed-size sliding window buffer."""
+
+    def test_overlapping_windows_read_only_new_samples(self, pcm_wav):
+        path, expected = pcm_wav
+        buffer = AudioWindowBuffer(PCMReader(path), max_seconds=45)
+        allocated = buffer.nbytes
+        for start in range(0, 60, 15):
+            window = buffer.window(start, start + 45)
+            np.testing.assert_allclose(window, expected[start * SR:(start + 45) * SR], atol=1e-6)
+        assert buffer.nbytes == allocated
+        # 45s first window, then 15s of new audio per stride
+        assert buffer.samples_read == (45 + 3 * 15) * SR
+        assert buffer.samples_served == 4 * 45 * SR
+
+    def test_non_overlapping_and_backward_windows(self, pcm_wav):
+        path, expected = pcm_wav
+        buffer = AudioWindowBuffer(PCMReader(path), max_seconds=10)
+        np.testing.assert_allclose(buffer.window(50, 60), expected[50 * SR:60 * SR], atol=1e-6)
+        np.testing.assert_allclose(buffer.window(5, 12), expected[5 * SR:12 * SR], atol=1e-6)
+
+    def test_window_larger_than_buffer(self, pcm_wav):
+        path, _ = pcm_wav
+        buffer = AudioWindowBuffer(PCMReader(path), max_seconds=10)
+        with pytest.raises(ValueError):
+            buffer.window(0, 20)
+
+
+class TestPlanStreamBlocks:
+    """Test long-media block planning."""
+
+    def test_short_media_single_block(self):
+        assert plan_stream_blocks(300, 600) == [(0.0, 300)]
+
+    def test_blocks_cut_in_silence_gaps(self):
+        speech = [(0, 580), (584, 1170), (1174, 1500)]
+        blocks = plan_stream_blocks(1500, 600, speech)
+        assert blocks == [(0.0, 582.0), (582.0, 1172.0), (1172.0, 1500)]
+
+    def test_overlap_without_gaps(self):
+        blocks = plan_stream_blocks(1500, 600, overlap_seconds=1.0)
+        assert blocks == [(0.0, 600.0), (599.0, 1199.0), (1198.0, 1500)]
+        assert max(end - start for start, end in blocks) <= 600
+
+    def test_tiny_blocks_always_advance(self):
+        for block in (0.5, 1.0, 2.0):
+            blocks = plan_stream_blocks(10, block, overlap_seconds=1.0)
+            assert blocks[-1][1] == 10
+            assert all(b[0] < n[0] for b, n in zip(blocks, blocks[1:]))
+        with pytest.raises(ValueError):
+            plan_stream_blocks(10, 0)
+
+    def test_block_setting_validated(self):
+        import logging
+        from whisperx_integration import WhisperXProcessor
+        from whisperx_module.asr_context import MIN_STREAM_BLOCK_SECONDS
+        processor = object.__new__(WhisperXProcessor)
+        processor.logger = logging.getLogger("test")
+        assert processor._stream_block_seconds("1") == MIN_STREAM_BLOCK_SECONDS
+        assert processor._stream_block_seconds("0") == 0
+        assert processor._stream_block_seconds("900") == 900
+        assert processor._stream_block_seconds("ten") == 600
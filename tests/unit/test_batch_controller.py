@@ -0,0 +1,197 @@
+"""
+Unit tests for the adaptive batch-size controller.
+"""
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.batch_controller import (
+    AdaptiveBatchController,
+    get_learned_batch_size,
+    is_out_of_memory,
+    tuning_key,
+)
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    """Hardware cache with unrelated content that must be preserved."""
+    path = tmp_path / "hardware_cache.json"
+    path.write_text(json.dumps({"version": "1.0", "hardware": {"has_mps": False}}))
+    return path
+
+
+def make_controller(cache_file, **kwargs):
+    controller = AdaptiveBatchController("large-v3", "int8", cache_file=cache_file, **kwargs)
+    controller._under_memory_pressure = lambda: False
+    return controller
+
+
+def feed(controller, throughput_for_size, steps=10):
+    """Simulate chunks of 30s audio at a throughput that depends on batch size."""
+    for _ in range(steps):
+        size = controller.batch_size
+        controller.record(30.0, 30.0 / throughput_for_size(size), size)
+
+
+class TestProbing:
+    """Test growth until diminishing returns."""
+
+    def test_grows_then_settles_on_best(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=2)
+        # Throughput saturates at 8
+        feed(controller, lambda size: min(size, 8) * 10.0)
+        assert controller.converged
+        assert controller.batch_size == 8
+
+    def test_respects_max_batch_size(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=4, max_batch_size=16)
+        feed(controller, lambda size: size * 10.0)
+        assert controller.batch_size == 16
+
+    def test_first_measurement_is_warmup(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=4)
+        controller.record(30.0, 1.0)
+        assert controller.batch_size == 4
+        assert controller.stats()["throughput"] == {}
+
+    def test_short_batches_do_not_move_probe(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=16)
+        controller.record(300.0, 1.0, 16)
+        controller.record(300.0, 1.0, 16)
+        assert controller.batch_size == 32
+        controller.record(30.0, 1.0, 5)
+        assert controller.batch_size == 32
+        assert controller.stats()["throughput"]["5"] == 30.0
+
+    def test_disabled_controller_is_fixed(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=4, enabled=False)
+        feed(controller, lambda size: size * 10.0)
+        assert controller.batch_size == 4
+        assert not controller.can_back_off
+        assert controller.save() is False
+
+
+class TestBackoff:
+    """Test failure and memory-pressure back-off."""
+
+    def test_failure_backs_off_smoothly_and_caps_growth(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=16)
+        assert controller.on_failure(RuntimeError("OOM")) == 12
+        feed(controller, lambda size: size * 10.0)
+        assert controller.batch_size <= 15
+
+    def test_run_retries_with_smaller_batch(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=16)
+        sizes = []
+
+        def transcribe(size):
+            sizes.append(size)
+            if size > 8:
+                raise RuntimeError("out of memory")
+            return {"segments": []}
+
+        assert controller.run(transcribe, work=30.0) == {"segments": []}
+        assert sizes == [16, 12, 9, 6]
+
+    def test_non_oom_errors_raise_without_back_off(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=16)
+        sizes = []
+
+        def transcribe(size):
+            sizes.append(size)
+            raise ValueError("could not decode window")
+
+        with pytest.raises(ValueError):
+            controller.run(transcribe, work=30.0)
+        assert sizes == [16]
+        assert controller.batch_size == 16 and not controller.converged
+        assert controller.save() is False
+        assert not controller.should_back_off(RuntimeError("cuDNN error: bad param"))
+
+    def test_oom_detection(self):
+        assert is_out_of_memory(MemoryError())
+        assert is_out_of_memory(RuntimeError("CUDA out of memory. Tried to allocate 2.00 GiB"))
+        assert is_out_of_memory(RuntimeError("MPS backend out of memory (MPS allocated: 9 GB)"))
+        assert not is_out_of_memory(RuntimeError("Expected all tensors to be on the same device"))
+        assert not is_out_of_memory(ValueError("out of memory"))
+
+    def test_run_raises_at_minimum(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=1)
+        with pytest.raises(RuntimeError):
+            controller.run(lambda size: (_ for _ in ()).throw(RuntimeError("boom")), work=1.0)
+
+    def test_memory_pressure_shrinks_batch(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=8)
+        controller._under_memory_pressure = lambda: True
+        controller.record(30.0, 1.0)
+        controller.record(30.0, 1.0)
+        assert controller.batch_size == 6
+        assert controller.converged
+
+    def test_memory_pressure_is_temporary_and_not_saved(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=2)
+        feed(controller, lambda size: min(size, 8) * 10.0)
+        assert controller.batch_size == 8
+
+        pressure = [True]
+        controller._under_memory_pressure = lambda: pressure[0]
+        controller.record(30.0, 1.0)
+        assert controller.batch_size == 6
+        assert controller.save()
+        assert get_learned_batch_size("large-v3", "int8", cache_file) == 8
+
+        pressure[0] = False
+        controller.record(30.0, 1.0)
+        assert controller.batch_size == 8
+
+
+class TestPersistence:
+    """Test learned optimum persistence in the hardware cache."""
+
+    def test_save_and_reload(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=2)
+        feed(controller, lambda size: min(size, 8) * 10.0)
+        assert controller.save()
+
+        data = json.loads(cache_file.read_text())
+        assert data["version"] == "1.0"
+        assert data["batch_tuning"][tuning_key("large-v3", "int8")]["batch_size"] == 8
+        assert get_learned_batch_size("large-v3", "int8", cache_file) == 8
+        assert get_learned_batch_size("large-v3", "float16", cache_file) is None
+
+        reloaded = make_controller(cache_file, initial_batch_size=2)
+        assert reloaded.learned
+        assert reloaded.converged
+        assert reloaded.batch_size == 8
+        # Nothing changed, so the cache is not rewritten
+        assert reloaded.save() is False
+
+    def test_settling_on_initial_size_does_not_rewrite(self, cache_file):
+        controller = make_controller(cache_file, initial_batch_size=8, max_batch_size=8)
+        feed(controller, lambda size: size * 10.0)
+        assert controller.converged and controller.batch_size == 8
+        assert controller.save() is False
+        assert "batch_tuning" not in json.loads(cache_file.read_text())
+
+    def test_save_keeps_other_keys_and_leaves_no_temp_files(self, cache_file):
+        for model in ("large-v3", "medium"):
+            controller = AdaptiveBatchController(model, "int8", cache_file=cache_file, initial_batch_size=16)
+            controller.on_failure(MemoryError())
+            assert controller.save()
+        tuning = json.loads(cache_file.read_text())["batch_tuning"]
+        assert {tuning_key("large-v3", "int8"), tuning_key("medium", "int8")} <= set(tuning)
+        assert not list(cache_file.parent.glob("*.tmp"))
+
+    def test_for_backend_disables_non_batching_backends(self, cache_file):
+        backend = SimpleNamespace(model_name="large-v3", compute_type="float16", device="mps")
+        controller = AdaptiveBatchController.for_backend(backend, 8)
+        assert not controller.enabled
+        backend.supports_batching = True
+        assert AdaptiveBatchController.for_backend(backend, 8).enabled
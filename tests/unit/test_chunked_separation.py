@@ -0,0 +1,169 @@
+"""
+Unit tests for chunked, resumable source separation.
+"""
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import chunked_separation
+from shared.chunked_separation import (
+    ChunkedSeparator,
+    plan_segments,
+    plan_selective_segments,
+    regions_from_envelope,
+    speech_flags,
+)
+
+SR = 16000
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SR)
+        wav.writeframes((samples * 32767).astype('<i2').tobytes())
+
+
+def read_wav(path):
+    with wave.open(str(path), 'rb') as wav:
+        return np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2') / 32767.0
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Halve the mix into vocals/accompaniment and count calls."""
+    calls = []
+
+    def separate(mix):
+        calls.append(len(mix))
+        return np.stack([mix * 0.5, mix * 0.5]).astype(np.float32)
+
+    monkeypatch.setattr(chunked_separation, '_MODEL', object())
+    monkeypatch.setattr(chunked_separation, '_separate_array', separate)
+    return calls
+
+
+@pytest.fixture
+def audio(tmp_path):
+    t = np.arange(int(10.5 * SR)) / SR
+    samples = (0.4 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    path = tmp_path / "audio.wav"
+    write_wav(path, samples)
+    return path, samples
+
+
+class TestPlanning:
+    """Test segment planning and speech gating."""
+
+    def test_segments_overlap_and_cover(self):
+        segments = plan_segments(10 * SR, SR, segment_seconds=4, overlap_seconds=1)
+        assert segments == [(0, 4 * SR), (3 * SR, 7 * SR), (6 * SR, 10 * SR)]
+
+    def test_short_remainder_folds_into_last(self):
+        segments = plan_segments(int(7.5 * SR), SR, segment_seconds=4, overlap_seconds=1)
+        assert segments[-1][1] == int(7.5 * SR)
+        assert all(end - start >= 1 * SR for start, end in segments)
+
+    def test_short_input_single_segment(self):
+        assert plan_segments(100, SR, 4, 1) == [(0, 100)]
+
+    def test_speech_flags(self):
+        segments = [(0, 4 * SR), (3 * SR, 7 * SR), (6 * SR, 10 * SR)]
+        assert speech_flags(segments, [(7.5, 8.0)], SR) == [False, False, True]
+        assert speech_flags(segments, None, SR) == [True, True, True]
+
+    def test_regions_from_envelope(self):
+        envelope = [-90, -20, -25, -90, -90, -30]
+        assert regions_from_envelope(envelope, 1.0) == [(1.0, 3.0), (5.0, 6.0)]
+
+
+class TestSeparation:
+    """Test separation, pass-through, cross-fade and resume."""
+
+    def test_assembled_output_is_seamless(self, tmp_path, audio, fake_model):
+        path, samples = audio
+        separator = ChunkedSeparator(path, tmp_path / "segments", "htdemucs",
+                                     segment_seconds=4, overlap_seconds=1, workers=1, device='cpu')
+        separator.run(tmp_path / "vocals.wav", tmp_path / "accompaniment.wav")
+
+        vocals = read_wav(tmp_path / "vocals.wav")
+        assert len(vocals) == len(samples)
+        np.testing.assert_allclose(vocals, samples * 0.5, atol=2e-4)
+        assert separator.stats['separated'] == len(separator.segments)
+        assert not (tmp_path / "segments").exists()
+
+    def test_non_speech_segments_pass_through(self, tmp_path, audio, fake_model):
+        path, samples = audio
+        separator = ChunkedSeparator(path, tmp_path / "segments", "htdemucs",
+                                     segment_seconds=4, overlap_seconds=1, workers=1, device='cpu',
+                                     speech_regions=[(0.5, 1.0)])
+        separator.run(tmp_path / "vocals.wav")
+
+        assert len(fake_model) == 1
+        vocals = read_wav(tmp_path / "vocals.wav")
+        np.testing.assert_allclose(vocals[:2 * SR], samples[:2 * SR] * 0.5, atol=2e-4)
+        np.testing.assert_allclose(vocals[-SR:], samples[-SR:], atol=2e-4)
+
+    def test_resume_reuses_checkpoints(self, tmp_path, audio, fake_model):
+        path, _ = audio
+        kwargs = dict(segment_seconds=4, overlap_seconds=1, workers=1, device='cpu')
+        first = ChunkedSeparator(path, tmp_path / "segments", "htdemucs", **kwargs)
+        first.run(tmp_path / "vocals.wav", keep_checkpoints=True)
+        separated = len(fake_model)
+
+        second = ChunkedSeparator(path, tmp_path / "segments", "htdemucs", **kwargs)
+        assert second.pending() == []
+        second.run(tmp_path / "vocals.wav")
+        assert len(fake_model) == separated
+        assert second.stats['resumed'] == len(second.segments)
+
+    def test_changed_plan_discards_checkpoints(self, tmp_path, audio, fake_model):
+        path, _ = audio
+        ChunkedSeparator(path, tmp_path / "segments", "htdemucs", segment_seconds=4,
+                         overlap_seconds=1, workers=1, device='cpu').run(
+            tmp_path / "vocals.wav", keep_checkpoints=True)
+        calls = len(fake_model)
+
+        ChunkedSeparator(path, tmp_path / "segments", "mdx_extra_q", segment_seconds=4,
+                         overlap_seconds=1, workers=1, device='cpu').run(tmp_path / "vocals.wav")
+        assert len(fake_model) == 2 * calls
+
+
+class TestSelectivePlan:
+    """Test separation limited to flagged windows."""
+
+    def test_runs_are_segmented_separately(self):
+        segments, flags = plan_selective_segments(
+            20 * SR, [False, True, True, False], window_seconds=5,
+            sample_rate=SR, segment_seconds=4, overlap_seconds=1
+        )
+        # Every boundary overlaps for the cross-fade
+        assert all(b[0] < a[1] for a, b in zip(segments, segments[1:]))
+        assert segments[0][0] == 0 and segments[-1][1] == 20 * SR
+        assert flags[0] is False and flags[-1] is False and any(flags)
+        # Separated segments stay inside the music run (plus one overlap)
+        separated = [seg for seg, flag in zip(segments, flags) if flag]
+        assert separated[0][0] == 4 * SR and separated[-1][1] == 15 * SR
+
+    def test_splices_separated_and_original(self, tmp_path, audio, fake_model):
+        path, samples = audio
+        segments, flags = plan_selective_segments(
+            len(samples), [False, True, False], window_seconds=4,
+            sample_rate=SR, segment_seconds=10, overlap_seconds=0.5
+        )
+        separator = ChunkedSeparator(path, tmp_path / "segments", "htdemucs", workers=1,
+                                     device='cpu', segments=segments, selected=flags)
+        separator.run(tmp_path / "vocals.wav")
+
+        vocals = read_wav(tmp_path / "vocals.wav")
+        assert len(fake_model) == 1
+        np.testing.assert_allclose(vocals[:3 * SR], samples[:3 * SR], atol=2e-4)
+        np.testing.assert_allclose(vocals[5 * SR:7 * SR], samples[5 * SR:7 * SR] * 0.5, atol=2e-4)
+        np.testing.assert_allclose(vocals[9 * SR:], samples[9 * SR:], atol=2e-4)
@@ -0,0 +1,94 @@
+"""
+Startup-time regression tests for the run-pipeline and prepare-job CLIs.
+
+Runs each CLI with `python -X importtime ... --help` in a fresh
+interpreter and checks that heavy modules stay lazy and that the project's
+own imports fit the budget (override with CLI_IMPORT_BUDGET_MS on slow
+machines).
+"""
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# Modules that must not load before a CLI does real work
+HEAVY_MODULES = ("numpy", "pydantic", "pydantic_settings", "pythonjsonlogger", "torch")
+
+# Cumulative import time (ms) of shared.* / scripts.* modules; measured
+# ~60ms (run-pipeline) and ~30ms (prepare-job) when introduced
+IMPORT_BUDGET_MS = {"run-pipeline.py": 120, "prepare-job.py": 70}
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(args: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """Top-level cumulative import times (us) and all imported modules."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    )
+    top_level: Dict[str, int] = {}
+    modules: List[str] = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(1)), match.group(2), match.group(3)
+        modules.append(name)
+        if len(indent) == 1:
+            top_level[name] = cumulative
+    return top_level, modules
+
+
+@pytest.mark.parametrize("script", sorted(IMPORT_BUDGET_MS))
+def test_cli_startup_imports(script):
+    top_level, modules = import_profile([f"scripts/{script}", "--help"])
+    assert modules, "no -X importtime output"
+
+    heavy = sorted({m for m in modules if m.split(".")[0] in HEAVY_MODULES})
+    assert not heavy, f"{script} imports heavy modules at startup: {heavy}"
+
+    budget_ms = float(os.environ.get("CLI_IMPORT_BUDGET_MS", IMPORT_BUDGET_MS[script]))
+    project_ms = sum(us for name, us in top_level.items() if name.startswith(("shared", "scripts"))) / 1000
+    assert project_ms <= budget_ms, f"{script} project imports took {project_ms:.0f}ms (budget {budget_ms:.0f}ms)"
+
+
+def test_pipeline_logger_does_not_build_pipeline_config(tmp_path):
+    code = (
+        "import sys; from pathlib import Path; "
+        "from shared.logger import PipelineLogger; "
+        f"PipelineLogger('pipeline', log_file=Path({str(tmp_path / 'p.log')!r})); "
+        "print(sorted(m for m in sys.modules if m.startswith(('pydantic', 'shared.pipeline_config'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_settings_parsed_once(tmp_path, monkeypatch):
+    from shared import config
+
+    env_file = tmp_path / ".job.env"
+    env_file.write_text("LOG_LEVEL=DEBUG\nLOG_ROOT=  # unset\n")
+    monkeypatch.setenv("CONFIG_PATH", str(env_file))
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    config.clear_config_cache()
+
+    assert config.get_setting("LOG_LEVEL") == "DEBUG"
+    assert config.get_setting("LOG_ROOT", "./logs") == "./logs"
+    env_file.write_text("LOG_LEVEL=ERROR\n")
+    assert config.get_setting("LOG_LEVEL") == "DEBUG"  # cached for the process
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+    assert config.get_setting("LOG_LEVEL") == "WARNING"  # environment wins
+
+    assert config.load_env_config(PROJECT_ROOT) is config.load_env_config(PROJECT_ROOT)
+    config.clear_config_cache()
@@ -0,0 +1,176 @@
+"""
+Unit tests for the single-decode demux analysis.
+"""
+import hashlib
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.demux_analysis import (
+    AudioAnalyzer,
+    load_analysis,
+    manifest_summary,
+    save_analysis,
+)
+
+SR = 16000
+
+
+def tone_then_silence(seconds_tone=3.0, seconds_silence=2.0, amplitude=0.5):
+    t = np.arange(int(seconds_tone * SR)) / SR
+    tone = amplitude * np.sin(2 * np.pi * 440 * t)
+    audio = np.concatenate([tone, np.zeros(int(seconds_silence * SR))])
+    return (audio * 32767).astype('<i2')
+
+
+def analyze(pcm, block=SR):
+    analyzer = AudioAnalyzer()
+    for start in range(0, len(pcm), block):
+        analyzer.update(pcm[start:start + block].tobytes())
+    return analyzer.result()
+
+
+@pytest.fixture
+def demuxed(tmp_path):
+    """A WAV plus its analysis, as the demux stage leaves them."""
+    pcm = tone_then_silence()
+    audio = tmp_path / "audio.wav"
+    with wave.open(str(audio), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SR)
+        wav.writeframes(pcm.tobytes())
+
+    analysis = analyze(pcm)
+    stat = audio.stat()
+    analysis.update({
+        'version': 1,
+        'media_id': 'abc123',
+        'audio': {'path': audio.name, 'size_bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns},
+    })
+    save_analysis(analysis, audio)
+    return audio, analysis
+
+
+class TestAudioAnalyzer:
+    """Test the streaming analysis."""
+
+    def test_duration_hash_and_loudness(self):
+        pcm = tone_then_silence()
+        result = analyze(pcm)
+        assert result['duration'] == pytest.approx(5.0)
+        assert result['pcm_sha256'] == hashlib.sha256(pcm.tobytes()).hexdigest()
+        # 0.5-amplitude sine over 3 of 5 seconds
+        expected_rms = 20 * np.log10(0.5 / np.sqrt(2) * np.sqrt(3 / 5))
+        assert result['loudness']['rms_dbfs'] == pytest.approx(expected_rms, abs=0.1)
+        assert result['loudness']['peak_dbfs'] == pytest.approx(20 * np.log10(0.5), abs=0.1)
+
+    def test_envelope_follows_signal(self):
+        result = analyze(tone_then_silence())
+        envelope = result['envelope']['rms_dbfs']
+        assert len(envelope) == 5
+        assert all(v > -10 for v in envelope[:3])
+        assert all(v <= -100 for v in envelope[3:])
+        assert result['energy_profile'][0] == 1.0
+        assert result['energy_profile'][-1] == 0.0
+
+    def test_block_size_does_not_change_result(self):
+        pcm = tone_then_silence(2.3, 0.4)
+        a = analyze(pcm, block=SR)
+        b = analyze(pcm, block=777)
+        assert a['envelope'] == b['envelope']
+        assert a['pcm_sha256'] == b['pcm_sha256']
+        assert a['features'] == b['features']
+
+    def test_features_shape(self):
+        features = analyze(tone_then_silence())['features']
+        assert set(features) >= {'duration', 'snr', 'speech_ratio', 'complexity', 'sample_rate'}
+        assert 0.0 <= features['complexity'] <= 1.0
+        assert 0.3 <= features['speech_ratio'] <= 1.0
+
+    def test_empty_stream(self):
+        result = AudioAnalyzer().result()
+        assert result['duration'] == 0.0
+        assert result['envelope']['rms_dbfs'] == []
+
+
+class TestAnalysisRecord:
+    """Test persistence, validation and consumers."""
+
+    def test_load_matches_saved(self, demuxed):
+        audio, analysis = demuxed
+        assert load_analysis(audio)['pcm_sha256'] == analysis['pcm_sha256']
+        summary = manifest_summary(analysis)
+        assert summary['media_id'] == 'abc123'
+        assert 'envelope' not in summary
+
+    def test_replaced_audio_invalidates(self, demuxed):
+        audio, _ = demuxed
+        with open(audio, 'ab') as f:
+            f.write(b'\x00\x00')
+        assert load_analysis(audio) is None
+
+    def test_missing_analysis(self, tmp_path):
+        assert load_analysis(tmp_path / "audio.wav") is None
+
+    def test_cost_estimator_uses_analysis(self, demuxed):
+        from shared.cost_estimator import CostEstimator
+        audio, analysis = demuxed
+        assert CostEstimator().get_audio_duration(audio) == analysis['duration']
+
+    def test_feature_extractor_uses_analysis(self, demuxed):
+        from shared.ml_features import extract_features
+        audio, analysis = demuxed
+        features = extract_features(audio)
+        assert features['snr'] == analysis['features']['snr']
+        assert features['complexity'] == analysis['features']['complexity']
+
+
+class TestMediaIdMemo:
+    """Test per-process media ID memoization."""
+
+    def test_computed_once_per_file_state(self, tmp_path, monkeypatch):
+        from shared import media_identity
+
+        calls = []
+        monkeypatch.setattr(media_identity, '_MEDIA_ID_CACHE', {})
+        monkeypatch.setattr(
+            media_identity, '_compute_media_id',
+            lambda path, duration: calls.append(path) or f"id{len(calls)}"
+        )
+        media = tmp_path / "movie.mp4"
+        media.write_bytes(b"x" * 10)
+
+        assert media_identity.compute_media_id(media) == "id1"
+        assert media_identity.compute_media_id(media) == "id1"
+        media.write_bytes(b"y" * 20)
+        assert media_identity.compute_media_id(media) == "id2"
+        assert len(calls) == 2
+
+    def test_sidecar_survives_process_memo(self, tmp_path, monkeypatch):
+        from shared import media_identity
+
+        calls = []
+        monkeypatch.setattr(media_identity, '_MEDIA_ID_CACHE', {})
+        monkeypatch.setattr(
+            media_identity, '_compute_media_id',
+            lambda path, duration: calls.append(path) or format(len(calls), '064x')
+        )
+        media = tmp_path / "movie.mp4"
+        media.write_bytes(b"x" * 10)
+
+        first = media_identity.compute_media_id(media)
+        assert media_identity.media_id_sidecar_path(media).exists()
+        monkeypatch.setattr(media_identity, '_MEDIA_ID_CACHE', {})
+        assert media_identity.compute_media_id(media) == first
+        assert len(calls) == 1
+
+        media.write_bytes(b"y" * 20)
+        assert media_identity.compute_media_id(media) != first
+        assert len(calls) == 2
@@ -0,0 +1,77 @@
+"""
+Unit tests for the compiled glossary phrase index.
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.glossary_index import GlossaryIndex, merge_sources, normalize_phrase
+from shared.glossary_manager import UnifiedGlossaryManager
+
+SOURCES = {
+    'master': {'yaar': 'dude', 'bhai': 'bro', 'Aamir': 'master_aamir'},
+    'tmdb': {'Aamir Khan': 'Aamir Khan', 'Rancho': 'Rancho'},
+    'film': {'all is well': 'All is well'},
+    'learned': {'bhai': 'brother'},
+}
+
+
+class TestIndex:
+    """Test merging, matching and serialization."""
+
+    def test_normalized_priority_merge(self):
+        entries = merge_sources({'master': {'Yaar': 'dude'}, 'film': {'yaar': 'buddy'}})
+        assert normalize_phrase("Aamir  Khan!") == ('aamir', 'khan')
+        assert entries == {('yaar',): ('buddy', 'film')}
+
+    def test_longest_phrase_wins_and_punctuation_kept(self):
+        index = GlossaryIndex.build(SOURCES)
+        text, hits = index.apply("Yaar, aamir khan said: all is well!  Bhai?")
+        assert text == "Dude, Aamir Khan said: All is well!  Bro?"
+        assert hits['master'] == 2 and hits['tmdb'] == 1 and hits['film'] == 1
+        assert hits['misses'] == 1
+
+    def test_no_match_across_sentences_or_inside_words(self):
+        index = GlossaryIndex.build(SOURCES)
+        text, _ = index.apply("Aamir. Khan is yaarana")
+        assert text == "Master_aamir. Khan is yaarana"
+
+    def test_devanagari_tokens(self):
+        index = GlossaryIndex.build({'master': {'यार': 'dude'}})
+        assert index.apply("अरे यार!")[0] == "अरे dude!"
+
+    def test_serialized_by_content_hash(self, tmp_path):
+        first = GlossaryIndex.load_or_build(SOURCES, tmp_path)
+        files = list(tmp_path.glob("*.json"))
+        assert len(files) == 1
+        loaded = GlossaryIndex.load(files[0], first.digest)
+        assert loaded.trie == first.trie
+        assert GlossaryIndex.load_or_build(SOURCES, tmp_path).digest == first.digest
+
+        changed = dict(SOURCES, film={'all is well': 'Everything is fine'})
+        GlossaryIndex.load_or_build(changed, tmp_path)
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+class TestManager:
+    """Test bulk application through UnifiedGlossaryManager."""
+
+    def test_apply_to_segments(self, tmp_path):
+        glossary_dir = tmp_path / "glossary"
+        glossary_dir.mkdir()
+        (glossary_dir / "hinglish_master.tsv").write_text(
+            "source\tpreferred_english\tnotes\tcontext\n"
+            "yaar\tdude|man\tTest\tcasual\n"
+            "kya baat hai\twhat a thing\tTest\tcasual\n",
+            encoding='utf-8',
+        )
+        manager = UnifiedGlossaryManager(tmp_path, enable_cache=False, index_dir=tmp_path / "index")
+        manager.load_all_sources()
+
+        segments = [{'text': "Kya baat hai, yaar!"}, {'text': "Nothing here"}, {'start': 1.0}]
+        assert manager.apply_to_segments(segments) == 1
+        assert segments[0]['text'] == "What a thing, dude!"
+        assert manager.stats['master_hits'] == 2
+        assert manager.apply_to_text("hey yaar") == "hey dude"
@@ -0,0 +1,157 @@
+"""
+Unit tests for the per-job config snapshot (shared/job_config.py).
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import config as shared_config
+from shared import config_loader
+from shared.job_config import (
+    JOB_CONFIG_ENV,
+    SNAPSHOT_FILE,
+    JobConfigSnapshot,
+    load_job_config,
+    read_env_file,
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Project root with .env.pipeline/secrets.json and one prepared job."""
+    root = tmp_path / "project"
+    (root / "config").mkdir(parents=True)
+    (root / "config" / ".env.pipeline").write_text(
+        "# system\nLOG_LEVEL=info\nWHISPER_BATCH_SIZE=16\nPYANNOTE_VAD_THRESHOLD=0.5  # default\nTMDB_ENABLED=true\n"
+    )
+    (root / "config" / "secrets.json").write_text("{}")
+    job = tmp_path / "job"
+    job.mkdir()
+    (job / "job.json").write_text(json.dumps({
+        "job_id": "job-1", "workflow": "subtitle", "vad": {"threshold": 0.7}
+    }))
+    (job / ".job-1.env").write_text("LOG_LEVEL=debug\nWHISPER_BATCH_SIZE=8\n")
+    return root, job
+
+
+@pytest.fixture(autouse=True)
+def clean_caches(monkeypatch):
+    monkeypatch.delenv(JOB_CONFIG_ENV, raising=False)
+    shared_config.clear_config_cache()
+    config_loader.clear_config_cache()
+    yield
+    shared_config.clear_config_cache()
+    config_loader.clear_config_cache()
+
+
+class TestResolve:
+    """Test layering, persistence and staleness."""
+
+    def test_layers(self, project):
+        root, job = project
+        snapshot = JobConfigSnapshot.resolve(job, root, environ={"CPWHISPERX_WHISPER_BATCH_SIZE": "4", "HOME": "/x"},
+                                             defaults={"COMPUTE_TYPE": "int8", "LOG_LEVEL": "warning"})
+        assert snapshot.get("COMPUTE_TYPE") == "int8"
+        assert snapshot.get("TMDB_ENABLED") == "true"
+        assert snapshot.get("LOG_LEVEL") == "debug"
+        assert snapshot.get("PYANNOTE_VAD_THRESHOLD") == "0.5"
+        assert snapshot.get_int("WHISPER_BATCH_SIZE") == 4
+        assert "HOME" not in snapshot.settings
+        assert dict(snapshot.sources) == {"COMPUTE_TYPE": "default", "LOG_LEVEL": "job", "WHISPER_BATCH_SIZE": "env",
+                                          "PYANNOTE_VAD_THRESHOLD": "system", "TMDB_ENABLED": "system"}
+
+    def test_env_only_known_settings(self, project):
+        root, job = project
+        environ = {"CPWHISPERX_TITLE": "Env Title", "CPWHISPERX_PYANNOTE_VAD_WORKERS": "3",
+                   "CPWHISPERX_NOT_A_SETTING": "x",
+                   # Plain shell variables never override a job
+                   "LOG_LEVEL": "error", "USER_ID": "7", "DEVICE": "cuda"}
+        snapshot = JobConfigSnapshot.resolve(job, root, environ=environ, defaults={})
+        assert snapshot.get("TITLE") == "Env Title" and snapshot.sources["TITLE"] == "env"
+        assert snapshot.param("vad", "workers", "PYANNOTE_VAD_WORKERS", 1, int) == 3
+        assert "NOT_A_SETTING" not in snapshot.settings
+        assert snapshot.get("LOG_LEVEL") == "debug"
+        assert "USER_ID" not in snapshot.settings and "DEVICE" not in snapshot.settings
+
+        # Stage processes also take the orchestrator's per-stage exports
+        base = JobConfigSnapshot.resolve(job, root, environ={}, defaults={})
+        stage = base.with_env({"CPWHISPERX_TITLE": "Stage Title", "TITLE": "shell", "LOG_LEVEL": "INFO"})
+        assert stage.get("TITLE") == "Stage Title" and stage.get("LOG_LEVEL") == "INFO"
+
+    def test_env_file_values_keep_hashes(self, tmp_path):
+        env = tmp_path / ".env"
+        env.write_text(
+            "TOKEN=abc#123\nURL=http://host/page#frag  # the page\n"
+            "QUOTED=\"a # b\"  # note\nSINGLE='x#y'\nEMPTY= # nothing\nPLAIN=value # comment\n"
+        )
+        assert read_env_file(env) == {"TOKEN": "abc#123", "URL": "http://host/page#frag",
+                                      "QUOTED": "a # b", "SINGLE": "x#y", "EMPTY": "", "PLAIN": "value"}
+
+    def test_param_precedence(self, project):
+        root, job = project
+        snapshot = JobConfigSnapshot.resolve(job, root, environ={}, defaults={})
+        assert snapshot.param("vad", "threshold", "PYANNOTE_VAD_THRESHOLD", 0.1, float) == 0.7
+        assert snapshot.param("vad", "enabled", "TMDB_ENABLED", False, bool) is True
+        assert snapshot.param("vad", "workers", "PYANNOTE_VAD_WORKERS", 2, int) == 2
+
+        env = JobConfigSnapshot.resolve(job, root, environ={"CPWHISPERX_PYANNOTE_VAD_THRESHOLD": "0.9"}, defaults={})
+        assert env.param("vad", "threshold", "PYANNOTE_VAD_THRESHOLD", 0.1, float) == 0.9
+
+    def test_save_load_immutable_and_stale(self, project):
+        root, job = project
+        snapshot = JobConfigSnapshot.resolve(job, root, environ={}, defaults={})
+        path = snapshot.save()
+        assert path == job / SNAPSHOT_FILE
+        loaded = JobConfigSnapshot.load(path)
+        assert loaded.to_dict() == snapshot.to_dict()
+        assert loaded.section("vad")["threshold"] == 0.7
+        with pytest.raises(TypeError):
+            loaded.settings["LOG_LEVEL"] = "error"
+        with pytest.raises(TypeError):
+            loaded.section("vad")["threshold"] = 0.1
+        assert not loaded.is_stale()
+
+        (job / "job.json").write_text(json.dumps({"job_id": "job-1", "vad": {"threshold": 0.3, "workers": 2}}))
+        assert loaded.is_stale()
+        assert load_job_config(job).section("vad")["threshold"] == 0.3
+
+
+class TestLoaders:
+    """Both config loaders read the active snapshot."""
+
+    def test_loaders_agree(self, project, monkeypatch):
+        root, job = project
+        monkeypatch.delenv("LOG_LEVEL", raising=False)
+        monkeypatch.setenv("CONFIG_PATH", str(root / "config" / ".env.pipeline"))
+        snapshot = JobConfigSnapshot.resolve(job, root)
+        monkeypatch.setenv(JOB_CONFIG_ENV, str(snapshot.save()))
+
+        simple = config_loader.load_config(root)
+        pipeline = shared_config.load_config()
+        assert simple.get("LOG_LEVEL") == "debug" and pipeline.log_level == "debug"
+        assert simple.get("WHISPER_BATCH_SIZE") == 8 and pipeline.whisper_batch_size == 8
+        assert shared_config.load_config() is pipeline
+
+        # A stage's own environment still overrides
+        monkeypatch.setenv("CPWHISPERX_WHISPER_BATCH_SIZE", "2")
+        shared_config.clear_config_cache()
+        assert shared_config.load_config().whisper_batch_size == 2
+        assert load_job_config().sources["WHISPER_BATCH_SIZE"] == "env"
+
+        # Plain shell variables do not reach PipelineConfig either
+        monkeypatch.setenv("TITLE", "From Shell")
+        monkeypatch.setenv("USER_ID", "7")
+        shared_config.clear_config_cache()
+        pipeline = shared_config.load_config()
+        assert pipeline.title is None and pipeline.user_id == 1
+
+    def test_without_snapshot_unchanged(self, project, monkeypatch):
+        root, _ = project
+        assert JOB_CONFIG_ENV not in os.environ
+        assert config_loader.load_config(root).get("WHISPER_BATCH_SIZE") == 16
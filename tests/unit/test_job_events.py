@@ -0,0 +1,146 @@
+"""
+Unit tests for the per-job event stream and pipeline-status board.
+"""
+import importlib.util
+import json
+import sys
+import time
+from multiprocessing import Process
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.job_events import (
+    EVENTS_ENV, JOB_ENV, STAGE_ENV, EventStream, ProgressReporter, emit, events_path, read_events
+)
+
+
+def _load_status_tool():
+    spec = importlib.util.spec_from_file_location(
+        "pipeline_status", PROJECT_ROOT / "tools" / "pipeline-status.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def job_stream(tmp_path, monkeypatch):
+    path = events_path(tmp_path)
+    monkeypatch.setenv(EVENTS_ENV, str(path))
+    monkeypatch.setenv(JOB_ENV, "job-1")
+    monkeypatch.setenv(STAGE_ENV, "asr")
+    return path
+
+
+def _append_many(path: str, n: int) -> None:
+    stream = EventStream(Path(path), "job-1")
+    for i in range(n):
+        stream.emit("progress", "asr", done=i, padding="x" * 200)
+
+
+class TestEventStream:
+    """Test appending and reading events."""
+
+    def test_emit_uses_environment(self, job_stream):
+        record = emit("heartbeat", elapsed=1.0)
+        assert record["job_id"] == "job-1" and record["stage"] == "asr"
+        events, offset = read_events(job_stream)
+        assert events == [record] and offset == job_stream.stat().st_size
+
+    def test_noop_outside_pipeline(self, monkeypatch):
+        monkeypatch.delenv(EVENTS_ENV, raising=False)
+        assert emit("stage_start") is None
+
+    def test_partial_line_left_for_next_read(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text('{"event":"a"}\n{"event":"b"')
+        events, offset = read_events(path)
+        assert [e["event"] for e in events] == ["a"]
+        with open(path, "a") as f:
+            f.write('}\n')
+        events, _ = read_events(path, offset)
+        assert [e["event"] for e in events] == ["b"]
+
+    def test_concurrent_writers_do_not_interleave(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        procs = [Process(target=_append_many, args=(str(path), 200)) for _ in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        lines = path.read_text().splitlines()
+        assert len(lines) == 800
+        assert all(json.loads(line)["event"] == "progress" for line in lines)
+
+
+class TestProgress:
+    """Test RTF and ETA computation."""
+
+    def test_rtf_and_eta_from_audio(self, job_stream):
+        progress = ProgressReporter(total=4, unit="block", total_audio_seconds=400.0)
+        progress.started = time.time() - 10.0
+        record = progress.update(done=1, audio_seconds=100.0, force=True)
+        assert record["rtf"] == pytest.approx(0.1, rel=0.05)
+        assert record["eta_seconds"] == pytest.approx(30.0, rel=0.05)
+        assert record["done"] == 1 and record["total"] == 4
+
+    def test_throttled_until_finished(self, job_stream):
+        progress = ProgressReporter(total=3, min_interval=60.0)
+        assert progress.update() is not None
+        assert progress.update() is None
+        assert progress.update() is not None  # last unit always reported
+
+
+class TestStatusBoard:
+    """Test folding events into job status and ETAs."""
+
+    def _write(self, job_dir: Path, events):
+        job_dir.mkdir(parents=True)
+        with open(events_path(job_dir), "w") as f:
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+
+    def test_eta_from_progress_and_history(self, tmp_path):
+        status = _load_status_tool()
+        now = time.time()
+        # Finished job: asr took 60s and mux 10s for 600s of media
+        self._write(tmp_path / "done", [
+            {"ts": now - 100, "job_id": "done", "event": "job_start", "workflow": "transcribe"},
+            {"ts": now - 100, "event": "plan", "stages": ["asr", "mux"]},
+            {"ts": now - 99, "event": "media", "media_seconds": 600},
+            {"ts": now - 90, "event": "stage_end", "stage": "asr", "status": "completed", "duration": 60},
+            {"ts": now - 80, "event": "stage_end", "stage": "mux", "status": "completed", "duration": 10},
+            {"ts": now - 80, "event": "job_end", "status": "completed"},
+        ])
+        # Running job in asr, 20s left by its own progress; mux from history
+        self._write(tmp_path / "live", [
+            {"ts": now - 30, "job_id": "live", "event": "job_start", "workflow": "transcribe"},
+            {"ts": now - 30, "event": "plan", "stages": ["asr", "mux"]},
+            {"ts": now - 29, "event": "media", "media_seconds": 1200},
+            {"ts": now - 28, "event": "stage_start", "stage": "asr"},
+            {"ts": now, "event": "progress", "stage": "asr", "done": 2, "total": 4,
+             "unit": "block", "rtf": 0.1, "eta_seconds": 20.0},
+        ])
+        board = status.StatusBoard([tmp_path])
+        board.poll()
+        rows = {row["job_id"]: row for row in board.rows(now)}
+        live = rows["live"]
+        assert live["status"] == "running" and live["stage"] == "asr"
+        assert live["chunk"] == "2/4 block"
+        assert live["eta_seconds"] == pytest.approx(20.0 + 10 / 600 * 1200)
+        assert rows["done"]["status"] == "completed" and rows["done"]["eta_seconds"] == 0.0
+
+    def test_incremental_poll(self, tmp_path):
+        status = _load_status_tool()
+        stream = EventStream(events_path(tmp_path), "job-1")
+        stream.emit("job_start", workflow="subtitle")
+        board = status.StatusBoard([tmp_path])
+        assert len(board.poll()) == 1
+        stream.emit("stage_start", "demux")
+        new = board.poll()
+        assert [e["event"] for e in new] == ["stage_start"]
+        assert board.rows()[0]["stage"] == "demux"
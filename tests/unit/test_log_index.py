@@ -0,0 +1,118 @@
+"""
+Unit tests for JSON-lines log sidecars and the incremental log index.
+"""
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.job_events import JOB_ENV
+from shared.log_index import LogIndex
+from shared.logger import LOG_JSONL_ENV, PipelineLogger, setup_dual_logger
+
+
+def _close(logger: logging.Logger) -> None:
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = []
+
+
+def write_records(path: Path, records) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.fixture
+def job_dir(tmp_path):
+    job = tmp_path / "out" / "2025" / "01" / "01" / "u" / "1"
+    job.mkdir(parents=True)
+    (job / "job.json").write_text(json.dumps({"job_id": "job-1", "workflow": "subtitle"}))
+    return job
+
+
+class TestJsonLinesSidecar:
+    """Test the .log.jsonl written next to text logs."""
+
+    def test_stage_logger_writes_sidecar(self, job_dir, monkeypatch):
+        monkeypatch.setenv(JOB_ENV, "job-1")
+        stage_log = job_dir / "06_asr" / "stage.log"
+        log = setup_dual_logger("asr", stage_log, job_dir, log_level="DEBUG")
+        log.debug("decoding")
+        try:
+            raise ValueError("bad chunk")
+        except ValueError:
+            log.error("chunk failed", exc_info=True)
+        _close(log)
+
+        records = [json.loads(line) for line in (job_dir / "06_asr" / "stage.log.jsonl").read_text().splitlines()]
+        assert [r["level"] for r in records] == ["DEBUG", "ERROR"]
+        assert records[1]["error_class"] == "ValueError"
+        assert all(r["job_id"] == "job-1" and r["stage"] == "asr" for r in records)
+        assert stage_log.exists()
+
+    def test_pipeline_logger_extra_and_disable(self, job_dir, monkeypatch):
+        plog = PipelineLogger("pipeline", log_file=job_dir / "99_pipeline_20250101_000000.log")
+        plog.info("Stage asr: COMPLETED", extra={"stage": "asr", "duration": 12.5})
+        plog.error("Stage asr: EXCEPTION: RuntimeError: CUDA out of memory")
+        _close(plog.logger)
+        [sidecar] = job_dir.glob("99_pipeline_*.log.jsonl")  # setup_logger names the file itself
+        records = [json.loads(line) for line in sidecar.read_text().splitlines()]
+        assert records[0]["duration"] == 12.5 and records[0]["stage"] == "asr"
+        assert records[1]["error_class"] == "RuntimeError"
+
+        monkeypatch.setenv(LOG_JSONL_ENV, "false")
+        plog = PipelineLogger("demux", log_file=job_dir / "01_demux" / "stage.log")
+        plog.info("no sidecar")
+        _close(plog.logger)
+        assert not list((job_dir / "01_demux").glob("*.jsonl"))
+
+
+class TestLogIndex:
+    """Test incremental ingest and queries."""
+
+    def test_incremental_ingest_and_queries(self, job_dir, tmp_path):
+        pipeline_log = job_dir / "99_pipeline_x.log.jsonl"
+        stage_log = job_dir / "07_alignment" / "stage.log.jsonl"
+        write_records(pipeline_log, [
+            {"ts": 1.0, "level": "INFO", "msg": "Stage asr: COMPLETED", "stage": "asr", "duration": 30.0},
+            {"ts": 2.0, "level": "ERROR", "msg": "Stage alignment: FAILED", "stage": "alignment",
+             "duration": 4.0, "error_class": "StageFailed"},
+        ])
+        write_records(stage_log, [{"ts": 1.5, "level": "WARNING", "msg": "low confidence"}])
+
+        index = LogIndex(tmp_path / "index.db")
+        assert index.ingest([tmp_path / "out"]) == {"files": 2, "read": 2, "records": 3}
+        assert index.ingest([tmp_path / "out"])["read"] == 0
+
+        # Appended complete line is picked up; a partial line waits
+        write_records(stage_log, [{"ts": 3.0, "level": "ERROR", "msg": "KeyError: 'words'",
+                                   "error_class": "KeyError"}])
+        with open(stage_log, "a") as f:
+            f.write('{"ts": 4.0, "level": "ERR')
+        assert index.ingest([tmp_path / "out"])["records"] == 1
+
+        [job] = index.job_summaries()
+        assert job["job_id"] == "job-1" and job["workflow"] == "subtitle"
+        assert job["errors"] == 2 and job["warnings"] == 1
+        assert job["stages"] == ["alignment", "asr"]
+        assert {r["error_class"] for r in index.error_classes()} == {"StageFailed", "KeyError"}
+        durations = {r["stage"]: r["mean"] for r in index.stage_durations()}
+        assert durations == {"asr": 30.0, "alignment": 4.0}
+        assert index.recent("ERROR")[0]["error_class"] == "KeyError"
+
+    def test_truncated_file_reindexed(self, job_dir, tmp_path):
+        log = job_dir / "99_pipeline_x.log.jsonl"
+        write_records(log, [{"ts": 1.0, "level": "ERROR", "msg": "a"}, {"ts": 2.0, "level": "ERROR", "msg": "b"}])
+        index = LogIndex(tmp_path / "index.db")
+        index.ingest([tmp_path / "out"])
+        log.write_text(json.dumps({"ts": 3.0, "level": "INFO", "msg": "c"}) + "\n")
+        index.ingest([tmp_path / "out"])
+        assert index.level_counts() == {"INFO": 1}
+        assert index.job_summaries()[0]["errors"] == 0
@@ -0,0 +1,152 @@
+"""
+Unit tests for atomic, merged manifest writes (shared/manifest.py).
+"""
+import gc
+import importlib.util
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import shared.manifest as manifest_module
+from shared.manifest import ManifestWriter, PipelineManifest, StageManifest, write_json_atomic
+from shared.stage_utils import StageIO
+
+
+def read(path):
+    return json.loads(Path(path).read_text())
+
+
+def _load_orchestrator():
+    spec = importlib.util.spec_from_file_location("run_pipeline", PROJECT_ROOT / "scripts" / "run-pipeline.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestManifestWriter:
+    """Test atomic replace, debounce and merge."""
+
+    def test_atomic_write_leaves_no_temp_files(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        write_json_atomic(path, {"stages": {}, "output": tmp_path})
+        write_json_atomic(path, {"stages": {"a": {}}})
+        assert read(path) == {"stages": {"a": {}}}
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["manifest.json"]
+
+    def test_debounced_save_is_flushed(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        state = {"count": 0}
+        writer = ManifestWriter(path, lambda on_disk: dict(on_disk, **state), interval=60)
+        assert writer.save(force=True)
+        for count in range(1, 5):
+            state["count"] = count
+            assert not writer.save()
+        assert writer.writes == 1 and read(path)["count"] == 0
+        assert writer.flush()
+        assert writer.writes == 2 and read(path)["count"] == 4
+        assert not writer.flush()
+
+        fast = ManifestWriter(path, lambda on_disk: dict(on_disk, fast=True), interval=0.05)
+        fast.save(force=True)
+        fast.save()
+        time.sleep(0.3)
+        assert fast.writes == 2 and not fast.dirty
+
+    def test_exit_flush_does_not_keep_writers_alive(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        pending = ManifestWriter(path, lambda on_disk: {"pending": True}, interval=60)
+        pending.save(force=True)
+        pending.save()
+        dropped = ManifestWriter(tmp_path / "other.json", lambda on_disk: {}, interval=60)
+        assert dropped in manifest_module._LIVE_WRITERS
+        del dropped
+        gc.collect()
+        assert all(w.path.name != "other.json" for w in manifest_module._LIVE_WRITERS)
+
+        manifest_module._flush_live_writers()
+        assert pending.writes == 2 and not pending.dirty
+
+    def test_timer_flush_waits_for_owner_lock(self, tmp_path):
+        state = {"a": 0, "b": 0}
+        writer = ManifestWriter(tmp_path / "manifest.json", lambda on_disk: dict(state), interval=0.05)
+        writer.save(force=True)
+        with writer.lock:
+            state["a"] = 1
+            writer.save()
+            time.sleep(0.2)
+            state["b"] = 1
+        time.sleep(0.3)
+        assert read(tmp_path / "manifest.json") == {"a": 1, "b": 1}
+
+
+class TestConcurrentWriters:
+    """Stages and the orchestrator share one job manifest."""
+
+    def test_stage_manifests_keep_each_others_records(self, tmp_path):
+        first = StageManifest("demux", tmp_path)
+        second = StageManifest("tmdb", tmp_path)
+        with first:
+            with second:
+                pass
+        data = read(tmp_path / "manifest.json")
+        assert set(data["stages"]) == {"demux", "tmdb"}
+        assert data["stages"]["demux"]["status"] == "success"
+        assert sorted(data["pipeline"]["completed_stages"]) == ["demux", "tmdb"]
+
+    def test_orchestrator_stage_list_is_kept(self, tmp_path):
+        write_json_atomic(tmp_path / "manifest.json", {
+            "job_id": "job-1", "status": "running",
+            "stages": [{"name": "demux", "status": "running", "start_time": "t0"},
+                       {"name": "asr", "status": "pending"}],
+        })
+        stage = StageManifest("demux", tmp_path)
+        stage.add_metadata("duration", 12.5)
+        stage.finalize("success")
+
+        data = read(tmp_path / "manifest.json")
+        assert [s["name"] for s in data["stages"]] == ["demux", "asr"]
+        assert data["stages"][0]["start_time"] == "t0"
+        assert data["stages"][0]["metadata"] == {"duration": 12.5}
+        assert data["status"] == "running"
+        assert stage.data["stages"]["asr"]["status"] == "pending"
+
+    def test_pipeline_manifest_keeps_stage_records(self, tmp_path):
+        pipeline = PipelineManifest(tmp_path / "manifest.json")
+        pipeline.set_output_dir(str(tmp_path))
+        StageManifest("demux", tmp_path).finalize("success")
+        pipeline.set_pipeline_step("asr", True, completed=True)
+        pipeline.finalize()
+
+        data = read(tmp_path / "manifest.json")
+        assert set(data["stages"]) == {"demux", "asr"}
+        assert data["pipeline"]["status"] == "completed"
+        assert data["output_dir"] == str(tmp_path)
+
+    def test_stage_io_finalize_writes_once(self, tmp_path):
+        io = StageIO("asr", output_base=tmp_path, enable_manifest=True)
+        io.finalize("success", segments=3)
+        data = read(io.manifest.manifest_file)
+        assert io.manifest._writer.writes == 1
+        assert data["stages"]["asr"]["status"] == "success"
+        assert data["stages"]["asr"]["metadata"]["segments"] == 3
+
+    def test_orchestrator_merge_keeps_own_state(self, tmp_path):
+        module = _load_orchestrator()
+        pipeline = object.__new__(module.IndicTrans2Pipeline)
+        pipeline.manifest = {"job_id": "job-1", "status": "running",
+                             "stages": [{"name": "demux", "status": "pending"}]}
+        pipeline.manifest_writer = ManifestWriter(tmp_path / "manifest.json", pipeline._merge_manifest)
+        own = pipeline.manifest
+        StageManifest("tmdb", tmp_path).finalize("success")
+
+        pipeline._update_stage_status("demux", "completed", duration=1.5)
+        assert pipeline.manifest is own
+        assert [s["name"] for s in own["stages"]] == ["demux"]
+        data = read(tmp_path / "manifest.json")
+        assert [s["name"] for s in data["stages"]] == ["demux", "tmdb"]
+        assert data["stages"][0]["duration_seconds"] == 1.5
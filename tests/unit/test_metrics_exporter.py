@@ -0,0 +1,133 @@
+"""
+Unit tests for the Prometheus metrics exporter.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.cost_tracker import CostTracker
+from shared.job_events import EventStream, events_path
+from shared.metrics_exporter import MetricsCollector, MetricsRegistry, write_textfile
+
+
+def make_job(root: Path, name: str, status: str, stages, media_seconds=None, events=(), backend="mlx"):
+    job_dir = root / name
+    job_dir.mkdir(parents=True)
+    (job_dir / "job.json").write_text(json.dumps({"job_id": name}))
+    (job_dir / "manifest.json").write_text(json.dumps({"job_id": name, "status": status, "stages": stages}))
+    (job_dir / f".{name}.env").write_text(f"WHISPER_BACKEND={backend}\nWHISPER_MODEL=large-v3\n")
+    stream = EventStream(events_path(job_dir), name)
+    if media_seconds:
+        stream.emit("media", media_seconds=media_seconds)
+    for event, fields in events:
+        stream.emit(event, **fields)
+    return job_dir
+
+
+def sample(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not in metrics")
+
+
+class TestRegistry:
+    """Test the text exposition format."""
+
+    def test_render(self):
+        registry = MetricsRegistry(prefix="t")
+        registry.inc("runs_total", "Runs", stage="asr")
+        registry.inc("runs_total", "Runs", 2, stage="asr")
+        registry.set("queue_depth", "Queue", 3)
+        registry.observe("duration_seconds", "Durations", 7.0, buckets=(5, 10), stage='a"b')
+        text = registry.render()
+        assert '# TYPE t_runs_total counter' in text
+        assert 't_runs_total{stage="asr"} 3' in text
+        assert 't_queue_depth 3' in text
+        assert 't_duration_seconds_bucket{stage="a\\"b",le="5"} 0' in text
+        assert 't_duration_seconds_bucket{stage="a\\"b",le="+Inf"} 1' in text
+        assert 't_duration_seconds_sum{stage="a\\"b"} 7' in text
+
+    def test_textfile_atomic(self, tmp_path):
+        write_textfile(tmp_path / "m.prom", "a 1\n")
+        write_textfile(tmp_path / "m.prom", "a 2\n")
+        assert (tmp_path / "m.prom").read_text() == "a 2\n"
+        assert [p.name for p in tmp_path.iterdir()] == ["m.prom"]
+
+
+class TestCollector:
+    """Test metrics built from manifests, events and the cost ledger."""
+
+    @pytest.fixture
+    def fleet(self, tmp_path):
+        out = tmp_path / "out"
+        make_job(out, "job-1", "completed", [
+            {"name": "demux", "status": "completed", "duration_seconds": 10.0},
+            {"name": "asr", "status": "completed", "duration_seconds": 300.0,
+             "resources": {"cpu_seconds": 900.0}},
+        ], media_seconds=600.0, events=[
+            ("cache", {"cache": "baseline", "hits": 0, "misses": 1}),
+            ("cache", {"cache": "translation", "hits": 30, "misses": 70}),
+            ("throughput", {"kind": "translation", "model": "nllb", "tokens": 5000, "seconds": 50.0}),
+        ])
+        make_job(out, "job-2", "failed", {
+            "asr": {"status": "success", "duration_seconds": 120.0},
+            "alignment": {"status": "failed", "duration_seconds": 5.0},
+        }, media_seconds=400.0, backend="whisperx", events=[
+            ("cache", {"cache": "baseline", "hits": 1, "misses": 0}),
+        ])
+        make_job(out, "job-3", "prepared", [{"name": "demux", "status": "pending"}])
+
+        costs = tmp_path / "costs"
+        CostTracker(cost_storage_path=costs).log_usage("openai", "gpt-4o", 1000, 200, stage="summary")
+        return MetricsCollector([out], cost_storage_path=costs, cache_info=False)
+
+    def test_fleet_metrics(self, fleet):
+        text = fleet.collect().render()
+        assert sample(text, 'cpwhisperx_queue_depth') == 1
+        assert sample(text, 'cpwhisperx_jobs{status="failed"}') == 1
+        assert sample(text, 'cpwhisperx_stage_failures{stage="alignment"}') == 1
+        assert sample(text, 'cpwhisperx_stage_runs{stage="asr",status="completed"}') == 2
+        assert sample(text, 'cpwhisperx_stage_duration_seconds_count{stage="asr"}') == 2
+        assert sample(text, 'cpwhisperx_stage_cpu_seconds{stage="asr"}') == 900
+        # RTF per backend/model: 300/600 and 120/400
+        assert sample(text, 'cpwhisperx_asr_rtf_sum{backend="mlx",model="large-v3"}') == 0.5
+        assert sample(text, 'cpwhisperx_asr_rtf_sum{backend="whisperx",model="large-v3"}') == 0.3
+        assert sample(text, 'cpwhisperx_cache_hit_ratio{cache="baseline"}') == 0.5
+        assert sample(text, 'cpwhisperx_cache_hit_ratio{cache="translation"}') == 0.3
+        assert sample(text, 'cpwhisperx_translation_tokens{model="nllb"}') == 5000
+        assert sample(text, 'cpwhisperx_api_tokens{direction="input",model="gpt-4o",service="openai"}') == 1000
+        # Sums over jobs on disk can drop, so they are not exported as counters
+        assert '# TYPE cpwhisperx_stage_runs gauge' in text
+        assert '_total' not in text
+
+    def test_cache_info_reused_within_ttl(self, tmp_path, monkeypatch):
+        import shared.baseline_cache_orchestrator as orchestrator
+        calls = []
+
+        class FakeOrchestrator:
+            def __init__(self, root):
+                pass
+
+            def get_cache_info(self):
+                calls.append(1)
+                return {"total_size_bytes": 100 * len(calls), "cached_media_count": 1}
+
+        monkeypatch.setattr(orchestrator, "BaselineCacheOrchestrator", FakeOrchestrator)
+        collector = MetricsCollector([tmp_path], cost_storage_path=tmp_path / "costs", cache_info_ttl=60)
+        assert sample(collector.collect().render(), 'cpwhisperx_baseline_cache_size_bytes') == 100
+        assert sample(collector.collect().render(), 'cpwhisperx_baseline_cache_size_bytes') == 100
+        assert len(calls) == 1
+        collector.cache_info_ttl = 0
+        assert sample(collector.collect().render(), 'cpwhisperx_baseline_cache_size_bytes') == 200
+
+    def test_unchanged_jobs_not_reparsed(self, fleet, monkeypatch):
+        fleet.collect()
+        import shared.metrics_exporter as exporter
+        monkeypatch.setattr(exporter, "load_job", lambda job_dir: pytest.fail("re-parsed"))
+        fleet.collect()
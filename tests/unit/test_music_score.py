@@ -0,0 +1,77 @@
+"""
+Unit tests for the music/speech overlap score.
+"""
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.music_score import music_score, score_audio, select_windows
+
+SR = 16000
+rng = np.random.default_rng(0)
+
+
+def speech_like(seconds):
+    """Harmonic voice with moving pitch, syllable envelope and pauses."""
+    t = np.arange(int(seconds * SR)) / SR
+    f0 = 140 + 40 * np.sin(2 * np.pi * 0.7 * t) + 20 * np.sin(2 * np.pi * 3.1 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+    voice = sum(np.sin(k * phase) / k for k in range(1, 15))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    envelope[(t % 2.0) > 1.4] = 0
+    return (0.3 * voice * envelope + 0.003 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def music_like(seconds):
+    """Held two-note chords changing every second."""
+    t = np.arange(int(seconds * SR)) / SR
+    notes = [220, 277, 330, 247, 294, 370]
+    out = np.zeros_like(t)
+    for i in range(int(seconds)):
+        held = (t >= i) & (t < i + 1)
+        for f in (notes[i % 6], notes[(i + 2) % 6] * 1.5):
+            out[held] += sum(0.5 / k * np.sin(2 * np.pi * f * k * t[held]) for k in range(1, 6))
+    return (0.15 * out).astype(np.float32)
+
+
+class TestMusicScore:
+    """Test window scores on synthetic signals."""
+
+    def test_speech_alone_scores_low(self):
+        assert music_score(speech_like(5)) < 0.3
+
+    def test_music_under_dialogue_scores_high(self):
+        assert music_score(speech_like(5) + 0.3 * music_like(5)) > 0.7
+
+    def test_noise_and_silence_score_low(self):
+        assert music_score((0.05 * rng.standard_normal(5 * SR)).astype(np.float32)) < 0.2
+        assert music_score(np.zeros(5 * SR, dtype=np.float32)) == 0.0
+
+    def test_score_audio_streams_windows(self, tmp_path):
+        audio = np.concatenate([speech_like(10), speech_like(10) + 0.3 * music_like(10)])
+        path = tmp_path / "audio.wav"
+        with wave.open(str(path), 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SR)
+            wav.writeframes((np.clip(audio, -1, 1) * 32767).astype('<i2').tobytes())
+
+        scores = score_audio(path, window_seconds=5.0)
+        assert len(scores) == 4
+        assert select_windows(scores, 0.5, padding=0) == [False, False, True, True]
+
+
+class TestSelection:
+    """Test window selection."""
+
+    def test_padding_dilates_hits(self):
+        assert select_windows([0.1, 0.1, 0.9, 0.1, 0.1], padding=1) == [False, True, True, True, False]
+
+    def test_no_hits(self):
+        assert select_windows([0.1, 0.2], padding=2) == [False, False]
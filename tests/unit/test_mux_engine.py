@@ -0,0 +1,161 @@
+"""
+Unit tests for the subtitle mux engine.
+"""
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared import mux_engine
+from shared.mux_engine import (
+    ClipPlan,
+    SubtitleTrack,
+    build_mux_command,
+    keyframe_at_or_before,
+    mux_job,
+    output_container,
+    parse_timestamp,
+    partial_path,
+)
+
+
+@pytest.fixture
+def job(tmp_path):
+    source = tmp_path / "movie.mkv"
+    source.write_bytes(b"video" * 100)
+    subs = tmp_path / "subs"
+    subs.mkdir()
+    tracks = []
+    for lang in ("en", "hi"):
+        path = subs / f"movie.{lang}.srt"
+        path.write_text(f"1\n00:00:00,000 --> 00:00:01,000\n{lang}\n\n")
+        tracks.append(SubtitleTrack(path, lang))
+    out = tmp_path / "12_mux"
+    return source, tracks, [(out / "movie_subtitled.mp4", "mp4"), (out / "movie_subtitled.mkv", "mkv")]
+
+
+def fake_ffmpeg(calls):
+    """Record commands and create the partial outputs ffmpeg would write."""
+    def run(cmd, what):
+        calls.append(cmd)
+        for arg in cmd:
+            if arg.endswith(".partial"):
+                Path(arg).write_bytes(b"muxed")
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+    return run
+
+
+class TestHelpers:
+    """Test timestamp, container and keyframe helpers."""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("00:01:30", 90.0), ("01:00:00.5", 3600.5), ("2:03", 123.0), (12, 12.0), ("", None), (None, None),
+    ])
+    def test_parse_timestamp(self, value, expected):
+        assert parse_timestamp(value) == expected
+
+    def test_output_container(self):
+        assert output_container(Path("a.MP4")) == "mp4"
+        assert output_container(Path("a.webm")) == "mkv"
+        assert output_container(Path("a.avi")) == "mkv"
+
+    def test_keyframe_lookup_reads_only_the_window(self):
+        result = subprocess.CompletedProcess([], 0, "88.0\n92.5,\n95.0\n", "")
+        with patch.object(mux_engine.subprocess, "run", return_value=result) as run:
+            assert keyframe_at_or_before(Path("m.mkv"), 93.0) == 92.5
+        cmd = run.call_args[0][0]
+        assert cmd[cmd.index("-read_intervals") + 1] == "63.000%93.001"
+
+
+class TestCommand:
+    """Test ffmpeg command construction."""
+
+    def test_one_read_for_all_containers(self, job):
+        source, tracks, outputs = job
+        cmd = build_mux_command(source, tracks, outputs)
+        assert cmd.count(str(source)) == 1
+        assert cmd[-1] == str(partial_path(outputs[-1][0]))
+        mp4_part = cmd[:cmd.index(str(partial_path(outputs[0][0])))]
+        mkv_part = cmd[len(mp4_part):]
+        assert mp4_part.count("mov_text") == 2
+        assert "srt" in mkv_part and "mov_text" not in mkv_part
+        assert "language=hin" in cmd and "title=Hindi" in cmd
+        # Stream copy for everything but the subtitle encoders
+        assert cmd.count("-c") == 2 and cmd.count("copy") == 2
+
+    def test_keyframe_aligned_clip(self, job):
+        source, tracks, outputs = job
+        clip = ClipPlan(start=100.0, end=160.0, keyframe=97.5)
+        cmd = build_mux_command(source, tracks, outputs[:1], clip=clip)
+        # Input seek to the keyframe, before the source input
+        assert cmd.index("-ss") < cmd.index(str(source))
+        assert cmd[cmd.index("-ss") + 1] == "97.500"
+        # Subtitles (timed from the clip start) shifted by the preroll
+        assert cmd.count("-itsoffset") == 2
+        assert cmd[cmd.index("-itsoffset") + 1] == "2.500"
+        assert cmd[cmd.index("-t") + 1] == "62.500"
+
+    def test_keep_existing_subtitles(self, job):
+        source, tracks, outputs = job
+        cmd = build_mux_command(source, tracks[:1], outputs[1:], keep_subtitles=[1])
+        assert "0:s:1" in cmd
+        # The added track comes after the kept one and is not the default
+        assert cmd[cmd.index("-disposition:s:1") + 1] == "0"
+
+
+class TestMuxJob:
+    """Test skip / fast path / full remux decisions."""
+
+    def test_full_then_skip_then_attach(self, job):
+        source, tracks, outputs = job
+        calls = []
+        with patch.object(mux_engine, "_run", side_effect=fake_ffmpeg(calls)):
+            first = mux_job(source, tracks, outputs)
+            assert first["mode"] == "full"
+            assert all(path.exists() for path, _ in outputs)
+            assert str(source) in calls[-1]
+
+            assert mux_job(source, tracks, outputs)["mode"] == "skip"
+            assert len(calls) == 1
+
+            # New subtitle text: update from the existing MKV, not the source
+            tracks[1].path.write_text("1\n00:00:00,000 --> 00:00:01,000\nबदला\n\n")
+            third = mux_job(source, tracks, outputs)
+            assert third["mode"] == "attach"
+            assert str(source) not in calls[-1]
+            assert calls[-1][calls[-1].index("-i") + 1] == str(outputs[1][0])
+
+            # A different clip needs the source again
+            clip = ClipPlan(start=10.0, end=20.0, keyframe=9.0)
+            assert mux_job(source, tracks, outputs, clip=clip)["mode"] == "full"
+            assert mux_job(source, tracks, outputs, clip=clip, remux="always")["mode"] == "full"
+
+    def test_same_language_tracks_tracked_separately(self, job, tmp_path):
+        source, tracks, outputs = job
+        forced = tmp_path / "subs" / "movie.en.forced.srt"
+        forced.write_text("1\n00:00:00,000 --> 00:00:01,000\nforced\n\n")
+        tracks.append(SubtitleTrack(forced, "en"))
+        with patch.object(mux_engine, "_run", side_effect=fake_ffmpeg([])):
+            assert mux_job(source, tracks, outputs)["mode"] == "full"
+            # The first "en" track changes; the forced one does not
+            tracks[0].path.write_text("1\n00:00:00,000 --> 00:00:01,000\nchanged\n\n")
+            assert mux_job(source, tracks, outputs)["mode"] == "attach"
+
+    def test_failure_leaves_no_partial_files(self, job):
+        source, tracks, outputs = job
+
+        def failing(cmd, what):
+            for arg in cmd:
+                if arg.endswith(".partial"):
+                    Path(arg).write_bytes(b"half")
+            raise RuntimeError("ffmpeg mux failed (1): boom")
+
+        with patch.object(mux_engine, "_run", side_effect=failing):
+            with pytest.raises(RuntimeError):
+                mux_job(source, tracks, outputs)
+        assert not any(p.name.endswith(".partial") for p in outputs[0][0].parent.iterdir())
@@ -0,0 +1,139 @@
+"""
+Unit tests for per-job stage profiling and the profile aggregator.
+"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.profiling import PROFILE_ENV, ProfilingSettings, StackSampler, StageProfiler, profiled_stage
+from shared.stage_utils import StageIO
+
+
+def _load_aggregator():
+    spec = importlib.util.spec_from_file_location(
+        "aggregate_profiles", PROJECT_ROOT / "tools" / "aggregate-profiles.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def busy(seconds: float = 0.2) -> int:
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += sum(range(100))
+    return n
+
+
+class TestSettings:
+    """Test job.json / env settings resolution."""
+
+    def test_job_overrides_env(self):
+        settings = ProfilingSettings.from_job(
+            {"profiling": {"enabled": True, "stages": ["asr", "*translation*"]}},
+            {"PROFILING_ENABLED": "false", "PROFILING_MODE": "sampling"},
+        )
+        assert settings.enabled and settings.mode == "sampling"
+        assert settings.profiles("asr") and settings.profiles("hybrid_translation")
+        assert not settings.profiles("mux")
+
+    def test_disabled_and_all(self):
+        assert not ProfilingSettings.from_job({}, {}).profiles("asr")
+        assert ProfilingSettings(enabled=True).profiles("mux")
+
+    def test_env_round_trip(self):
+        settings = ProfilingSettings(enabled=True, stages=("asr",), tracemalloc_top=5)
+        assert ProfilingSettings.from_env({PROFILE_ENV: settings.to_env()}) == settings
+        assert ProfilingSettings.from_env({}) is None
+
+
+class TestProfilers:
+    """Test profile output files."""
+
+    def test_cprofile_and_tracemalloc(self, tmp_path):
+        profiler = StageProfiler(ProfilingSettings(enabled=True, tracemalloc_top=5), tmp_path, "p")
+        profiler.start()
+        blob = [bytearray(1000) for _ in range(100)]
+        busy(0.05)
+        files = profiler.stop()
+        assert Path(files["cprofile"]).exists()
+        sites = json.loads(Path(files["tracemalloc"]).read_text())
+        assert 0 < len(sites) <= 5 and {"site", "size_kb", "count"} <= set(sites[0])
+        del blob
+
+    def test_sampler_collapsed_format(self, tmp_path):
+        sampler = StackSampler(interval=0.005)
+        sampler.start()
+        busy()
+        sampler.stop()
+        sampler.write(tmp_path / "out.collapsed")
+        lines = (tmp_path / "out.collapsed").read_text().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0 and stack.startswith("thread ")
+        assert any("busy (" in line for line in lines)
+
+    def test_profiled_stage_exports_env(self, tmp_path):
+        settings = ProfilingSettings(enabled=True, stages=("asr",))
+        with profiled_stage(settings, "mux", tmp_path) as profiler:
+            assert profiler is None and PROFILE_ENV not in os.environ
+        with profiled_stage(settings, "asr", tmp_path):
+            assert ProfilingSettings.from_env() == settings
+        assert PROFILE_ENV not in os.environ
+        assert (tmp_path / "orchestrator_asr.prof").exists()
+
+    def test_stage_io_profiles_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(PROFILE_ENV, ProfilingSettings(enabled=True, mode="sampling").to_env())
+        # Stdlib sampler even where py-spy is installed
+        monkeypatch.setattr("shared.profiling.shutil.which", lambda name: None)
+        io = StageIO("asr", tmp_path, enable_manifest=True)
+        busy(0.1)
+        io.finalize(status="success")
+        files = io.manifest.metadata["profiling"]
+        assert Path(files["collapsed"]).parent == io.stage_dir
+
+    def test_stage_that_raises_still_writes_profile(self, tmp_path):
+        env = dict(os.environ, **{PROFILE_ENV: ProfilingSettings(enabled=True).to_env()})
+        code = (
+            "from shared.stage_utils import StageIO\n"
+            f"io = StageIO('asr', {str(tmp_path)!r})\n"
+            "raise RuntimeError('stage failed before finalize')"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 1
+        assert list(tmp_path.glob("*/profile_asr_*.prof"))
+
+
+class TestAggregator:
+    """Test merging profiles across jobs."""
+
+    def test_aggregate_jobs(self, tmp_path):
+        aggregate = _load_aggregator()
+        for job in ("job-1", "job-2"):
+            stage_dir = tmp_path / job / "06_asr"
+            profiler = StageProfiler(ProfilingSettings(enabled=True), stage_dir, "profile_asr")
+            profiler.start()
+            busy(0.02)
+            profiler.stop()
+            (stage_dir / "profile_asr.collapsed").write_text("thread main;main (a.py:1);work (a.py:9) 3\n")
+
+        aggregator = aggregate.ProfileAggregator()
+        for path in aggregator.find([tmp_path]):
+            aggregator.add(path)
+        report = aggregator.report(top=5)
+        assert report["jobs"] == 2
+        asr = report["stages"]["asr"]
+        assert asr["prof_files"] == 2 and asr["functions"]
+        assert asr["samples"] == 6
+        assert asr["stacks"]["self"][0] == {"frame": "work (a.py:9)", "samples": 6, "percent": 100.0}
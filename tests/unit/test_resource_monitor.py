@@ -0,0 +1,147 @@
+"""
+Unit tests for per-stage resource telemetry.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.manifest import StageManifest
+from shared.resource_monitor import ResourceMonitor, phase_timer, phase_times, reset_phases, with_phases
+from shared.stage_utils import StageIO
+
+BURN = "import time\nend = time.process_time() + 0.3\nwhile time.process_time() < end: pass"
+
+
+@pytest.fixture(autouse=True)
+def clean_phases():
+    reset_phases()
+    yield
+    reset_phases()
+
+
+class TestPhases:
+    """Test phase timing and the model load / compute split."""
+
+    def test_decorator_accumulates(self):
+        @phase_timer("model_load")
+        def load():
+            pass
+
+        load()
+        load()
+        assert set(phase_times()) == {"model_load"}
+
+    def test_split(self):
+        result = with_phases({'wall_seconds': 10.0}, {'model_load': 4.0, 'other': 1.0})
+        assert result['model_load_seconds'] == 4.0
+        assert result['compute_seconds'] == 6.0
+        assert result['phases'] == {'model_load': 4.0, 'other': 1.0}
+
+
+class TestMonitor:
+    """Test CPU, memory and I/O measurement."""
+
+    def test_child_cpu_counted(self):
+        with ResourceMonitor(interval=0.05) as monitor:
+            subprocess.run([sys.executable, "-c", BURN], check=True)
+        result = monitor.result
+        assert result['cpu_seconds'] >= 0.25
+        assert result['wall_seconds'] >= 0.3
+        assert result['lifetime_peak_rss_mb'] > 0
+
+    def test_sampled_tree_with_psutil(self, tmp_path):
+        pytest.importorskip("psutil")
+        script = f"open({str(tmp_path / 'out.bin')!r}, 'wb').write(b'x' * 4_000_000)\nimport time; time.sleep(0.3)"
+        with ResourceMonitor(interval=0.05) as monitor:
+            subprocess.run([sys.executable, "-c", script], check=True)
+        result = monitor.result
+        assert result['sampler'] == 'psutil'
+        assert result['samples'] > 2
+        assert 'write_bytes' in result
+
+    def test_earlier_peaks_not_charged(self, monkeypatch):
+        from shared import resource_monitor
+
+        monkeypatch.setitem(sys.modules, "psutil", None)
+        usage = {'self_user': 0.0, 'self_system': 0.0, 'child_user': 0.0, 'child_system': 0.0,
+                 'self_maxrss_mb': 80.0, 'child_maxrss_mb': 413.8}
+        monkeypatch.setattr(resource_monitor, '_rusage', lambda: dict(usage))
+        with ResourceMonitor() as monitor:
+            pass  # e.g. a sleep-only stage after a 400 MB one
+        assert 'peak_rss_mb' not in monitor.result
+        assert monitor.result['lifetime_peak_rss_mb'] == 413.8
+
+        with ResourceMonitor() as monitor:
+            usage['child_maxrss_mb'] = 512.0
+        assert monitor.result['peak_rss_mb'] == 512.0
+
+    def test_late_children_io_counted_from_zero(self, monkeypatch):
+        from types import SimpleNamespace
+
+        class Proc:
+            def __init__(self, pid, io):
+                self.pid, self.io = pid, io
+
+            def oneshot(self):
+                from contextlib import nullcontext
+                return nullcontext()
+
+            def create_time(self):
+                return 1.0
+
+            def memory_info(self):
+                return SimpleNamespace(rss=1_000_000)
+
+            def io_counters(self):
+                return SimpleNamespace(read_bytes=self.io[0], write_bytes=self.io[1])
+
+        root, child = Proc(1, (100, 100)), Proc(2, (50, 4000))
+        monitor = ResourceMonitor(interval=None)
+        monitor.interval = 60.0  # sample children, but no thread
+        monitor._start_wall, monitor._start_usage, monitor._root = 0.0, None, root
+        root.children = lambda recursive: []
+        monitor._sample()
+        monitor._baseline = False
+        root.io = (150, 100)
+        root.children = lambda recursive: [child]
+        monitor._sample()
+        result = monitor.stop()
+        assert result['read_bytes'] == 50 + 50
+        assert result['write_bytes'] == 4000
+
+    def test_without_psutil_falls_back_to_rusage(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "psutil", None)
+        with ResourceMonitor() as monitor:
+            pass
+        assert monitor.result['sampler'] == 'rusage'
+        assert 'read_bytes' not in monitor.result
+
+
+class TestManifests:
+    """Test resources written into the stage manifest."""
+
+    def test_stage_manifest_resources(self, tmp_path):
+        manifest = StageManifest("asr", tmp_path)
+        manifest.set_resources(cpu_seconds=1.5)
+        manifest.set_resources(peak_rss_mb=200.0)
+        manifest.save("success")
+        data = json.loads((tmp_path / "manifest.json").read_text())
+        assert data["stages"]["asr"]["resources"] == {'cpu_seconds': 1.5, 'peak_rss_mb': 200.0}
+
+    def test_stage_io_records_phases(self, tmp_path):
+        with phase_timer("model_load"):
+            pass  # an earlier in-process stage
+        io = StageIO("asr", tmp_path, enable_manifest=True)
+        assert phase_times() == {}
+        with phase_timer("model_load"):
+            pass
+        io.finalize(status="success")
+        resources = json.loads(io.resources_path.read_text())
+        assert 'model_load' in resources['phases']
+        assert io.manifest.resources['compute_seconds'] == resources['compute_seconds']
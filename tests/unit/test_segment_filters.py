@@ -0,0 +1,85 @@
+"""
+Unit tests for the hallucination and lyrics segment filters.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.segment_filters import (
+    classify_hallucinations,
+    classify_lyrics,
+    hallucination_rule,
+    lyrics_rule,
+)
+
+
+def segs(*texts, **extra):
+    return [dict(text=text, **extra) for text in texts]
+
+
+class TestHallucinationRules:
+    """Test per-segment hallucination rules."""
+
+    @pytest.mark.parametrize("text,rule", [
+        ("", 'empty'),
+        ("   ", 'empty'),
+        ("Thanks for watching!", 'thanks_for_watching'),
+        ("Please subscribe to the channel", 'subscribe'),
+        ("www.example.com", 'website'),
+        ("[Music]", 'annotation'),
+        ("[door slams]", 'annotation'),
+        ("ok", 'too_short'),
+        ("no no no no yes", 'word_repetition'),
+        ("I will meet you tomorrow", None),
+        ("He said thanks for watching", None),
+    ])
+    def test_rules(self, text, rule):
+        assert hallucination_rule(text) == rule
+
+    def test_loop_keeps_first_occurrence(self):
+        segments = segs("Where are you going?", "where are you going", "Where are you going?!", "Home.")
+        reasons, hits = classify_hallucinations(segments, loop_threshold=3)
+        assert reasons == [None, 'repeated_line', 'repeated_line', None]
+        assert hits == {'repeated_line': 2}
+
+    def test_short_runs_are_kept(self):
+        reasons, hits = classify_hallucinations(segs("Yes, sir.", "Yes, sir.", "Go."), loop_threshold=3)
+        assert reasons == [None, None, None]
+        assert not hits
+
+    def test_lyrics_are_never_flagged(self):
+        segments = segs("[Music]", "la la la la la", is_lyrics=True)
+        reasons, hits = classify_hallucinations(segments)
+        assert reasons == [None, None]
+
+
+class TestLyricsRules:
+    """Test per-segment and chorus lyrics rules."""
+
+    def test_phrase_and_repetition(self):
+        assert lyrics_rule("Sha la la, my love") == 'lyrics_phrase'
+        assert lyrics_rule("dil dil dil mera") == 'word_repetition'
+        assert lyrics_rule("Where is the car?") is None
+
+    def test_chorus_across_segments(self):
+        chorus = "tum hi ho meri aashiqui"
+        segments = segs(chorus, "ab tum hi ho", chorus, "chain bhi", "mera dard bhi", chorus, "Let's go.")
+        reasons, hits = classify_lyrics(segments, chorus_repeats=3)
+        assert [i for i, r in enumerate(reasons) if r == 'chorus'] == [0, 2, 5]
+        assert hits['chorus'] == 3
+        assert reasons[-1] is None
+
+    def test_consecutive_repeats_are_not_chorus(self):
+        line = "where are you going"
+        reasons, _ = classify_lyrics(segs(line, line, line), chorus_repeats=3)
+        assert reasons == [None, None, None]
+
+    def test_far_apart_repeats_are_not_chorus(self):
+        line = "i love you so much"
+        texts = [line] + [f"line {i} of dialogue" for i in range(20)] + [line, line]
+        reasons, _ = classify_lyrics(segs(*texts), chorus_repeats=3)
+        assert 'chorus' not in reasons
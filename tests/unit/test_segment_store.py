@@ -0,0 +1,118 @@
+"""
+Unit tests for columnar transcript sidecars (shared/segment_store.py).
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+pytest.importorskip("numpy")
+
+from shared.segment_store import (
+    LazySegment,
+    SegmentStore,
+    copy_segments,
+    json_default,
+    load_segments,
+    save_segments,
+    sidecar_path,
+)
+
+
+def make_transcript():
+    return {
+        "segments": [
+            {"start": 0.0, "end": 1.52, "text": "नमस्ते दुनिया", "id": 0, "speaker": "SPEAKER_00",
+             "words": [{"word": "नमस्ते", "start": 0.0, "end": 0.7, "score": 0.912},
+                       {"word": "दुनिया", "start": 0.8, "end": 1.52, "score": 0.5, "speaker": "SPEAKER_00"},
+                       {"word": "2"}]},
+            {"start": 2.125, "end": 3.0, "text": "no words"},
+            {"start": 3.5, "end": 4.0, "text": None, "words": []},
+        ],
+        "language": "hi",
+        "metadata": {"stage": "asr"},
+    }
+
+
+class TestSegmentStore:
+    """Test round trips and lazy access."""
+
+    def test_round_trip_is_exact(self, tmp_path):
+        data = make_transcript()
+        path = save_segments(tmp_path / "segments.json", data, sidecar=True)
+        assert sidecar_path(path).exists()
+        assert json.loads(path.read_text()) == data
+
+        loaded = load_segments(path)
+        assert list(loaded) == ["segments", "language", "metadata"]
+        assert isinstance(loaded["segments"][0], LazySegment)
+        assert [dict(s) for s in loaded["segments"]] == data["segments"]
+        assert load_segments(path, lazy=False) == data
+
+        save_segments(tmp_path / "list.json", data["segments"], sidecar=True)
+        assert load_segments(tmp_path / "list.json", lazy=False) == data["segments"]
+
+    def test_integer_numbers_keep_their_type(self, tmp_path):
+        segments = [{"start": 0, "end": 2.0, "text": "a", "big": 2 ** 60,
+                     "words": [{"word": "a", "start": 1, "end": 1.5, "score": 1}]}]
+        path = save_segments(tmp_path / "segments.json", segments, sidecar=True)
+        loaded = load_segments(path, lazy=False)
+        assert loaded == segments
+        segment, word = loaded[0], loaded[0]["words"][0]
+        assert [type(segment[k]) for k in ("start", "end", "big")] == [int, float, int]
+        assert [type(word[k]) for k in ("start", "end", "score")] == [int, float, int]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["segments.json", "segments.npz"]
+
+    def test_words_built_on_demand(self, tmp_path):
+        path = save_segments(tmp_path / "segments.json", make_transcript(), sidecar=True)
+        segment = load_segments(path)["segments"][0]
+        assert segment["text"] == "नमस्ते दुनिया"
+        assert "words" in segment and segment._words_pending()
+        assert segment["words"][1]["speaker"] == "SPEAKER_00"
+        assert not segment._words_pending()
+
+    def test_mutated_lazy_segments_resave(self, tmp_path):
+        path = save_segments(tmp_path / "segments.json", make_transcript(), sidecar=True)
+        data = load_segments(path)
+        data["segments"][1]["removed"] = True
+        copy = data["segments"][0].copy()
+        copy["text"] = "hello"
+        out = save_segments(tmp_path / "cleaned.json", {"segments": data["segments"], "removed": [copy]}, sidecar=True)
+
+        expected = make_transcript()["segments"]
+        expected[1]["removed"] = True
+        reloaded = load_segments(out, lazy=False)
+        assert reloaded["segments"] == expected == json.loads(out.read_text())["segments"]
+        assert reloaded["removed"][0]["text"] == "hello"
+
+    def test_json_rewritten_elsewhere_wins(self, tmp_path):
+        path = save_segments(tmp_path / "segments.json", make_transcript(), sidecar=True)
+        path.write_text(json.dumps({"segments": [{"start": 9.0, "end": 9.5, "text": "edited"}]}))
+        assert load_segments(path)["segments"][0]["text"] == "edited"
+
+        copied = copy_segments(save_segments(path, make_transcript(), sidecar=True), tmp_path / "copy.json")
+        assert SegmentStore.load(sidecar_path(copied)) is not None
+        assert isinstance(load_segments(copied)["segments"][0], LazySegment)
+
+    def test_json_stays_readable_and_plain_dicts_on_request(self, tmp_path):
+        path = save_segments(tmp_path / "segments.json", make_transcript(), sidecar=True)
+        assert sidecar_path(path).exists()
+        assert path.read_text().startswith('{\n  "segments"')
+
+        plain = load_segments(path, lazy=False)["segments"]
+        assert all(type(seg) is dict for seg in plain)
+        assert type(plain[0]["words"][0]) is dict
+        lazy = load_segments(path)["segments"]
+        assert json.loads(json.dumps(lazy, default=json_default)) == make_transcript()["segments"]
+
+    def test_disabled_writes_indented_json_only(self, tmp_path):
+        path = tmp_path / "segments.json"
+        save_segments(path, make_transcript(), sidecar=True)
+        save_segments(path, make_transcript(), sidecar=False)
+        assert not sidecar_path(path).exists()
+        assert path.read_text().startswith('{\n  "segments"')
+        assert load_segments(path) == make_transcript()
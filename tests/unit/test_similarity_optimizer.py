@@ -20,6 +20,7 @@ import pytest
 
 # Local
 from shared.similarity_optimizer import (
+    FINGERPRINT_VERSION,
     SimilarityOptimizer,
     MediaFingerprint,
     ProcessingDecision,
@@ -188,6 +189,16 @@ class TestSimilarityOptimizer:
         assert matches[0].reference_media_id == "media1"
         assert matches[0].similarity_score >= 0.75
     
+    def test_find_similar_media_skips_other_versions(self, optimizer):
+        """Legacy fingerprints are not compared with current ones."""
+        fields = dict(duration=300.0, audio_hash="hash123", spectral_features={"mean": 1500.0},
+                      energy_profile=[0.5, 0.6, 0.7], language="hi", created_at="2025-12-10T00:00:00")
+        optimizer.fingerprints["legacy"] = MediaFingerprint.from_dict({"media_id": "legacy", **fields})
+        current = MediaFingerprint(media_id="current", version=FINGERPRINT_VERSION, **fields)
+        
+        assert optimizer.fingerprints["legacy"].version != FINGERPRINT_VERSION
+        assert optimizer.find_similar_media(current, threshold=0.0) == []
+    
     def test_store_and_retrieve_decision(self, optimizer):
         """Test storing and retrieving processing decision."""
         # Store decision
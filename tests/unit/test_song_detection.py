@@ -0,0 +1,142 @@
+"""
+Unit tests for audio-domain song detection.
+"""
+import json
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.cache_manager import MediaCacheManager
+from shared.segment_filters import classify_lyrics
+from shared.song_detection import (
+    detect_song_map,
+    load_soundtrack,
+    match_soundtrack,
+    song_intervals,
+    window_song_score,
+)
+
+SR = 16000
+rng = np.random.default_rng(0)
+
+
+def speech_like(seconds):
+    """Harmonic voice with moving pitch, syllable envelope and pauses."""
+    t = np.arange(int(seconds * SR)) / SR
+    f0 = 140 + 40 * np.sin(2 * np.pi * 0.7 * t) + 20 * np.sin(2 * np.pi * 3.1 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SR
+    voice = sum(np.sin(k * phase) / k for k in range(1, 15))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    envelope[(t % 2.0) > 1.4] = 0
+    return (0.3 * voice * envelope + 0.003 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+def music_like(seconds):
+    """Held two-note chords changing every second."""
+    t = np.arange(int(seconds * SR)) / SR
+    notes = [220, 277, 330, 247, 294, 370]
+    out = np.zeros_like(t)
+    for i in range(int(seconds)):
+        held = (t >= i) & (t < i + 1)
+        for f in (notes[i % 6], notes[(i + 2) % 6] * 1.5):
+            out[held] += sum(0.5 / k * np.sin(2 * np.pi * f * k * t[held]) for k in range(1, 6))
+    return (0.15 * out).astype(np.float32)
+
+
+def drums(seconds, bpm=110):
+    """Kick drum on every beat."""
+    t = np.arange(int(seconds * SR)) / SR
+    phase = t % (60.0 / bpm)
+    return (0.5 * np.exp(-30 * phase) * np.sin(2 * np.pi * 60 * t)).astype(np.float32)
+
+
+def song_like(seconds):
+    """Chords, a beat and a voice on top."""
+    return (0.6 * music_like(seconds) + drums(seconds) + 0.5 * speech_like(seconds)).astype(np.float32)
+
+
+@pytest.fixture
+def film(tmp_path):
+    """60s dialogue, 90s song, 30s dialogue."""
+    audio = np.concatenate([speech_like(60), song_like(90), speech_like(30)])
+    path = tmp_path / "01_demux" / "audio.wav"
+    path.parent.mkdir()
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SR)
+        wav.writeframes((np.clip(audio, -1, 1) * 32767).astype('<i2').tobytes())
+    return path
+
+
+class TestSongScore:
+    """Test window scores on synthetic signals."""
+
+    def test_song_scores_above_dialogue_and_score(self):
+        assert window_song_score(song_like(5)) > 0.7
+        assert window_song_score(speech_like(5)) < 0.2
+        # Background score under dialogue: tonal but no beat
+        assert window_song_score(speech_like(5) + 0.3 * music_like(5)) < 0.5
+
+    def test_intervals_smooth_merge_and_drop(self):
+        scores = [0.1] * 4 + [0.9] * 10 + [0.1] + [0.9] * 6 + [0.1] * 4 + [0.9] * 3 + [0.1] * 2
+        songs = song_intervals(scores, window_seconds=5, threshold=0.55, min_song_seconds=45)
+        # One dropout is smoothed away; the 15s burst is too short
+        assert [(s['start'], s['end']) for s in songs] == [(20.0, 105.0)]
+
+
+class TestSongMap:
+    """Test detection, caching and soundtrack matching."""
+
+    def test_detects_song_and_caches_per_media(self, tmp_path, film):
+        cache = MediaCacheManager(tmp_path / "cache")
+        song_map = detect_song_map(film, media_id="m1", cache_manager=cache)
+
+        assert len(song_map['songs']) == 1
+        song = song_map['songs'][0]
+        assert song['start'] == pytest.approx(60, abs=10)
+        assert song['end'] == pytest.approx(150, abs=10)
+        assert song_map['cached'] is False
+        assert json.loads((film.parent / "song_map.json").read_text())['songs'][0]['start'] == song['start']
+
+        again = detect_song_map(film, media_id="m1", cache_manager=cache)
+        assert again['cached'] is True
+        assert again['songs'] == song_map['songs']
+        # Different parameters are a different cache entry
+        assert detect_song_map(film, media_id="m1", threshold=0.6, cache_manager=cache)['cached'] is False
+
+    def test_match_by_duration(self):
+        songs = [{'start': 0, 'end': 200, 'duration': 200.0}, {'start': 500, 'end': 560, 'duration': 60.0}]
+        tracks = [
+            {'title': 'Long Song', 'length': 300000},
+            {'title': 'Title Track', 'artist': 'A', 'duration': 210},
+            {'title': 'No Length'},
+        ]
+        assert match_soundtrack(songs, tracks) == 1
+        assert songs[0]['track'] == {'title': 'Title Track', 'artist': 'A'}
+        assert songs[1]['track'] is None
+
+    def test_load_soundtrack(self):
+        tracks = load_soundtrack("Jaane Tu... Ya Jaane Na", 2008)
+        assert any(t['title'] == "Pappu Can't Dance Saala" for t in tracks)
+        assert load_soundtrack("Unknown Film", 1999) == []
+
+
+class TestLyricsFromSongMap:
+    """Test the lyrics stage rule fed by the song map."""
+
+    def test_segments_inside_songs_are_lyrics(self):
+        segments = [
+            {'start': 10.0, 'end': 14.0, 'text': 'Where are you going?'},
+            {'start': 62.0, 'end': 66.0, 'text': 'Dil ki baat kahoon'},
+            {'start': 148.0, 'end': 154.0, 'text': 'Mostly after the song'},
+        ]
+        reasons, hits = classify_lyrics(segments, songs=[{'start': 60.0, 'end': 150.0}])
+        assert reasons == [None, 'song_audio', None]
+        assert hits == {'song_audio': 1}
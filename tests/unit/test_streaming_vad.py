@@ -0,0 +1,153 @@
+"""
+Unit tests for windowed voice activity detection.
+"""
+import json
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.streaming_vad import (
+    StreamingVAD,
+    resolve_backend,
+    energy_speech_regions,
+    merge_segments,
+    plan_windows,
+)
+
+SR = 16000
+rng = np.random.default_rng(0)
+
+
+def bursts(spans, seconds):
+    """Speech-band tone bursts at `spans` over faint noise."""
+    t = np.arange(int(seconds * SR)) / SR
+    audio = 0.001 * rng.standard_normal(len(t))
+    for start, end in spans:
+        held = (t >= start) & (t < end)
+        audio[held] += 0.3 * np.sin(2 * np.pi * 600 * t[held])
+    return audio.astype(np.float32)
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SR)
+        wav.writeframes((np.clip(samples, -1, 1) * 32767).astype('<i2').tobytes())
+
+
+class TestEnergyDetector:
+    """Test the NumPy fast path."""
+
+    def test_finds_bursts(self):
+        regions = energy_speech_regions(bursts([(1.0, 2.0), (3.0, 3.5)], 5))
+        assert len(regions) == 2
+        assert regions[0] == pytest.approx((1.0, 2.0), abs=0.05)
+        assert regions[1] == pytest.approx((3.0, 3.5), abs=0.05)
+
+    def test_silence_and_noise_only(self):
+        assert energy_speech_regions(np.zeros(5 * SR, dtype=np.float32)) == []
+        assert energy_speech_regions(bursts([], 5)) == []
+
+    def test_short_gap_closed_short_burst_dropped(self):
+        regions = energy_speech_regions(bursts([(1.0, 2.0), (2.05, 3.0), (4.0, 4.1)], 5))
+        assert len(regions) == 1
+        assert regions[0] == pytest.approx((1.0, 3.0), abs=0.05)
+
+
+class TestStitching:
+    """Test window planning and segment merging."""
+
+    def test_windows_cover_and_hand_over(self):
+        windows = plan_windows(25 * SR, SR, window_seconds=10, overlap_seconds=2)
+        assert windows[0][:2] == (0, 10 * SR)
+        assert windows[-1][1] == 25 * SR
+        # Authoritative spans tile the file exactly
+        assert windows[0][2] == 0.0 and windows[-1][3] == 25.0
+        assert all(a[3] == b[2] for a, b in zip(windows, windows[1:]))
+
+    def test_merge_gap(self):
+        regions = [(0.0, 1.0), (1.1, 2.0), (3.0, 4.0)]
+        assert [s['end'] for s in merge_segments(regions, 0.2)] == [2.0, 4.0]
+        assert len(merge_segments(regions, 0.0)) == 3
+        assert merge_segments(regions, 5.0) == [{'start': 0.0, 'end': 4.0, 'duration': 4.0}]
+
+    def test_segment_across_window_edge_is_whole(self, tmp_path):
+        audio = tmp_path / "audio.wav"
+        write_wav(audio, bursts([(2.0, 3.0), (9.0, 12.0), (17.0, 18.0)], 20))
+        output = tmp_path / "speech_segments.json"
+
+        vad = StreamingVAD(backend='energy', window_seconds=10, overlap_seconds=2)
+        segments = vad.run(audio, output, merge_gap=0.2)
+
+        assert vad.stats['windows'] == 3
+        assert len(segments) == 3
+        assert segments[1]['start'] == pytest.approx(9.0, abs=0.05)
+        assert segments[1]['end'] == pytest.approx(12.0, abs=0.05)
+        data = json.loads(output.read_text())
+        assert data == {'segments': segments}
+        assert set(data['segments'][0]) == {'start', 'end', 'duration'}
+
+    def test_windowing_matches_single_pass(self, tmp_path):
+        audio = tmp_path / "audio.wav"
+        write_wav(audio, bursts([(1.0, 4.0), (6.5, 7.0), (11.0, 15.0)], 16))
+
+        whole = StreamingVAD(backend='energy', window_seconds=60).detect(audio)
+        windowed = StreamingVAD(backend='energy', window_seconds=5, overlap_seconds=1).detect(audio)
+        assert [s['start'] for s in merge_segments(whole)] == pytest.approx(
+            [s['start'] for s in merge_segments(windowed)], abs=0.05)
+        assert [s['end'] for s in merge_segments(whole)] == pytest.approx(
+            [s['end'] for s in merge_segments(windowed)], abs=0.05)
+
+
+class TestBackendSelection:
+    """Test 'auto' resolution and per-configuration detectors."""
+
+    @pytest.fixture
+    def installed(self, monkeypatch, tmp_path):
+        """Pretend-install modules; torch hub lives under tmp_path."""
+        import importlib.util
+        from shared import streaming_vad
+
+        present = set()
+        real = importlib.util.find_spec
+
+        def find_spec(name, *args):
+            if name in ('torch', 'pyannote'):
+                return object() if name in present else None
+            return real(name, *args)
+
+        monkeypatch.setattr(streaming_vad.importlib.util, 'find_spec', find_spec)
+        monkeypatch.setenv('TORCH_HOME', str(tmp_path / "torch"))
+        return present
+
+    def test_auto_keeps_pyannote_on_cpu(self, installed):
+        installed.update({'torch', 'pyannote'})
+        assert resolve_backend('auto', 'cpu') == 'pyannote'
+        assert resolve_backend('silero', 'cpu') == 'silero'
+
+    def test_auto_uses_silero_only_if_cached(self, installed, tmp_path):
+        installed.add('torch')
+        assert resolve_backend('auto', 'cpu') == 'energy'
+        (tmp_path / "torch" / "hub" / "snakers4_silero-vad_master").mkdir(parents=True)
+        assert resolve_backend('auto', 'cpu') == 'silero'
+
+    def test_detector_rebuilt_per_configuration(self, monkeypatch):
+        from shared import streaming_vad
+
+        built = []
+        monkeypatch.setattr(streaming_vad, '_DETECTOR', None)
+        monkeypatch.setattr(streaming_vad, '_DETECTOR_KEY', None)
+        monkeypatch.setattr(streaming_vad, 'create_detector',
+                            lambda *args: built.append(args) or (lambda samples: []))
+        streaming_vad._get_detector('energy', 'cpu', 0.5, None)
+        streaming_vad._get_detector('energy', 'cpu', 0.5, None)
+        streaming_vad._get_detector('energy', 'cpu', 0.7, None)
+        streaming_vad._get_detector('silero', 'cpu', 0.7, None)
+        assert [args[:3] for args in built] == [('energy', 'cpu', 0.5), ('energy', 'cpu', 0.7), ('silero', 'cpu', 0.7)]
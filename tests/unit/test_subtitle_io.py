@@ -0,0 +1,107 @@
+"""
+Unit tests for the shared subtitle reader/writer.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.subtitle_io import (
+    SubtitleStreamWriter,
+    format_timestamp,
+    iter_srt,
+    parse_srt,
+    render,
+    write_subtitles,
+)
+
+SEGMENTS = [
+    {'start': 0.5, 'end': 2.25, 'text': ' Hello there. '},
+    {'start': 3.0, 'end': 4.0, 'text': 'Removed', 'removed': True},
+    {'start': 4.0, 'end': 5.0, 'text': '   '},
+    {'start': 3661.001, 'end': 3663.5, 'text': 'Two\nlines'},
+]
+
+
+class TestTimestamps:
+    """Test timestamp formats."""
+
+    @pytest.mark.parametrize("seconds,fmt,expected", [
+        (0, 'srt', "00:00:00,000"),
+        (3661.001, 'srt', "01:01:01,001"),
+        (59.9996, 'srt', "00:01:00,000"),
+        (3661.001, 'vtt', "01:01:01.001"),
+        (3661.006, 'ass', "1:01:01.01"),
+        (-1, 'srt', "00:00:00,000"),
+    ])
+    def test_formats(self, seconds, fmt, expected):
+        assert format_timestamp(seconds, fmt) == expected
+
+
+class TestWriters:
+    """Test one-pass and streamed writing."""
+
+    def test_render_srt_skips_and_renumbers(self):
+        assert render(SEGMENTS) == (
+            "1\n00:00:00,500 --> 00:00:02,250\nHello there.\n\n"
+            "2\n01:01:01,001 --> 01:01:03,500\nTwo\nlines\n\n"
+        )
+
+    def test_write_all_formats_in_one_pass(self, tmp_path):
+        paths = [tmp_path / "out" / f"movie.{fmt}" for fmt in ('srt', 'vtt', 'ass')]
+        assert write_subtitles(SEGMENTS, *paths, title="Movie") == 2
+
+        assert paths[0].read_text() == render(SEGMENTS, 'srt')
+        vtt = paths[1].read_text()
+        assert vtt.startswith("WEBVTT\n\n1\n00:00:00.500 --> 00:00:02.250\n")
+        ass = paths[2].read_text()
+        assert "Title: Movie" in ass
+        assert "Dialogue: 0,1:01:01.00,1:01:03.50,Default,,0,0,0,,Two\\Nlines\n" in ass
+        assert not list((tmp_path / "out").glob(".*.tmp"))
+
+    def test_unknown_suffix_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_subtitles(SEGMENTS, tmp_path / "movie.txt")
+
+    def test_stream_matches_one_pass(self, tmp_path):
+        with SubtitleStreamWriter(tmp_path / "a.srt", tmp_path / "a.vtt", buffer_size=16) as writer:
+            for segment in SEGMENTS:
+                writer.write(segment)
+            assert not (tmp_path / "a.srt").exists()
+        assert writer.count == 2
+        assert (tmp_path / "a.srt").read_text() == render(SEGMENTS, 'srt')
+        assert (tmp_path / "a.vtt").read_text() == render(SEGMENTS, 'vtt')
+
+    def test_stream_discarded_on_error(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            with SubtitleStreamWriter(tmp_path / "b.srt") as writer:
+                writer.write_many(SEGMENTS)
+                raise RuntimeError("boom")
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestParser:
+    """Test SRT parsing."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "movie.srt"
+        write_subtitles(SEGMENTS, path)
+        cues = parse_srt(path)
+        assert [(c['index'], c['start'], c['end'], c['text']) for c in cues] == [
+            (1, 0.5, 2.25, "Hello there."),
+            (2, 3661.001, 3663.5, "Two\nlines"),
+        ]
+
+    def test_tolerates_crlf_bom_and_bad_blocks(self):
+        text = (
+            "\ufeff1\r\n00:00:01,000 --> 00:00:02,000\r\nFirst\r\n\r\n"
+            "garbage block\r\n\r\n"
+            "2\r\n00:00:03.5 --> 00:00:04,000 X1:0\r\nSecond\r\n  \r\n"
+            "3\r\n00:00:05,000 --> 00:00:06,000\r\nLast"
+        )
+        cues = list(iter_srt(text))
+        assert [c['text'] for c in cues] == ["First", "Second", "Last"]
+        assert cues[1]['start'] == 3.5
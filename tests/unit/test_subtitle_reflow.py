@@ -0,0 +1,134 @@
+"""
+Unit tests for the subtitle reflow engine.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.subtitle_reflow import (
+    ReflowSettings,
+    break_lines,
+    reflow_segments,
+    tokenize,
+    visible_width,
+)
+
+SETTINGS = ReflowSettings()
+LONG = ("This is a very long segment that goes on and on, and it really should be "
+        "split into more than one subtitle cue because it is long.")
+
+
+def timed_words(text, start, per_word):
+    words = []
+    for i, word in enumerate(text.split()):
+        words.append({'word': word, 'start': start + i * per_word, 'end': start + (i + 1) * per_word - 0.05})
+    return words
+
+
+class TestLayout:
+    """Test width, tokenization and line breaking."""
+
+    def test_visible_width(self):
+        assert visible_width("hello") == 5
+        # Devanagari vowel signs and virama take no width of their own
+        assert visible_width("हिंदी") < len("हिंदी")
+        assert visible_width("中文") == 4
+
+    def test_cjk_tokenized_per_character(self):
+        assert tokenize("中文，好") == [(' ', '中'), ('', '文，'), ('', '好')]
+
+    def test_short_text_is_one_line(self):
+        assert break_lines(tokenize("Where are you going?")) == ["Where are you going?"]
+
+    def test_lines_balanced_and_within_width(self):
+        lines = break_lines(tokenize("and it really should be split into more than one subtitle cue"), 42, 2)
+        assert len(lines) == 2
+        assert all(len(line) <= 42 for line in lines)
+        assert abs(len(lines[0]) - len(lines[1])) < 15
+
+    def test_prefers_break_after_punctuation(self):
+        lines = break_lines(tokenize("I told you already, we are leaving tonight for good"), 42, 2)
+        assert lines[0] == "I told you already,"
+
+
+class TestReflow:
+    """Test splitting, merging and timing."""
+
+    def test_long_segment_split_at_clause(self):
+        cues, stats = reflow_segments([{'start': 0.0, 'end': 9.0, 'text': LONG}], SETTINGS)
+        assert len(cues) == 2
+        assert cues[0]['text'].endswith("on and on,")
+        assert cues[0]['end'] == cues[1]['start']
+        assert cues[1]['end'] == 9.0
+        assert stats['split_segments'] == 1
+        for cue in cues:
+            assert all(len(line) <= 42 for line in cue['text'].split('\n'))
+
+    def test_word_timestamps_drive_the_split(self):
+        segment = {'start': 0.0, 'end': 30.0, 'text': LONG, 'words': timed_words(LONG, 0.0, 1.0)}
+        cues, _ = reflow_segments([segment], SETTINGS)
+        # 7s max duration at one word per second
+        assert all(cue['end'] - cue['start'] <= 7.0 for cue in cues)
+        assert cues[1]['start'] == float(len(cues[0]['text'].split()))
+
+    def test_short_segments_merge_and_extend(self):
+        segments = [
+            {'start': 9.5, 'end': 9.9, 'text': "Yes."},
+            {'start': 10.0, 'end': 10.4, 'text': "Go now."},
+            {'start': 15.0, 'end': 15.3, 'text': "Wait!", 'removed': True},
+            {'start': 20.0, 'end': 20.3, 'text': "Hey."},
+        ]
+        cues, stats = reflow_segments(segments, SETTINGS)
+        assert [c['text'] for c in cues] == ["Yes. Go now.", "Hey."]
+        assert cues[0]['end'] == pytest.approx(10.5)
+        assert cues[1]['end'] == pytest.approx(21.0)
+        assert stats['merged_cues'] == 1
+
+    def test_speaker_change_and_no_merge(self):
+        segments = [
+            {'start': 0.0, 'end': 0.5, 'text': "Hi", 'speaker': 'A'},
+            {'start': 0.6, 'end': 1.0, 'text': "there", 'speaker': 'B'},
+        ]
+        cues, _ = reflow_segments(segments, SETTINGS)
+        assert [c['speaker'] for c in cues] == ['A', 'B']
+        # Extension stops short of the next cue
+        assert cues[0]['end'] < cues[1]['start']
+
+        cues, _ = reflow_segments([dict(s, speaker=None) for s in segments], ReflowSettings(merge=False))
+        assert len(cues) == 2
+
+    def test_cps_extension(self):
+        text = "A fairly long line of dialogue spoken fast"
+        cues, stats = reflow_segments([{'start': 0.0, 'end': 1.0, 'text': text}], SETTINGS)
+        assert cues[0]['end'] == pytest.approx(len(text) / 17.0, abs=0.01)
+        assert stats['cps_violations'] == 0
+
+    def test_disabled_passes_through(self):
+        segments = [{'start': 0.0, 'end': 9.0, 'text': LONG}]
+        cues, _ = reflow_segments(segments, ReflowSettings(enabled=False))
+        assert cues == segments
+
+    def test_overrides(self):
+        class StubConfig:
+            subtitle_reflow_enabled = True
+            segment_merging_enabled = True
+            subtitle_max_line_length = 42
+            subtitle_max_lines = 2
+            subtitle_min_duration = 1.0
+            subtitle_max_duration = 7.0
+            segment_merge_max_duration = 6.0
+            segment_merge_max_gap = 1.5
+            cps_hard_cap = 17.0
+            cps_enforcement = True
+
+            def get(self, key, default=None):
+                return default
+
+        settings = ReflowSettings.from_config(StubConfig(), {'max_line_length': '37', 'reflow': 'false'})
+        assert settings.max_line_length == 37
+        assert settings.max_duration == 6.0
+        assert settings.enabled is False
@@ -0,0 +1,58 @@
+"""
+Unit tests for deduplicated, length-bucketed translation batching.
+"""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.translation_batching import (
+    dedupe_texts,
+    length_sorted_order,
+    normalize_text,
+    token_budget_batch_size,
+)
+
+
+class TestDedupe:
+    """Test deduplication and scatter-back."""
+
+    def test_normalized_duplicates_collapse(self):
+        texts = ["हाँ", "  हाँ ", "चलो  चलो", "हाँ", "चलो चलो"]
+        deduped = dedupe_texts(texts)
+        assert deduped.unique == ["हाँ", "चलो चलो"]
+        assert deduped.positions == [0, 0, 1, 0, 1]
+        assert deduped.duplicates == 3
+
+    def test_empty_texts_keep_original(self):
+        texts = ["", "hello", "   ", None]
+        deduped = dedupe_texts(texts)
+        assert deduped.unique == ["hello"]
+        assert deduped.scatter(["hola"], texts) == ["", "hola", "   ", None]
+
+    def test_scatter_restores_order(self):
+        texts = ["a", "b", "a", "c", "b"]
+        deduped = dedupe_texts(texts)
+        translations = [t.upper() for t in deduped.unique]
+        assert deduped.scatter(translations, texts) == ["A", "B", "A", "C", "B"]
+
+    def test_normalize_text(self):
+        assert normalize_text("  a \n b\t") == "a b"
+        assert normalize_text(None) == ""
+
+
+class TestBucketing:
+    """Test length ordering and token-budget batch sizing."""
+
+    def test_longest_first(self):
+        assert length_sorted_order([3, 10, 1, 7]) == [1, 3, 0, 2]
+
+    def test_budget_limits_long_sentences(self):
+        assert token_budget_batch_size(longest=100, max_batch_tokens=1000, max_batch_size=64) == 10
+
+    def test_sentence_cap_limits_short_sentences(self):
+        assert token_budget_batch_size(longest=4, max_batch_tokens=1000, max_batch_size=16) == 16
+
+    def test_oversized_sentence_still_batched_alone(self):
+        assert token_budget_batch_size(longest=5000, max_batch_tokens=1000, max_batch_size=16) == 1
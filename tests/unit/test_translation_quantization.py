@@ -0,0 +1,162 @@
+"""
+Unit tests for the CPU int8 translation path (compute type, parity check).
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import shared.translation_quantization as quantization
+from shared.translation_quantization import (
+    PARITY_FAILURE_TTL,
+    PARITY_REFERENCE_TEXTS,
+    check_parity,
+    cached_parity,
+    get_quantized_cache_dir,
+    resolve_compute_type,
+)
+
+
+@pytest.fixture(autouse=True)
+def ct2_home(tmp_path, monkeypatch):
+    """Keep converted models and parity results out of the repo cache."""
+    monkeypatch.setenv("CT2_HOME", str(tmp_path / "ct2"))
+    return tmp_path / "ct2"
+
+
+class TestComputeType:
+    """Test compute type resolution."""
+
+    def test_int8_on_cpu(self):
+        assert resolve_compute_type("int8", "cpu") == "int8"
+
+    def test_int8_falls_back_off_cpu(self):
+        assert resolve_compute_type("int8", "mps") == "float32"
+        assert resolve_compute_type("INT8", "cuda") == "float32"
+
+    def test_default_and_unknown(self):
+        assert resolve_compute_type(None, "cpu") == "float32"
+        assert resolve_compute_type("bfloat3", "cpu") == "float32"
+
+    def test_cache_dir_per_model(self, ct2_home):
+        path = get_quantized_cache_dir("facebook/nllb-200-distilled-600M")
+        assert path == ct2_home / "facebook--nllb-200-distilled-600M-int8"
+
+
+class TestParity:
+    """Test the int8 vs fp32 parity check."""
+
+    def test_identical_output_passes_and_is_cached(self):
+        calls = []
+
+        def fp32(texts):
+            calls.append("fp32")
+            return [t.upper() for t in texts]
+
+        result = check_parity("model/a", "torch-dynamic", ["eins", "zwei"], fp32, fp32)
+        assert result["passed"]
+        assert result["score"] == 1.0
+        assert result["samples"] == 2
+        assert cached_parity("model/a", "torch-dynamic")["passed"]
+
+        # Second job reuses the cached result without running either model
+        calls.clear()
+        assert check_parity("model/a", "torch-dynamic", ["eins"], fp32, fp32)["passed"]
+        assert calls == []
+
+    def test_divergent_output_fails(self):
+        result = check_parity(
+            "model/b", "ctranslate2", ["a", "b"],
+            lambda texts: ["the quick brown fox"] * len(texts),
+            lambda texts: ["zzzz"] * len(texts),
+        )
+        assert not result["passed"]
+        assert result["score"] < 0.85
+
+    def test_reference_set_is_capped(self):
+        seen = []
+
+        def translate(texts):
+            seen.append(len(texts))
+            return texts
+
+        check_parity("model/c", "torch-dynamic", [f"s{i}" for i in range(50)], translate, translate)
+        assert seen == [8, 8]
+
+    def test_cached_per_language_pair_on_fixed_reference(self):
+        seen = []
+
+        def translate(texts):
+            seen.append(list(texts))
+            return texts
+
+        check_parity("model/f", "ctranslate2", ["job text"], translate, translate,
+                     source_lang="eng_Latn", target_lang="hin_Deva")
+        assert seen[0] == PARITY_REFERENCE_TEXTS["eng_Latn"]
+
+        # Another pair is checked on its own; its first job's sentences
+        # become the pair's fixed set
+        seen.clear()
+        check_parity("model/f", "ctranslate2", ["uno", "dos"], translate, translate,
+                     source_lang="spa_Latn", target_lang="eng_Latn")
+        assert seen == [["uno", "dos"]] * 2
+        get_quantized_cache_dir("model/f").joinpath("parity_ctranslate2_int8_spa_Latn-eng_Latn.json").unlink()
+        seen.clear()
+        check_parity("model/f", "ctranslate2", ["tres"], translate, translate,
+                     source_lang="spa_Latn", target_lang="eng_Latn")
+        assert seen == [["uno", "dos"]] * 2
+
+    def test_failure_expires_and_model_change_rechecks(self, monkeypatch):
+        calls = []
+
+        def fp32(texts):
+            calls.append("fp32")
+            return ["the quick brown fox"] * len(texts)
+
+        def int8(texts):
+            return ["zzzz"] * len(texts)
+
+        signature = ["rev-1"]
+        monkeypatch.setattr(quantization, "_model_signature", lambda model, backend: signature[0])
+        assert not check_parity("model/g", "torch-dynamic", ["a"], fp32, int8)["passed"]
+        assert not check_parity("model/g", "torch-dynamic", ["a"], fp32, int8)["passed"]
+        assert calls == ["fp32"]
+
+        # An old failure is retried
+        path = quantization.get_parity_file("model/g", "torch-dynamic")
+        cached = json.loads(path.read_text())
+        cached["checked_ts"] -= PARITY_FAILURE_TTL + 1
+        path.write_text(json.dumps(cached))
+        good_int8 = lambda texts: ["the quick brown fox"] * len(texts)
+        assert check_parity("model/g", "torch-dynamic", ["a"], fp32, good_int8)["passed"]
+        assert calls == ["fp32", "fp32"]
+        assert check_parity("model/g", "torch-dynamic", ["a"], fp32, int8)["passed"]
+        assert calls == ["fp32", "fp32"]
+
+        # New weights: checked again
+        signature[0] = "rev-2"
+        assert not check_parity("model/g", "torch-dynamic", ["a"], fp32, int8)["passed"]
+        assert calls == ["fp32", "fp32", "fp32"]
+
+    def test_no_reference_text(self):
+        result = check_parity("model/d", "torch-dynamic", ["", "  "], None, None)
+        assert result["passed"]
+        assert result["samples"] == 0
+
+
+class TestDynamicQuantization:
+    """Test the PyTorch dynamic int8 fallback."""
+
+    def test_load_int8_model_without_ct2(self):
+        torch = pytest.importorskip("torch")
+        from shared.translation_quantization import load_int8_model
+
+        fp32 = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.ReLU(), torch.nn.Linear(8, 2))
+        model, backend = load_int8_model("model/e", None, lambda: fp32, allow_ct2=False)
+        assert backend == "torch-dynamic"
+        x = torch.randn(4, 8)
+        assert torch.allclose(model(x), fp32(x), atol=0.1)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Benchmark Harness Utilities
+
+Deterministic synthetic media, repeated timing and a baseline store with a
+statistical regression gate for tests/performance/.
+
+Baselines are kept per host (OS, architecture, CPU count, Python version)
+in tests/performance/baselines.json, or BENCHMARK_BASELINES if set. They
+are only written when BENCHMARK_UPDATE=1; without a baseline for the host
+the benchmarks run and report but do not gate.
+
+A benchmark fails when its samples are slower than the baseline samples
+with one-sided Mann-Whitney p < BENCHMARK_ALPHA (default 0.01) AND the
+median is more than BENCHMARK_TOLERANCE (default 25%) slower.
+"""
+
+# Standard library
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional
+
+# Third-party
+import numpy as np
+import pytest
+
+SAMPLE_RATE = 16000
+DEFAULT_BASELINES = Path(__file__).parent.parent / "performance" / "baselines.json"
+DEFAULT_ALPHA = 0.01
+DEFAULT_TOLERANCE = 0.25
+# Differences below this are timer noise, never a regression
+NOISE_FLOOR_SECONDS = 0.002
+
+
+# ============================================================================
+# SYNTHETIC MEDIA
+# ============================================================================
+
+def synth_speech(seconds: float, sample_rate: int = SAMPLE_RATE, seed: int = 0) -> np.ndarray:
+    """
+    Deterministic speech-like int16 audio (no TTS)
+
+    Phrases of 4-5 Hz syllable bursts with a gliding harmonic voice and
+    breath noise, separated by 0.3-1.2s pauses over a -55 dBFS noise floor.
+
+    Args:
+        seconds: Duration
+        sample_rate: Sample rate
+        seed: RNG seed
+
+    Returns:
+        Mono int16 samples
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    t = np.arange(n) / sample_rate
+    envelope = np.zeros(n, dtype=np.float32)
+
+    pos = 0.0
+    while pos < seconds:
+        phrase = rng.uniform(1.0, 3.5)
+        syllables = np.arange(pos, min(pos + phrase, seconds), 1.0 / rng.uniform(4.0, 5.0))
+        for start in syllables:
+            length = rng.uniform(0.12, 0.2)
+            i0, i1 = int(start * sample_rate), min(n, int((start + length) * sample_rate))
+            if i1 > i0:
+                envelope[i0:i1] = np.maximum(envelope[i0:i1], np.hanning(i1 - i0) * rng.uniform(0.5, 1.0))
+        pos += phrase + rng.uniform(0.3, 1.2)
+
+    f0 = 140.0 + 40.0 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    breath = rng.standard_normal(n) * 0.15
+    floor = rng.standard_normal(n) * 10 ** (-55 / 20)
+
+    audio = 0.3 * envelope * (voice + breath) + floor
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def write_wav(path: Path, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> Path:
+    """Write mono int16 PCM WAV."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype('<i2').tobytes())
+    return path
+
+
+def make_synthetic_video(path: Path, audio_wav: Path, seconds: float) -> Path:
+    """
+    Mux a small test-pattern video with the given audio (requires ffmpeg)
+
+    Args:
+        path: Output .mp4/.mkv
+        audio_wav: Audio track
+        seconds: Duration
+
+    Returns:
+        Path to the video (skips the test if ffmpeg is missing)
+    """
+    if not shutil.which("ffmpeg"):
+        pytest.skip("ffmpeg not available for synthetic video")
+    subprocess.run([
+        "ffmpeg", "-y", "-nostdin", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc=size=160x90:rate=10:duration={seconds}",
+        "-i", str(audio_wav),
+        "-c:v", "mpeg4", "-q:v", "10", "-c:a", "aac", "-b:a", "64k",
+        "-shortest", str(path),
+    ], check=True)
+    return path
+
+
+WORDS = ("kya", "baat", "hai", "yaar", "bhai", "chalo", "ghar", "abhi", "nahi", "dekho",
+         "the", "train", "is", "late", "again", "we", "will", "walk", "home", "tonight")
+
+HALLUCINATIONS = ("Thanks for watching!", "Subscribe to my channel", "♪", "...")
+
+
+def synth_segments(count: int, seed: int = 0, seconds_per_segment: float = 2.5) -> List[Dict[str, Any]]:
+    """
+    Deterministic transcript segments with some hallucinations and loops
+
+    Args:
+        count: Number of segments
+        seed: RNG seed
+        seconds_per_segment: Segment spacing
+
+    Returns:
+        Segment dicts with start, end and text
+    """
+    rng = np.random.default_rng(seed)
+    segments = []
+    previous = ""
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.03:
+            text = str(rng.choice(HALLUCINATIONS))
+        elif roll < 0.06 and previous:
+            text = previous
+        else:
+            text = " ".join(rng.choice(WORDS, size=int(rng.integers(3, 12))))
+            text = text[0].upper() + text[1:] + str(rng.choice([".", "?", "!", ","]))
+        start = i * seconds_per_segment
+        segments.append({'start': start, 'end': start + seconds_per_segment * 0.9, 'text': text})
+        previous = text
+    return segments
+
+
+# ============================================================================
+# TIMING AND REGRESSION GATE
+# ============================================================================
+
+def measure(fn: Callable[[], Any], repeat: int = 7, warmup: int = 1) -> List[float]:
+    """
+    Time repeated calls
+
+    Args:
+        fn: Zero-argument callable
+        repeat: Timed calls
+        warmup: Untimed calls first (imports, caches)
+
+    Returns:
+        Wall seconds per timed call
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """
+    One-sided Mann-Whitney U p-value that current is slower than baseline
+
+    Normal approximation with continuity correction (no scipy needed).
+
+    Args:
+        current: Current timings
+        baseline: Baseline timings
+
+    Returns:
+        p-value (small = current significantly slower)
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    u = sum(1.0 if c > b else 0.5 if c == b else 0.0 for c in current for b in baseline)
+    mean = n1 * n2 / 2.0
+    sd = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12.0)
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def host_key() -> str:
+    """Baseline key for this machine."""
+    return (f"{platform.system()}-{platform.machine()}-{os.cpu_count()}cpu-"
+            f"py{sys.version_info.major}.{sys.version_info.minor}")
+
+
+class BaselineStore:
+    """Per-host benchmark baselines with a regression check."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize baseline store.
+
+        Args:
+            path: Baselines JSON (default: BENCHMARK_BASELINES or
+                tests/performance/baselines.json)
+        """
+        self.path = Path(path or os.environ.get("BENCHMARK_BASELINES") or DEFAULT_BASELINES)
+        self.update = os.environ.get("BENCHMARK_UPDATE", "").lower() in ("1", "true", "yes")
+        self.alpha = float(os.environ.get("BENCHMARK_ALPHA", DEFAULT_ALPHA))
+        self.tolerance = float(os.environ.get("BENCHMARK_TOLERANCE", DEFAULT_TOLERANCE))
+        self.host = host_key()
+
+    def _load(self) -> Dict[str, Any]:
+        if self.path.exists():
+            with open(self.path) as f:
+                return json.load(f)
+        return {"version": 1, "hosts": {}}
+
+    def baseline(self, name: str) -> Optional[List[float]]:
+        """Baseline samples for a benchmark on this host."""
+        entry = self._load()["hosts"].get(self.host, {}).get("benchmarks", {}).get(name)
+        return entry["samples"] if entry else None
+
+    def record(self, name: str, samples: List[float]) -> None:
+        """Store samples as the new baseline."""
+        data = self._load()
+        host = data["hosts"].setdefault(self.host, {"benchmarks": {}})
+        host["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        host["benchmarks"][name] = {
+            "samples": [round(s, 6) for s in samples],
+            "median": round(median(samples), 6),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def check(self, name: str, samples: List[float]) -> Dict[str, Any]:
+        """
+        Compare samples with the baseline (and record them in update mode)
+
+        Args:
+            name: Benchmark name
+            samples: Current timings
+
+        Returns:
+            Report dict: median, baseline_median, ratio, p_value, regressed
+        """
+        report: Dict[str, Any] = {"name": name, "median": median(samples), "regressed": False}
+        baseline = self.baseline(name)
+        if baseline:
+            base_median = median(baseline)
+            report["baseline_median"] = base_median
+            report["ratio"] = report["median"] / base_median if base_median else float("inf")
+            report["p_value"] = mann_whitney_greater(samples, baseline)
+            report["regressed"] = (
+                report["p_value"] < self.alpha
+                and report["ratio"] > 1.0 + self.tolerance
+                and report["median"] - base_median > NOISE_FLOOR_SECONDS
+            )
+        if self.update:
+            self.record(name, samples)
+        return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """One-line human summary of a benchmark report."""
+    line = f"{report['name']}: median {report['median'] * 1000:.2f} ms"
+    if "baseline_median" in report:
+        line += (f" (baseline {report['baseline_median'] * 1000:.2f} ms, "
+                 f"x{report['ratio']:.2f}, p={report['p_value']:.4f})")
+    else:
+        line += " (no baseline for this host)"
+    return line
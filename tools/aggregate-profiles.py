@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Profile Aggregator
+
+Merge stage profiles written by the pipeline's profiling hooks
+(job.json "profiling", see shared/profiling.py) across one or more jobs
+and report the hottest functions, stacks and allocation sites per stage.
+
+    *.prof               cProfile stats, merged with pstats
+    *.collapsed          collapsed stacks (py-spy raw / stdlib sampler)
+    *.tracemalloc.json   top-N allocation sites
+
+Run: ./tools/aggregate-profiles.py out/ [--stage asr] [--top 25] [--json]
+
+Compliance: § 16.7 (DEVELOPER_STANDARDS.md)
+"""
+
+# Standard library
+import argparse
+import io
+import json
+import pstats
+import re
+import sys
+from collections import Counter, defaultdict
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Configure simple logging
+import logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIXES = (".prof", ".collapsed", ".tracemalloc.json")
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+_STAGE_DIR_RE = re.compile(r"^\d+_(.+)$")
+_COLLAPSED_RE = re.compile(r"^(.*) (\d+)$")
+
+
+def stage_of(path: Path) -> str:
+    """Stage name of a profile file, from its stage directory (NN_stage)."""
+    match = _STAGE_DIR_RE.match(path.parent.name)
+    return match.group(1) if match else path.parent.name
+
+
+def read_collapsed(path: Path) -> Counter:
+    """
+    Read a collapsed-stack file ("frame;frame;frame count" per line).
+
+    Args:
+        path: .collapsed file
+
+    Returns:
+        Counter of stack -> samples
+    """
+    stacks: Counter = Counter()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = _COLLAPSED_RE.match(line.rstrip("\n"))
+            if match:
+                stacks[match.group(1)] += int(match.group(2))
+    return stacks
+
+
+class ProfileAggregator:
+    """Collect and merge profile files per stage."""
+
+    def __init__(self, stage_filter: Optional[str] = None):
+        """
+        Initialize aggregator.
+
+        Args:
+            stage_filter: Only include stages matching this fnmatch pattern
+        """
+        self.stage_filter = stage_filter
+        self.prof_files: Dict[str, List[Path]] = defaultdict(list)
+        self.stacks: Dict[str, Counter] = defaultdict(Counter)
+        self.allocations: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        self.jobs: set = set()
+
+    def find(self, roots: Iterable[Path]) -> List[Path]:
+        """Profile files under the given job or output directories."""
+        files = []
+        for root in roots:
+            if root.is_file():
+                candidates = [root]
+            else:
+                candidates = [p for p in root.rglob("*") if p.is_file()]
+            files.extend(p for p in candidates if p.name.endswith(PROFILE_SUFFIXES))
+        return sorted(files)
+
+    def add(self, path: Path) -> None:
+        """Add one profile file."""
+        stage = stage_of(path)
+        if self.stage_filter and not fnmatch(stage, self.stage_filter):
+            return
+        self.jobs.add(path.parent.parent)
+
+        if path.name.endswith(".prof"):
+            self.prof_files[stage].append(path)
+        elif path.name.endswith(".collapsed"):
+            self.stacks[stage].update(read_collapsed(path))
+        elif path.name.endswith(".tracemalloc.json"):
+            try:
+                sites = json.loads(path.read_text())
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Skipping {path}: {e}")
+                return
+            merged = self.allocations[stage]
+            for site in sites:
+                entry = merged.setdefault(site["site"], {"size_kb": 0.0, "count": 0, "files": 0})
+                entry["size_kb"] += site.get("size_kb", 0.0)
+                entry["count"] += site.get("count", 0)
+                entry["files"] += 1
+
+    def stages(self) -> List[str]:
+        """Stages with any profile data."""
+        return sorted(set(self.prof_files) | set(self.stacks) | set(self.allocations))
+
+    def cprofile_top(self, stage: str, sort: str = "cumulative", top: int = 25) -> List[Dict[str, Any]]:
+        """
+        Hottest functions of the merged cProfile stats of a stage.
+
+        Args:
+            stage: Stage name
+            sort: cumulative, tottime or ncalls
+            top: Number of functions
+
+        Returns:
+            Rows with function, ncalls, tottime and cumtime
+        """
+        files = self.prof_files.get(stage)
+        if not files:
+            return []
+        stats = pstats.Stats(str(files[0]), stream=io.StringIO())
+        for path in files[1:]:
+            try:
+                stats.add(str(path))
+            except (OSError, TypeError, EOFError, ValueError) as e:
+                logger.warning(f"Skipping {path}: {e}")
+        column = {"cumulative": 3, "tottime": 2, "ncalls": 1}[sort]
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+        return [
+            {
+                "function": f"{name} ({filename}:{line})",
+                "ncalls": nc,
+                "tottime": round(tt, 4),
+                "cumtime": round(ct, 4),
+            }
+            for (filename, line, name), (cc, nc, tt, ct, _callers) in rows[:top]
+        ]
+
+    def stack_top(self, stage: str, top: int = 25) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Hottest frames of the merged sampled stacks of a stage.
+
+        Args:
+            stage: Stage name
+            top: Number of frames
+
+        Returns:
+            {"self": [...], "inclusive": [...]} rows with frame, samples, percent
+        """
+        stacks = self.stacks.get(stage)
+        if not stacks:
+            return {"self": [], "inclusive": []}
+        total = sum(stacks.values())
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames):
+                inclusive[frame] += count
+
+        def rows(counter: Counter) -> List[Dict[str, Any]]:
+            return [
+                {"frame": frame, "samples": n, "percent": round(100.0 * n / total, 1)}
+                for frame, n in counter.most_common(top)
+            ]
+
+        return {"self": rows(own), "inclusive": rows(inclusive)}
+
+    def allocation_top(self, stage: str, top: int = 25) -> List[Dict[str, Any]]:
+        """Largest allocation sites of a stage, summed across profiles."""
+        sites = self.allocations.get(stage, {})
+        ranked = sorted(sites.items(), key=lambda item: item[1]["size_kb"], reverse=True)
+        return [
+            {"site": site, "size_kb": round(v["size_kb"], 1), "count": v["count"], "profiles": v["files"]}
+            for site, v in ranked[:top]
+        ]
+
+    def write_collapsed(self, path: Path) -> None:
+        """Write all merged stacks, prefixed by stage, for flamegraph tools."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stage in sorted(self.stacks):
+                for stack, count in self.stacks[stage].most_common():
+                    f.write(f"{stage};{stack} {count}\n")
+
+    def report(self, sort: str = "cumulative", top: int = 25) -> Dict[str, Any]:
+        """Aggregated report for all stages."""
+        return {
+            "jobs": len(self.jobs),
+            "stages": {
+                stage: {
+                    "prof_files": len(self.prof_files.get(stage, [])),
+                    "samples": sum(self.stacks.get(stage, Counter()).values()),
+                    "functions": self.cprofile_top(stage, sort, top),
+                    "stacks": self.stack_top(stage, top),
+                    "allocations": self.allocation_top(stage, top),
+                }
+                for stage in self.stages()
+            },
+        }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print an aggregated report as text."""
+    print(f"\nProfiles from {report['jobs']} job(s)")
+    for stage, data in report["stages"].items():
+        print(f"\n{'=' * 70}\n{stage}\n{'=' * 70}")
+        if data["functions"]:
+            print(f"\ncProfile ({data['prof_files']} file(s)):")
+            print(f"  {'ncalls':>10} {'tottime':>10} {'cumtime':>10}  function")
+            for row in data["functions"]:
+                print(f"  {row['ncalls']:>10} {row['tottime']:>10.3f} {row['cumtime']:>10.3f}  {row['function']}")
+        if data["stacks"]["self"]:
+            print(f"\nSampled stacks ({data['samples']} samples), self time:")
+            for row in data["stacks"]["self"]:
+                print(f"  {row['percent']:>5.1f}%  {row['frame']}")
+            print("\nInclusive time:")
+            for row in data["stacks"]["inclusive"]:
+                print(f"  {row['percent']:>5.1f}%  {row['frame']}")
+        if data["allocations"]:
+            print("\nAllocations (tracemalloc):")
+            for row in data["allocations"]:
+                print(f"  {row['size_kb']:>10.1f} KiB {row['count']:>8}  {row['site']}")
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Aggregate stage profiles across pipeline jobs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # All profiled jobs under out/
+  ./tools/aggregate-profiles.py out/
+
+  # One stage, by self time
+  ./tools/aggregate-profiles.py out/ --stage asr --sort tottime
+
+  # Merged flamegraph input
+  ./tools/aggregate-profiles.py out/ --collapsed all.collapsed
+  flamegraph.pl all.collapsed > flame.svg
+        """
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        type=Path,
+        help="Job directories, output roots or profile files"
+    )
+    parser.add_argument(
+        "--stage",
+        help="Only stages matching this pattern (e.g. asr, *translation*)"
+    )
+    parser.add_argument(
+        "--sort",
+        choices=SORT_KEYS,
+        default="cumulative",
+        help="cProfile sort key (default: cumulative)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=25,
+        help="Rows per section (default: 25)"
+    )
+    parser.add_argument(
+        "--collapsed",
+        type=Path,
+        metavar="FILE",
+        help="Also write all merged stacks to FILE"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON"
+    )
+
+    args = parser.parse_args()
+
+    aggregator = ProfileAggregator(stage_filter=args.stage)
+    files = aggregator.find(args.paths)
+    if not files:
+        logger.error("No profile files found (enable the job.json \"profiling\" section)")
+        return 1
+    for path in files:
+        aggregator.add(path)
+
+    report = aggregator.report(sort=args.sort, top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.collapsed:
+        aggregator.write_collapsed(args.collapsed)
+        logger.info(f"Merged stacks written to {args.collapsed}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,10 @@ Features:
     - Find common errors
     - Generate timing reports
     - Export to JSON/CSV
+
+Job logs are read from the JSON-lines sidecars (*.log.jsonl) through an
+incremental SQLite index (shared/log_index.py): each run ingests only the
+lines appended since the previous run, then answers from SQL.
 """
 
 import sys
@@ -20,13 +24,13 @@ import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
-from typing import Dict, List, Tuple
-import re
+from typing import Dict, List, Optional
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from shared.log_index import LogIndex
 from shared.logger import setup_logger
 
 logger = setup_logger("log_analyzer", log_level="INFO", log_format="text")
@@ -35,12 +39,14 @@ logger = setup_logger("log_analyzer", log_level="INFO", log_format="text")
 class LogAnalyzer:
     """Analyze logs from CP-WhisperX-App"""
     
-    def __init__(self, logs_dir: Path, job_logs_dir: Path):
+    def __init__(self, logs_dir: Path, job_logs_dir: Path, index_db: Optional[Path] = None,
+                 refresh: bool = True):
         self.logs_dir = logs_dir
         self.job_logs_dir = job_logs_dir
-        self.errors = []
-        self.warnings = []
-        self.job_stats = defaultdict(dict)
+        self.index = LogIndex(index_db or job_logs_dir / ".log_index.db")
+        if refresh and job_logs_dir.exists():
+            stats = self.index.ingest([job_logs_dir])
+            logger.info(f"Log index: {stats['records']} new records from {stats['read']} of {stats['files']} log files")
         
     def analyze_script_logs(self, days: int = 7) -> Dict:
         """Analyze main script logs (bootstrap, prepare-job, etc.)"""
@@ -94,74 +100,23 @@ class LogAnalyzer:
         
         return stats
     
-    def analyze_job_logs(self, limit: int = 10) -> List[Dict]:
-        """Analyze pipeline job logs"""
+    def analyze_job_logs(self, limit: int = 10, job_id: Optional[str] = None) -> List[Dict]:
+        """Analyze pipeline job logs (newest first, from the log index)"""
         logger.info(f"Analyzing last {limit} job logs...")
-        
-        # Find all job directories
-        job_dirs = []
-        for path in self.job_logs_dir.rglob("job.json"):
-            job_dir = path.parent
-            job_dirs.append((job_dir, path.stat().st_mtime))
-        
-        # Sort by modification time (newest first)
-        job_dirs.sort(key=lambda x: x[1], reverse=True)
-        job_dirs = job_dirs[:limit]
-        
-        job_stats = []
-        
-        for job_dir, _ in job_dirs:
-            try:
-                # Read job metadata
-                job_json = job_dir / "job.json"
-                with open(job_json) as f:
-                    job_data = json.load(f)
-                
-                job_id = job_data.get("job_id", "unknown")
-                workflow = job_data.get("workflow", "unknown")
-                
-                # Analyze logs in job directory
-                logs_dir = job_dir / "logs"
-                if not logs_dir.exists():
-                    continue
-                
-                stage_logs = list(logs_dir.glob("*.log"))
-                
-                errors = 0
-                warnings = 0
-                stages_completed = []
-                
-                for log_file in stage_logs:
-                    # Extract stage name from filename
-                    # Format: NN_stagename_timestamp.log
-                    match = re.match(r'(\d+)_([^_]+)_', log_file.name)
-                    if match:
-                        stage_num, stage_name = match.groups()
-                        stages_completed.append(stage_name)
-                    
-                    # Count errors/warnings
-                    with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
-                        content = f.read()
-                        errors += content.count("[ERROR]") + content.count("[CRITICAL]")
-                        warnings += content.count("[WARN]")
-                
-                job_stats.append({
-                    "job_id": job_id,
-                    "workflow": workflow,
-                    "job_dir": str(job_dir),
-                    "stages_completed": len(stages_completed),
-                    "stages": stages_completed,
-                    "errors": errors,
-                    "warnings": warnings,
-                    "log_files": len(stage_logs)
-                })
-                
-            except Exception as e:
-                logger.warning(f"Could not analyze job {job_dir.name}: {e}")
-        
-        return job_stats
+        return self.index.job_summaries(limit=limit, job_id=job_id)
+    
+    def analyze_index(self, days: Optional[int] = None, top: int = 10) -> Dict:
+        """Cross-job error classes, stage timings and recent errors"""
+        since = (datetime.now() - timedelta(days=days)).timestamp() if days else None
+        return {
+            "levels": self.index.level_counts(since),
+            "error_classes": self.index.error_classes(limit=top, since=since),
+            "stage_durations": self.index.stage_durations(since),
+            "recent_errors": self.index.recent("ERROR", limit=top),
+        }
     
-    def generate_report(self, script_stats: Dict, job_stats: List[Dict]) -> str:
+    def generate_report(self, script_stats: Dict, job_stats: List[Dict],
+                        index_stats: Optional[Dict] = None) -> str:
         """Generate text report"""
         report = []
         report.append("=" * 70)
@@ -214,17 +169,33 @@ class LogAnalyzer:
                 if len(job['stages']) > 5:
                     report.append(f"              ... and {len(job['stages']) - 5} more")
         
+        if index_stats:
+            report.append("")
+            report.append("ERROR CLASSES ACROSS JOBS")
+            report.append("-" * 70)
+            for row in index_stats["error_classes"]:
+                report.append(f"  {row['error_class']:<32} {row['count']:>6}x in {row['jobs']} jobs")
+            
+            report.append("")
+            report.append("STAGE TIMINGS")
+            report.append("-" * 70)
+            for row in index_stats["stage_durations"]:
+                report.append(f"  {row['stage']:<28} runs={row['runs']:<5} "
+                              f"mean={row['mean']:.1f}s max={row['max']:.1f}s")
+        
         report.append("")
         report.append("=" * 70)
         
         return "\n".join(report)
     
-    def export_json(self, script_stats: Dict, job_stats: List[Dict], output_file: Path):
+    def export_json(self, script_stats: Dict, job_stats: List[Dict], output_file: Path,
+                    index_stats: Optional[Dict] = None):
         """Export analysis to JSON"""
         data = {
             "generated_at": datetime.now().isoformat(),
             "script_logs": script_stats,
-            "job_logs": job_stats
+            "job_logs": job_stats,
+            "index": index_stats or {}
         }
         
         with open(output_file, 'w') as f:
@@ -265,24 +236,49 @@ def main():
         help="Save report to text file"
     )
     
+    parser.add_argument(
+        "--job",
+        help="Only report this job ID"
+    )
+    
+    parser.add_argument(
+        "--out-dir",
+        type=Path,
+        default=PROJECT_ROOT / "out",
+        help="Job output root to index (default: out/)"
+    )
+    
+    parser.add_argument(
+        "--index-db",
+        type=Path,
+        help="Log index database (default: <out-dir>/.log_index.db)"
+    )
+    
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Query the index without ingesting new log lines"
+    )
+    
     args = parser.parse_args()
     
     # Setup paths
     logs_dir = PROJECT_ROOT / "logs"
-    job_logs_dir = PROJECT_ROOT / "out"
+    job_logs_dir = args.out_dir
     
-    if not logs_dir.exists():
+    if not logs_dir.exists() and not job_logs_dir.exists():
         logger.error(f"Logs directory not found: {logs_dir}")
         return 1
     
     # Run analysis
-    analyzer = LogAnalyzer(logs_dir, job_logs_dir)
+    analyzer = LogAnalyzer(logs_dir, job_logs_dir, index_db=args.index_db, refresh=not args.no_refresh)
     
     script_stats = analyzer.analyze_script_logs(days=args.days)
-    job_stats = analyzer.analyze_job_logs(limit=args.jobs)
+    job_stats = analyzer.analyze_job_logs(limit=args.jobs, job_id=args.job)
+    index_stats = analyzer.analyze_index(days=args.days)
     
     # Generate report
-    report = analyzer.generate_report(script_stats, job_stats)
+    report = analyzer.generate_report(script_stats, job_stats, index_stats)
     
     # Output report
     if args.output:
@@ -296,7 +292,7 @@ def main():
     # Export JSON if requested
     if args.json:
         json_path = Path(args.json)
-        analyzer.export_json(script_stats, job_stats, json_path)
+        analyzer.export_json(script_stats, job_stats, json_path, index_stats)
     
     return 0
 
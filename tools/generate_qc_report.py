@@ -13,6 +13,12 @@ from typing import Dict, List, Optional
 from datetime import datetime
 import re
 
+# Add project root to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.subtitle_io import iter_srt
+
 
 def parse_srt(srt_file: Path) -> List[Dict]:
     """
@@ -24,42 +30,14 @@ def parse_srt(srt_file: Path) -> List[Dict]:
     Returns:
         List of subtitle dictionaries
     """
-    subtitles = []
-    
-    with open(srt_file, 'r', encoding='utf-8') as f:
-        content = f.read().strip()
-    
-    # Split into subtitle blocks
-    blocks = content.split('\n\n')
-    
-    for block in blocks:
-        lines = block.strip().split('\n')
-        if len(lines) < 3:
-            continue
-        
-        try:
-            index = int(lines[0])
-            timecode = lines[1]
-            text = '\n'.join(lines[2:])
-            
-            # Parse timecodes
-            start_str, end_str = timecode.split(' --> ')
-            start = parse_srt_time(start_str)
-            end = parse_srt_time(end_str)
-            
-            subtitles.append({
-                'index': index,
-                'start': start,
-                'end': end,
-                'duration': end - start,
-                'text': text,
-                'char_count': len(text.replace('\n', ''))
-            })
-        except Exception as e:
-            print(f"Warning: Could not parse subtitle block: {e}", file=sys.stderr)
-            continue
-    
-    return subtitles
+    return [
+        {
+            **cue,
+            'duration': cue['end'] - cue['start'],
+            'char_count': len(cue['text'].replace('\n', ''))
+        }
+        for cue in iter_srt(Path(srt_file))
+    ]
 
 
 def parse_srt_time(time_str: str) -> float:
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics Exporter
+
+Expose fleet metrics (stage durations, ASR real-time factor per
+backend/model, translation tokens/sec, cache hit ratios, queue depth,
+failures, API usage) in the Prometheus text format, built from job
+manifests, job event streams, the CostTracker ledger and the baseline
+cache (see shared/metrics_exporter.py).
+
+Run: ./tools/metrics-exporter.py [out/] [--output FILE.prom] [--serve PORT]
+
+Compliance: § 16.7 (DEVELOPER_STANDARDS.md)
+"""
+
+# Standard library
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Local
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.metrics_exporter import MetricsCollector, write_textfile
+
+# Configure simple logging
+import logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def make_handler(collector: MetricsCollector, lock: threading.Lock):
+    """HTTP handler class serving /metrics from the collector."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            with lock:
+                body = collector.collect().render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return MetricsHandler
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Export pipeline metrics in the Prometheus text format",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Print metrics once
+  ./tools/metrics-exporter.py out/
+
+  # node_exporter textfile collector, refreshed every minute
+  ./tools/metrics-exporter.py out/ --output /var/lib/node_exporter/cpwhisperx.prom --interval 60
+
+  # Local scrape endpoint on http://127.0.0.1:9464/metrics
+  ./tools/metrics-exporter.py out/ --serve 9464
+        """
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[PROJECT_ROOT / "out"],
+        help="Job output roots or job directories (default: out/)"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        metavar="FILE",
+        help="Write metrics to FILE (atomically replaced)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        help="With --output, rewrite every N seconds (default: once)"
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        metavar="PORT",
+        help="Serve /metrics on PORT"
+    )
+    parser.add_argument(
+        "--bind",
+        default="127.0.0.1",
+        help="Address for --serve (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--cost-dir",
+        type=Path,
+        help="CostTracker ledger directory (default: ~/.cp-whisperx/costs)"
+    )
+    parser.add_argument(
+        "--no-cache-info",
+        action="store_true",
+        help="Skip baseline cache size metrics"
+    )
+
+    args = parser.parse_args()
+
+    collector = MetricsCollector(
+        args.paths,
+        cost_storage_path=args.cost_dir,
+        cache_info=not args.no_cache_info
+    )
+
+    if args.serve:
+        server = ThreadingHTTPServer((args.bind, args.serve), make_handler(collector, threading.Lock()))
+        logger.info(f"Serving metrics on http://{args.bind}:{args.serve}/metrics")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    try:
+        while True:
+            text = collector.collect().render()
+            if args.output:
+                write_textfile(args.output, text)
+                logger.info(f"Metrics written to {args.output}")
+            else:
+                print(text, end="")
+            if not (args.output and args.interval > 0):
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
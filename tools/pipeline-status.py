@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Pipeline Status
+
+Live progress and ETAs for running jobs, from each job's append-only
+events.jsonl (see shared/job_events.py) instead of log lines.
+
+For a running stage the ETA comes from its own progress events (remaining
+audio x real-time factor); stages not started yet are estimated from the
+median seconds-per-media-second of the same stage in the other jobs found.
+
+Run: ./tools/pipeline-status.py [out/ | JOB_DIR ...] [--follow] [--events]
+
+Compliance: § 16.7 (DEVELOPER_STANDARDS.md)
+"""
+
+# Standard library
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+# Local
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from shared.job_events import DEFAULT_HEARTBEAT_INTERVAL, EVENTS_FILE, read_events
+
+# Configure simple logging
+import logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# A running job silent for longer than this is flagged as stalled
+STALL_SECONDS = 3 * DEFAULT_HEARTBEAT_INTERVAL
+
+
+@dataclass
+class JobStatus:
+    """State of one job folded from its events."""
+
+    path: Path
+    job_id: Optional[str] = None
+    workflow: Optional[str] = None
+    status: str = "prepared"
+    started: Optional[float] = None
+    updated: Optional[float] = None
+    media_seconds: Optional[float] = None
+    plan: List[str] = field(default_factory=list)
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    current: Optional[str] = None
+    offset: int = 0
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """Fold one event into the status."""
+        kind = event.get("event")
+        stage = event.get("stage")
+        ts = event.get("ts")
+        self.updated = max(self.updated or 0.0, ts or 0.0)
+        self.job_id = event.get("job_id") or self.job_id
+
+        if kind == "job_start":
+            self.status = "running"
+            self.started = ts
+            self.workflow = event.get("workflow")
+        elif kind == "job_end":
+            self.status = event.get("status", "completed")
+            self.current = None
+        elif kind == "plan":
+            self.plan = event.get("stages", [])
+        elif kind == "media":
+            self.media_seconds = event.get("media_seconds")
+        elif kind == "stage_start" and stage:
+            self.stages[stage] = {"status": "running", "started": ts}
+            self.current = stage
+        elif kind == "stage_end" and stage:
+            entry = self.stages.setdefault(stage, {})
+            entry.update(status=event.get("status"), duration=event.get("duration"), ended=ts)
+            if self.current == stage:
+                self.current = None
+        elif kind == "stage_skipped" and stage:
+            self.stages[stage] = {"status": "skipped"}
+        elif kind in ("progress", "heartbeat") and stage:
+            entry = self.stages.setdefault(stage, {"status": "running"})
+            progress = {k: v for k, v in event.items() if k not in ("v", "job_id", "pid", "event", "stage")}
+            if kind == "heartbeat":
+                # Heartbeats prove liveness but must not erase chunk progress
+                progress = {**entry.get("progress", {}), "ts": ts, "elapsed": event.get("elapsed")}
+            entry["progress"] = progress
+            if self.media_seconds is None and event.get("total_audio_seconds"):
+                self.media_seconds = event["total_audio_seconds"]
+
+    def stage_eta(self, stage: str, now: float, history: Dict[str, float]) -> Optional[float]:
+        """Remaining seconds of a stage, or None if unknown."""
+        entry = self.stages.get(stage, {})
+        status = entry.get("status")
+        if status in ("completed", "failed", "skipped"):
+            return 0.0
+        progress = entry.get("progress", {})
+        if status == "running" and progress.get("eta_seconds") is not None:
+            return max(0.0, progress["eta_seconds"] - (now - progress.get("ts", now)))
+        ratio = history.get(stage)
+        if ratio is None or not self.media_seconds:
+            return None
+        expected = ratio * self.media_seconds
+        if status == "running" and entry.get("started"):
+            return max(0.0, expected - (now - entry["started"]))
+        return expected
+
+    def eta(self, now: float, history: Dict[str, float]) -> Optional[float]:
+        """Remaining seconds of the job, or None if any stage is unknown."""
+        if self.status != "running":
+            return 0.0 if self.status in ("completed", "failed") else None
+        total = 0.0
+        for stage in self.plan or list(self.stages):
+            remaining = self.stage_eta(stage, now, history)
+            if remaining is None:
+                return None
+            total += remaining
+        return total
+
+
+class StatusBoard:
+    """Incrementally tail events.jsonl of many jobs."""
+
+    def __init__(self, roots: List[Path]):
+        """
+        Initialize status board.
+
+        Args:
+            roots: Job directories or output roots to search
+        """
+        self.roots = roots
+        self.jobs: Dict[Path, JobStatus] = {}
+
+    def discover(self) -> None:
+        """Find event streams (new jobs appear while following)."""
+        for root in self.roots:
+            if (root / EVENTS_FILE).exists():
+                paths = [root / EVENTS_FILE]
+            else:
+                paths = root.rglob(EVENTS_FILE)
+            for path in paths:
+                self.jobs.setdefault(path, JobStatus(path=path))
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Read events appended since the last poll
+
+        Returns:
+            New events, each with its job path under "_path"
+        """
+        self.discover()
+        new = []
+        for path, job in self.jobs.items():
+            events, job.offset = read_events(path, job.offset)
+            for event in events:
+                job.apply(event)
+                new.append({**event, "_path": str(path.parent)})
+        return new
+
+    def history(self) -> Dict[str, float]:
+        """Median stage seconds per media second over completed stages."""
+        ratios: Dict[str, List[float]] = {}
+        for job in self.jobs.values():
+            if not job.media_seconds:
+                continue
+            for stage, entry in job.stages.items():
+                if entry.get("status") == "completed" and entry.get("duration") is not None:
+                    ratios.setdefault(stage, []).append(entry["duration"] / job.media_seconds)
+        return {stage: median(values) for stage, values in ratios.items()}
+
+    def rows(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """One summary row per job, running jobs first."""
+        now = now or time.time()
+        history = self.history()
+        rows = []
+        for job in self.jobs.values():
+            current = job.current
+            progress = job.stages.get(current, {}).get("progress", {}) if current else {}
+            done = sum(1 for s in job.plan if job.stages.get(s, {}).get("status") in ("completed", "skipped"))
+            status = job.status
+            if status == "running" and job.updated and now - job.updated > STALL_SECONDS:
+                status = "stalled?"
+            rows.append({
+                "job_id": job.job_id or job.path.parent.name,
+                "path": str(job.path.parent),
+                "status": status,
+                "workflow": job.workflow,
+                "stages_done": done,
+                "stages_total": len(job.plan),
+                "stage": current,
+                "chunk": f"{progress['done']}/{progress['total']} {progress.get('unit', '')}".strip()
+                         if progress.get("total") else None,
+                "rtf": progress.get("rtf"),
+                "stage_eta_seconds": job.stage_eta(current, now, history) if current else None,
+                "eta_seconds": job.eta(now, history),
+                "elapsed_seconds": now - job.started if job.started and job.status == "running" else None,
+                "last_event_age": now - job.updated if job.updated else None,
+            })
+        order = {"running": 0, "stalled?": 1, "failed": 2, "prepared": 3, "completed": 4}
+        rows.sort(key=lambda r: (order.get(r["status"], 5), r["job_id"]))
+        return rows
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    """Compact duration (1h02m, 4m10s, 35s) or '?'."""
+    if seconds is None:
+        return "?"
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    """Print the status table."""
+    print(f"{'JOB':<28} {'STATUS':<10} {'STAGES':>7}  {'STAGE':<26} {'CHUNK':<14} {'RTF':>6} {'STAGE ETA':>9} {'JOB ETA':>8}")
+    for row in rows:
+        stages = f"{row['stages_done']}/{row['stages_total']}" if row["stages_total"] else "-"
+        rtf = f"{row['rtf']:.2f}" if row["rtf"] is not None else "-"
+        stage_eta = format_seconds(row["stage_eta_seconds"]) if row["stage"] else "-"
+        print(f"{row['job_id'][:28]:<28} {row['status']:<10} {stages:>7}  {(row['stage'] or '-')[:26]:<26} "
+              f"{(row['chunk'] or '-')[:14]:<14} {rtf:>6} {stage_eta:>9} {format_seconds(row['eta_seconds']):>8}")
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """One human-readable line for an event."""
+    ts = time.strftime("%H:%M:%S", time.localtime(event.get("ts", 0)))
+    skip = {"v", "ts", "job_id", "pid", "event", "stage", "_path"}
+    details = " ".join(f"{k}={v}" for k, v in event.items() if k not in skip)
+    return f"{ts} {event.get('job_id') or '-'} {event.get('event')} {event.get('stage') or ''} {details}".rstrip()
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Live status, progress and ETAs of pipeline jobs",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # All jobs under out/
+  ./tools/pipeline-status.py
+
+  # Refresh every 5 seconds
+  ./tools/pipeline-status.py out/ --follow
+
+  # Tail the raw events of one job
+  ./tools/pipeline-status.py out/2025/12/01/1/0001 --events --follow
+        """
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        default=[PROJECT_ROOT / "out"],
+        help="Job directories or output roots (default: out/)"
+    )
+    parser.add_argument(
+        "-f", "--follow",
+        action="store_true",
+        help="Keep running and refresh as events arrive"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Refresh interval with --follow (default: 5s)"
+    )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Print events as they arrive instead of the table"
+    )
+    parser.add_argument(
+        "--running",
+        action="store_true",
+        help="Only show running jobs"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the status rows as JSON"
+    )
+
+    args = parser.parse_args()
+
+    board = StatusBoard(args.paths)
+    try:
+        while True:
+            events = board.poll()
+            if args.events:
+                for event in events:
+                    print(format_event(event), flush=True)
+            else:
+                if not board.jobs:
+                    logger.error(f"No {EVENTS_FILE} found under: {', '.join(map(str, args.paths))}")
+                    return 1
+                rows = board.rows()
+                if args.running:
+                    rows = [r for r in rows if r["status"] in ("running", "stalled?")]
+                if args.json:
+                    print(json.dumps(rows, indent=2))
+                else:
+                    if args.follow:
+                        print("\033[2J\033[H", end="")
+                    print_table(rows)
+            if not args.follow:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())